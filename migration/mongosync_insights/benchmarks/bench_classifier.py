@@ -0,0 +1,74 @@
+"""
+Micro-benchmark: log line classification throughput (lines/sec).
+
+Compares the previous approach -- one case-insensitive re.search per
+message pattern and per error pattern on every line -- against
+LogLineClassifier, which scans literal anchors once and only confirms
+candidate patterns with their regex.
+
+Usage (from the mongosync_insights directory):
+    python benchmarks/bench_classifier.py [num_lines]
+"""
+import json
+import sys
+import time
+
+from synthetic_logs import generate_lines
+
+from lib.app_config import load_error_patterns
+from lib.log_ingest import (
+    LOG_MESSAGE_PATTERNS,
+    NATURAL_ORDER_REASON_PATTERN,
+    LogLineClassifier,
+    new_categories,
+)
+
+
+def _cascade_classify(json_obj, error_patterns, categories):
+    """Per-pattern regex cascade (the pre-classifier implementation)."""
+    message = json_obj.get('message', '')
+    for name, pattern in LOG_MESSAGE_PATTERNS.items():
+        if pattern.search(message):
+            categories.setdefault(name, []).append(json_obj)
+    if NATURAL_ORDER_REASON_PATTERN.search(json_obj.get('reason', '')):
+        categories['natural_order_collections'].append(json_obj)
+    for ep in error_patterns:
+        if ep['pattern'].search(message):
+            categories['matched_errors'].append(json_obj)
+            break
+
+
+def _time(label, fn, objs):
+    t0 = time.perf_counter()
+    fn(objs)
+    elapsed = time.perf_counter() - t0
+    rate = len(objs) / elapsed
+    print(f"{label:<28} {elapsed:8.3f}s  {rate:>12,.0f} lines/sec")
+    return rate
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    objs = [json.loads(line) for line in generate_lines(n)]
+    config = load_error_patterns()
+    classifier = LogLineClassifier(config)
+
+    def run_cascade(items):
+        categories = new_categories()
+        for obj in items:
+            _cascade_classify(obj, classifier.error_patterns, categories)
+
+    def run_classifier(items):
+        categories = new_categories()
+        for obj in items:
+            classifier.classify(obj, categories)
+
+    print(f"Classifying {n:,} synthetic log lines "
+          f"({len(LOG_MESSAGE_PATTERNS)} message patterns, {len(config)} error patterns)")
+    before = _time("regex cascade (before)", run_cascade, objs)
+    after = _time("LogLineClassifier (after)", run_classifier, objs)
+    print(f"speed-up: {after / before:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,148 @@
+"""
+Micro-benchmark: decompression and line framing throughput (MB/s) per format.
+
+Compresses the synthetic log in memory as each upload format the Log
+Analyzer accepts (zstandard only when the zstandard package is installed)
+and times decompress_file_classified over it, reporting decompressed
+megabytes per second. For gzip and bzip2 the per-line framing used
+before lib.file_decompressor.iter_lines (iterating the GzipFile, and the
+buffer += / split(b'\\n', 1) bzip2 splitter) is timed on the same data
+for comparison. Finally a bundle of MEMBERS gzip-rotated
+logs is read with one thread and with one thread per CPU
+(MI_ARCHIVE_MEMBER_WORKERS), and a single .gz and .bz2 file is read and
+JSON-decoded line by line inline and with the reader thread of
+MI_DECOMPRESS_PIPELINE. Both speed-ups need a multi-core host. A single
+gzip member cannot be decoded in parallel without an index, so
+pipelining is the only supported overlap for one large file.
+
+Usage (from the mongosync_insights directory):
+    python benchmarks/bench_decompress.py [num_lines]
+"""
+import bz2
+import gzip
+import io
+import lzma
+import os
+import sys
+import tarfile
+import time
+import zipfile
+
+from synthetic_logs import generate_lines
+
+from lib.file_decompressor import decompress_file_classified, zstandard
+from lib.json_backend import loads
+
+REPEAT = 3
+# Rotated logs in the bundle used for parallel member decompression
+MEMBERS = 12
+
+
+def _zip(members):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as zf:
+        for name, data in members:
+            zf.writestr(name, data)
+    return buffer.getvalue()
+
+
+def _tar(members, compression):
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode=f'w:{compression}') as tf:
+        for name, data in members:
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tf.addfile(info, io.BytesIO(data))
+    return buffer.getvalue()
+
+
+def _formats(data):
+    """(label, payload, mime type, filename) per upload format."""
+    half = data.index(b'\n', len(data) // 2) + 1
+    # A support bundle: the current log plus a gzip-rotated one
+    members = [('mongosync.log', data[:half]), ('mongosync-1.log.gz', gzip.compress(data[half:]))]
+    return [
+        ('gzip', gzip.compress(data), 'application/gzip', 'mongosync.log.gz'),
+        ('bzip2', bz2.compress(data), 'application/x-bzip2', 'mongosync.log.bz2'),
+        ('zip', _zip(members), 'application/zip', 'bundle.zip'),
+        ('tar.gz', _tar(members, 'gz'), 'application/gzip', 'bundle.tar.gz'),
+        ('tar.bz2', _tar(members, 'bz2'), 'application/x-bzip2', 'bundle.tar.bz2'),
+        ('xz', lzma.compress(data), 'application/x-xz', 'mongosync.log.xz'),
+        ('tar.xz', _tar(members, 'xz'), 'application/x-xz', 'bundle.tar.xz'),
+    ] + ([
+        ('zstd', zstandard.ZstdCompressor().compress(data), 'application/zstd', 'mongosync.log.zst'),
+        ('tar.zst', zstandard.ZstdCompressor().compress(_tar(members, '')), 'application/zstd', 'bundle.tar.zst'),
+    ] if zstandard is not None else [])
+
+
+def _gzip_readline(payload):
+    with gzip.GzipFile(fileobj=io.BytesIO(payload), mode='rb') as gz:
+        for line in gz:
+            yield line
+
+
+def _bzip2_split(payload):
+    file_obj = io.BytesIO(payload)
+    decompressor = bz2.BZ2Decompressor()
+    buffer = b''
+    while True:
+        chunk = file_obj.read(8192)
+        if not chunk:
+            break
+        buffer += decompressor.decompress(chunk)
+        while b'\n' in buffer:
+            line, buffer = buffer.split(b'\n', 1)
+            yield line + b'\n'
+    if buffer:
+        yield buffer
+
+
+BEFORE = {'gzip': _gzip_readline, 'bzip2': _bzip2_split}
+
+
+def _rate(size, lines_fn):
+    best = None
+    for _ in range(REPEAT):
+        t0 = time.perf_counter()
+        for _line in lines_fn():
+            pass
+        elapsed = time.perf_counter() - t0
+        best = elapsed if best is None else min(best, elapsed)
+    return size / (1024 * 1024) / best
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 300000
+    data = ''.join(line if line.endswith('\n') else line + '\n' for line in generate_lines(n)).encode()
+
+    print(f"Decompressing {n:,} synthetic log lines ({len(data) / (1024 * 1024):.1f} MB), best of {REPEAT}")
+    print(f"{'format':<9} {'before':>12} {'iter_lines':>12}")
+    for label, payload, mime_type, filename in _formats(data):
+        after = _rate(len(data), lambda: decompress_file_classified(io.BytesIO(payload), mime_type, filename))
+        before_fn = BEFORE.get(label)
+        before = f"{_rate(len(data), lambda: before_fn(payload)):7.0f} MB/s" if before_fn else f"{'-':>12}"
+        print(f"{label:<9} {before} {after:7.0f} MB/s")
+
+    lines = data.splitlines(keepends=True)
+    step = len(lines) // MEMBERS + 1
+    bundle = _zip([(f'mongosync-{i}.log.gz', gzip.compress(b''.join(lines[i * step:(i + 1) * step])))
+                   for i in range(MEMBERS)])
+    print(f"zip bundle of {MEMBERS} .gz logs")
+    for workers in sorted({1, os.cpu_count() or 1}):
+        rate = _rate(len(data), lambda: decompress_file_classified(
+            io.BytesIO(bundle), 'application/zip', 'bundle.zip', member_workers=workers))
+        print(f"{workers:>3} thread(s) {rate:7.0f} MB/s")
+
+    print("single file, decompressed and JSON-decoded")
+    print(f"{'format':<9} {'inline':>12} {'pipelined':>12}")
+    for label, payload, mime_type, filename in _formats(data)[:2]:
+        rates = [
+            _rate(len(data), lambda: (loads(line) for line, _file_type in decompress_file_classified(
+                io.BytesIO(payload), mime_type, filename, pipelined=pipelined)))
+            for pipelined in (False, True)
+        ]
+        print(f"{label:<9} {rates[0]:7.0f} MB/s {rates[1]:7.0f} MB/s")
+
+
+if __name__ == '__main__':
+    main()
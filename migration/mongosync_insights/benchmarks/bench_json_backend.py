@@ -0,0 +1,80 @@
+"""
+End-to-end benchmark: Log Analyzer upload time per JSON backend.
+
+Writes a synthetic mongosync log to a temporary file and posts it to
+/logs/uploadLogs through the Flask test client, once with the standard
+library json.loads and once with the backend chosen by lib.json_backend
+(orjson when installed). Page rendering and snapshot saving are stubbed
+out so the timing covers decoding, parsing, the log store and plotting.
+
+Usage (from the mongosync_insights directory):
+    python benchmarks/bench_json_backend.py [num_lines]
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+from unittest.mock import patch
+
+from synthetic_logs import generate_lines
+
+from lib import json_backend
+
+# Modules that bound json_backend.loads at import time
+_PATCH_TARGETS = ('lib.log_ingest.json_loads', 'lib.otel_metrics.json_loads')
+
+
+def _upload(app, path):
+    with app.test_client() as client, open(path, 'rb') as f:
+        t0 = time.perf_counter()
+        response = client.post(
+            '/logs/uploadLogs',
+            data={'file': (f, 'mongosync.log')},
+            content_type='multipart/form-data',
+        )
+        elapsed = time.perf_counter() - t0
+    if response.status_code != 200:
+        raise RuntimeError(f"upload failed with HTTP {response.status_code}")
+    return elapsed
+
+
+def _run(app, path, loads, label, n):
+    patches = [patch(target, loads) for target in _PATCH_TARGETS]
+    for p in patches:
+        p.start()
+    try:
+        _upload(app, path)  # warm-up
+        elapsed = min(_upload(app, path) for _ in range(3))
+    finally:
+        for p in patches:
+            p.stop()
+    print(f"{label:<24} {elapsed:8.3f}s  {n / elapsed:>12,.0f} lines/sec")
+    return elapsed
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ.setdefault('MI_LOG_STORE_DIR', tmp)
+        from mongosync_insights import create_app
+
+        path = os.path.join(tmp, 'mongosync.log')
+        with open(path, 'w') as f:
+            f.write('\n'.join(generate_lines(n)) + '\n')
+
+        app = create_app()
+        app.config['TESTING'] = True
+        with patch('lib.logs_metrics.render_template', return_value='ok'), \
+                patch('lib.logs_metrics.save_snapshot'):
+            print(f"Uploading {n:,} synthetic log lines (best of 3)")
+            before = _run(app, path, json.loads, "stdlib json", n)
+            if json_backend.BACKEND == 'json':
+                print("orjson is not installed; nothing to compare")
+                return
+            after = _run(app, path, json_backend.loads, json_backend.BACKEND, n)
+        print(f"speed-up: {before / after:.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""
+Benchmark: Log Viewer store load throughput per SQLite load profile.
+
+Loads the synthetic log into a new LogStore with each of
+LogStore.LOAD_PROFILES (MI_LOG_STORE_LOAD_PROFILE), with raw documents
+and with compressed document blocks (and the MI_LOG_STORE_FIELDS columns
+when that is set), feeding rows in the 1,000-line chunks the parse
+workers produce. Reports the best of REPEAT runs:
+inserts per second up to the final flush and the total time including
+the index build.
+
+Usage (from the mongosync_insights directory):
+    python benchmarks/bench_load_profiles.py [num_lines]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from synthetic_logs import generate_lines
+
+from lib.app_config import LOG_STORE_FIELDS
+from lib.json_backend import loads
+from lib.log_store import LogStore
+
+BLOCK_ROWS = (0, 64)
+CHUNK = 1000
+REPEAT = 3
+
+
+def _rows(lines):
+    rows = []
+    for line in lines:
+        doc = loads(line)
+        rows.append((doc.get('time', ''), doc.get('level', ''), doc.get('message', ''), line))
+    return rows
+
+
+def _load(db_path, rows, profile, block_rows):
+    store = LogStore(db_path, doc_block_rows=block_rows, fields=LOG_STORE_FIELDS, load_profile=profile)
+    try:
+        t0 = time.perf_counter()
+        for start in range(0, len(rows), CHUNK):
+            store.insert_rows(rows[start:start + CHUNK])
+        store.flush()
+        insert_seconds = time.perf_counter() - t0
+        store.build_fts_index()
+        return insert_seconds, time.perf_counter() - t0
+    finally:
+        store.close()
+
+
+def _measure(directory, rows, profile, block_rows):
+    runs = []
+    for run in range(REPEAT):
+        db_path = os.path.join(directory, f'store_{profile}_{block_rows}_{run}.db')
+        runs.append(_load(db_path, rows, profile, block_rows))
+        size_mb = os.path.getsize(db_path) / (1024 * 1024)
+        os.remove(db_path)
+    insert_seconds = min(run[0] for run in runs)
+    total_seconds = min(run[1] for run in runs)
+    layout = 'doc column' if block_rows == 0 else f'blocks of {block_rows}'
+    print(f"{profile:<8} {layout:<16} {len(rows) / insert_seconds:12,.0f} {total_seconds:9.2f}s {size_mb:9.1f} MB")
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 300000
+    rows = _rows(generate_lines(n))
+
+    print(f"Loading {n:,} synthetic log lines")
+    print(f"{'profile':<8} {'layout':<16} {'inserts/s':>12} {'w/ index':>10} {'size':>12}")
+    with tempfile.TemporaryDirectory() as directory:
+        for block_rows in BLOCK_ROWS:
+            for profile in LogStore.LOAD_PROFILES:
+                _measure(directory, rows, profile, block_rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""
+Benchmark: Log Viewer store size and query latency with and without
+compressed document blocks.
+
+Loads the synthetic log into a LogStore once with raw documents in the
+doc column and once per block size with LogStore(doc_block_rows=N), then
+reports the database size, the insert time and the latency of the Log
+Viewer queries: the first and a deep page of a text search, a level
+filter and the latest-lines tail.
+
+Usage (from the mongosync_insights directory):
+    python benchmarks/bench_log_store.py [num_lines]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from synthetic_logs import generate_lines
+
+from lib.json_backend import loads
+from lib.log_store import LogStore
+
+BLOCK_ROWS = (0, 16, 64, 256)
+REPEAT = 20
+
+
+def _rows(lines):
+    rows = []
+    for line in lines:
+        doc = loads(line)
+        rows.append((doc.get('time', ''), doc.get('level', ''), doc.get('message', ''), line))
+    return rows
+
+
+def _latency_ms(fn):
+    fn()
+    t0 = time.perf_counter()
+    for _ in range(REPEAT):
+        fn()
+    return (time.perf_counter() - t0) / REPEAT * 1000
+
+
+def _measure(directory, rows, block_rows):
+    db_path = os.path.join(directory, f'store_{block_rows}.db')
+    store = LogStore(db_path, doc_block_rows=block_rows)
+    t0 = time.perf_counter()
+    store.insert_rows(rows)
+    store.flush()
+    store.build_fts_index()
+    load_seconds = time.perf_counter() - t0
+    store.close()
+    size_mb = os.path.getsize(db_path) / (1024 * 1024)
+
+    store = LogStore(db_path)
+    try:
+        first = store.find({'$text': 'progress'}, limit=50)
+        deep = store.find({'$text': 'progress'}, skip=max(0, first['total'] - 100), limit=50)
+        latencies = (
+            _latency_ms(lambda: store.find({'$text': 'progress'}, limit=50)),
+            _latency_ms(lambda: store.find({'$text': 'progress'}, limit=50,
+                                           after_rowid=deep['next_after_rowid'])),
+            _latency_ms(lambda: store.find({'level': 'error'}, limit=50)),
+            _latency_ms(lambda: store.fetch_latest_raw_lines(1000)),
+        )
+    finally:
+        store.close()
+    label = 'doc column' if block_rows == 0 else f'blocks of {block_rows}'
+    print(f"{label:<16} {size_mb:8.1f} MB {load_seconds:8.2f}s"
+          + ''.join(f"{ms:10.2f}" for ms in latencies))
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    lines = generate_lines(n)
+    rows = _rows(lines)
+    raw_mb = sum(len(line) + 1 for line in lines) / (1024 * 1024)
+
+    print(f"Storing {n:,} synthetic log lines ({raw_mb:.1f} MB raw); query latency in ms")
+    print(f"{'layout':<16} {'size':>11} {'load':>9}{'search':>10}{'deep page':>10}{'level':>10}{'tail 1000':>10}")
+    with tempfile.TemporaryDirectory() as directory:
+        for block_rows in BLOCK_ROWS:
+            _measure(directory, rows, block_rows)
+
+
+if __name__ == '__main__':
+    main()
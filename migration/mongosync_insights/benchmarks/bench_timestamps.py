@@ -0,0 +1,42 @@
+"""
+Micro-benchmark: log timestamp parsing throughput (timestamps/sec).
+
+Compares datetime.strptime(value[:26], "%Y-%m-%dT%H:%M:%S.%f"), which the
+chart builders used for every point, against lib.timestamps.parse_log_time
+on the timestamps of the synthetic log.
+
+Usage (from the mongosync_insights directory):
+    python benchmarks/bench_timestamps.py [num_lines]
+"""
+import sys
+import time
+from datetime import datetime
+
+from synthetic_logs import generate_lines
+
+from lib.json_backend import loads
+from lib.timestamps import LOG_TIME_FORMAT, parse_log_time
+
+
+def _time(label, fn, values):
+    t0 = time.perf_counter()
+    for value in values:
+        fn(value)
+    elapsed = time.perf_counter() - t0
+    rate = len(values) / elapsed
+    print(f"{label:<28} {elapsed:8.3f}s  {rate:>12,.0f} timestamps/sec")
+    return rate
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    values = [loads(line)['time'] for line in generate_lines(n)]
+
+    print(f"Parsing {n:,} synthetic log timestamps")
+    before = _time("strptime (before)", lambda v: datetime.strptime(v[:26], LOG_TIME_FORMAT), values)
+    after = _time("parse_log_time (after)", parse_log_time, values)
+    print(f"speed-up: {after / before:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""
+Synthetic mongosync log lines for the benchmarks in this directory.
+
+Produces a deterministic mix that resembles a verbose mongosync log:
+mostly routine chatter, with replication progress, operation stats,
+sent-response progress payloads, partition events and error lines
+spread through it at roughly the rates seen in real uploads.
+"""
+import json
+import os
+import random
+import sys
+from datetime import datetime, timedelta
+
+# Make `lib` importable when a benchmark is run as a script from any directory
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if APP_DIR not in sys.path:
+    sys.path.insert(0, APP_DIR)
+
+_START = datetime(2024, 3, 1, 0, 0, 0)
+
+
+def _timestamp(i: int) -> str:
+    t = _START + timedelta(milliseconds=100 * i)
+    return t.strftime('%Y-%m-%dT%H:%M:%S.%f') + '-05:00'
+
+
+def _progress_body(i: int, n: int) -> str:
+    return json.dumps({
+        'progress': {
+            'state': 'RUNNING',
+            'canCommit': i > n // 2,
+            'canWrite': False,
+            'collectionCopy': {'estimatedTotalBytes': 10 ** 9, 'estimatedCopiedBytes': i * 1000},
+            'estimatedSecondsToCEACatchup': i % 100,
+            'indexBuilding': {
+                'indexesBuilt': i % 9, 'totalIndexesToBuild': 9,
+                'collectionsFinished': i % 3, 'collectionsTotal': 3,
+            },
+            'verification': {
+                'source': {
+                    'scannedCollectionCount': 1, 'totalCollectionCount': 2,
+                    'hashedDocumentCount': i, 'estimatedDocumentCount': n,
+                },
+                'destination': {},
+            },
+        }
+    })
+
+
+def generate_lines(n: int, seed: int = 7) -> list[str]:
+    """Return n JSON log lines (without trailing newlines)."""
+    rng = random.Random(seed)
+    lines = []
+    for i in range(n):
+        obj = {'level': 'debug', 'time': _timestamp(i)}
+        r = rng.randrange(100)
+        if r < 2:
+            obj.update(level='info', message='Replication progress', totalEventsApplied=i,
+                       lagTimeSeconds=i % 30, estimatedOplogTimeRemaining='12 minutes',
+                       eventApplicationRatePerSecond=i % 7)
+        elif r < 4:
+            obj.update(level='info', message='Operation duration stats',
+                       CollectionCopySourceRead={'averageDurationMs': '1.5', 'maximumDurationMs': '3', 'numOperations': '7'},
+                       CEADestinationWrite={'averageDurationMs': '2', 'maximumDurationMs': '4', 'numOperations': '8'},
+                       sourcePingLatencyMs=3, destinationPingLatencyMs=4)
+        elif r < 6:
+            obj.update(level='info', message='sent response', body=_progress_body(i, n))
+        elif r < 7:
+            obj.update(level='info', message='Average Source CRUD events rate', srcCRUDEventsPerSec=i % 11)
+        elif r < 8:
+            obj.update(level='info', message=f'Completed writing {i % 10} / 10 partitions to destination cluster')
+        elif r < 9:
+            obj.update(level='error', message='resume point may no longer be in the oplog')
+        elif r < 10:
+            obj.update(level='warn', message='Persisted a new partition after sampling', database='db',
+                       collection=f'c{i % 4}', partition={'partition': {'db': 'db', 'coll': f'c{i % 4}'}})
+        else:
+            obj.update(message=f'Read batch of change events from source cluster {i}',
+                       componentName='CEA', database='db', collection=f'c{i % 4}',
+                       numEvents=rng.randrange(1000), durationMs=rng.random() * 10)
+        lines.append(json.dumps(obj, separators=(',', ':')))
+    return lines
@@ -1,9 +1,10 @@
 import logging
 import os
 
-from flask import Blueprint, jsonify, render_template, request
+from flask import Blueprint, jsonify, redirect, render_template, request, url_for
 
 from lib.logs_metrics import upload_file
+from lib.ingest_jobs import ingest_job_manager
 from lib.log_store_registry import log_store_registry
 from lib.snapshot_store import (
     load_snapshot,
@@ -25,6 +26,14 @@ _SNAPSHOT_NOT_FOUND_KWARGS = {
     ),
 }
 
+_JOB_NOT_FOUND_KWARGS = {
+    "error_title": "Analysis Job Not Found",
+    "error_message": (
+        "The requested analysis job was not found or has expired. "
+        "Please upload and parse the log file again."
+    ),
+}
+
 
 @bp.route("/")
 def logs_home():
@@ -41,6 +50,36 @@ def upload_logs():
     return upload_file()
 
 
+@bp.route("/job/<job_id>")
+def job_status(job_id):
+    if not is_valid_store_id(job_id):
+        return jsonify({"error": "Job not found"}), 404
+
+    status = ingest_job_manager.status(job_id)
+    if status is None:
+        return jsonify({"error": "Job not found"}), 404
+    if status["phase"] in ("done", "error"):
+        status["result_url"] = url_for("logs.job_result", job_id=job_id)
+    return jsonify(status)
+
+
+@bp.route("/job/<job_id>/result")
+def job_result(job_id):
+    job = ingest_job_manager.get(job_id) if is_valid_store_id(job_id) else None
+    if job is None:
+        return render_template("error.html", **_JOB_NOT_FOUND_KWARGS)
+
+    if job.phase == "error":
+        return render_template(
+            "error.html", error_title=job.error_title, error_message=job.error_message
+        )
+    if job.phase == "done":
+        if job.snapshot_id:
+            return redirect(url_for("logs.load_snapshot_view", snapshot_id=job.snapshot_id))
+        return render_template("upload_results.html", **job.template_data)
+    return render_template("logs/job_progress.html", job_id=job_id, filename=job.filename)
+
+
 @bp.route("/search_logs")
 def search_logs():
     store_id = request.args.get("store_id", "").strip()
@@ -49,8 +88,6 @@ def search_logs():
     if not is_valid_store_id(store_id):
         return jsonify({"error": "Invalid store_id parameter"}), 400
 
-    q = request.args.get("q", "").strip()
-    level = request.args.get("level", "").strip()
     try:
         page = max(1, int(request.args.get("page", 1)))
     except (ValueError, TypeError):
@@ -59,27 +96,93 @@ def search_logs():
         per_page = min(max(1, int(request.args.get("per_page", 50))), 200)
     except (ValueError, TypeError):
         per_page = 50
+    # Keyset cursors from the previous page; page is then only echoed back
+    cursors = {}
+    for name in ("after_rowid", "before_rowid"):
+        value = request.args.get(name, "").strip()
+        if value:
+            try:
+                cursors[name] = max(0, int(value))
+            except ValueError:
+                return jsonify({"error": f"Invalid {name} parameter"}), 400
 
     store = log_store_registry.open_store(store_id)
     if store is None:
         return jsonify({"error": "Log store not found or expired"}), 404
 
     try:
-        query = {}
-        if level:
-            query["level"] = level
-        if q:
-            query["$text"] = q
-
-        result = store.find(query, skip=(page - 1) * per_page, limit=per_page)
+        query = _log_query_from_args(store)
+        result = store.find(query, skip=(page - 1) * per_page, limit=per_page, **cursors)
         result["page"] = page
         result["per_page"] = per_page
+        result["cache"] = {"hits": store.cache_hits, "misses": store.cache_misses}
         return jsonify(result)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         logger.error("Log search error: %s", e)
         return jsonify({"error": "Search failed", "detail": str(e)}), 500
 
 
+@bp.route("/log_histogram")
+def log_histogram():
+    store_id = request.args.get("store_id", "").strip()
+    if not store_id:
+        return jsonify({"error": "Missing store_id parameter"}), 400
+    if not is_valid_store_id(store_id):
+        return jsonify({"error": "Invalid store_id parameter"}), 400
+    bucket_seconds = request.args.get("bucket_seconds", "").strip()
+    try:
+        bucket_seconds = int(bucket_seconds) if bucket_seconds else None
+    except ValueError:
+        return jsonify({"error": "Invalid bucket_seconds parameter"}), 400
+
+    store = log_store_registry.open_store(store_id)
+    if store is None:
+        return jsonify({"error": "Log store not found or expired"}), 404
+
+    try:
+        return jsonify(store.histogram(_log_query_from_args(store), bucket_seconds))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        logger.error("Log histogram error: %s", e)
+        return jsonify({"error": "Histogram failed", "detail": str(e)}), 500
+
+
+_SEARCH_MODES = ("text", "phrase", "regex")
+
+
+def _log_query_from_args(store):
+    """
+    LogStore query from the q, mode, level, timestamp and field request
+    parameters. mode is how q is searched: "text" (FTS5 query syntax,
+    the default), "phrase" (the exact words in order) or "regex".
+
+    Raises:
+        ValueError: unknown mode
+    """
+    query = {}
+    level = request.args.get("level", "").strip()
+    if level:
+        query["level"] = level
+    mode = request.args.get("mode", "text").strip() or "text"
+    if mode not in _SEARCH_MODES:
+        raise ValueError(f"Invalid mode parameter: {mode!r}")
+    q = request.args.get("q", "").strip()
+    if q and mode == "regex":
+        query["$regex"] = q
+    elif q and mode == "phrase":
+        query["$text"] = '"' + q.replace('"', '""') + '"'
+    elif q:
+        query["$text"] = q
+    for name in ("timestamp_gte", "timestamp_lte") + store.search_fields:
+        value = request.args.get(name, "").strip()
+        if value:
+            query[name] = value
+    return query
+
+
 @bp.route("/list_snapshots")
 def list_snapshots():
     try:
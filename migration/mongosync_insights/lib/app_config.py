@@ -17,6 +17,8 @@ from pymongo import MongoClient, ReadPreference
 from pymongo.errors import PyMongoError, InvalidURI
 
 VALID_LOG_LEVELS = frozenset({"DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"})
+# Names of LogStore.LOAD_PROFILES
+VALID_LOG_STORE_LOAD_PROFILES = frozenset({"wal", "memory", "bulk"})
 
 
 def parse_env_int(
@@ -48,6 +50,34 @@ def parse_env_int(
     return value
 
 
+_FIELD_NAME_PATTERN = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+
+
+def parse_env_fields(env_name: str, default: str) -> dict[str, str]:
+    """
+    Parse a comma-separated list of log fields: `name` for a top-level
+    key or `name=dotted.path` for a nested one. Returns {name: path}.
+    """
+    raw = os.getenv(env_name)
+    if raw is None:
+        raw = default
+    fields = {}
+    for entry in raw.split(','):
+        entry = entry.strip()
+        if not entry:
+            continue
+        name, _, path = entry.partition('=')
+        name, path = name.strip(), (path.strip() or name.strip())
+        if not _FIELD_NAME_PATTERN.match(name) or not all(
+                _FIELD_NAME_PATTERN.match(part) for part in path.split('.')):
+            raise ValueError(
+                f"Invalid {env_name} entry: {entry!r}. Use name or name=dotted.path "
+                f"with letters, digits and underscores."
+            )
+        fields[name] = path
+    return fields
+
+
 # Environment variable configuration
 LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
 LOG_FILE = os.getenv('MI_LOG_FILE', 'insights.log')
@@ -70,7 +100,7 @@ DEVELOPER_CREDITS = {
 
 # File upload settings
 MAX_FILE_SIZE = parse_env_int('MI_MAX_FILE_SIZE', 10 * 1024 * 1024 * 1024, min_value=1)
-ALLOWED_EXTENSIONS = {'.log', '.json', '.out', '.gz', '.zip', '.bz2', '.tar.gz', '.tgz', '.tar.bz2'}
+ALLOWED_EXTENSIONS = {'.log', '.json', '.out', '.gz', '.zip', '.bz2', '.xz', '.zst', '.tar.gz', '.tgz', '.tar.bz2', '.tar.xz', '.tar.zst'}
 ALLOWED_MIME_TYPES = [
     'text/plain',
     'application/json',
@@ -78,6 +108,8 @@ ALLOWED_MIME_TYPES = [
     'application/gzip', 'application/x-gzip',
     'application/zip', 'application/x-zip-compressed',
     'application/x-bzip2',
+    'application/x-xz',
+    'application/zstd',
     'application/x-tar',  # Tar archives
     'application/octet-stream'  # Generic binary (often used for compressed files)
 ]
@@ -87,11 +119,49 @@ LOG_VIEWER_MAX_LINES = parse_env_int('MI_LOG_VIEWER_MAX_LINES', 2000, min_value=
 LOG_STORE_DIR = os.getenv('MI_LOG_STORE_DIR', tempfile.gettempdir())
 LOG_STORE_MAX_AGE_HOURS = parse_env_int('MI_LOG_STORE_MAX_AGE_HOURS', 24, min_value=1)
 
+# Log parsing settings
+# Worker processes used to parse log lines (1 = parse inline, 0 = one per CPU)
+PARSE_WORKERS = parse_env_int('MI_PARSE_WORKERS', 1, min_value=0)
+# Zip archive members decompressed concurrently on threads (1 = one at a time, 0 = one per CPU)
+ARCHIVE_MEMBER_WORKERS = parse_env_int('MI_ARCHIVE_MEMBER_WORKERS', 1, min_value=0)
+# Decompress single .gz/.bz2 uploads on a reader thread ahead of parsing
+DECOMPRESS_PIPELINE = os.getenv('MI_DECOMPRESS_PIPELINE', 'False').lower() == 'true'
+# Memory budget (MB) for retained log records before they spill to the log store (0 = unlimited)
+INGEST_MEMORY_BUDGET_MB = parse_env_int('MI_INGEST_MEMORY_MB', 0, min_value=0)
+# Matched log lines kept per error pattern for the Errors tab (0 = keep all)
+MAX_ERROR_CAPTURES = parse_env_int('MI_MAX_ERROR_CAPTURES', 0, min_value=0)
+# Uploads analyzed concurrently in background jobs (0 = analyze inside the upload request)
+INGEST_JOB_WORKERS = parse_env_int('MI_INGEST_JOB_WORKERS', 2, min_value=0)
+# Parse uploads while they are still arriving (requires MI_INGEST_JOB_WORKERS > 0)
+STREAM_UPLOADS = os.getenv('MI_STREAM_UPLOADS', 'True').lower() == 'true'
+# Index log lines for search as they are stored instead of after ingest
+INCREMENTAL_LOG_INDEX = os.getenv('MI_INCREMENTAL_LOG_INDEX', 'False').lower() == 'true'
+# Row batches queued for the log store writer thread (0 = write on the parsing thread)
+LOG_STORE_WRITER_QUEUE = parse_env_int('MI_LOG_STORE_WRITER_QUEUE', 0, min_value=0)
+# Rows per compressed block of raw log lines in the log store (0 = uncompressed)
+LOG_STORE_DOC_BLOCK_ROWS = parse_env_int('MI_LOG_STORE_DOC_BLOCK_ROWS', 0, min_value=0)
+# Log fields copied into indexed log store columns for the Log Viewer search
+LOG_STORE_FIELDS = parse_env_fields('MI_LOG_STORE_FIELDS', '')
+# Log Viewer result pages and totals cached per open log store (0 = no cache)
+LOG_QUERY_CACHE_SIZE = parse_env_int('MI_LOG_QUERY_CACHE_SIZE', 64, min_value=0)
+# Read-only connections per open log store for concurrent Log Viewer queries (0 = shared connection)
+LOG_STORE_READ_CONNECTIONS = parse_env_int('MI_LOG_STORE_READ_CONNECTIONS', 4, min_value=0)
+# SQLite load profile for writing upload log stores (wal, memory or bulk)
+LOG_STORE_LOAD_PROFILE = os.getenv('MI_LOG_STORE_LOAD_PROFILE', 'wal').strip().lower()
+# Trigram index of raw log lines for Log Viewer regex searches
+LOG_REGEX_INDEX = os.getenv('MI_LOG_REGEX_INDEX', 'False').lower() == 'true'
+# Log lines a Log Viewer regex search examines per request
+LOG_REGEX_MAX_ROWS = parse_env_int('MI_LOG_REGEX_MAX_ROWS', 100000, min_value=1)
+# Milliseconds a Log Viewer regex search spends testing lines per request
+LOG_REGEX_TIME_LIMIT_MS = parse_env_int('MI_LOG_REGEX_TIME_LIMIT_MS', 2000, min_value=1)
+
 # Compressed file MIME types (subset of ALLOWED_MIME_TYPES)
 COMPRESSED_MIME_TYPES = {
     'application/gzip', 'application/x-gzip',
     'application/zip', 'application/x-zip-compressed',
     'application/x-bzip2',
+    'application/x-xz',
+    'application/zstd',
     'application/x-tar',  # Tar archives
     'application/octet-stream'  # Generic binary (often used for compressed files)
 }
@@ -101,9 +171,13 @@ EXTENSION_TO_COMPRESSION = {
     '.gz': 'gzip',
     '.zip': 'zip',
     '.bz2': 'bzip2',
+    '.xz': 'xz',
+    '.zst': 'zstd',
     '.tar.gz': 'tar_gzip',
     '.tgz': 'tar_gzip',
-    '.tar.bz2': 'tar_bzip2'
+    '.tar.bz2': 'tar_bzip2',
+    '.tar.xz': 'tar_xz',
+    '.tar.zst': 'tar_zstd'
 }
 
 # File type patterns for identification
@@ -132,7 +206,7 @@ def classify_file_type(filename: str) -> str:
     # Remove compression extensions to get the base name
     # Handle compound extensions like .log.gz, .log.1.gz, etc.
     name_without_compression = basename
-    for ext in ['.gz', '.bz2', '.zip']:
+    for ext in ['.gz', '.bz2', '.xz', '.zst', '.zip']:
         if name_without_compression.lower().endswith(ext):
             name_without_compression = name_without_compression[:-len(ext)]
     
@@ -275,6 +349,12 @@ def validate_config():
             f"Must be one of: {', '.join(sorted(VALID_LOG_LEVELS))}."
         )
 
+    if LOG_STORE_LOAD_PROFILE not in VALID_LOG_STORE_LOAD_PROFILES:
+        raise ValueError(
+            f"Invalid MI_LOG_STORE_LOAD_PROFILE: {LOG_STORE_LOAD_PROFILE!r}. "
+            f"Must be one of: {', '.join(sorted(VALID_LOG_STORE_LOAD_PROFILES))}."
+        )
+
     return True
 
 def validate_progress_endpoint_url(url):
@@ -1,17 +1,136 @@
 """
 File decompression utilities for handling compressed log files.
-Supports gzip (.gz), zip (.zip), bzip2 (.bz2), tar.gz (.tar.gz, .tgz), and tar.bz2 (.tar.bz2) formats.
+Supports gzip (.gz), zip (.zip), bzip2 (.bz2), xz (.xz), zstandard (.zst),
+tar.gz (.tar.gz, .tgz), tar.bz2 (.tar.bz2), tar.xz (.tar.xz) and tar.zst
+(.tar.zst) formats. Zstandard needs the zstandard package (listed in
+requirements.txt); without it .zst files are rejected with a
+MissingDecompressorError.
 """
 import gzip
 import zipfile
 import bz2
+import lzma
 import tarfile
 import io
 import logging
+import queue
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from typing import BinaryIO, Iterator, Tuple, Optional
 
 logger = logging.getLogger(__name__)
 
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - depends on the environment
+    zstandard = None
+
+
+
+class MissingDecompressorError(ValueError):
+    """Raised when the package needed to decompress an upload is not installed."""
+
+
+# Bytes read from a decompressed stream per iter_lines() chunk
+LINE_CHUNK_BYTES = 1024 * 1024
+# Decompressed chunks a reader thread may queue ahead of the consumer, per
+# zip member in the parallel window and per pipelined single file
+READ_AHEAD_CHUNKS = 8
+
+
+def iter_lines(stream: BinaryIO, chunk_size: int = LINE_CHUNK_BYTES) -> Iterator[bytes]:
+    """
+    Yield the lines of a binary stream, newline included.
+
+    The stream is read in large chunks and each chunk is split in one pass
+    (io.BytesIO shares the chunk's buffer instead of copying it); only the
+    partial line at the end of a chunk is carried over to the next one. A
+    line longer than a chunk is collected piecewise and joined once.
+
+    Args:
+        stream: Binary file object, e.g. a GzipFile or BZ2File
+        chunk_size: Bytes to read per chunk
+
+    Yields:
+        Lines as bytes; the last one has no newline if the stream lacks one
+    """
+    pending = []
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        end = chunk.rfind(b'\n') + 1
+        if not end:
+            pending.append(chunk)
+            continue
+        if pending:
+            end += sum(len(piece) for piece in pending)
+            pending.append(chunk)
+            chunk = b''.join(pending)
+            pending = []
+        yield from io.BytesIO(chunk if end == len(chunk) else chunk[:end])
+        if end < len(chunk):
+            pending.append(chunk[end:])
+    if pending:
+        yield b''.join(pending)
+
+
+def _open_member(name: str, inner_file: BinaryIO) -> BinaryIO:
+    """
+    Wrap an archive member in a streaming reader for its own compression.
+
+    Nested .gz, .bz2, .xz and .zst members (e.g. mongosync.log.1.gz from log rotation)
+    are decompressed straight from the member file object, so memory stays
+    flat however large the member is; other members are read as they are.
+
+    Args:
+        name: Member name inside the archive
+        inner_file: Open file object for the member
+
+    Returns:
+        Binary file object yielding the member's decompressed lines
+    """
+    name_lower = name.lower()
+    if name_lower.endswith('.gz'):
+        logger.info(f"Decompressing nested gzip file: {name}")
+        return gzip.GzipFile(fileobj=inner_file, mode='rb')
+    if name_lower.endswith('.bz2'):
+        logger.info(f"Decompressing nested bzip2 file: {name}")
+        return bz2.BZ2File(inner_file, mode='rb')
+    if name_lower.endswith('.xz'):
+        logger.info(f"Decompressing nested xz file: {name}")
+        return lzma.LZMAFile(inner_file, mode='rb')
+    if name_lower.endswith('.zst'):
+        logger.info(f"Decompressing nested zstandard file: {name}")
+        return _zstd_reader(inner_file)
+    return inner_file
+
+
+def _zstd_reader(file_obj: BinaryIO) -> BinaryIO:
+    """
+    Streaming zstandard reader over file_obj, across concatenated frames.
+    Closing it leaves file_obj open.
+
+    Raises:
+        MissingDecompressorError: If the zstandard package is not installed
+    """
+    if zstandard is None:
+        raise MissingDecompressorError("Zstandard (.zst) files require the 'zstandard' package (pip install zstandard)")
+    return zstandard.ZstdDecompressor().stream_reader(file_obj, read_across_frames=True, closefd=False)
+
+
+def _open_tar(file_obj: BinaryIO, compression: str) -> tarfile.TarFile:
+    """
+    Open a tar archive for reading members in order.
+
+    tarfile has no zstandard support, so a .tar.zst is read in stream mode
+    from a zstandard reader; members must then be read as they are reached.
+    """
+    if compression == 'zst':
+        return tarfile.open(fileobj=_zstd_reader(file_obj), mode='r|')
+    return tarfile.open(fileobj=file_obj, mode=f'r:{compression}')
+
 
 def decompress_gzip(file_obj: BinaryIO) -> Iterator[bytes]:
     """
@@ -25,8 +144,7 @@ def decompress_gzip(file_obj: BinaryIO) -> Iterator[bytes]:
     """
     file_obj.seek(0)
     with gzip.GzipFile(fileobj=file_obj, mode='rb') as gz:
-        for line in gz:
-            yield line
+        yield from iter_lines(gz)
 
 
 def decompress_bzip2(file_obj: BinaryIO) -> Iterator[bytes]:
@@ -40,25 +158,8 @@ def decompress_bzip2(file_obj: BinaryIO) -> Iterator[bytes]:
         Decompressed lines as bytes
     """
     file_obj.seek(0)
-    decompressor = bz2.BZ2Decompressor()
-    buffer = b''
-    
-    while True:
-        chunk = file_obj.read(8192)
-        if not chunk:
-            break
-        try:
-            decompressed = decompressor.decompress(chunk)
-            buffer += decompressed
-            while b'\n' in buffer:
-                line, buffer = buffer.split(b'\n', 1)
-                yield line + b'\n'
-        except EOFError:
-            break
-    
-    # Yield any remaining data
-    if buffer:
-        yield buffer
+    with bz2.BZ2File(file_obj, mode='rb') as bz:
+        yield from iter_lines(bz)
 
 
 def decompress_zip(file_obj: BinaryIO) -> Iterator[bytes]:
@@ -85,72 +186,44 @@ def decompress_zip(file_obj: BinaryIO) -> Iterator[bytes]:
             
             logger.info(f"Processing file from ZIP: {filename}")
             with zf.open(filename) as inner_file:
-                if filename.lower().endswith('.gz'):
-                    # Nested gzip file (e.g. mongosync.log.1.gz from log rotation)
-                    logger.info(f"Decompressing nested gzip file: {filename}")
-                    inner_bytes = io.BytesIO(inner_file.read())
-                    with gzip.GzipFile(fileobj=inner_bytes, mode='rb') as gz:
-                        for line in gz:
-                            yield line
-                elif filename.lower().endswith('.bz2'):
-                    # Nested bzip2 file
-                    logger.info(f"Decompressing nested bzip2 file: {filename}")
-                    decompressed = bz2.decompress(inner_file.read())
-                    for line in io.BytesIO(decompressed):
-                        yield line
-                else:
-                    # Regular uncompressed file (e.g. mongosync.log)
-                    for line in inner_file:
+                with _open_member(filename, inner_file) as stream:
+                    for line in iter_lines(stream):
                         yield line
 
 
 def decompress_tar(file_obj: BinaryIO, compression: str = 'gz') -> Iterator[bytes]:
     """
-    Decompress a tar archive (tar.gz or tar.bz2) and yield lines from all contained files (concatenated).
-    Handles nested compressed files (.gz, .bz2) inside the archive, which is common
+    Decompress a tar archive (tar.gz, tar.bz2, tar.xz or tar.zst) and yield lines from all contained files (concatenated).
+    Handles nested compressed files (.gz, .bz2, .xz, .zst) inside the archive, which is common
     when mongosync log rotation produces compressed rotated log files.
     
     Args:
         file_obj: File-like object containing tar archive data
-        compression: Compression type - 'gz' for gzip, 'bz2' for bzip2
+        compression: Compression type - 'gz' for gzip, 'bz2' for bzip2, 'xz' for xz, 'zst' for zstandard
         
     Yields:
         Decompressed lines as bytes from all files in the archive
     """
     file_obj.seek(0)
-    mode = f'r:{compression}'
     
-    with tarfile.open(fileobj=file_obj, mode=mode) as tf:
-        members = tf.getmembers()
-        file_names = [m.name for m in members if m.isfile()]
-        logger.info(f"TAR archive contains {len(file_names)} file(s): {file_names}")
-        
-        for member in members:
+    with _open_tar(file_obj, compression) as tf:
+        # Members are read as they are reached (required for tar.zst streams)
+        file_names = []
+        for member in tf:
             # Skip directories and non-regular files
             if not member.isfile():
                 continue
+            file_names.append(member.name)
             
             logger.info(f"Processing file from TAR: {member.name}")
             inner_file = tf.extractfile(member)
             if inner_file:
-                if member.name.lower().endswith('.gz'):
-                    # Nested gzip file (e.g. mongosync.log.1.gz from log rotation)
-                    logger.info(f"Decompressing nested gzip file: {member.name}")
-                    inner_bytes = io.BytesIO(inner_file.read())
-                    with gzip.GzipFile(fileobj=inner_bytes, mode='rb') as gz:
-                        for line in gz:
-                            yield line
-                elif member.name.lower().endswith('.bz2'):
-                    # Nested bzip2 file
-                    logger.info(f"Decompressing nested bzip2 file: {member.name}")
-                    decompressed = bz2.decompress(inner_file.read())
-                    for line in io.BytesIO(decompressed):
-                        yield line
-                else:
-                    # Regular uncompressed file (e.g. mongosync.log)
-                    for line in inner_file:
+                with _open_member(member.name, inner_file) as stream:
+                    for line in iter_lines(stream):
                         yield line
 
+        logger.info(f"TAR archive contains {len(file_names)} file(s): {file_names}")
+
 
 def get_file_extension(filename: str) -> str:
     """
@@ -166,7 +239,7 @@ def get_file_extension(filename: str) -> str:
     filename_lower = filename.lower()
     
     # Check for compound extensions first
-    compound_extensions = ['.tar.gz', '.tar.bz2']
+    compound_extensions = ['.tar.gz', '.tar.bz2', '.tar.xz', '.tar.zst']
     for ext in compound_extensions:
         if filename_lower.endswith(ext):
             return ext
@@ -193,13 +266,15 @@ def is_compressed_mime_type(mime_type: str) -> bool:
 # Classified decompression functions - yield (line, file_type) tuples
 # =============================================================================
 
-def decompress_gzip_classified(file_obj: BinaryIO, filename: str) -> Iterator[Tuple[bytes, Optional[str]]]:
+def decompress_gzip_classified(file_obj: BinaryIO, filename: str,
+                               pipelined: bool = False) -> Iterator[Tuple[bytes, Optional[str]]]:
     """
     Decompress a gzip file and yield (line, file_type) tuples.
     
     Args:
         file_obj: File-like object containing gzip data
         filename: Original filename for classification
+        pipelined: Decompress on a reader thread ahead of the consumer
         
     Yields:
         Tuples of (decompressed line as bytes, file_type string or None)
@@ -211,17 +286,19 @@ def decompress_gzip_classified(file_obj: BinaryIO, filename: str) -> Iterator[Tu
     
     file_obj.seek(0)
     with gzip.GzipFile(fileobj=file_obj, mode='rb') as gz:
-        for line in gz:
+        for line in (_pipelined_lines(gz) if pipelined else iter_lines(gz)):
             yield (line, file_type)
 
 
-def decompress_bzip2_classified(file_obj: BinaryIO, filename: str) -> Iterator[Tuple[bytes, Optional[str]]]:
+def decompress_bzip2_classified(file_obj: BinaryIO, filename: str,
+                                pipelined: bool = False) -> Iterator[Tuple[bytes, Optional[str]]]:
     """
     Decompress a bzip2 file and yield (line, file_type) tuples.
     
     Args:
         file_obj: File-like object containing bzip2 data
         filename: Original filename for classification
+        pipelined: Decompress on a reader thread ahead of the consumer
         
     Yields:
         Tuples of (decompressed line as bytes, file_type string or None)
@@ -232,34 +309,77 @@ def decompress_bzip2_classified(file_obj: BinaryIO, filename: str) -> Iterator[T
     logger.info(f"Bzip2 file classified as: {file_type} (filename: {filename})")
     
     file_obj.seek(0)
-    decompressor = bz2.BZ2Decompressor()
-    buffer = b''
+    with bz2.BZ2File(file_obj, mode='rb') as bz:
+        for line in (_pipelined_lines(bz) if pipelined else iter_lines(bz)):
+            yield (line, file_type)
+
+
+def decompress_xz_classified(file_obj: BinaryIO, filename: str,
+                             pipelined: bool = False) -> Iterator[Tuple[bytes, Optional[str]]]:
+    """
+    Decompress an xz file and yield (line, file_type) tuples.
     
-    while True:
-        chunk = file_obj.read(8192)
-        if not chunk:
-            break
-        try:
-            decompressed = decompressor.decompress(chunk)
-            buffer += decompressed
-            while b'\n' in buffer:
-                line, buffer = buffer.split(b'\n', 1)
-                yield (line + b'\n', file_type)
-        except EOFError:
-            break
+    Args:
+        file_obj: File-like object containing xz data
+        filename: Original filename for classification
+        pipelined: Decompress on a reader thread ahead of the consumer
+        
+    Yields:
+        Tuples of (decompressed line as bytes, file_type string or None)
+    """
+    from .app_config import classify_file_type
+    
+    file_type = classify_file_type(filename) if filename else None
+    logger.info(f"Xz file classified as: {file_type} (filename: {filename})")
+    
+    file_obj.seek(0)
+    with lzma.LZMAFile(file_obj, mode='rb') as xz:
+        for line in (_pipelined_lines(xz) if pipelined else iter_lines(xz)):
+            yield (line, file_type)
+
+
+def decompress_zstd_classified(file_obj: BinaryIO, filename: str,
+                               pipelined: bool = False) -> Iterator[Tuple[bytes, Optional[str]]]:
+    """
+    Decompress a zstandard file and yield (line, file_type) tuples.
     
-    # Yield any remaining data
-    if buffer:
-        yield (buffer, file_type)
+    Args:
+        file_obj: File-like object containing zstandard data
+        filename: Original filename for classification
+        pipelined: Decompress on a reader thread ahead of the consumer
+        
+    Yields:
+        Tuples of (decompressed line as bytes, file_type string or None)
+
+    Raises:
+        MissingDecompressorError: If the zstandard package is not installed
+    """
+    from .app_config import classify_file_type
+    
+    file_type = classify_file_type(filename) if filename else None
+    logger.info(f"Zstandard file classified as: {file_type} (filename: {filename})")
+    
+    file_obj.seek(0)
+    with _zstd_reader(file_obj) as zst:
+        for line in (_pipelined_lines(zst) if pipelined else iter_lines(zst)):
+            yield (line, file_type)
 
 
-def decompress_zip_classified(file_obj: BinaryIO) -> Iterator[Tuple[bytes, Optional[str]]]:
+def decompress_zip_classified(file_obj: BinaryIO, workers: int = 1) -> Iterator[Tuple[bytes, Optional[str]]]:
     """
     Decompress a zip archive and yield (line, file_type) tuples from all contained files.
     Classifies each file based on its filename pattern.
+
+    With workers > 1, up to that many members are decompressed at once on
+    a thread pool (zlib and bz2 release the GIL while inflating). Lines are
+    still yielded member by member in archive order. A member is started
+    only once the consumer has finished an earlier one, and each buffers at
+    most READ_AHEAD_CHUNKS decompressed chunks, so no more than
+    workers x READ_AHEAD_CHUNKS chunks are held at once.
     
     Args:
         file_obj: File-like object containing zip data
+        workers: Members decompressed concurrently (1 = one after another)
         
     Yields:
         Tuples of (decompressed line as bytes, file_type string or None)
@@ -271,6 +391,7 @@ def decompress_zip_classified(file_obj: BinaryIO) -> Iterator[Tuple[bytes, Optio
         file_list = zf.namelist()
         logger.info(f"ZIP archive contains {len(file_list)} file(s): {file_list}")
 
+        members = []
         for filename in file_list:
             # Skip directories
             if filename.endswith('/'):
@@ -283,27 +404,116 @@ def decompress_zip_classified(file_obj: BinaryIO) -> Iterator[Tuple[bytes, Optio
             if file_type is None:
                 logger.warning(f"Skipping unrecognized file: {filename}")
                 continue
+            members.append((filename, file_type))
+
+        if workers > 1 and len(members) > 1:
+            yield from _read_zip_members_parallel(zf, members, workers)
+            return
 
+        for filename, file_type in members:
             with zf.open(filename) as inner_file:
-                if filename.lower().endswith('.gz'):
-                    # Nested gzip file
-                    logger.info(f"Decompressing nested gzip file: {filename}")
-                    inner_bytes = io.BytesIO(inner_file.read())
-                    with gzip.GzipFile(fileobj=inner_bytes, mode='rb') as gz:
-                        for line in gz:
-                            yield (line, file_type)
-                elif filename.lower().endswith('.bz2'):
-                    # Nested bzip2 file
-                    logger.info(f"Decompressing nested bzip2 file: {filename}")
-                    decompressed = bz2.decompress(inner_file.read())
-                    for line in io.BytesIO(decompressed):
-                        yield (line, file_type)
-                else:
-                    # Regular uncompressed file
-                    for line in inner_file:
+                with _open_member(filename, inner_file) as stream:
+                    for line in iter_lines(stream):
                         yield (line, file_type)
 
 
+class _QueuedStream:
+    """Internal: read() side of a member decompressed by _pump_member."""
+
+    def __init__(self, chunks: queue.Queue):
+        self._chunks = chunks
+
+    def read(self, size: int = -1) -> bytes:
+        chunk = self._chunks.get()
+        if isinstance(chunk, BaseException):
+            raise chunk
+        return chunk
+
+
+def _put_chunk(chunks: queue.Queue, item, stop: threading.Event) -> bool:
+    """Internal: queue item for the consumer unless it stops first; return whether it was queued."""
+    while not stop.is_set():
+        try:
+            chunks.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _pump_chunks(stream: BinaryIO, chunks: queue.Queue, stop: threading.Event):
+    """Internal: queue stream's decompressed chunks, ending with b'' or the error raised."""
+    try:
+        while True:
+            chunk = stream.read(LINE_CHUNK_BYTES)
+            if not _put_chunk(chunks, chunk, stop) or not chunk:
+                return
+    except Exception as e:
+        _put_chunk(chunks, e, stop)
+
+
+def _pump_member(zf: zipfile.ZipFile, filename: str, chunks: queue.Queue, stop: threading.Event):
+    """Internal: decompress one zip member into chunks, ending with b'' or the error raised."""
+    try:
+        with zf.open(filename) as inner_file, _open_member(filename, inner_file) as stream:
+            _pump_chunks(stream, chunks, stop)
+    except Exception as e:
+        _put_chunk(chunks, e, stop)
+
+
+def _pipelined_lines(stream: BinaryIO) -> Iterator[bytes]:
+    """
+    Internal: yield the lines of stream while a reader thread decompresses
+    up to READ_AHEAD_CHUNKS chunks ahead, overlapping inflate with parsing.
+    """
+    stop = threading.Event()
+    chunks = queue.Queue(maxsize=READ_AHEAD_CHUNKS)
+    reader = threading.Thread(target=_pump_chunks, args=(stream, chunks, stop),
+                              name='decompress-pipeline', daemon=True)
+    reader.start()
+    try:
+        yield from iter_lines(_QueuedStream(chunks))
+    finally:
+        stop.set()
+        reader.join()
+
+
+def _read_zip_members_parallel(zf: zipfile.ZipFile, members: list, workers: int) -> Iterator[Tuple[bytes, Optional[str]]]:
+    """
+    Internal: yield the lines of zip members decompressed on a thread pool, in member order.
+
+    Members are submitted in a sliding window: the next one starts only when
+    the consumer has finished an earlier one, so at most `workers` members
+    (and READ_AHEAD_CHUNKS chunks each) are held in memory at once.
+    """
+    logger.info(f"Decompressing {len(members)} ZIP members with {workers} threads")
+    stop = threading.Event()
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='zip-member')
+    pending = iter(members)
+    window = deque()
+
+    def submit_next():
+        for filename, file_type in pending:
+            chunks = queue.Queue(maxsize=READ_AHEAD_CHUNKS)
+            pool.submit(_pump_member, zf, filename, chunks, stop)
+            window.append((_QueuedStream(chunks), file_type))
+            return
+
+    try:
+        for _ in range(workers):
+            submit_next()
+        while window:
+            stream, file_type = window[0]
+            for line in iter_lines(stream):
+                yield (line, file_type)
+            window.popleft()
+            submit_next()
+    finally:
+        # Unblocks members still waiting to queue chunks if the consumer stopped early
+        stop.set()
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
 def decompress_tar_classified(file_obj: BinaryIO, compression: str = 'gz') -> Iterator[Tuple[bytes, Optional[str]]]:
     """
     Decompress a tar archive and yield (line, file_type) tuples from all contained files.
@@ -311,7 +521,7 @@ def decompress_tar_classified(file_obj: BinaryIO, compression: str = 'gz') -> It
     
     Args:
         file_obj: File-like object containing tar archive data
-        compression: Compression type - 'gz' for gzip, 'bz2' for bzip2
+        compression: Compression type - 'gz' for gzip, 'bz2' for bzip2, 'xz' for xz, 'zst' for zstandard
         
     Yields:
         Tuples of (decompressed line as bytes, file_type string or None)
@@ -319,17 +529,16 @@ def decompress_tar_classified(file_obj: BinaryIO, compression: str = 'gz') -> It
     from .app_config import classify_file_type
     
     file_obj.seek(0)
-    mode = f'r:{compression}'
     
-    with tarfile.open(fileobj=file_obj, mode=mode) as tf:
-        members = tf.getmembers()
-        file_names = [m.name for m in members if m.isfile()]
-        logger.info(f"TAR archive contains {len(file_names)} file(s): {file_names}")
-        
-        for member in members:
+    with _open_tar(file_obj, compression) as tf:
+        # Members are read as they are reached so a staged upload can be
+        # parsed while the rest of the archive is still arriving
+        file_names = []
+        for member in tf:
             # Skip directories and non-regular files
             if not member.isfile():
                 continue
+            file_names.append(member.name)
             
             file_type = classify_file_type(member.name)
             logger.info(f"Processing file from TAR: {member.name} (classified as: {file_type})")
@@ -341,26 +550,15 @@ def decompress_tar_classified(file_obj: BinaryIO, compression: str = 'gz') -> It
             
             inner_file = tf.extractfile(member)
             if inner_file:
-                if member.name.lower().endswith('.gz'):
-                    # Nested gzip file
-                    logger.info(f"Decompressing nested gzip file: {member.name}")
-                    inner_bytes = io.BytesIO(inner_file.read())
-                    with gzip.GzipFile(fileobj=inner_bytes, mode='rb') as gz:
-                        for line in gz:
-                            yield (line, file_type)
-                elif member.name.lower().endswith('.bz2'):
-                    # Nested bzip2 file
-                    logger.info(f"Decompressing nested bzip2 file: {member.name}")
-                    decompressed = bz2.decompress(inner_file.read())
-                    for line in io.BytesIO(decompressed):
-                        yield (line, file_type)
-                else:
-                    # Regular uncompressed file
-                    for line in inner_file:
+                with _open_member(member.name, inner_file) as stream:
+                    for line in iter_lines(stream):
                         yield (line, file_type)
 
+        logger.info(f"TAR archive contains {len(file_names)} file(s): {file_names}")
+
 
-def decompress_file_classified(file_obj: BinaryIO, mime_type: str, filename: str = None) -> Iterator[Tuple[bytes, Optional[str]]]:
+def decompress_file_classified(file_obj: BinaryIO, mime_type: str, filename: str = None,
+                               member_workers: int = 1, pipelined: bool = False) -> Iterator[Tuple[bytes, Optional[str]]]:
     """
     Decompress a file and return an iterator over (line, file_type) tuples.
     Each line is tagged with its file type based on the source filename pattern.
@@ -369,12 +567,15 @@ def decompress_file_classified(file_obj: BinaryIO, mime_type: str, filename: str
         file_obj: File-like object to decompress
         mime_type: Detected MIME type of the file
         filename: Original filename (used for classification and extension-based detection)
+        member_workers: Zip members decompressed concurrently (tar archives are read in order)
+        pipelined: Decompress single .gz/.bz2/.xz/.zst files on a reader thread ahead of parsing
         
     Returns:
         Iterator yielding tuples of (decompressed line as bytes, file_type string or None)
         
     Raises:
-        ValueError: If the MIME type is not a supported compressed format
+        ValueError: If the MIME type is not a supported compressed format, or
+            the file is zstandard and the zstandard package is not installed
     """
     from .app_config import EXTENSION_TO_COMPRESSION
     
@@ -391,14 +592,24 @@ def decompress_file_classified(file_obj: BinaryIO, mime_type: str, filename: str
     elif compression_type == 'tar_bzip2':
         logger.info(f"Using tar+bzip2 decompression based on file extension: {ext}")
         return decompress_tar_classified(file_obj, compression='bz2')
+    elif compression_type == 'tar_xz':
+        logger.info(f"Using tar+xz decompression based on file extension: {ext}")
+        return decompress_tar_classified(file_obj, compression='xz')
+    elif compression_type == 'tar_zstd':
+        logger.info(f"Using tar+zstandard decompression based on file extension: {ext}")
+        return decompress_tar_classified(file_obj, compression='zst')
     
     # Handle by MIME type
     if mime_type in ('application/gzip', 'application/x-gzip'):
-        return decompress_gzip_classified(file_obj, filename)
+        return decompress_gzip_classified(file_obj, filename, pipelined=pipelined)
     elif mime_type in ('application/zip', 'application/x-zip-compressed'):
-        return decompress_zip_classified(file_obj)
+        return decompress_zip_classified(file_obj, workers=member_workers)
     elif mime_type == 'application/x-bzip2':
-        return decompress_bzip2_classified(file_obj, filename)
+        return decompress_bzip2_classified(file_obj, filename, pipelined=pipelined)
+    elif mime_type == 'application/x-xz':
+        return decompress_xz_classified(file_obj, filename, pipelined=pipelined)
+    elif mime_type == 'application/zstd':
+        return decompress_zstd_classified(file_obj, filename, pipelined=pipelined)
     elif mime_type == 'application/x-tar':
         # Plain tar with gzip compression (common for tar.gz detected as x-tar)
         logger.info("Using tar+gzip decompression for application/x-tar")
@@ -407,13 +618,19 @@ def decompress_file_classified(file_obj: BinaryIO, mime_type: str, filename: str
         # Fallback to extension-based detection for generic binary files
         if compression_type == 'gzip':
             logger.info(f"Using gzip decompression based on file extension: {ext}")
-            return decompress_gzip_classified(file_obj, filename)
+            return decompress_gzip_classified(file_obj, filename, pipelined=pipelined)
         elif compression_type == 'zip':
             logger.info(f"Using zip decompression based on file extension: {ext}")
-            return decompress_zip_classified(file_obj)
+            return decompress_zip_classified(file_obj, workers=member_workers)
         elif compression_type == 'bzip2':
             logger.info(f"Using bzip2 decompression based on file extension: {ext}")
-            return decompress_bzip2_classified(file_obj, filename)
+            return decompress_bzip2_classified(file_obj, filename, pipelined=pipelined)
+        elif compression_type == 'xz':
+            logger.info(f"Using xz decompression based on file extension: {ext}")
+            return decompress_xz_classified(file_obj, filename, pipelined=pipelined)
+        elif compression_type == 'zstd':
+            logger.info(f"Using zstandard decompression based on file extension: {ext}")
+            return decompress_zstd_classified(file_obj, filename, pipelined=pipelined)
         else:
             raise ValueError(f"Cannot determine compression type for octet-stream file with extension: {ext}")
     else:
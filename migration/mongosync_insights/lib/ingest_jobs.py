@@ -0,0 +1,211 @@
+"""
+Background job queue for log file analysis.
+
+Uploads are parsed by a bounded pool of worker threads instead of inside
+the HTTP request, so large files do not run into proxy timeouts and
+concurrent uploads queue up instead of oversubscribing the host. Each
+job records its phase and parse progress; the /logs/job/<id> endpoint
+reports it to the browser while the job runs.
+"""
+import logging
+import threading
+import time
+import uuid as uuid_mod
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+from .app_config import INGEST_JOB_WORKERS
+
+logger = logging.getLogger(__name__)
+
+# Job phases, in order; 'error' can replace any of them
+JOB_PHASES = ('queued', 'parsing', 'indexing', 'charting', 'saving', 'done')
+FINISHED_PHASES = frozenset({'done', 'error'})
+
+
+class IngestJob:
+    """Progress and outcome of one background log analysis."""
+
+    def __init__(self, filename: str, total_bytes: int):
+        self.job_id = str(uuid_mod.uuid4())
+        self.filename = filename
+        self.total_bytes = total_bytes
+        self.phase = 'queued'
+        self.bytes_read = 0
+        self.lines = 0
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.snapshot_id = ''
+        # Log store searchable while the job runs (incremental indexing only)
+        self.log_store_id = ''
+        # Results of a job whose snapshot could not be saved
+        self.template_data: Optional[dict] = None
+        self.error_title = ''
+        self.error_message = ''
+        self._parse_started: Optional[float] = None
+        self._parse_finished: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def update(self, phase: Optional[str] = None, bytes_read: Optional[int] = None,
+               lines: Optional[int] = None, total_bytes: Optional[int] = None,
+               log_store_id: Optional[str] = None):
+        """Record progress; called from the worker thread running the job."""
+        with self._lock:
+            if log_store_id is not None:
+                self.log_store_id = log_store_id
+            if total_bytes is not None:
+                self.total_bytes = total_bytes
+            now = time.time()
+            if phase is not None and phase != self.phase:
+                if phase == 'parsing':
+                    self._parse_started = now
+                elif self.phase == 'parsing':
+                    self._parse_finished = now
+                self.phase = phase
+            if bytes_read is not None:
+                self.bytes_read = min(bytes_read, self.total_bytes)
+            if lines is not None:
+                self.lines = lines
+
+    def finish(self, snapshot_id: str, template_data: dict):
+        """Mark the job done; template_data is kept only if no snapshot was saved."""
+        with self._lock:
+            self.snapshot_id = snapshot_id
+            self.template_data = None if snapshot_id else template_data
+            self.phase = 'done'
+            self.bytes_read = self.total_bytes
+            self.finished_at = time.time()
+
+    def fail(self, title: str, message: str):
+        """Mark the job failed with an error to show the user."""
+        with self._lock:
+            self.error_title = title
+            self.error_message = message
+            if self.phase == 'parsing':
+                self._parse_finished = time.time()
+            self.phase = 'error'
+            self.finished_at = time.time()
+
+    @property
+    def finished(self) -> bool:
+        return self.phase in FINISHED_PHASES
+
+    def to_dict(self) -> dict:
+        """Return the JSON-serializable status reported by /logs/job/<id>."""
+        with self._lock:
+            now = time.time()
+            lines_per_second = None
+            eta_seconds = None
+            if self._parse_started is not None:
+                parse_elapsed = (self._parse_finished or now) - self._parse_started
+                if parse_elapsed > 0:
+                    lines_per_second = round(self.lines / parse_elapsed, 1)
+                if self.phase == 'parsing' and 0 < self.bytes_read and parse_elapsed > 0:
+                    remaining = self.total_bytes - self.bytes_read
+                    eta_seconds = round(parse_elapsed * remaining / self.bytes_read, 1)
+            if self.phase == 'done':
+                eta_seconds = 0
+            return {
+                'job_id': self.job_id,
+                'filename': self.filename,
+                'phase': self.phase,
+                'bytes_read': self.bytes_read,
+                'total_bytes': self.total_bytes,
+                'lines': self.lines,
+                'lines_per_second': lines_per_second,
+                'eta_seconds': eta_seconds,
+                'elapsed_seconds': round((self.finished_at or now) - self.created_at, 1),
+                'snapshot_id': self.snapshot_id,
+                'log_store_id': self.log_store_id,
+                'error_title': self.error_title,
+                'error_message': self.error_message,
+            }
+
+
+class IngestJobManager:
+    """Thread-safe queue of ingest jobs run by a bounded worker pool."""
+
+    def __init__(self, max_workers: int, finished_ttl: int = 3600):
+        """
+        Args:
+            max_workers: jobs analyzed concurrently; later jobs wait queued
+            finished_ttl: seconds a finished job's status stays available
+        """
+        self._max_workers = max(1, max_workers)
+        self._finished_ttl = finished_ttl
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._jobs: dict[str, IngestJob] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, filename: str, total_bytes: int, work: Callable[[IngestJob], None]) -> IngestJob:
+        """
+        Queue work(job) to run on the worker pool and return the job.
+
+        work reports progress through job.update() and must call
+        job.finish() or job.fail(); an unexpected exception fails the job.
+        """
+        job = IngestJob(filename, total_bytes)
+        with self._lock:
+            self._prune_finished()
+            self._jobs[job.job_id] = job
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._max_workers, thread_name_prefix='mi-ingest'
+                )
+            self._executor.submit(self._run, job, work)
+        logger.info(f"Queued ingest job {job.job_id[:8]}... for {filename} ({total_bytes} bytes)")
+        return job
+
+    def get(self, job_id: str) -> Optional[IngestJob]:
+        """Return the job with this id, or None if unknown or expired."""
+        with self._lock:
+            self._prune_finished()
+            return self._jobs.get(job_id)
+
+    def status(self, job_id: str) -> Optional[dict]:
+        """Return the job's status dict plus how many queued jobs are ahead of it."""
+        job = self.get(job_id)
+        if job is None:
+            return None
+        status = job.to_dict()
+        with self._lock:
+            status['queued_ahead'] = sum(
+                1 for other in self._jobs.values()
+                if other.phase == 'queued' and other.created_at < job.created_at
+            ) if job.phase == 'queued' else 0
+        return status
+
+    def shutdown(self, wait: bool = True):
+        """Stop the worker pool, waiting for running jobs if wait is set."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+    def _run(self, job: IngestJob, work: Callable[[IngestJob], None]):
+        job.started_at = time.time()
+        logger.info(f"Starting ingest job {job.job_id[:8]}... for {job.filename}")
+        try:
+            work(job)
+        except Exception as e:
+            logger.exception(f"Ingest job {job.job_id[:8]}... failed: {e}")
+            job.fail("Processing Error",
+                     f"An unexpected error occurred while processing '{job.filename}'. "
+                     "Please check the application log for details.")
+            return
+        if not job.finished:
+            job.fail("Processing Error", f"Processing of '{job.filename}' ended without a result.")
+        logger.info(f"Ingest job {job.job_id[:8]}... finished in "
+                    f"{time.time() - job.started_at:.2f}s with phase '{job.phase}'")
+
+    def _prune_finished(self):
+        """Internal: drop expired finished jobs. Caller must hold lock."""
+        cutoff = time.time() - self._finished_ttl
+        expired = [job_id for job_id, job in self._jobs.items()
+                   if job.finished_at is not None and job.finished_at < cutoff]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+
+ingest_job_manager = IngestJobManager(INGEST_JOB_WORKERS)
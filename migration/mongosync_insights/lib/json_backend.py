@@ -0,0 +1,44 @@
+"""
+JSON decoding backend for the log and metrics parsers.
+
+Uses orjson when it is installed and falls back to the standard library
+otherwise. The backend is chosen once at import time; BACKEND names it.
+Callers keep catching json.JSONDecodeError, which orjson's error type
+subclasses.
+"""
+import json
+import logging
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+BACKEND = 'orjson' if orjson is not None else 'json'
+
+
+if orjson is not None:
+    _orjson_loads = orjson.loads
+    _OrjsonDecodeError = orjson.JSONDecodeError
+
+    def loads(text: Any) -> Any:
+        """
+        Decode a JSON document with orjson.
+
+        Input orjson rejects but the standard library accepts (NaN,
+        Infinity, lone surrogates) is retried with json.loads, and invalid
+        input raises the same errors json.loads would. Integers beyond 64
+        bits may decode as float, depending on the orjson release.
+        """
+        try:
+            return _orjson_loads(text)
+        except _OrjsonDecodeError:
+            return json.loads(text)
+else:
+    loads = json.loads
+
+
+logger.debug(f"JSON decoding backend: {BACKEND}")
@@ -0,0 +1,589 @@
+"""
+Line classification and ingest for mongosync JSON log lines.
+
+Routes each parsed log line into the category lists that feed the Log
+Analyzer charts and tables, and into the SQLite log store used by the
+Log Viewer. Every line is decoded, so invalid JSON is always counted,
+but lines that cannot feed any category (most of a verbose log) skip
+the category filters and only go to the store. Parsing can run inline (one core) or fan out line-aligned
+chunks to a process pool; chunk results are merged in stream order so
+both paths produce identical category lists. With a memory budget, growing
+list categories are pickled and spill to the log store once they exceed
+it (see record_spill).
+"""
+import json
+import logging
+import os
+import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Optional
+
+from .json_backend import loads as json_loads
+from .record_spill import SpillableRecords
+from .series_columns import ColumnarSeries
+
+logger = logging.getLogger(__name__)
+
+# Lines per chunk handed to a parse worker
+PARSE_CHUNK_LINES = 20000
+
+# Message patterns that route a log line into a category list
+LOG_MESSAGE_PATTERNS = {
+    'replication_progress': re.compile(r"Replication progress", re.IGNORECASE),
+    'version_info': re.compile(r"Version info", re.IGNORECASE),
+    'operation_stats': re.compile(r"Operation duration stats", re.IGNORECASE),
+    'sent_response': re.compile(r"sent response", re.IGNORECASE),
+    'phase_transitions': re.compile(r"Starting initializing collections and indexes phase|Starting initializing partitions phase|Starting collection copy phase|Starting change event application phase|Commit handler called", re.IGNORECASE),
+    'phase_in_memory': re.compile(r"Updating the in-memory phase from", re.IGNORECASE),
+    'mongosync_options': re.compile(r"Mongosync Options", re.IGNORECASE),
+    'hidden_flags': re.compile(r"Mongosync HiddenFlags", re.IGNORECASE),
+    'crud_events_rate': re.compile(r"Average Source CRUD events rate", re.IGNORECASE),
+    'partition_copy_progress': re.compile(r"Completed writing \d+ / \d+ partitions to destination cluster", re.IGNORECASE),
+    'received_request': re.compile(r"Received request", re.IGNORECASE),
+    'partition_single_created': re.compile(r"Creating a single partition for whole collection", re.IGNORECASE),
+    'partition_multi_created': re.compile(r"Creating initial partitions for non-capped collection", re.IGNORECASE),
+    'partition_sampling_info': re.compile(r"Pre-sampling information", re.IGNORECASE),
+    'partition_persisted_after_sampling': re.compile(r"Persisted a new partition after sampling", re.IGNORECASE),
+}
+
+# Matched against the 'reason' field rather than the message
+NATURAL_ORDER_REASON_PATTERN = re.compile(r"Selected for natural order collection reads", re.IGNORECASE)
+
+_REGEX_METACHARS = frozenset('\\.^$*+?{}[]|()')
+
+
+def literal_anchors(pattern: str) -> tuple[str, ...]:
+    """
+    Return lowercase literals, at least one of which appears in any text
+    the case-insensitive `pattern` matches.
+
+    Each top-level alternative contributes its literal prefix. Returns ()
+    when no anchor can be derived safely; such patterns are always run.
+    """
+    if '|' in pattern and any(c in pattern for c in '\\()[]'):
+        return ()
+    anchors = []
+    for branch in pattern.split('|'):
+        prefix = []
+        for ch in branch:
+            if ch in _REGEX_METACHARS:
+                if ch in '*?{' and prefix:
+                    prefix.pop()  # the preceding character is optional
+                break
+            prefix.append(ch)
+        anchor = ''.join(prefix).lower()
+        if not anchor or not anchor.isascii():
+            return ()
+        anchors.append(anchor)
+    return tuple(anchors)
+
+
+class MultiPatternMatcher:
+    """
+    Finds which of several case-insensitive patterns match a text.
+
+    ASCII texts are lowercased once and scanned for each pattern's literal
+    anchors; only patterns whose anchor is present are confirmed with the
+    regex. Texts that are not ASCII fall back to running every regex, so
+    results always equal calling each pattern's search() in turn.
+    """
+
+    def __init__(self, patterns: list[tuple[str, re.Pattern]]):
+        """
+        Args:
+            patterns: (name, compiled pattern) pairs, in priority order
+        """
+        self._patterns = patterns
+        self._all = list(range(len(patterns)))
+        self._anchors: list[tuple[str, int]] = []
+        self._unanchored: set[int] = set()
+        for idx, (_, regex) in enumerate(patterns):
+            anchors = literal_anchors(regex.pattern)
+            if not anchors:
+                self._unanchored.add(idx)
+            for anchor in anchors:
+                self._anchors.append((anchor, idx))
+
+    def _candidates(self, text: str) -> list[int]:
+        if not text.isascii():
+            return self._all
+        lowered = text.lower()
+        hits = {idx for anchor, idx in self._anchors if anchor in lowered}
+        if self._unanchored:
+            hits |= self._unanchored
+        return sorted(hits)
+
+    def might_match(self, text: str) -> bool:
+        """
+        Return False only if no pattern can match, without running any
+        regex. May return True for texts that turn out not to match.
+        """
+        if self._unanchored or not text.isascii():
+            return True
+        lowered = text.lower()
+        for anchor, _ in self._anchors:
+            if anchor in lowered:
+                return True
+        return False
+
+    def match_all(self, text: str) -> list[str]:
+        """Return the names of all matching patterns, in priority order."""
+        patterns = self._patterns
+        return [patterns[idx][0] for idx in self._candidates(text) if patterns[idx][1].search(text)]
+
+    def matches_any(self, text: str) -> bool:
+        """Return True if at least one pattern matches."""
+        patterns = self._patterns
+        return any(patterns[idx][1].search(text) for idx in self._candidates(text))
+
+    def match_first(self, text: str) -> Optional[int]:
+        """Return the index of the first matching pattern, or None."""
+        patterns = self._patterns
+        for idx in self._candidates(text):
+            if patterns[idx][1].search(text):
+                return idx
+        return None
+
+
+# Top-level keys whose presence alone routes a line into a category
+_DOCUMENT_FIELD_KEYS = ('"reason"', '"verifierDstLagTimeSeconds"', '"verifierSrcLagTimeSeconds"')
+
+
+@dataclass(slots=True)
+class ProgressRecord:
+    """
+    The progress payload of one 'sent response' log line.
+
+    The response body is a JSON string; it is decoded once during ingest
+    so the chart extractors all read the same dict instead of each
+    re-parsing every body.
+    """
+    time: str
+    # body['progress'] when the body decoded to an object with a progress object
+    progress: Optional[dict]
+    # False when the body was missing or not valid JSON
+    body_decoded: bool
+
+    @classmethod
+    def from_response(cls, json_obj: dict) -> 'ProgressRecord':
+        time = json_obj.get('time')
+        if not isinstance(time, str):
+            time = ''
+        try:
+            body = json_loads(json_obj['body'])
+        except (KeyError, json.JSONDecodeError, TypeError):
+            return cls(time, None, False)
+        progress = body.get('progress') if isinstance(body, dict) else None
+        if not isinstance(progress, dict):
+            progress = None
+        return cls(time, progress, True)
+
+
+# Result lists collected during ingest, in the order they are reported
+LOG_CATEGORIES = (
+    'replication_progress',
+    'version_info',
+    'operation_stats',
+    'sent_response',
+    'phase_transitions',
+    'phase_in_memory',
+    'mongosync_options',
+    'hidden_flags',
+    'start_options',
+    'crud_events_rate',
+    'partition_copy_progress',
+    'natural_order_collections',
+    'partition_single_created',
+    'partition_multi_created',
+    'partition_sampling_info',
+    'partition_persisted_after_sampling',
+    'verifier_dst_lag',
+    'verifier_src_lag',
+    'matched_errors',
+)
+
+
+_OPERATION_STATS_OPERATIONS = (
+    'CollectionCopySourceRead',
+    'CollectionCopyDestinationWrite',
+    'CEASourceRead',
+    'CEADestinationWrite',
+)
+
+# Categories that only feed time-series charts keep just these fields
+# (name -> array typecode, see ColumnarSeries) instead of whole log lines
+CATEGORY_COLUMNS = {
+    'replication_progress': {
+        'totalEventsApplied': None,
+        'lagTimeSeconds': None,
+        'estimatedOplogTimeRemaining': None,
+        'eventApplicationRatePerSecond': None,
+    },
+    'operation_stats': {
+        **{
+            f'{operation}.{field}': 'd'
+            for operation in _OPERATION_STATS_OPERATIONS
+            for field in ('averageDurationMs', 'maximumDurationMs', 'numOperations')
+        },
+        'sourcePingLatencyMs': 'd',
+        'destinationPingLatencyMs': 'd',
+    },
+    'crud_events_rate': {'srcCRUDEventsPerSec': 'd'},
+    'verifier_dst_lag': {'verifierDstLagTimeSeconds': None},
+    'verifier_src_lag': {'verifierSrcLagTimeSeconds': None},
+}
+
+
+# List categories that grow with the log and may spill to the log store
+SPILLABLE_CATEGORIES = (
+    'sent_response',
+    'phase_transitions',
+    'phase_in_memory',
+    'partition_copy_progress',
+    'natural_order_collections',
+    'partition_single_created',
+    'partition_multi_created',
+    'partition_sampling_info',
+    'partition_persisted_after_sampling',
+)
+
+
+class ErrorCaptures(list):
+    """
+    Matched error entries, keeping at most max_per_pattern entries per
+    error pattern (0 = no limit). match_counts counts every match,
+    including the ones that were not kept.
+    """
+
+    def __init__(self, max_per_pattern: int = 0):
+        super().__init__()
+        self.max_per_pattern = max_per_pattern
+        self.match_counts: dict[str, int] = {}
+
+    def __reduce__(self):
+        # Pickle (for parse workers) must not route entries through extend()
+        return _restore_error_captures, (self.max_per_pattern, self.match_counts, list(self))
+
+    def accept(self, friendly_name: str) -> bool:
+        """Count a match and return True if its entry should be kept."""
+        count = self.match_counts.get(friendly_name, 0) + 1
+        self.match_counts[friendly_name] = count
+        return not self.max_per_pattern or count <= self.max_per_pattern
+
+    def extend(self, other: 'ErrorCaptures'):
+        """Merge the captures of a later chunk of the log."""
+        kept: dict[str, int] = {}
+        for entry in other:
+            name = entry['friendly_name']
+            position = self.match_counts.get(name, 0) + kept.get(name, 0)
+            kept[name] = kept.get(name, 0) + 1
+            if not self.max_per_pattern or position < self.max_per_pattern:
+                self.append(entry)
+        for name, count in other.match_counts.items():
+            self.match_counts[name] = self.match_counts.get(name, 0) + count
+
+    def suppressed_counts(self) -> dict[str, int]:
+        """Return pattern name -> number of matches that were not kept."""
+        if not self.max_per_pattern:
+            return {}
+        return {
+            name: count - self.max_per_pattern
+            for name, count in self.match_counts.items()
+            if count > self.max_per_pattern
+        }
+
+
+def _restore_error_captures(max_per_pattern: int, match_counts: dict, entries: list) -> ErrorCaptures:
+    captures = ErrorCaptures(max_per_pattern)
+    captures.match_counts = match_counts
+    list.extend(captures, entries)
+    return captures
+
+
+def new_categories(max_error_captures: int = 0, spill_store=None) -> dict:
+    """
+    Return an empty collection for every log category: a ColumnarSeries
+    for the categories in CATEGORY_COLUMNS, ErrorCaptures for matched
+    errors and a list for the others. With spill_store, the categories in
+    SPILLABLE_CATEGORIES are SpillableRecords backed by that log store.
+    """
+    categories = {}
+    for name in LOG_CATEGORIES:
+        if name in CATEGORY_COLUMNS:
+            categories[name] = ColumnarSeries(CATEGORY_COLUMNS[name])
+        elif name == 'matched_errors':
+            categories[name] = ErrorCaptures(max_error_captures)
+        elif spill_store is not None and name in SPILLABLE_CATEGORIES:
+            categories[name] = SpillableRecords(name, spill_store)
+        else:
+            categories[name] = []
+    return categories
+
+
+def resolve_parse_workers(workers: int) -> int:
+    """Return the effective worker count; 0 means one worker per CPU."""
+    if workers <= 0:
+        return os.cpu_count() or 1
+    return workers
+
+
+class LogLineClassifier:
+    """Applies the Log Analyzer category filters to parsed log lines."""
+
+    def __init__(self, error_patterns_config: list[dict]):
+        """
+        Args:
+            error_patterns_config: entries loaded from error_patterns.json
+                with 'pattern', 'friendly_name' and optional 'recommendation'
+        """
+        self.error_patterns = [
+            {
+                'pattern': re.compile(ep['pattern'], re.IGNORECASE),
+                'friendly_name': ep['friendly_name'],
+                'recommendation': ep.get('recommendation', ''),
+            }
+            for ep in error_patterns_config
+        ]
+        self._message_matcher = MultiPatternMatcher(list(LOG_MESSAGE_PATTERNS.items()))
+        self._error_matcher = MultiPatternMatcher(
+            [(ep['friendly_name'], ep['pattern']) for ep in self.error_patterns]
+        )
+
+    def needs_document(self, message: str, line: str) -> bool:
+        """
+        Return True if a line could feed any category, so it must be
+        classified. Lines for which this is False only go to the LogStore.
+        """
+        for key in _DOCUMENT_FIELD_KEYS:
+            if key in line:
+                return True
+        # Anchor checks only: a false positive merely costs a classify() call
+        return self._message_matcher.might_match(message) or self._error_matcher.might_match(message)
+
+    def parse_line(self, line: str) -> tuple[tuple, Optional[dict]]:
+        """
+        Return the LogStore row for a log line and, when the line feeds a
+        category, its parsed JSON object (otherwise None).
+
+        Every line is decoded, so a line that is not valid JSON raises
+        json.JSONDecodeError and is counted as invalid; only the category
+        filters are skipped for lines no extractor needs.
+        """
+        json_obj = json_loads(line)
+        message = json_obj.get('message', '')
+        row = (
+            json_obj.get('time', ''),
+            json_obj.get('level', ''),
+            message,
+            line
+        )
+        if isinstance(message, str) and not self.needs_document(message, line):
+            return row, None
+        return row, json_obj
+
+    def classify(self, json_obj: dict, categories: dict):
+        """Append json_obj to every category list whose filter it matches."""
+        message = json_obj.get('message', '')
+        if not isinstance(message, str):
+            message = ''
+
+        for name in self._message_matcher.match_all(message):
+            if name in ('mongosync_options', 'hidden_flags'):
+                # Filter out time and level fields for options and hidden flags
+                filtered_obj = {k: v for k, v in json_obj.items() if k not in ('time', 'level')}
+                categories[name].append(filtered_obj)
+            elif name == 'received_request':
+                if json_obj.get('uri') == '/api/v1/start':
+                    try:
+                        body = json_loads(json_obj.get('body', '{}'))
+                        categories['start_options'].append(body)
+                    except (json.JSONDecodeError, TypeError):
+                        pass
+            elif name == 'sent_response':
+                categories[name].append(ProgressRecord.from_response(json_obj))
+            else:
+                categories[name].append(json_obj)
+
+        reason = json_obj.get('reason', '')
+        if isinstance(reason, str) and reason and NATURAL_ORDER_REASON_PATTERN.search(reason):
+            db = json_obj.get('database', '')
+            coll = json_obj.get('collection', '')
+            if db and coll:
+                categories['natural_order_collections'].append({'database': db, 'collection': coll})
+
+        if json_obj.get('verifierDstLagTimeSeconds') is not None and 'time' in json_obj:
+            categories['verifier_dst_lag'].append(json_obj)
+
+        if json_obj.get('verifierSrcLagTimeSeconds') is not None and 'time' in json_obj:
+            categories['verifier_src_lag'].append(json_obj)
+
+        # Check for common error patterns (only the first matching pattern counts)
+        error_idx = self._error_matcher.match_first(message)
+        if error_idx is not None:
+            ep = self.error_patterns[error_idx]
+            errors = categories['matched_errors']
+            if not errors.accept(ep['friendly_name']):
+                return
+            errors.append({
+                'friendly_name': ep['friendly_name'],
+                'recommendation': ep['recommendation'],
+                'message': message,
+                'time': json_obj.get('time', ''),
+                'level': json_obj.get('level', ''),
+                'full_log': json.dumps(json_obj, indent=2)
+            })
+
+
+# Per-process classifier used by parallel parse workers
+_worker_classifier: Optional[LogLineClassifier] = None
+
+
+_worker_max_error_captures = 0
+
+
+def _init_parse_worker(error_patterns_config: list[dict], max_error_captures: int = 0):
+    global _worker_classifier, _worker_max_error_captures
+    _worker_classifier = LogLineClassifier(error_patterns_config)
+    _worker_max_error_captures = max_error_captures
+
+
+def _parse_chunk(lines: list[tuple[int, str]]) -> tuple[dict, list[tuple], list[tuple]]:
+    """
+    Parse and classify a chunk of log lines inside a worker process.
+
+    Returns (categories, store_rows, invalid) where store_rows are
+    (timestamp, level, message, line) tuples for LogStore and invalid
+    holds (line_no, error) for lines that are not valid JSON.
+    """
+    classifier = _worker_classifier
+    categories = new_categories(_worker_max_error_captures)
+    rows = []
+    invalid = []
+    for line_no, line in lines:
+        try:
+            row, json_obj = classifier.parse_line(line)
+        except json.JSONDecodeError as e:
+            invalid.append((line_no, str(e)))
+            continue
+        rows.append(row)
+        if json_obj is not None:
+            classifier.classify(json_obj, categories)
+    return categories, rows, invalid
+
+
+class LogIngest:
+    """
+    Collects category lists, the Log Viewer tail and LogStore rows from
+    a stream of mongosync JSON log lines.
+
+    With workers > 1, lines are grouped into chunks of `chunk_lines` and
+    parsed in a process pool. At most two chunks per worker are in flight
+    at once, and results are merged in submission order.
+
+    With memory_budget_bytes > 0, the SPILLABLE_CATEGORIES records are
+    moved to the log store whenever their pickled size exceeds the budget.
+    """
+
+    def __init__(self, error_patterns_config: list[dict], log_store, tail_lines: int,
+                 workers: int = 1, chunk_lines: int = PARSE_CHUNK_LINES,
+                 max_error_captures: int = 0, memory_budget_bytes: int = 0):
+        self.categories = new_categories(
+            max_error_captures, spill_store=log_store if memory_budget_bytes > 0 else None
+        )
+        self.spill_count = 0
+        self._memory_budget_bytes = memory_budget_bytes
+        self._spillable = [
+            records for records in self.categories.values() if isinstance(records, SpillableRecords)
+        ]
+        self.raw_log_tail: deque = deque(maxlen=tail_lines)
+        self.invalid_json_count = 0
+        self.workers = resolve_parse_workers(workers)
+        self._log_store = log_store
+        self._chunk_lines = chunk_lines
+        self._chunk: list[tuple[int, str]] = []
+        self._in_flight: deque = deque()
+        self._classifier: Optional[LogLineClassifier] = None
+        self._executor: Optional[ProcessPoolExecutor] = None
+        if self.workers > 1:
+            logger.info(f"Parsing log lines with {self.workers} worker processes")
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_parse_worker,
+                initargs=(error_patterns_config, max_error_captures),
+            )
+        else:
+            self._classifier = LogLineClassifier(error_patterns_config)
+
+    def feed(self, line: str, line_no: int):
+        """Parse one stripped log line (line_no is used for error reporting)."""
+        if self._executor is None:
+            try:
+                row, json_obj = self._classifier.parse_line(line)
+            except json.JSONDecodeError as e:
+                self._record_invalid(line_no, e)
+                return
+            self.raw_log_tail.append(line)
+            self._log_store.insert_rows((row,))
+            if json_obj is not None:
+                self._classifier.classify(json_obj, self.categories)
+                if self._spillable:
+                    self._enforce_memory_budget()
+            return
+
+        self._chunk.append((line_no, line))
+        if len(self._chunk) >= self._chunk_lines:
+            self._submit_chunk()
+
+    def finish(self):
+        """Parse any buffered lines and merge all outstanding chunk results."""
+        if self._executor is None:
+            return
+        self._submit_chunk()
+        while self._in_flight:
+            self._merge(self._in_flight.popleft().result())
+        self.close()
+
+    def close(self):
+        """Shut down the worker pool, discarding unmerged chunks."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+            self._in_flight.clear()
+            self._chunk = []
+
+    def _submit_chunk(self):
+        if not self._chunk:
+            return
+        self._in_flight.append(self._executor.submit(_parse_chunk, self._chunk))
+        self._chunk = []
+        while len(self._in_flight) >= self.workers * 2:
+            self._merge(self._in_flight.popleft().result())
+
+    def _merge(self, result: tuple[dict, list[tuple], list[tuple]]):
+        categories, rows, invalid = result
+        for name, items in categories.items():
+            if items:
+                self.categories[name].extend(items)
+        for line_no, error in invalid:
+            self._record_invalid(line_no, error)
+        self.raw_log_tail.extend(row[3] for row in rows)
+        self._log_store.insert_rows(rows)
+        if self._spillable:
+            self._enforce_memory_budget()
+
+    def _enforce_memory_budget(self):
+        if sum(records.pending_bytes for records in self._spillable) <= self._memory_budget_bytes:
+            return
+        for records in self._spillable:
+            records.spill()
+        self.spill_count += 1
+        if self.spill_count == 1:
+            logger.info(f"Log records exceeded the {self._memory_budget_bytes // (1024 * 1024)} MB "
+                        f"ingest memory budget; spilling them to the log store")
+
+    def _record_invalid(self, line_no: int, error):
+        self.invalid_json_count += 1
+        if self.invalid_json_count <= 5:  # Log first 5 errors to avoid spam
+            logger.warning(f"Invalid JSON on line {line_no}: {error}")
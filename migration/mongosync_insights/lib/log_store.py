@@ -5,47 +5,335 @@ Stores raw JSON log lines as documents and provides a MongoDB-like
 query API for searching across the full log file. Uses SQLite's
 JSON functions for field extraction and FTS5 for full-text search
 on the message field.
+
+With doc_block_rows > 0 the raw documents are not kept row by row:
+each group of consecutive rows is zlib-compressed into one doc_blocks
+entry keyed by its first rowid and the row's doc column stays NULL.
+Reads decompress the blocks they need, so both layouts can be queried.
+
+Configured log fields (componentName, database, ...) are copied out of
+each document with json_extract at insert time into f_<name> columns
+with partial indexes, so find() can filter on them without FTS.
+
+log_level_counts keeps the number of lines per level and second of log
+time, updated with each batch, so histogram() can answer level/time
+queries without touching log_lines.
+
+find() also takes a Python regular expression ($regex), confirmed line
+by line against the message and the raw document. Stores created with
+regex_index keep a contentless FTS5 trigram index of the raw documents
+(log_trigram) that narrows the lines examined to those containing the
+pattern's literal text; see lib.regex_search.
+
+Stores opened with read_connections > 0 (the Log Viewer registry) run
+find(), count(), histogram() and the tail on a small pool of read-only
+connections, so concurrent searches on one store do not wait for each
+other on a single connection.
+
+How a store is written during ingest is set by a named load profile
+(LOAD_PROFILES): journal mode, page size, mmap, cache and batch size,
+and whether each batch is committed or the whole load is one
+transaction. Non-WAL profiles switch the store to WAL once its indexes
+are built.
 """
+import bisect
+import collections
+import contextlib
 import json
 import logging
 import os
+import pathlib
+import queue
 import sqlite3
+import threading
+import re
 import time
+import zlib
 import glob
+from datetime import datetime, timedelta, timezone
 from typing import Any, Optional
 
+from .regex_search import compile_regex, regex_trigram_query
+
 logger = logging.getLogger(__name__)
 
+_CREATE_FTS_SQL = """
+    CREATE VIRTUAL TABLE IF NOT EXISTS log_fts
+    USING fts5(message, content=log_lines, content_rowid=rowid)
+"""
+# Rows only, no content or positions: it answers AND-of-trigram prefilters
+_CREATE_TRIGRAM_SQL = """
+    CREATE VIRTUAL TABLE IF NOT EXISTS log_trigram
+    USING fts5(doc, content='', tokenize='trigram', detail='none')
+"""
+_CREATE_DOC_BLOCKS_SQL = """
+    CREATE TABLE IF NOT EXISTS doc_blocks (
+        first_rowid INTEGER PRIMARY KEY,
+        data BLOB
+    )
+"""
+_CREATE_LEVEL_COUNTS_SQL = """
+    CREATE TABLE IF NOT EXISTS log_level_counts (
+        second INTEGER,
+        level TEXT,
+        count INTEGER,
+        PRIMARY KEY (second, level)
+    ) WITHOUT ROWID
+"""
+# Seconds since the epoch of a log timestamp's wall-clock time, ignoring the
+# UTC offset like the charts do; NULL for lines without a timestamp
+_SECOND_SQL = "CAST(strftime('%s', substr({}, 1, 19)) AS INTEGER)"
+_EPOCH = datetime(1970, 1, 1)
+_ONE_SECOND = timedelta(seconds=1)
+_CREATE_INDEX_SQL = (
+    "CREATE INDEX IF NOT EXISTS idx_level ON log_lines(level)",
+    "CREATE INDEX IF NOT EXISTS idx_timestamp ON log_lines(timestamp)",
+)
+
+
+_FIELD_NAME_PATTERN = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+
 
 class LogStore:
     """Document store for mongosync log lines backed by SQLite + FTS5."""
 
     BATCH_SIZE = 5000
+    # Query cache lookups between INFO lines with the cumulative hit/miss counts
+    CACHE_LOG_INTERVAL = 100
+
+    # zlib level for doc_blocks; higher levels cost ingest time for a few % of size
+    DOC_BLOCK_COMPRESS_LEVEL = 6
+    # doc_blocks read per query when resolving docs (below SQLite's bound parameter limit)
+    BLOCK_FETCH_SIZE = 500
 
-    def __init__(self, db_path: str):
+    # histogram() picks the smallest of these bucket sizes that covers the
+    # time range in at most HISTOGRAM_TARGET_BUCKETS buckets
+    HISTOGRAM_BUCKET_SECONDS = (1, 2, 5, 10, 15, 30, 60, 120, 300, 600, 900, 1800,
+                                3600, 7200, 10800, 21600, 43200, 86400)
+    HISTOGRAM_TARGET_BUCKETS = 120
+    HISTOGRAM_MAX_BUCKETS = 5000
+    # SQLite settings for loading a store; batch_size None means BATCH_SIZE
+    LOAD_PROFILES = {
+        # WAL and a commit per batch: rows are readable while the load runs
+        'wal': {'journal_mode': 'WAL', 'page_size': None, 'mmap_size': 0,
+                'cache_size_kb': 64000, 'batch_size': None, 'single_transaction': False},
+        # Rollback journal kept in memory, one transaction for the whole load
+        'memory': {'journal_mode': 'MEMORY', 'page_size': None, 'mmap_size': 0,
+                   'cache_size_kb': 64000, 'batch_size': None, 'single_transaction': True},
+        # No journal, one transaction, larger pages and batches, memory-mapped reads
+        'bulk': {'journal_mode': 'OFF', 'page_size': 16384, 'mmap_size': 256 * 1024 * 1024,
+                 'cache_size_kb': 128000, 'batch_size': 20000, 'single_transaction': True},
+    }
+
+    def __init__(self, db_path: str, incremental_index: bool = False,
+                 writer_queue_batches: int = 0, doc_block_rows: int = 0,
+                 fields: Optional[dict[str, str]] = None, query_cache_size: int = 64,
+                 read_connections: int = 0, load_profile: str = 'wal',
+                 regex_index: bool = False, regex_max_rows: int = 100000,
+                 regex_time_limit: float = 2.0):
+        """
+        Args:
+            db_path: SQLite database file
+            incremental_index: keep the FTS5 index and the level/timestamp
+                indexes up to date as rows are inserted, so the store can be
+                searched during ingest, instead of building them once in
+                build_fts_index()
+            writer_queue_batches: if > 0, batches of inserted rows are
+                written by a dedicated thread with its own connection; at
+                most this many batches wait in its queue before inserts
+                block. 0 writes each batch on the calling thread.
+            doc_block_rows: if > 0, store the raw documents zlib-compressed
+                in blocks of this many consecutive rows instead of in the
+                doc column. Only affects writes; blocks are always readable.
+            fields: {name: dotted.path} of document fields to copy into
+                indexed columns when a new store is created. Stores opened
+                later expose whatever fields they were created with.
+            query_cache_size: find() pages and totals kept in an LRU cache
+                until the store changes (0 disables it)
+            read_connections: if > 0, queries run on up to this many
+                read-only connections (opened on demand) so that several
+                threads can search at once. 0 runs them on the store's
+                own connection.
+            load_profile: name of the LOAD_PROFILES entry used to write the
+                store. Stores searched during ingest (incremental_index) or
+                written by the writer thread always use WAL and commit
+                each batch.
+            regex_index: when a new store is created, also index the raw
+                documents by trigram for $regex queries. Stores opened
+                later use the index if they were created with it.
+            regex_max_rows: lines a $regex find() examines at most
+                before returning a partial page
+            regex_time_limit: seconds a $regex find() spends testing lines
+                before returning a partial page
+        """
+        if load_profile not in self.LOAD_PROFILES:
+            raise ValueError(f"Unknown log store load profile: {load_profile!r} "
+                             f"(expected one of {', '.join(self.LOAD_PROFILES)})")
+        fields = dict(fields or {})
+        for name, path in fields.items():
+            if not _FIELD_NAME_PATTERN.match(name) or not all(
+                    _FIELD_NAME_PATTERN.match(part) for part in path.split('.')):
+                raise ValueError(f"Invalid log store field: {name}={path}")
         self.db_path = db_path
+        self.incremental_index = incremental_index
+        self.writer_queue_batches = writer_queue_batches
+        self.doc_block_rows = doc_block_rows
+        self.fields = fields
+        self.load_profile = load_profile
+        self._profile = dict(self.LOAD_PROFILES[load_profile])
+        if incremental_index or writer_queue_batches > 0:
+            # Readers during ingest and the writer's second connection need WAL
+            self._profile.update(journal_mode='WAL', single_transaction=False)
+        self.batch_size = self._profile['batch_size'] or self.BATCH_SIZE
+        self.regex_index = regex_index
+        self.regex_max_rows = regex_max_rows
+        self.regex_time_limit = regex_time_limit
+        # Whether log_trigram exists; set by _open()
+        self._has_trigram_index = False
+        # Field names with an f_<name> column in this store; set by _open()
+        self.search_fields: tuple[str, ...] = ()
+        # Whether log_level_counts exists (stores created before it do not have it)
+        self._has_level_counts = False
         self._conn: Optional[sqlite3.Connection] = None
         self._pending: list[tuple] = []
         self._total_inserted = 0
+        # Highest log_lines rowid already added to log_fts (incremental_index)
+        self._fts_rowid = 0
+        self._spill_table_ready = False
+        self._spill_index_ready = False
+        # Writer thread state (writer_queue_batches > 0)
+        self._writer: Optional[threading.Thread] = None
+        self._queue: Optional[queue.Queue] = None
+        self._writer_error: Optional[BaseException] = None
+        # Seconds inserts spent blocked on a full writer queue / spent writing
+        self.queue_wait_seconds = 0.0
+        self.write_seconds = 0.0
+        self.batches_written = 0
+        # LRU cache of find() pages and totals, valid for _cache_version
+        self.query_cache_size = query_cache_size
+        self._cache: collections.OrderedDict = collections.OrderedDict()
+        self._cache_version: Optional[tuple] = None
+        self._cache_lock = threading.Lock()
+        self._data_generation = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        # Idle read-only connections (read_connections > 0)
+        self.read_connections = read_connections
+        self._readers: queue.LifoQueue = queue.LifoQueue()
+        self._readers_opened = 0
+        self._readers_lock = threading.Lock()
         self._open()
 
+    def _connect(self) -> sqlite3.Connection:
+        profile = self._profile
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        if profile['page_size']:
+            # Only takes effect while the database file is still empty
+            conn.execute(f"PRAGMA page_size={profile['page_size']}")
+        conn.execute(f"PRAGMA journal_mode={profile['journal_mode']}")
+        conn.execute("PRAGMA busy_timeout=5000")
+        conn.execute("PRAGMA synchronous=OFF")
+        conn.execute(f"PRAGMA cache_size=-{profile['cache_size_kb']}")
+        if profile['mmap_size']:
+            conn.execute(f"PRAGMA mmap_size={profile['mmap_size']}")
+        return conn
+
+    def _connect_reader(self) -> sqlite3.Connection:
+        uri = pathlib.Path(os.path.abspath(self.db_path)).as_uri() + '?mode=ro'
+        conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        conn.execute("PRAGMA query_only=ON")
+        conn.execute("PRAGMA busy_timeout=5000")
+        conn.execute("PRAGMA cache_size=-16000")  # 16 MB cache per reader
+        return conn
+
+    @contextlib.contextmanager
+    def _reader(self):
+        """
+        Internal: a connection for read queries, taken from the read-only
+        pool (waiting for one when read_connections are all busy) or the
+        store's own connection when the pool is disabled.
+        """
+        if self.read_connections <= 0:
+            yield self._conn
+            return
+        try:
+            conn = self._readers.get_nowait()
+        except queue.Empty:
+            with self._readers_lock:
+                can_open = self._readers_opened < self.read_connections
+                if can_open:
+                    self._readers_opened += 1
+            if can_open:
+                try:
+                    conn = self._connect_reader()
+                except BaseException:
+                    with self._readers_lock:
+                        self._readers_opened -= 1
+                    raise
+            else:
+                conn = self._readers.get()
+        try:
+            yield conn
+        finally:
+            if self._conn is None:
+                # Store closed while the query ran
+                conn.close()
+            else:
+                self._readers.put(conn)
+
+    def _close_readers(self):
+        while True:
+            try:
+                conn = self._readers.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+        with self._readers_lock:
+            self._readers_opened = 0
+
     def _open(self):
-        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
-        self._conn.execute("PRAGMA journal_mode=WAL")
-        self._conn.execute("PRAGMA busy_timeout=5000")
-        self._conn.execute("PRAGMA synchronous=OFF")
-        self._conn.execute("PRAGMA cache_size=-64000")  # 64 MB cache
-        self._conn.execute("""
+        self._conn = self._connect()
+        new_store = not self._table_exists('log_lines')
+        field_columns = ''.join(f", f_{name} TEXT" for name in self.fields)
+        self._conn.execute(f"""
             CREATE TABLE IF NOT EXISTS log_lines (
                 rowid INTEGER PRIMARY KEY,
                 timestamp TEXT,
                 level TEXT,
                 message TEXT,
-                doc TEXT
+                doc TEXT{field_columns}
             )
         """)
+        columns = [row[1] for row in self._conn.execute("PRAGMA table_info(log_lines)")]
+        self.search_fields = tuple(c[2:] for c in columns if c.startswith('f_'))
+        if new_store:
+            self._conn.execute(_CREATE_LEVEL_COUNTS_SQL)
+            if self.regex_index:
+                self._conn.execute(_CREATE_TRIGRAM_SQL)
+        self._has_level_counts = self._table_exists('log_level_counts')
+        self._has_trigram_index = self._table_exists('log_trigram')
+        if self.doc_block_rows > 0:
+            self._conn.execute(_CREATE_DOC_BLOCKS_SQL)
+        if self.incremental_index:
+            self._conn.execute(_CREATE_FTS_SQL)
+            for sql in self._index_sql():
+                self._conn.execute(sql)
         self._conn.commit()
 
+    def _table_exists(self, name: str) -> bool:
+        row = self._conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,)
+        ).fetchone()
+        return row is not None
+
+    def _index_sql(self) -> list[str]:
+        """Internal: CREATE INDEX statements for the level, timestamp and field columns."""
+        # Fields are sparse; partial indexes skip the lines without them
+        return list(_CREATE_INDEX_SQL) + [
+            f"CREATE INDEX IF NOT EXISTS idx_f_{name} ON log_lines(f_{name}) WHERE f_{name} IS NOT NULL"
+            for name in self.search_fields
+        ]
+
     def insert_many(self, documents: list[dict]):
         """
         Batch-insert raw JSON documents.
@@ -63,12 +351,7 @@ class LogStore:
                 doc.get('message', ''),
                 json.dumps(doc, separators=(',', ':'))
             ))
-        self._conn.executemany(
-            "INSERT INTO log_lines(timestamp, level, message, doc) VALUES (?,?,?,?)",
-            rows
-        )
-        self._conn.commit()
-        self._total_inserted += len(rows)
+        self._write_rows(rows)
 
     def insert_line(self, line: str, parsed: Optional[dict] = None):
         """
@@ -88,71 +371,541 @@ class LogStore:
         else:
             self._pending.append(('', '', '', line))
 
-        if len(self._pending) >= self.BATCH_SIZE:
+        if len(self._pending) >= self.batch_size:
+            self._flush_pending()
+
+    def insert_rows(self, rows: list[tuple]):
+        """
+        Buffer pre-extracted (timestamp, level, message, doc) rows.
+
+        Used when log lines were parsed elsewhere (e.g. in a worker
+        process) so the fields do not need to be extracted again.
+        """
+        if not rows:
+            return
+        self._pending.extend(rows)
+        if len(self._pending) >= self.batch_size:
             self._flush_pending()
 
     def _flush_pending(self):
         if not self._pending:
             return
-        self._conn.executemany(
-            "INSERT INTO log_lines(timestamp, level, message, doc) VALUES (?,?,?,?)",
-            self._pending
-        )
-        self._conn.commit()
-        self._total_inserted += len(self._pending)
-        self._pending.clear()
+        rows, self._pending = self._pending, []
+        self._write_rows(rows)
 
     def flush(self):
-        """Flush any remaining buffered rows to the database."""
+        """
+        Flush any remaining buffered rows to the database.
+
+        With a writer thread, waits until it has written every queued
+        batch, then stops it; later inserts start a new one. With a
+        single-transaction load profile, commits the rows written so far.
+        """
         self._flush_pending()
+        if self._writer is not None:
+            self._stop_writer()
+        if self._profile['single_transaction'] and self._conn.in_transaction:
+            self._conn.commit()
+
+    def _write_rows(self, rows: list[tuple]):
+        """Write a batch now, or hand it to the writer thread."""
+        self._submit_write(self._write_batch, rows)
+
+    def _submit_write(self, write, *args):
+        """
+        Run write(conn, *args) on the store's connection now, or queue it
+        for the writer thread, so every write of a load goes through one
+        connection in order.
+        """
+        if self.writer_queue_batches <= 0:
+            write(self._conn, *args)
+            return
+        self._raise_writer_error()
+        if self._writer is None:
+            self._queue = queue.Queue(maxsize=self.writer_queue_batches)
+            self._writer = threading.Thread(
+                target=self._writer_loop, name='mi-logstore-writer', daemon=True
+            )
+            self._writer.start()
+        t0 = time.perf_counter()
+        self._queue.put((write, args))
+        self.queue_wait_seconds += time.perf_counter() - t0
+
+    def _write_batch(self, conn: sqlite3.Connection, rows: list[tuple]):
+        t0 = time.perf_counter()
+        if self.doc_block_rows > 0:
+            first_rowid = self._insert_doc_blocks(conn, rows)
+        else:
+            first_rowid = self._insert_lines(conn, rows)
+        self._count_rows(conn, rows)
+        if self._has_trigram_index:
+            conn.executemany(
+                "INSERT INTO log_trigram(rowid, doc) VALUES (?,?)",
+                [(first_rowid + i, row[3]) for i, row in enumerate(rows)]
+            )
+        self._index_new_rows(conn)
+        if not self._profile['single_transaction']:
+            conn.commit()
+        self._data_generation += 1
+        self._total_inserted += len(rows)
+        self.batches_written += 1
+        self.write_seconds += time.perf_counter() - t0
+
+    def _insert_doc_blocks(self, conn: sqlite3.Connection, rows: list[tuple]) -> int:
+        """
+        Internal: insert rows with explicit consecutive rowids and their docs
+        as compressed blocks. Docs are single log lines, so a block is the
+        newline-joined docs of rows first_rowid, first_rowid + 1, ...
+        Returns first_rowid.
+        """
+        first = conn.execute("SELECT COALESCE(MAX(rowid), 0) FROM log_lines").fetchone()[0] + 1
+        self._insert_lines(conn, rows, first_rowid=first)
+        step = self.doc_block_rows
+        blocks = []
+        for start in range(0, len(rows), step):
+            text = '\n'.join(row[3] for row in rows[start:start + step])
+            blocks.append((first + start, zlib.compress(text.encode('utf-8'), self.DOC_BLOCK_COMPRESS_LEVEL)))
+        conn.executemany("INSERT INTO doc_blocks(first_rowid, data) VALUES (?,?)", blocks)
+        return first
+
+    def _insert_lines(self, conn: sqlite3.Connection, rows: list[tuple],
+                      first_rowid: Optional[int] = None) -> int:
+        """
+        Internal: insert (timestamp, level, message, doc) rows into log_lines,
+        extracting the configured fields from each doc. With first_rowid
+        (doc_blocks layout) rows get consecutive rowids and doc is not stored.
+        Returns the rowid of the first row.
+        """
+        store_doc = first_rowid is None
+        if store_doc:
+            first_rowid = conn.execute("SELECT COALESCE(MAX(rowid), 0) FROM log_lines").fetchone()[0] + 1
+            params = rows
+        elif self.fields:
+            params = [(first_rowid + i,) + tuple(row) for i, row in enumerate(rows)]
+        else:
+            params = [(first_rowid + i, row[0], row[1], row[2]) for i, row in enumerate(rows)]
+        try:
+            conn.executemany(self._insert_sql(store_doc, guard_json=False), params)
+        except sqlite3.OperationalError as e:
+            if not self.fields or 'JSON' not in str(e):
+                raise
+            # A stored line is not valid JSON: redo the batch, extracting from valid docs only.
+            # Rows are deleted rather than rolled back, which would also undo
+            # earlier batches of a single-transaction load. The redo inserts
+            # the same rowids, so doc_blocks rows stay consecutive.
+            conn.execute("DELETE FROM log_lines WHERE rowid >= ?", (first_rowid,))
+            conn.executemany(self._insert_sql(store_doc, guard_json=True), params)
+        return first_rowid
+
+    def _insert_sql(self, store_doc: bool, guard_json: bool) -> str:
+        """Internal: INSERT statement for _insert_lines() parameters."""
+        if store_doc:
+            columns = ['timestamp', 'level', 'message', 'doc']
+            values = ['?1', '?2', '?3', '?4']
+            doc = '?4'
+        else:
+            columns = ['rowid', 'timestamp', 'level', 'message', 'doc']
+            values = ['?1', '?2', '?3', '?4', 'NULL']
+            doc = '?5'
+        if guard_json:
+            doc = f"CASE WHEN json_valid({doc}) THEN {doc} END"
+        for name, path in self.fields.items():
+            columns.append(f"f_{name}")
+            values.append(f"json_extract({doc}, '$.{path}')")
+        return f"INSERT INTO log_lines({', '.join(columns)}) VALUES ({', '.join(values)})"
+
+    def _resolve_docs(self, conn: sqlite3.Connection, rows: list[tuple[int, Optional[str]]]) -> list[str]:
+        """
+        Internal: raw docs for (rowid, doc) rows, decompressing doc_blocks where
+        doc is NULL. The block starts covering the rows are read with one range
+        query and the blocks they need with one query per BLOCK_FETCH_SIZE.
+        """
+        missing = [rowid for rowid, doc in rows if doc is None]
+        if not missing:
+            return [doc for _rowid, doc in rows]
+        starts = [first for (first,) in conn.execute(
+            "SELECT first_rowid FROM doc_blocks WHERE first_rowid BETWEEN "
+            "(SELECT MAX(first_rowid) FROM doc_blocks WHERE first_rowid <= ?) AND ? ORDER BY first_rowid",
+            (min(missing), max(missing))
+        )]
+        block_of = {rowid: starts[bisect.bisect_right(starts, rowid) - 1] for rowid in missing}
+        needed = sorted(set(block_of.values()))
+        blocks: dict[int, list[str]] = {}
+        for i in range(0, len(needed), self.BLOCK_FETCH_SIZE):
+            chunk = needed[i:i + self.BLOCK_FETCH_SIZE]
+            for first, data in conn.execute(
+                    f"SELECT first_rowid, data FROM doc_blocks WHERE first_rowid IN ({','.join('?' * len(chunk))})",
+                    chunk):
+                blocks[first] = zlib.decompress(data).decode('utf-8').split('\n')
+        docs = []
+        for rowid, doc in rows:
+            if doc is None:
+                first = block_of[rowid]
+                lines = blocks[first]
+                # Rows of a block have consecutive rowids (see _insert_doc_blocks)
+                if rowid - first >= len(lines):
+                    raise sqlite3.DatabaseError(
+                        f"Log store {self.db_path}: row {rowid} is past the end of doc block {first}")
+                doc = lines[rowid - first]
+            docs.append(doc)
+        return docs
+
+    def _count_rows(self, conn: sqlite3.Connection, rows: list[tuple]):
+        """Internal: add a batch of (timestamp, level, ...) rows to log_level_counts."""
+        if not self._has_level_counts:
+            return
+        # Counted here rather than in SQL: strftime() per line would cost
+        # more than the insert itself, and a batch spans few distinct seconds
+        counts = collections.Counter((row[0][:19], row[1] or '') for row in rows if row[0])
+        seconds: dict[str, Optional[int]] = {}
+        updates = []
+        for (prefix, level), n in counts.items():
+            if prefix not in seconds:
+                try:
+                    seconds[prefix] = (datetime.fromisoformat(prefix) - _EPOCH) // _ONE_SECOND
+                except (ValueError, TypeError):
+                    seconds[prefix] = None
+            if seconds[prefix] is not None:
+                updates.append((seconds[prefix], level, n))
+        conn.executemany("""
+            INSERT INTO log_level_counts(second, level, count) VALUES (?,?,?)
+            ON CONFLICT(second, level) DO UPDATE SET count = count + excluded.count
+        """, updates)
+
+    def _index_new_rows(self, conn: sqlite3.Connection):
+        """Add rows inserted since the last batch to the FTS5 index (incremental_index)."""
+        if not self.incremental_index:
+            return
+        conn.execute(
+            "INSERT INTO log_fts(rowid, message) SELECT rowid, message FROM log_lines WHERE rowid > ?",
+            (self._fts_rowid,)
+        )
+        self._fts_rowid = conn.execute("SELECT MAX(rowid) FROM log_lines").fetchone()[0] or 0
+
+    def _writer_loop(self):
+        """Writer thread: run queued writes on a dedicated connection."""
+        conn = self._connect()
+        try:
+            while True:
+                item = self._queue.get()
+                try:
+                    if item is None:
+                        return
+                    # After a failure, keep draining so inserts never block forever
+                    if self._writer_error is None:
+                        write, args = item
+                        write(conn, *args)
+                except Exception as e:
+                    logger.error(f"Log store writer failed for {self.db_path}: {e}")
+                    self._writer_error = e
+                finally:
+                    self._queue.task_done()
+        finally:
+            conn.close()
+
+    def _stop_writer(self):
+        """Wait for the writer thread to drain its queue and exit."""
+        self._queue.put(None)
+        self._writer.join()
+        self._writer = None
+        self._queue = None
+        logger.info(f"Log store writer: {self.batches_written} batches written in {self.write_seconds:.2f}s; "
+                    f"inserts blocked {self.queue_wait_seconds:.2f}s on a full queue")
+        self._raise_writer_error()
+
+    def _raise_writer_error(self):
+        if self._writer_error is not None:
+            error, self._writer_error = self._writer_error, None
+            raise error
+
+    def spill_records(self, category: str, rows: list[tuple[str, int, bytes]]):
+        """
+        Store serialized category records that did not fit the ingest
+        memory budget.
+
+        Spills are written like log rows: by the writer thread when there
+        is one, and committed with the load under single-transaction
+        profiles.
+
+        Args:
+            category: log category name
+            rows: (time, seq, data) tuples; seq is the record's position
+                in its category and keeps equal times in append order
+        """
+        self._submit_write(self._write_spill, category, list(rows))
+
+    def _write_spill(self, conn: sqlite3.Connection, category: str, rows: list[tuple[str, int, bytes]]):
+        if not self._spill_table_ready:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS spilled_records (
+                    category TEXT,
+                    time TEXT,
+                    seq INTEGER,
+                    data BLOB
+                )
+            """)
+            self._spill_table_ready = True
+        conn.executemany(
+            "INSERT INTO spilled_records(category, time, seq, data) VALUES (?,?,?,?)",
+            [(category, time, seq, data) for time, seq, data in rows]
+        )
+        if not self._profile['single_transaction']:
+            conn.commit()
+
+    def iter_spilled_records(self, category: str, by_time: bool = False):
+        """
+        Yield the spilled records of a category, by seq or by (time, seq).
+        Buffered rows and queued writes are flushed first.
+        """
+        self.flush()
+        if not self._spill_index_ready:
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_spilled_time ON spilled_records(category, time, seq)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_spilled_seq ON spilled_records(category, seq)"
+            )
+            self._spill_index_ready = True
+        order = "time, seq" if by_time else "seq"
+        cur = self._conn.execute(
+            f"SELECT data FROM spilled_records WHERE category = ? ORDER BY {order}",
+            (category,)
+        )
+        for (data,) in cur:
+            yield data
+
+    def drop_spilled_records(self):
+        """Delete spilled category records once the upload has been processed."""
+        if self._spill_table_ready:
+            self._conn.execute("DROP TABLE IF EXISTS spilled_records")
+            self._conn.commit()
+            self._spill_table_ready = False
+            self._spill_index_ready = False
 
     def build_fts_index(self):
         """
         Build the FTS5 full-text index on the message column.
 
         Call this once after all inserts are complete for best performance.
+        With incremental_index the rows are already indexed; the FTS5
+        segments written batch by batch are merged for faster queries.
         """
         self.flush()
+        if self.incremental_index:
+            t0 = time.time()
+            self._conn.execute("INSERT INTO log_fts(log_fts) VALUES('optimize')")
+            self._conn.commit()
+            logger.info(f"FTS5 index optimized in {time.time() - t0:.2f}s for {self._total_inserted} documents")
+            return
         logger.info(f"Building FTS5 index over {self._total_inserted} log lines...")
         t0 = time.time()
-        self._conn.execute("""
-            CREATE VIRTUAL TABLE IF NOT EXISTS log_fts
-            USING fts5(message, content=log_lines, content_rowid=rowid)
-        """)
+        self._conn.execute(_CREATE_FTS_SQL)
         self._conn.execute("""
             INSERT INTO log_fts(log_fts) VALUES('rebuild')
         """)
-        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_level ON log_lines(level)")
-        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_timestamp ON log_lines(timestamp)")
+        for sql in self._index_sql():
+            self._conn.execute(sql)
         self._conn.commit()
+        if self._profile['journal_mode'] != 'WAL':
+            # Loaded; readers opened from now on share the store through WAL
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._data_generation += 1
         elapsed = time.time() - t0
         logger.info(f"FTS5 index built in {elapsed:.2f}s for {self._total_inserted} documents")
 
-    def find(self, query: Optional[dict] = None, skip: int = 0, limit: int = 50) -> dict:
+    def find(self, query: Optional[dict] = None, skip: int = 0, limit: int = 50,
+             after_rowid: Optional[int] = None, before_rowid: Optional[int] = None) -> dict:
         """
         Query log documents with optional filters.
 
+        Results are ordered by rowid (file order). Pages can be addressed by
+        offset (skip) or, cheaper on deep pages, by keyset cursor: pass the
+        next_after_rowid / prev_before_rowid of the previous result as
+        after_rowid / before_rowid. Pages and totals are cached per
+        normalized query until the store changes (query_cache_size).
+
         Args:
             query: MongoDB-style query dict. Supported keys:
                 - "level": exact match (str) or {"$in": [...]} for multiple levels
                 - "$text": FTS5 full-text search on message field
                 - "timestamp_gte": lines at or after this timestamp
                 - "timestamp_lte": lines at or before this timestamp
-            skip: number of results to skip (for pagination)
+                - any name in search_fields: exact match, {"$in": [...]}
+                  or {"$exists": bool}
+                - "$regex": Python regular expression searched for in the
+                  message and the raw document (see _find_regex)
+            skip: number of results to skip (ignored with a cursor)
             limit: max results to return (capped at 200)
+            after_rowid: return the matches following this rowid
+            before_rowid: return the matches preceding this rowid
 
         Returns:
-            dict with keys: results (list of dicts), total (int), skip, limit
+            dict with keys: results (list of dicts), total (int), skip, limit,
+            next_after_rowid and prev_before_rowid (None when there is no
+            further page in that direction)
         """
         if query is None:
             query = {}
         limit = min(limit, 200)
 
+        # Invalid patterns raise ValueError before any SQL is built
+        regex = compile_regex(query['$regex']) if query.get('$regex') else None
+        from_clause, params = self._query_sql(query)
+        self._check_cache_version()
+        page_key = ('page', from_clause, tuple(params), query.get('$regex'),
+                    skip, limit, after_rowid, before_rowid)
+        cached = self._cache_get(page_key)
+        if cached is not None:
+            # Copy so callers can add keys (page, per_page) to their result
+            return dict(cached)
+        if regex is not None:
+            with self._reader() as conn:
+                result = self._find_regex(conn, regex, from_clause, params, skip, limit,
+                                          after_rowid, before_rowid)
+            self._cache_put(page_key, result)
+            return dict(result)
+
+        # Fetch one extra row to learn whether another page follows
+        if after_rowid is not None:
+            data_sql = f"{from_clause} AND l.rowid > ? ORDER BY l.rowid LIMIT ?"
+            data_params = params + [after_rowid, limit + 1]
+        elif before_rowid is not None:
+            data_sql = f"{from_clause} AND l.rowid < ? ORDER BY l.rowid DESC LIMIT ?"
+            data_params = params + [before_rowid, limit + 1]
+        else:
+            data_sql = f"{from_clause} ORDER BY l.rowid LIMIT ? OFFSET ?"
+            data_params = params + [limit + 1, skip]
+        with self._reader() as conn:
+            total = self._cached_total(conn, from_clause, params)
+            rows = conn.execute(
+                f"SELECT l.rowid, l.timestamp, l.level, l.message, l.doc {data_sql}",
+                data_params
+            ).fetchall()
+
+            more = len(rows) > limit
+            rows = rows[:limit]
+            if before_rowid is not None:
+                rows.reverse()
+                has_next, has_prev = True, more
+            else:
+                has_next, has_prev = more, after_rowid is not None or skip > 0
+            docs = self._resolve_docs(conn, [(row[0], row[4]) for row in rows])
+
+        results = []
+        for row, doc in zip(rows, docs):
+            results.append({
+                'line': row[0],
+                'timestamp': row[1],
+                'level': row[2],
+                'message': row[3],
+                'raw': doc
+            })
+
+        result = {
+            'results': results,
+            'total': total,
+            'skip': skip,
+            'limit': limit,
+            'next_after_rowid': results[-1]['line'] if results and has_next else None,
+            'prev_before_rowid': results[0]['line'] if results and has_prev else None,
+        }
+        self._cache_put(page_key, result)
+        return dict(result)
+
+    def _find_regex(self, conn: sqlite3.Connection, regex: re.Pattern, from_clause: str, params: list,
+                    skip: int, limit: int, after_rowid: Optional[int], before_rowid: Optional[int]) -> dict:
+        """
+        Internal: find() for a $regex query. Candidate lines (prefiltered by
+        log_trigram when the store has it) are read in rowid order from the
+        cursor and tested with the regex until limit + 1 matches are found,
+        regex_max_rows lines have been examined or regex_time_limit seconds
+        have passed.
+
+        The total is not known without testing every line, so it is None;
+        examined is the number of lines tested and truncated is True when
+        the limit on examined lines or time ended the page early. The cursor of a
+        truncated page continues after the last line examined, so the next
+        request resumes the scan.
+        """
+        # Range and order on the trigram table's rowid let FTS5 stream the
+        # candidates from the cursor instead of collecting all of them first
+        rowid = 'g.rowid' if self._trigram_query(regex.pattern) else 'l.rowid'
+        descending = before_rowid is not None
+        if descending:
+            cursor_sql, cursor = f"AND {rowid} < ? ORDER BY {rowid} DESC", before_rowid
+        else:
+            cursor_sql, cursor = f"AND {rowid} > ? ORDER BY {rowid}", after_rowid or 0
+        wanted = limit + 1 + (0 if after_rowid is not None or descending else skip)
+        matches = []
+        examined = 0
+        last_examined = None
+        exhausted = False
+        chunk = wanted
+        deadline = time.monotonic() + self.regex_time_limit
+        out_of_time = False
+        while len(matches) < wanted and examined < self.regex_max_rows and not out_of_time:
+            # Chunks grow while matches are sparse, so common patterns read few rows
+            chunk = min(chunk * 2, self.BATCH_SIZE, self.regex_max_rows - examined)
+            rows = conn.execute(
+                f"SELECT l.rowid, l.timestamp, l.level, l.message, l.doc {from_clause} {cursor_sql} LIMIT ?",
+                params + [cursor, chunk]
+            ).fetchall()
+            docs = self._resolve_docs(conn, [(row[0], row[4]) for row in rows])
+            for row, doc in zip(rows, docs):
+                examined += 1
+                last_examined = row[0]
+                if regex.search(row[3] or '') or regex.search(doc or ''):
+                    matches.append({
+                        'line': row[0],
+                        'timestamp': row[1],
+                        'level': row[2],
+                        'message': row[3],
+                        'raw': doc
+                    })
+                    if len(matches) == wanted:
+                        break
+                if time.monotonic() >= deadline:
+                    out_of_time = True
+                    break
+            if len(rows) < chunk and len(matches) < wanted and not out_of_time:
+                exhausted = True
+                break
+            cursor = last_examined
+
+        if after_rowid is None and not descending:
+            matches = matches[skip:]
+        more = len(matches) > limit
+        results = matches[:limit]
+        truncated = not more and not exhausted
+        if descending:
+            results.reverse()
+            has_next, has_prev = True, more or truncated
+        else:
+            has_next, has_prev = more or truncated, after_rowid is not None or skip > 0
+        next_after = prev_before = None
+        if has_next:
+            next_after = last_examined if truncated and not descending else (results[-1]['line'] if results else None)
+        if has_prev:
+            prev_before = last_examined if truncated and descending else (results[0]['line'] if results else None)
+        return {
+            'results': results,
+            'total': None,
+            'skip': skip,
+            'limit': limit,
+            'next_after_rowid': next_after,
+            'prev_before_rowid': prev_before,
+            'examined': examined,
+            'truncated': truncated,
+        }
+
+    def _query_sql(self, query: dict) -> tuple[str, list]:
+        """Internal: FROM/WHERE clause (table alias l) and parameters for a find() query."""
         conditions = []
         params: list[Any] = []
         use_fts = False
         fts_term = ''
 
+
         level_filter = query.get('level')
         if level_filter:
             if isinstance(level_filter, dict) and '$in' in level_filter:
@@ -178,59 +931,224 @@ class LogStore:
             conditions.append("l.timestamp <= ?")
             params.append(ts_lte)
 
+        for name in self.search_fields:
+            value = query.get(name)
+            if value is None:
+                continue
+            column = f"l.f_{name}"
+            if isinstance(value, dict) and '$in' in value:
+                placeholders = ','.join('?' for _ in value['$in'])
+                conditions.append(f"{column} IN ({placeholders})")
+                params.extend(str(v) for v in value['$in'])
+            elif isinstance(value, dict) and '$exists' in value:
+                conditions.append(f"{column} IS {'NOT ' if value['$exists'] else ''}NULL")
+            else:
+                conditions.append(f"{column} = ?")
+                params.append(str(value))
+
         where_clause = (" AND ".join(conditions)) if conditions else "1=1"
 
+        tables = "log_lines l"
+        match_conditions = []
+        match_params = []
+        trigram_query = self._trigram_query(query.get('$regex'))
+        if trigram_query:
+            # The trigram index drives the scan (see _find_regex)
+            tables = "log_trigram g JOIN log_lines l ON l.rowid = g.rowid"
+            match_conditions.append("log_trigram MATCH ?")
+            match_params.append(trigram_query)
         if use_fts:
-            count_sql = f"""
-                SELECT COUNT(*) FROM log_lines l
-                JOIN log_fts f ON l.rowid = f.rowid
-                WHERE log_fts MATCH ? AND {where_clause}
-            """
-            data_sql = f"""
-                SELECT l.rowid, l.timestamp, l.level, l.message, l.doc
-                FROM log_lines l
-                JOIN log_fts f ON l.rowid = f.rowid
-                WHERE log_fts MATCH ? AND {where_clause}
-                ORDER BY l.rowid
-                LIMIT ? OFFSET ?
-            """
-            count_params = [fts_term] + params
-            data_params = [fts_term] + params + [limit, skip]
-        else:
-            count_sql = f"SELECT COUNT(*) FROM log_lines l WHERE {where_clause}"
-            data_sql = f"""
-                SELECT l.rowid, l.timestamp, l.level, l.message, l.doc
-                FROM log_lines l WHERE {where_clause}
-                ORDER BY l.rowid
-                LIMIT ? OFFSET ?
-            """
-            count_params = params
-            data_params = params + [limit, skip]
-
-        total = self._conn.execute(count_sql, count_params).fetchone()[0]
-        rows = self._conn.execute(data_sql, data_params).fetchall()
+            tables += " JOIN log_fts f ON l.rowid = f.rowid"
+            match_conditions.append("log_fts MATCH ?")
+            match_params.append(fts_term)
+        from_clause = f"FROM {tables} WHERE {' AND '.join(match_conditions + [where_clause])}"
+        return from_clause, match_params + params
 
-        results = []
-        for row in rows:
-            results.append({
-                'line': row[0],
-                'timestamp': row[1],
-                'level': row[2],
-                'message': row[3],
-                'raw': row[4]
-            })
+    def _trigram_query(self, pattern: Optional[str]) -> Optional[str]:
+        """Internal: log_trigram MATCH prefilter for a $regex pattern, if the store can use one."""
+        if not pattern or not self._has_trigram_index:
+            return None
+        return regex_trigram_query(pattern)
+
+    def _check_cache_version(self):
+        """
+        Internal: empty the query cache if the store changed since it was filled.
+
+        PRAGMA data_version detects commits from other connections (the
+        writer thread, an ingest still running); commits on this connection
+        bump _data_generation instead.
+        """
+        version = (self._conn.execute("PRAGMA data_version").fetchone()[0], self._data_generation)
+        with self._cache_lock:
+            if version != self._cache_version:
+                self._cache.clear()
+                self._cache_version = version
 
+    def _cache_get(self, key: tuple) -> Any:
+        with self._cache_lock:
+            value = self._cache.get(key)
+            if value is None:
+                self.cache_misses += 1
+            else:
+                self._cache.move_to_end(key)
+                self.cache_hits += 1
+            hits, misses = self.cache_hits, self.cache_misses
+        logger.debug(f"Log store query cache {'miss' if value is None else 'hit'} for {key[0]} "
+                     f"({hits} hits, {misses} misses)")
+        if (hits + misses) % self.CACHE_LOG_INTERVAL == 0:
+            logger.info(f"Log store query cache for {os.path.basename(self.db_path)}: "
+                        f"{hits} hits, {misses} misses")
+        return value
+
+    def _cache_put(self, key: tuple, value: Any):
+        if self.query_cache_size <= 0:
+            return
+        with self._cache_lock:
+            self._cache[key] = value
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.query_cache_size:
+                self._cache.popitem(last=False)
+
+    def _cached_total(self, conn: sqlite3.Connection, from_clause: str, params: list) -> int:
+        """Internal: COUNT(*) for a _query_sql() clause, through the query cache."""
+        key = ('total', from_clause, tuple(params))
+        total = self._cache_get(key)
+        if total is None:
+            total = conn.execute(f"SELECT COUNT(*) {from_clause}", params).fetchone()[0]
+            self._cache_put(key, total)
+        return total
+
+    def count(self, query: Optional[dict] = None) -> int:
+        """
+        Return the count of matching documents.
+
+        Raises:
+            ValueError: for a $regex query, which can only be paged with find()
+        """
+        if query and query.get('$regex'):
+            raise ValueError("$regex queries cannot be counted")
+        from_clause, params = self._query_sql(query or {})
+        self._check_cache_version()
+        with self._reader() as conn:
+            return self._cached_total(conn, from_clause, params)
+
+    def histogram(self, query: Optional[dict] = None, bucket_seconds: Optional[int] = None) -> dict:
+        """
+        Count the lines matching a find() query per level and time bucket.
+
+        Bucket times are the log's wall-clock seconds (UTC offsets are
+        ignored, as in the charts), aligned to multiples of bucket_seconds;
+        timestamp_gte/timestamp_lte select whole seconds. Queries that
+        filter only on level and timestamps are answered from
+        log_level_counts; others run one aggregate over the matching lines.
+
+        Args:
+            query: find() query dict
+            bucket_seconds: bucket width; by default the smallest of
+                HISTOGRAM_BUCKET_SECONDS that spans the store (or the
+                query's timestamp range) in HISTOGRAM_TARGET_BUCKETS buckets
+
+        Returns:
+            dict with keys: bucket_seconds, levels (sorted), total and
+            buckets, one {'start': 'YYYY-MM-DDTHH:MM:SS', 'counts': {level: n}}
+            per bucket from the first to the last, including empty ones
+
+        Raises:
+            ValueError: bucket_seconds < 1, more than HISTOGRAM_MAX_BUCKETS
+                buckets, or a $regex query
+        """
+        if query is None:
+            query = {}
+        if bucket_seconds is not None and bucket_seconds < 1:
+            raise ValueError("bucket_seconds must be at least 1")
+        if query.get('$regex'):
+            raise ValueError("$regex queries have no histogram")
+
+        with self._reader() as conn:
+            return self._histogram(conn, query, bucket_seconds)
+
+    def _histogram(self, conn: sqlite3.Connection, query: dict, bucket_seconds: Optional[int]) -> dict:
+        """Internal: histogram() on a reader connection."""
+        lo, hi = self._time_span(conn)
+        if lo is not None:
+            lo = max(lo, self._to_second(conn, query.get('timestamp_gte')) or lo)
+            hi = min(hi, self._to_second(conn, query.get('timestamp_lte')) or hi)
+        if lo is None or lo > hi:
+            return {'bucket_seconds': bucket_seconds, 'levels': [], 'total': 0, 'buckets': []}
+
+        if bucket_seconds is None:
+            span = hi - lo + 1
+            bucket_seconds = next(
+                (size for size in self.HISTOGRAM_BUCKET_SECONDS if span <= size * self.HISTOGRAM_TARGET_BUCKETS),
+                -(-span // (86400 * self.HISTOGRAM_TARGET_BUCKETS)) * 86400
+            )
+        first_bucket, last_bucket = lo // bucket_seconds, hi // bucket_seconds
+        if last_bucket - first_bucket + 1 > self.HISTOGRAM_MAX_BUCKETS:
+            raise ValueError(
+                f"bucket_seconds={bucket_seconds} gives {last_bucket - first_bucket + 1} buckets; "
+                f"the maximum is {self.HISTOGRAM_MAX_BUCKETS}"
+            )
+
+        source, params = self._histogram_source(query)
+        rows = conn.execute(
+            f"""
+            SELECT second / ? AS bucket, level, SUM(n) FROM ({source})
+            WHERE second BETWEEN ? AND ?
+            GROUP BY bucket, level
+            """,
+            [bucket_seconds] + params + [lo, hi]
+        ).fetchall()
+
+        counts: dict[int, dict[str, int]] = {}
+        for bucket, level, n in rows:
+            counts.setdefault(bucket, {})[level] = n
+        buckets = []
+        for bucket in range(first_bucket, last_bucket + 1):
+            start = datetime.fromtimestamp(bucket * bucket_seconds, timezone.utc)
+            buckets.append({'start': start.strftime('%Y-%m-%dT%H:%M:%S'), 'counts': counts.get(bucket, {})})
         return {
-            'results': results,
-            'total': total,
-            'skip': skip,
-            'limit': limit
+            'bucket_seconds': bucket_seconds,
+            'levels': sorted({level for _, level, _ in rows}),
+            'total': sum(n for _, _, n in rows),
+            'buckets': buckets,
         }
 
-    def count(self, query: Optional[dict] = None) -> int:
-        """Return the count of matching documents."""
-        result = self.find(query, skip=0, limit=1)
-        return result['total']
+    def _time_span(self, conn: sqlite3.Connection) -> tuple[Optional[int], Optional[int]]:
+        """Internal: first and last second of log time in the store."""
+        if self._has_level_counts:
+            return conn.execute("SELECT MIN(second), MAX(second) FROM log_level_counts").fetchone()
+        return conn.execute(
+            f"SELECT {_SECOND_SQL.format('MIN(timestamp)')}, {_SECOND_SQL.format('MAX(timestamp)')} "
+            f"FROM log_lines WHERE timestamp != ''"
+        ).fetchone()
+
+    def _to_second(self, conn: sqlite3.Connection, timestamp: Optional[str]) -> Optional[int]:
+        """Internal: _SECOND_SQL of a timestamp string; None if it is empty or invalid."""
+        if not timestamp:
+            return None
+        return conn.execute(f"SELECT {_SECOND_SQL.format('?')}", (timestamp,)).fetchone()[0]
+
+    def _histogram_source(self, query: dict) -> tuple[str, list]:
+        """Internal: SELECT of (second, level, n) rows for histogram(), and its parameters."""
+        filters = {key for key, value in query.items() if value}
+        if not self._has_level_counts or not filters <= {'level', 'timestamp_gte', 'timestamp_lte'}:
+            # Time bounds are applied by histogram() at second resolution
+            lines_query = {k: v for k, v in query.items() if k not in ('timestamp_gte', 'timestamp_lte')}
+            from_clause, params = self._query_sql(lines_query)
+            second = _SECOND_SQL.format('l.timestamp')
+            return f"SELECT {second} AS second, l.level AS level, 1 AS n {from_clause}", params
+
+        conditions = []
+        params: list[Any] = []
+        level_filter = query.get('level')
+        if isinstance(level_filter, dict) and '$in' in level_filter:
+            conditions.append(f"level IN ({','.join('?' for _ in level_filter['$in'])})")
+            params.extend(level_filter['$in'])
+        elif isinstance(level_filter, str) and level_filter:
+            conditions.append("level = ?")
+            params.append(level_filter)
+        where_clause = (" AND ".join(conditions)) if conditions else "1=1"
+        return f"SELECT second, level, count AS n FROM log_level_counts WHERE {where_clause}", params
 
     def fetch_latest_raw_lines(self, limit: int) -> list[str]:
         """
@@ -243,43 +1161,54 @@ class LogStore:
         if limit <= 0:
             return []
         self.flush()
-        cur = self._conn.execute(
-            """
-            SELECT doc FROM log_lines
-            WHERE timestamp != ''
-            ORDER BY timestamp DESC, rowid DESC
-            LIMIT ?
-            """,
-            (limit,),
-        )
-        rows = [r[0] for r in cur.fetchall()]
-        rows.reverse()
-        if rows:
-            return rows
-        cur = self._conn.execute(
-            "SELECT doc FROM log_lines ORDER BY rowid DESC LIMIT ?",
-            (limit,),
-        )
-        rows = [r[0] for r in cur.fetchall()]
-        rows.reverse()
-        return rows
+        with self._reader() as conn:
+            cur = conn.execute(
+                """
+                SELECT rowid, doc FROM log_lines
+                WHERE timestamp != ''
+                ORDER BY timestamp DESC, rowid DESC
+                LIMIT ?
+                """,
+                (limit,),
+            )
+            rows = cur.fetchall()
+            if not rows:
+                cur = conn.execute(
+                    "SELECT rowid, doc FROM log_lines ORDER BY rowid DESC LIMIT ?",
+                    (limit,),
+                )
+                rows = cur.fetchall()
+            rows.reverse()
+            return self._resolve_docs(conn, rows)
 
     @property
     def total_documents(self) -> int:
         """Total number of documents in the store."""
-        row = self._conn.execute("SELECT COUNT(*) FROM log_lines").fetchone()
+        with self._reader() as conn:
+            row = conn.execute("SELECT COUNT(*) FROM log_lines").fetchone()
         return row[0] if row else 0
 
     def close(self):
         """Close the database connection."""
+        if self.cache_hits or self.cache_misses:
+            logger.info(f"Log store query cache for {os.path.basename(self.db_path)}: "
+                        f"{self.cache_hits} hits, {self.cache_misses} misses")
+            self.cache_hits = self.cache_misses = 0
         if self._conn:
-            self.flush()
-            self._conn.close()
-            self._conn = None
+            try:
+                self.flush()
+            finally:
+                self._close_readers()
+                self._conn.close()
+                self._conn = None
 
     def delete(self):
         """Close connection and delete the database file."""
-        self.close()
+        try:
+            self.close()
+        except Exception as e:
+            # A store discarded after a failed load may fail its final flush
+            logger.warning(f"Error closing log store {self.db_path} before deleting it: {e}")
         try:
             if os.path.exists(self.db_path):
                 os.remove(self.db_path)
@@ -10,7 +10,10 @@ import threading
 import time
 from typing import Optional
 
-from .app_config import LOG_STORE_DIR, LOG_STORE_MAX_AGE_HOURS
+from .app_config import (
+    LOG_QUERY_CACHE_SIZE, LOG_REGEX_MAX_ROWS, LOG_REGEX_TIME_LIMIT_MS, LOG_STORE_DIR,
+    LOG_STORE_MAX_AGE_HOURS, LOG_STORE_READ_CONNECTIONS,
+)
 from .log_store import LogStore
 from .store_paths import validate_store_id
 
@@ -48,6 +51,10 @@ class LogStoreRegistry:
         """
         Return a cached LogStore connection for the given store_id.
 
+        The LogStore runs queries on a pool of up to
+        LOG_STORE_READ_CONNECTIONS read-only connections, so concurrent
+        searches on the same store do not serialize.
+
         Returns None if the store_id is not registered or the DB file
         no longer exists. The returned LogStore is owned by the registry;
         callers must NOT close it.
@@ -63,7 +70,13 @@ class LogStoreRegistry:
             if not os.path.exists(db_path):
                 return None
             if entry['store'] is None:
-                entry['store'] = LogStore(db_path)
+                entry['store'] = LogStore(
+                    db_path,
+                    query_cache_size=LOG_QUERY_CACHE_SIZE,
+                    read_connections=LOG_STORE_READ_CONNECTIONS,
+                    regex_max_rows=LOG_REGEX_MAX_ROWS,
+                    regex_time_limit=LOG_REGEX_TIME_LIMIT_MS / 1000,
+                )
             return entry['store']
 
     def remove(self, store_id: str):
@@ -2,33 +2,41 @@ import plotly.graph_objects as go
 from plotly.utils import PlotlyJSONEncoder
 from plotly.subplots import make_subplots
 from tqdm import tqdm
-from flask import request, render_template
+from flask import request, render_template, redirect, url_for
 import gzip
 import json
 import uuid as uuid_mod
 import zipfile
 import tarfile
-from collections import deque
 from datetime import datetime, timezone
 from dateutil import parser
 import re
 import logging
 import os
 import mimetypes
+from werkzeug.sansio.multipart import Epilogue, Field, File, MultipartDecoder, NeedData
 from werkzeug.utils import secure_filename
-from .utils import format_byte_size, convert_bytes
+from .utils import format_byte_size, convert_bytes, format_bytes_compact, peak_rss_bytes
 from .app_config import (
     MAX_FILE_SIZE, ALLOWED_EXTENSIONS, ALLOWED_MIME_TYPES,
     load_error_patterns, classify_file_type,
-    LOG_VIEWER_MAX_LINES,
+    LOG_VIEWER_MAX_LINES, LOG_STORE_DIR, PARSE_WORKERS, INGEST_MEMORY_BUDGET_MB, MAX_ERROR_CAPTURES,
+    ARCHIVE_MEMBER_WORKERS, DECOMPRESS_PIPELINE,
+    INGEST_JOB_WORKERS, STREAM_UPLOADS, INCREMENTAL_LOG_INDEX, LOG_STORE_WRITER_QUEUE,
+    LOG_STORE_DOC_BLOCK_ROWS, LOG_STORE_FIELDS, LOG_STORE_LOAD_PROFILE, LOG_REGEX_INDEX,
 )
 from .snapshot_store import logstore_path
-from .file_decompressor import decompress_file_classified, is_compressed_mime_type
+from .file_decompressor import MissingDecompressorError, decompress_file_classified, is_compressed_mime_type
 from .otel_metrics import MetricsCollector, create_metrics_plots
 from .plot_theme import apply_mi_theme, section_label_style
+from .log_ingest import LogIngest, resolve_parse_workers
+from .timestamps import parse_log_time
 from .log_store import LogStore
 from .log_store_registry import log_store_registry
+from .record_spill import sort_records_by_time
 from .snapshot_store import save_snapshot
+from .ingest_jobs import ingest_job_manager
+from .upload_stream import StagedUpload, UploadAborted
 
 _DECOMPRESS_ERRORS = (
     ValueError,
@@ -39,6 +47,22 @@ _DECOMPRESS_ERRORS = (
     tarfile.TarError,
 )
 
+# Lines between progress reports to a background ingest job
+PROGRESS_INTERVAL_LINES = 5000
+# Leading bytes of an upload used for MIME type detection
+MIME_SAMPLE_BYTES = 2048
+# Bytes read from the request body per iteration while staging an upload
+UPLOAD_READ_CHUNK_BYTES = 256 * 1024
+
+
+class LogAnalysisError(Exception):
+    """An uploaded file could not be analyzed; shown to the user on the error page."""
+
+    def __init__(self, title: str, message: str):
+        super().__init__(message)
+        self.title = title
+        self.message = message
+
 
 def detect_mime_type(file_sample: bytes, filename: str) -> str:
     """
@@ -51,6 +75,10 @@ def detect_mime_type(file_sample: bytes, filename: str) -> str:
         return 'application/zip'
     if file_sample[:3] == b'BZh':
         return 'application/x-bzip2'
+    if file_sample[:6] == b'\xfd7zXZ\x00':
+        return 'application/x-xz'
+    if file_sample[:4] == b'\x28\xb5\x2f\xfd':
+        return 'application/zstd'
     if len(file_sample) >= 262 and file_sample[257:262] == b'ustar':
         return 'application/x-tar'
 
@@ -149,19 +177,16 @@ def _merge_phase_events(info_lines, in_memory_lines, api_transitions=None):
     return merged
 
 
-def _extract_progress_flag_events(responses):
-    """Record canCommit/canWrite state transitions from sent response progress payloads."""
+def _extract_progress_flag_events(records):
+    """Record canCommit/canWrite state transitions from sent response progress records."""
     events = []
     prev_commit = False
     prev_write = False
-    for response in responses:
-        t = (response.get('time') or '')[:26]
-        if not t:
-            continue
-        try:
-            progress = json.loads(response.get('body', '{}')).get('progress') or {}
-        except (json.JSONDecodeError, TypeError):
+    for record in records:
+        t = record.time[:26]
+        if not t or not record.body_decoded:
             continue
+        progress = record.progress or {}
         can_commit = bool(progress.get('canCommit', False))
         can_write = bool(progress.get('canWrite', False))
         if can_commit != prev_commit:
@@ -178,6 +203,10 @@ def _extract_progress_flag_events(responses):
 def upload_file():
     # Use the centralized logging configuration
     logger = logging.getLogger(__name__)
+
+    # Start parsing while the body is still arriving when a background job can take it
+    if INGEST_JOB_WORKERS > 0 and STREAM_UPLOADS and request.mimetype == 'multipart/form-data':
+        return _stream_upload()
     
     # Check if a file was uploaded
     if 'file' not in request.files:
@@ -198,20 +227,9 @@ def upload_file():
 
     if file:
         # Validate filename and extension
-        filename = secure_filename(file.filename)
-        if not filename:
-            logger.error("Invalid filename")
-            return render_template('error.html',
-                                 error_title="Upload Error",
-                                 error_message="Invalid filename. Please use a valid file name.")
-        
-        # Check file extension
-        file_ext = os.path.splitext(filename)[1].lower()
-        if file_ext not in ALLOWED_EXTENSIONS:
-            logger.error(f"Invalid file extension: {file_ext}. Allowed: {ALLOWED_EXTENSIONS}")
-            return render_template('error.html',
-                                 error_title="Invalid File Type",
-                                 error_message=f"File type '{file_ext}' is not allowed. Allowed types: {', '.join(ALLOWED_EXTENSIONS)}")
+        filename, error = _check_upload_filename(file.filename)
+        if error:
+            return render_template('error.html', **error)
         
         # Check file size (Flask's request.files doesn't have content_length, so we need to read and check)
         file.seek(0, 2)  # Seek to end of file
@@ -228,1329 +246,1465 @@ def upload_file():
         
         # Detect MIME type using magic bytes and file extension (no libmagic needed)
         file.seek(0)
-        file_sample = file.read(2048)
-        file_mime_type = detect_mime_type(file_sample, filename)
+        file_sample = file.read(MIME_SAMPLE_BYTES)
         file.seek(0)
+        file_mime_type, error = _check_upload_type(file_sample, filename)
+        if error:
+            return render_template('error.html', **error)
+        
+        logger.info(f"File validation passed: {filename} ({file_size} bytes, MIME: {file_mime_type})")
 
-        logger.info(f"Detected MIME type: {file_mime_type}")
+        if INGEST_JOB_WORKERS > 0:
+            # Analyze in a background job; the browser follows its progress
+            upload = StagedUpload(LOG_STORE_DIR)
+            try:
+                while True:
+                    chunk = file.read(UPLOAD_READ_CHUNK_BYTES)
+                    if not chunk:
+                        break
+                    upload.write(chunk)
+            except Exception:
+                upload.remove()
+                raise
+            upload.finish()
+            job = _submit_ingest_job(upload, filename, file_size, file_mime_type)
+            return redirect(url_for('logs.job_result', job_id=job.job_id))
 
-        if file_mime_type not in ALLOWED_MIME_TYPES:
-            logger.error(f"Invalid MIME type: {file_mime_type}. Allowed: {ALLOWED_MIME_TYPES}")
-            return render_template('error.html',
-                                 error_title="Invalid File Type",
-                                 error_message=f"File MIME type '{file_mime_type}' is not allowed. Only JSON/text files are accepted. Detected type: {file_mime_type}")
-        
-        logger.info(f"File validation passed: {filename} ({file_size} bytes, {file_ext}, MIME: {file_mime_type})")
-        # Optimized single-pass log parsing with streaming approach
-        logger.info("Starting optimized log parsing - single pass through file")
-        
-        # Pre-compile all regex patterns once
-        patterns = {
-            'replication_progress': re.compile(r"Replication progress", re.IGNORECASE),
-            'version_info': re.compile(r"Version info", re.IGNORECASE),
-            'operation_stats': re.compile(r"Operation duration stats", re.IGNORECASE),
-            'sent_response': re.compile(r"sent response", re.IGNORECASE),
-            'phase_transitions': re.compile(r"Starting initializing collections and indexes phase|Starting initializing partitions phase|Starting collection copy phase|Starting change event application phase|Commit handler called", re.IGNORECASE),
-            'phase_in_memory': re.compile(r"Updating the in-memory phase from", re.IGNORECASE),
-            'mongosync_options': re.compile(r"Mongosync Options", re.IGNORECASE),
-            'hidden_flags': re.compile(r"Mongosync HiddenFlags", re.IGNORECASE),
-            'crud_events_rate': re.compile(r"Average Source CRUD events rate", re.IGNORECASE),
-            'partition_copy_progress': re.compile(r"Completed writing \d+ / \d+ partitions to destination cluster", re.IGNORECASE),
-            'natural_order_collections': re.compile(r"Selected for natural order collection reads", re.IGNORECASE),
-            'received_request': re.compile(r"Received request", re.IGNORECASE),
-            'partition_single_created': re.compile(r"Creating a single partition for whole collection", re.IGNORECASE),
-            'partition_multi_created': re.compile(r"Creating initial partitions for non-capped collection", re.IGNORECASE),
-            'partition_sampling_info': re.compile(r"Pre-sampling information", re.IGNORECASE),
-            'partition_persisted_after_sampling': re.compile(r"Persisted a new partition after sampling", re.IGNORECASE),
-        }
-        
-        # Load error patterns from external file
-        error_patterns_config = load_error_patterns()
-        error_patterns = [
-            {
-                'pattern': re.compile(ep['pattern'], re.IGNORECASE),
-                'friendly_name': ep['friendly_name'],
-                'recommendation': ep.get('recommendation', ''),
-            }
-            for ep in error_patterns_config
-        ]
+        try:
+            _, template_data = analyze_log_file(file, filename, file_size, file_mime_type)
+        except LogAnalysisError as e:
+            return render_template('error.html', error_title=e.title, error_message=e.message)
+        return render_template('upload_results.html', **template_data)
+
+
+def _check_upload_filename(raw_filename):
+    """Return (sanitized filename, None), or (None, error page kwargs) if it is not accepted."""
+    logger = logging.getLogger(__name__)
+    filename = secure_filename(raw_filename)
+    if not filename:
+        logger.error("Invalid filename")
+        return None, {'error_title': "Upload Error",
+                      'error_message': "Invalid filename. Please use a valid file name."}
+
+    # Check file extension
+    file_ext = os.path.splitext(filename)[1].lower()
+    if file_ext not in ALLOWED_EXTENSIONS:
+        logger.error(f"Invalid file extension: {file_ext}. Allowed: {ALLOWED_EXTENSIONS}")
+        return None, {'error_title': "Invalid File Type",
+                      'error_message': f"File type '{file_ext}' is not allowed. Allowed types: {', '.join(ALLOWED_EXTENSIONS)}"}
+    return filename, None
+
+
+def _check_upload_type(file_sample, filename):
+    """Return (MIME type, None), or (None, error page kwargs) if the type is not accepted."""
+    logger = logging.getLogger(__name__)
+    file_mime_type = detect_mime_type(file_sample, filename)
+    logger.info(f"Detected MIME type: {file_mime_type}")
+
+    if file_mime_type not in ALLOWED_MIME_TYPES:
+        logger.error(f"Invalid MIME type: {file_mime_type}. Allowed: {ALLOWED_MIME_TYPES}")
+        return None, {'error_title': "Invalid File Type",
+                      'error_message': f"File MIME type '{file_mime_type}' is not allowed. Only JSON/text files are accepted. Detected type: {file_mime_type}"}
+    return file_mime_type, None
+
+
+def _stream_upload():
+    """
+    Stage a multipart upload and start its ingest job while the body is
+    still arriving, enforcing the file size limit as bytes flow in.
+    """
+    logger = logging.getLogger(__name__)
+    boundary = request.mimetype_params.get('boundary', '')
+    if not boundary:
+        logger.error("Multipart upload without a boundary")
+        return render_template('error.html',
+                             error_title="Upload Error",
+                             error_message="The upload request is malformed. Please try again.")
+
+    decoder = MultipartDecoder(boundary.encode('latin-1'))
+    filename = None
+    in_file = False
+    head = bytearray()  # first bytes of the file, for MIME detection
+    received = 0
+    upload = None
+    job = None
+    event = None
+    try:
+        while not isinstance(event, Epilogue):
+            chunk = request.stream.read(UPLOAD_READ_CHUNK_BYTES)
+            decoder.receive_data(chunk or None)
+            event = decoder.next_event()
+            while not isinstance(event, (NeedData, Epilogue)):
+                if isinstance(event, (File, Field)):
+                    in_file = isinstance(event, File) and event.name == 'file' and filename is None
+                    if in_file:
+                        if event.filename == '':
+                            logger.error("Empty file without a filename")
+                            return render_template('error.html',
+                                                 error_title="Upload Error",
+                                                 error_message="Please select a file to upload.")
+                        filename, error = _check_upload_filename(event.filename)
+                        if error:
+                            return render_template('error.html', **error)
+                elif in_file:
+                    received += len(event.data)
+                    if received > MAX_FILE_SIZE:
+                        logger.error(f"File too large: more than {MAX_FILE_SIZE} bytes received")
+                        max_size_mb = MAX_FILE_SIZE / (1024 * 1024)
+                        error = {'error_title': "File Too Large",
+                                 'error_message': f"File size exceeds maximum allowed size ({max_size_mb:.1f} MB)."}
+                        if upload is not None:
+                            upload.abort(error['error_title'], error['error_message'])
+                        return render_template('error.html', **error)
+                    if upload is not None:
+                        upload.write(event.data)
+                    else:
+                        head += event.data
+                        if len(head) >= MIME_SAMPLE_BYTES or not event.more_data:
+                            file_mime_type, error = _check_upload_type(bytes(head[:MIME_SAMPLE_BYTES]), filename)
+                            if error:
+                                return render_template('error.html', **error)
+                            logger.info(f"File validation passed: {filename} (streamed, MIME: {file_mime_type})")
+                            upload = StagedUpload(LOG_STORE_DIR)
+                            upload.write(bytes(head))
+                            job = _submit_ingest_job(upload, filename, None, file_mime_type,
+                                                     expected_size=request.content_length or 0)
+                    if not event.more_data:
+                        in_file = False
+                event = decoder.next_event()
+    except ValueError as e:
+        # Raised by the multipart decoder for a truncated or malformed body
+        logger.error(f"Malformed multipart upload: {e}")
+        message = "The upload was interrupted or malformed. Please try again."
+        if upload is not None:
+            upload.abort("Upload Error", message)
+        return render_template('error.html', error_title="Upload Error", error_message=message)
+    except Exception:
+        if upload is not None:
+            upload.abort("Upload Error", "The upload was interrupted before the whole file was received.")
+        raise
+
+    if job is None:
+        logger.error("No file was uploaded")
+        return render_template('error.html',
+                             error_title="Upload Error",
+                             error_message="No file was selected for upload.")
+    upload.finish()
+    logger.info(f"Upload of {filename} complete: {upload.size} bytes")
+    return redirect(url_for('logs.job_result', job_id=job.job_id))
+
+
+def _discard_log_store(log_store, store_id):
+    """Delete an upload's log store and unregister it if it was registered."""
+    log_store.delete()
+    log_store_registry.remove(store_id)
+
+
+def _stream_position(file):
+    """Bytes consumed from the uploaded (possibly compressed) file, or None."""
+    try:
+        return file.tell()
+    except (OSError, ValueError):
+        return None
+
+
+def _submit_ingest_job(upload, filename, file_size, file_mime_type, expected_size=0):
+    """
+    Queue background analysis of a staged upload. file_size is None while
+    the upload is still arriving; expected_size then sizes the progress bar.
+    """
+    def run(job):
+        try:
+            with upload.open_reader() as reader:
+                snapshot_id, template_data = analyze_log_file(
+                    reader, filename, file_size, file_mime_type, progress=job
+                )
+        except (LogAnalysisError, UploadAborted) as e:
+            job.fail(e.title, e.message)
+            return
+        finally:
+            upload.remove()
+        job.finish(snapshot_id, template_data)
+
+    return ingest_job_manager.submit(filename, file_size if file_size is not None else expected_size, run)
+
+
+def analyze_log_file(file, filename, file_size, file_mime_type, progress=None):
+    """
+    Parse a validated upload and build the results page data.
+
+    Args:
+        file: binary file object positioned anywhere (it is rewound)
+        filename: sanitized upload filename, used for classification
+        file_size: size of the upload in bytes, or None for a staged
+            upload reader whose body is still arriving
+        file_mime_type: MIME type detected by detect_mime_type()
+        progress: optional IngestJob that receives phase and line progress
+
+    Returns:
+        (snapshot_id, template_data); snapshot_id is '' if the snapshot
+        could not be saved
+
+    Raises:
+        LogAnalysisError: the file could not be decompressed or holds
+            no mongosync data
+        UploadAborted: a streamed upload ended before it was complete
+    """
+    logger = logging.getLogger(__name__)
+
+    # Optimized single-pass log parsing with streaming approach
+    if progress is not None:
+        progress.update(phase='parsing')
+    logger.info("Starting optimized log parsing - single pass through file")
+    
+    # Initialize metrics collector for prometheus metrics
+    metrics_collector = MetricsCollector()
+    
+    # Initialize log viewer: SQLite store for full-text search
+    store_id = str(uuid_mod.uuid4())
+    db_path = logstore_path(store_id)
+    log_store = LogStore(db_path, incremental_index=INCREMENTAL_LOG_INDEX,
+                         writer_queue_batches=LOG_STORE_WRITER_QUEUE,
+                         doc_block_rows=LOG_STORE_DOC_BLOCK_ROWS, fields=LOG_STORE_FIELDS,
+                         load_profile=LOG_STORE_LOAD_PROFILE, regex_index=LOG_REGEX_INDEX)
+    if log_store.incremental_index:
+        # Rows are searchable as soon as their batch is written
+        log_store_registry.register(store_id, db_path)
+        if progress is not None:
+            progress.update(log_store_id=store_id)
+
+    # Log line classifier (inline or parallel, see MI_PARSE_WORKERS);
+    # also keeps the log viewer tail buffer. With MI_INGEST_MEMORY_MB,
+    # growing categories spill to the log store.
+    ingest = LogIngest(
+        load_error_patterns(),
+        log_store,
+        LOG_VIEWER_MAX_LINES,
+        workers=PARSE_WORKERS,
+        max_error_captures=MAX_ERROR_CAPTURES,
+        memory_budget_bytes=INGEST_MEMORY_BUDGET_MB * 1024 * 1024,
+    )
+    
+    # Single pass through the file with streaming
+    line_count = 0
+    logs_line_count = 0
+    metrics_line_count = 0
+
+    # Reset file pointer to beginning
+    file.seek(0)
+    
+    try:
+        # Determine if file is compressed and get appropriate iterator
+        # Use classified decompressor to track file types from archives
+        if is_compressed_mime_type(file_mime_type):
+            logger.info(f"Decompressing {file_mime_type} file before processing (with classification)")
+            file_iterator = decompress_file_classified(
+                file, file_mime_type, filename,
+                member_workers=resolve_parse_workers(ARCHIVE_MEMBER_WORKERS),
+                pipelined=DECOMPRESS_PIPELINE,
+            )
+            use_classified = True
+        else:
+            # For non-compressed files, classify by filename
+            file_type = classify_file_type(filename)
+            if file_type is None:
+                file_type = 'logs'
+            logger.info(f"Non-compressed file classified as: {file_type}")
+            file_iterator = file
+            use_classified = False
+    
+        for item in tqdm(file_iterator, desc="Processing log file"):
+            line_count += 1
+            if progress is not None and line_count % PROGRESS_INTERVAL_LINES == 0:
+                progress.update(bytes_read=_stream_position(file), lines=line_count)
         
-        # Initialize result containers for logs
-        data = []
-        version_info_list = []
-        mongosync_ops_stats = []
-        mongosync_sent_response = []
-        phase_transitions_json = []
-        phase_in_memory_json = []
-        mongosync_opts_list = []
-        mongosync_hiddenflags = []
-        mongosync_crud_rate = []
-        mongosync_partition_progress = []
-        matched_errors = []
-        natural_order_collections = []
-        mongosync_start_options = []
-        partition_single_created = []
-        partition_multi_created = []
-        partition_sampling_info = []
-        partition_persisted_after_sampling = []
-        verifier_dst_lag_items = []
-        verifier_src_lag_items = []
+            # Handle classified vs non-classified iterators
+            if use_classified:
+                line, current_file_type = item
+            else:
+                line = item
+                current_file_type = file_type
         
-        # Initialize metrics collector for prometheus metrics
-        metrics_collector = MetricsCollector()
+            # Handle both bytes and string input (decompressed files return bytes)
+            if isinstance(line, bytes):
+                line = line.decode('utf-8', errors='replace')
+            line = line.strip()
         
-        # Initialize log viewer: tail buffer + SQLite store for full-text search
-        raw_log_tail = deque(maxlen=LOG_VIEWER_MAX_LINES)
-        store_id = str(uuid_mod.uuid4())
-        db_path = logstore_path(store_id)
-        log_store = LogStore(db_path)
+            if not line:  # Skip empty lines
+                continue
         
-        # Single pass through the file with streaming
-        line_count = 0
-        logs_line_count = 0
-        metrics_line_count = 0
-        invalid_json_count = 0
-
-        # Reset file pointer to beginning
-        file.seek(0)
+            # Skip lines that don't look like JSON objects (handles trailing garbage from decompression)
+            if not line.startswith('{'):
+                continue
         
-        try:
-            # Determine if file is compressed and get appropriate iterator
-            # Use classified decompressor to track file types from archives
-            if is_compressed_mime_type(file_mime_type):
-                logger.info(f"Decompressing {file_mime_type} file before processing (with classification)")
-                file_iterator = decompress_file_classified(file, file_mime_type, filename)
-                use_classified = True
+            # Route to appropriate parser based on file type
+            if current_file_type == 'metrics':
+                # Process as Prometheus metrics
+                metrics_line_count += 1
+                metrics_collector.process_line(line)
+                continue
+            elif current_file_type == 'logs':
+                logs_line_count += 1
             else:
-                # For non-compressed files, classify by filename
-                file_type = classify_file_type(filename)
-                if file_type is None:
-                    file_type = 'logs'
-                logger.info(f"Non-compressed file classified as: {file_type}")
-                file_iterator = file
-                use_classified = False
-        
-            for item in tqdm(file_iterator, desc="Processing log file"):
-                line_count += 1
-            
-                # Handle classified vs non-classified iterators
-                if use_classified:
-                    line, current_file_type = item
-                else:
-                    line = item
-                    current_file_type = file_type
-            
-                # Handle both bytes and string input (decompressed files return bytes)
-                if isinstance(line, bytes):
-                    line = line.decode('utf-8', errors='replace')
-                line = line.strip()
-            
-                if not line:  # Skip empty lines
-                    continue
-            
-                # Skip lines that don't look like JSON objects (handles trailing garbage from decompression)
-                if not line.startswith('{'):
-                    continue
+                continue
             
-                # Route to appropriate parser based on file type
-                if current_file_type == 'metrics':
-                    # Process as Prometheus metrics
-                    metrics_line_count += 1
-                    metrics_collector.process_line(line)
-                    continue
-                elif current_file_type == 'logs':
-                    logs_line_count += 1
-                else:
-                    continue
-                
-                try:
-                    # Parse JSON only once per line (for logs)
-                    json_obj = json.loads(line)
-                    message = json_obj.get('message', '')
-                
-                    # Collect for log viewer: tail buffer + SQLite store
-                    raw_log_tail.append(line)
-                    log_store.insert_line(line, parsed=json_obj)
-                
-                    # Apply all filters to the same parsed object
-                    if patterns['replication_progress'].search(message):
-                        data.append(json_obj)
-                
-                    if patterns['version_info'].search(message):
-                        version_info_list.append(json_obj)
-                
-                    if patterns['operation_stats'].search(message):
-                        mongosync_ops_stats.append(json_obj)
-                
-                    if patterns['sent_response'].search(message):
-                        mongosync_sent_response.append(json_obj)
-                
-                    if patterns['phase_transitions'].search(message):
-                        phase_transitions_json.append(json_obj)
-
-                    if patterns['phase_in_memory'].search(message):
-                        phase_in_memory_json.append(json_obj)
-                
-                    if patterns['mongosync_options'].search(message):
-                        # Filter out time and level fields for options
-                        filtered_obj = {k: v for k, v in json_obj.items() if k not in ('time', 'level')}
-                        mongosync_opts_list.append(filtered_obj)
-                
-                    if patterns['hidden_flags'].search(message):
-                        # Filter out time and level fields for hidden flags
-                        filtered_obj = {k: v for k, v in json_obj.items() if k not in ('time', 'level')}
-                        mongosync_hiddenflags.append(filtered_obj)
-                
-                    if patterns['received_request'].search(message) and json_obj.get('uri') == '/api/v1/start':
-                        try:
-                            body = json.loads(json_obj.get('body', '{}'))
-                            mongosync_start_options.append(body)
-                        except (json.JSONDecodeError, TypeError):
-                            pass
-                
-                    if patterns['crud_events_rate'].search(message):
-                        mongosync_crud_rate.append(json_obj)
-                
-                    if patterns['partition_copy_progress'].search(message):
-                        mongosync_partition_progress.append(json_obj)
-                
-                    reason = json_obj.get('reason', '')
-                    if patterns['natural_order_collections'].search(reason):
-                        db = json_obj.get('database', '')
-                        coll = json_obj.get('collection', '')
-                        if db and coll:
-                            natural_order_collections.append({'database': db, 'collection': coll})
-                
-                    if patterns['partition_single_created'].search(message):
-                        partition_single_created.append(json_obj)
-                
-                    if patterns['partition_multi_created'].search(message):
-                        partition_multi_created.append(json_obj)
-                
-                    if patterns['partition_sampling_info'].search(message):
-                        partition_sampling_info.append(json_obj)
-                
-                    if patterns['partition_persisted_after_sampling'].search(message):
-                        partition_persisted_after_sampling.append(json_obj)
-                
-                    if json_obj.get('verifierDstLagTimeSeconds') is not None and 'time' in json_obj:
-                        verifier_dst_lag_items.append(json_obj)
-                
-                    if json_obj.get('verifierSrcLagTimeSeconds') is not None and 'time' in json_obj:
-                        verifier_src_lag_items.append(json_obj)
-                
-                    # Check for common error patterns
-                    for ep in error_patterns:
-                        if ep['pattern'].search(message):
-                            matched_errors.append({
-                                'friendly_name': ep['friendly_name'],
-                                'recommendation': ep['recommendation'],
-                                'message': message,
-                                'time': json_obj.get('time', ''),
-                                'level': json_obj.get('level', ''),
-                                'full_log': json.dumps(json_obj, indent=2)
-                            })
-                            break  # Only match first pattern per message
-                    
-                except json.JSONDecodeError as e:
-                    invalid_json_count += 1
-                    if invalid_json_count <= 5:  # Log first 5 errors to avoid spam
-                        logger.warning(f"Invalid JSON on line {line_count}: {e}")
-                    # Only treat as fatal error if this is the first error AND we haven't processed any valid lines
-                    if invalid_json_count == 1 and logs_line_count == 0 and metrics_line_count == 0:
-                        logger.error(f"File appears to contain invalid JSON. First error on line {line_count}: {e}")
-                        return render_template('error.html',
-                                             error_title="Invalid File Format",
-                                             error_message=f"The uploaded file does not contain valid JSON format. Error on line {line_count}: {str(e)}. Please ensure you're uploading a valid mongosync log file in NDJSON format.")
-
-        except _DECOMPRESS_ERRORS as e:
-            logger.error("Decompression failed for %s: %s", filename, e)
-            log_store.delete()
-            return render_template(
-                'error.html',
-                error_title="Decompression Error",
-                error_message=(
-                    f"The uploaded file '{filename}' could not be decompressed. "
-                    "The archive may be corrupt or use an unsupported compression format. "
-                    "Please try re-uploading the file or use an uncompressed mongosync log."
-                ),
-            )
-
-        log_viewer_lines_out = list(raw_log_tail)
-
-        # Finalize log store: flush remaining buffered rows and build FTS index
+            ingest.feed(line, line_count)
+
+        ingest.finish()
+
+        if file_size is None:
+            # Streamed upload: the size is known once the whole body has arrived
+            file_size = file.seek(0, 2)
+            if progress is not None:
+                progress.update(total_bytes=file_size)
+
+    except UploadAborted:
+        _discard_log_store(log_store, store_id)
+        raise
+    except MissingDecompressorError as e:
+        logger.error("Decompression failed for %s: %s", filename, e)
+        _discard_log_store(log_store, store_id)
+        raise LogAnalysisError(
+            "Decompression Error",
+            f"The uploaded file '{filename}' could not be decompressed: {e}.",
+        ) from e
+    except _DECOMPRESS_ERRORS as e:
+        logger.error("Decompression failed for %s: %s", filename, e)
+        _discard_log_store(log_store, store_id)
+        raise LogAnalysisError(
+            "Decompression Error",
+            f"The uploaded file '{filename}' could not be decompressed. "
+            "The archive may be corrupt or use an unsupported compression format. "
+            "Please try re-uploading the file or use an uncompressed mongosync log.",
+        ) from e
+    except BaseException:
+        # Any other failure (store writer, parse pool, spill) must not leave
+        # a half-loaded store on disk or searchable in the registry
+        _discard_log_store(log_store, store_id)
+        raise
+    finally:
+        ingest.close()
+
+    log_viewer_lines_out = list(ingest.raw_log_tail)
+    invalid_json_count = ingest.invalid_json_count
+
+    categories = ingest.categories
+    data = categories['replication_progress']
+    version_info_list = categories['version_info']
+    mongosync_ops_stats = categories['operation_stats']
+    mongosync_sent_response = categories['sent_response']
+    phase_transitions_json = categories['phase_transitions']
+    phase_in_memory_json = categories['phase_in_memory']
+    mongosync_opts_list = categories['mongosync_options']
+    mongosync_hiddenflags = categories['hidden_flags']
+    mongosync_start_options = categories['start_options']
+    mongosync_crud_rate = categories['crud_events_rate']
+    mongosync_partition_progress = categories['partition_copy_progress']
+    natural_order_collections = categories['natural_order_collections']
+    partition_single_created = categories['partition_single_created']
+    partition_multi_created = categories['partition_multi_created']
+    partition_sampling_info = categories['partition_sampling_info']
+    partition_persisted_after_sampling = categories['partition_persisted_after_sampling']
+    verifier_dst_lag_items = categories['verifier_dst_lag']
+    verifier_src_lag_items = categories['verifier_src_lag']
+    matched_errors = categories['matched_errors']
+
+    # Finalize log store: flush remaining buffered rows and build FTS index
+    if progress is not None:
+        progress.update(phase='indexing', bytes_read=file_size, lines=line_count)
+    try:
         log_store.flush()
         if log_store.total_documents > 0:
             log_store.build_fts_index()
+    except BaseException:
+        _discard_log_store(log_store, store_id)
+        raise
+    if log_store.total_documents > 0:
+        if not log_store.incremental_index:
             log_store_registry.register(store_id, db_path)
-            logger.info(f"Log store ready: {log_store.total_documents} documents, store_id={store_id[:8]}...")
-            try:
-                _chron = log_store.fetch_latest_raw_lines(LOG_VIEWER_MAX_LINES)
-                if _chron:
-                    log_viewer_lines_out = _chron
-            except Exception as _e:
-                logger.warning(f"Chronological log viewer tail fetch failed, using stream order: {_e}")
-        else:
-            log_store.delete()
-            store_id = ''
-
-        logger.info(f"Processed {line_count} total lines ({logs_line_count} logs, {metrics_line_count} metrics), found {invalid_json_count} invalid JSON lines")
-        logger.info(f"Found: {len(data)} replication progress, {len(version_info_list)} version info, "
-                    f"{len(mongosync_ops_stats)} operation stats, {len(mongosync_sent_response)} sent responses, "
-                    f"{len(phase_transitions_json)} phase transitions, {len(phase_in_memory_json)} in-memory phase updates, "
-                    f"{len(mongosync_opts_list)} options, "
-                    f"{len(mongosync_hiddenflags)} hidden flags, {len(mongosync_crud_rate)} CRUD rate entries, "
-                    f"{len(mongosync_partition_progress)} partition progress entries, "
-                    f"{len(natural_order_collections)} natural order collections, "
-                    f"{len(matched_errors)} common errors")
-        logger.info(f"Metrics collector: {metrics_collector.metrics_count} metric points from {metrics_collector.line_count} lines")  
-        
-        has_any_log_data = (len(data) > 0 or len(version_info_list) > 0 or len(mongosync_ops_stats) > 0 or
-                            len(mongosync_sent_response) > 0 or len(phase_transitions_json) > 0 or
-                            len(phase_in_memory_json) > 0 or
-                            len(mongosync_partition_progress) > 0 or len(mongosync_crud_rate) > 0)
-        has_any_metrics_data = metrics_collector.metrics_count > 0
-        if not has_any_log_data and not has_any_metrics_data:
-            logger.warning(f"No recognizable mongosync data found in {filename} ({line_count} lines processed)")
-            return render_template('error.html',
-                                 error_title="No Mongosync Data Found",
-                                 error_message=f"The file '{filename}' was processed ({line_count:,} lines) but no recognizable "
-                                               f"mongosync log entries or metrics were found. Please ensure you are uploading a "
-                                               f"valid mongosync log file (NDJSON format with standard mongosync log messages).")
-
-        # Sort log data by timestamp to ensure correct chronological plot ordering
-        # (archives may contain rotated log files in non-chronological order)
-        data.sort(key=lambda x: x.get('time', ''))
-        mongosync_ops_stats.sort(key=lambda x: x.get('time', ''))
-        mongosync_crud_rate.sort(key=lambda x: x.get('time', ''))
-        mongosync_partition_progress.sort(key=lambda x: x.get('time', ''))
-        mongosync_sent_response.sort(key=lambda x: x.get('time', ''))
-        verifier_dst_lag_items.sort(key=lambda x: x.get('time', ''))
-        verifier_src_lag_items.sort(key=lambda x: x.get('time', ''))
-        progress_flag_events = _extract_progress_flag_events(mongosync_sent_response)
-
-        # Aggregate partition initialization data per collection
-        partition_init_data = []
-        if partition_single_created or partition_multi_created or partition_sampling_info or partition_persisted_after_sampling:
-            pi_map = {}  # keyed by (db, coll)
-
-            for item in partition_single_created:
-                db = item.get('database', '')
-                coll = item.get('collection', '')
-                key = (db, coll)
-                if key not in pi_map:
-                    pi_map[key] = {}
-                reason = item.get('reason', '')
-                pi_map[key]['type'] = 'Natural Order' if 'natural order' in reason.lower() else 'Capped'
-                pi_map[key]['reason'] = reason
-                pi_map[key]['partition_count'] = 1
-                pi_map[key]['init_started'] = item.get('time', '')
-                pi_map[key]['init_ended'] = item.get('time', '')
-                pi_map[key].setdefault('sampler', 'N/A')
-                pi_map[key].setdefault('doc_count', None)
-                pi_map[key].setdefault('expected_partition_size', None)
-                pi_map[key].setdefault('ids_sampled', None)
-
-            for item in partition_multi_created:
-                db = item.get('database', '')
-                coll = item.get('collection', '')
-                key = (db, coll)
-                if key not in pi_map:
-                    pi_map[key] = {}
-                pi_map[key]['type'] = 'Sampled (multi-partition)'
-                pi_map[key]['reason'] = 'Index sampled'
-                pi_map[key].setdefault('partition_count', 0)
-                pi_map[key]['init_started'] = item.get('time', '')
-                pi_map[key]['expected_partition_size'] = item.get('expectedSizePerPartition')
-
-            for item in partition_sampling_info:
-                db = item.get('database', '')
-                coll = item.get('collection', '')
-                key = (db, coll)
-                if key not in pi_map:
-                    pi_map[key] = {}
-                pi_map[key]['sampler'] = item.get('sampler', 'N/A')
-                pi_map[key]['doc_count'] = item.get('collectionDocCount')
-                pi_map[key]['ids_sampled'] = item.get('numIDsToSample')
-
-            for item in partition_persisted_after_sampling:
-                coll = item.get('collection', '')
-                p = item.get('partition', {})
-                ns = p.get('partition', {})
-                db = ns.get('db', '')
-                if not coll:
-                    coll = ns.get('coll', '')
-                key = (db, coll)
-                if key not in pi_map:
-                    pi_map[key] = {}
-                pi_map[key]['partition_count'] = pi_map[key].get('partition_count', 0) + 1
-                ts = item.get('time', '')
-                if ts > pi_map[key].get('init_ended', ''):
-                    pi_map[key]['init_ended'] = ts
-
-            for (db, coll), info in sorted(pi_map.items()):
-                started = info.get('init_started', '')
-                ended = info.get('init_ended', started)
-                duration_sec = None
-                if started and ended:
-                    try:
-                        t0 = datetime.strptime(started[:26], "%Y-%m-%dT%H:%M:%S.%f")
-                        t1 = datetime.strptime(ended[:26], "%Y-%m-%dT%H:%M:%S.%f")
-                        duration_sec = round((t1 - t0).total_seconds(), 2)
-                    except (ValueError, TypeError):
-                        pass
-                exp_size = info.get('expected_partition_size')
-                exp_size_display = f"{exp_size / (1024*1024):.0f} MB" if exp_size else 'N/A'
-                partition_init_data.append({
-                    'collection': f"{db}.{coll}",
-                    'type': info.get('type', 'Unknown'),
-                    'reason': info.get('reason', ''),
-                    'partition_count': info.get('partition_count', 0),
-                    'doc_count': info.get('doc_count'),
-                    'expected_partition_size': exp_size_display,
-                    'sampler': info.get('sampler', 'N/A'),
-                    'ids_sampled': info.get('ids_sampled'),
-                    'init_started': started[:26] if started else '',
-                    'init_ended': ended[:26] if ended else '',
-                    'duration_sec': duration_sec,
-                })
-            logger.info(f"Aggregated partition init data for {len(partition_init_data)} collections")
-
-        # Build partition init progress time series (in-progress and completed per collection over time)
-        partition_init_progress_times = []
-        partition_init_progress_in_progress = []
-        partition_init_progress_completed = []
-        if partition_init_data:
-            init_events = []
-            for d in partition_init_data:
-                if d['init_started']:
-                    try:
-                        t0 = datetime.strptime(d['init_started'][:26], "%Y-%m-%dT%H:%M:%S.%f")
-                        init_events.append((t0, 'start'))
-                    except (ValueError, TypeError):
-                        pass
-                if d['init_ended']:
-                    try:
-                        t1 = datetime.strptime(d['init_ended'][:26], "%Y-%m-%dT%H:%M:%S.%f")
-                        init_events.append((t1, 'end'))
-                    except (ValueError, TypeError):
-                        pass
-            if init_events:
-                init_events.sort(key=lambda e: e[0])
-                in_prog = 0
-                done = 0
-                for ts, kind in init_events:
-                    if kind == 'start':
-                        in_prog += 1
-                    else:
-                        in_prog = max(0, in_prog - 1)
-                        done += 1
-                    partition_init_progress_times.append(ts)
-                    partition_init_progress_in_progress.append(in_prog)
-                    partition_init_progress_completed.append(done)
-                logger.info(f"Built partition init progress time series with {len(init_events)} events")
-
-        mongosync_sent_response_body = None
-        for response in mongosync_sent_response:
-            try:  
-                parsed_body = json.loads(response['body'])
-                # Only use this response if it contains 'progress'
-                if 'progress' in parsed_body:
-                    mongosync_sent_response_body = parsed_body  
-            except (json.JSONDecodeError, TypeError):  
-                mongosync_sent_response_body = None  # If parse fails, use None 
-                logger.warning(f"No message 'sent response' found in the logs") 
-
-        # Create a string with all the version information
-        if version_info_list and isinstance(version_info_list[0], dict):  
-            version = version_info_list[0].get('version', 'Unknown')  
-            os_name = version_info_list[0].get('os', 'Unknown')  
-            arch = version_info_list[0].get('arch', 'Unknown')  
-            version_text = f"MongoSync Version: {version}, OS: {os_name}, Arch: {arch}"   
-        else:  
-            version_text = f"MongoSync Version is not available"  
-            logger.error(version_text)  
-            
-
-        logger.info(f"Extracting data")
+        logger.info(f"Log store ready: {log_store.total_documents} documents, store_id={store_id[:8]}...")
+        try:
+            _chron = log_store.fetch_latest_raw_lines(LOG_VIEWER_MAX_LINES)
+            if _chron:
+                log_viewer_lines_out = _chron
+        except Exception as _e:
+            logger.warning(f"Chronological log viewer tail fetch failed, using stream order: {_e}")
+    else:
+        _discard_log_store(log_store, store_id)
+        store_id = ''
+
+    logger.info(f"Processed {line_count} total lines ({logs_line_count} logs, {metrics_line_count} metrics), found {invalid_json_count} invalid JSON lines")
+    logger.info(f"Found: {len(data)} replication progress, {len(version_info_list)} version info, "
+                f"{len(mongosync_ops_stats)} operation stats, {len(mongosync_sent_response)} sent responses, "
+                f"{len(phase_transitions_json)} phase transitions, {len(phase_in_memory_json)} in-memory phase updates, "
+                f"{len(mongosync_opts_list)} options, "
+                f"{len(mongosync_hiddenflags)} hidden flags, {len(mongosync_crud_rate)} CRUD rate entries, "
+                f"{len(mongosync_partition_progress)} partition progress entries, "
+                f"{len(natural_order_collections)} natural order collections, "
+                f"{len(matched_errors)} common errors")
+    logger.info(f"Metrics collector: {metrics_collector.metrics_count} metric points from {metrics_collector.line_count} lines")  
+    
+    has_any_log_data = (len(data) > 0 or len(version_info_list) > 0 or len(mongosync_ops_stats) > 0 or
+                        len(mongosync_sent_response) > 0 or len(phase_transitions_json) > 0 or
+                        len(phase_in_memory_json) > 0 or
+                        len(mongosync_partition_progress) > 0 or len(mongosync_crud_rate) > 0)
+    has_any_metrics_data = metrics_collector.metrics_count > 0
+    if not has_any_log_data and not has_any_metrics_data:
+        logger.warning(f"No recognizable mongosync data found in {filename} ({line_count} lines processed)")
+        if store_id:
+            _discard_log_store(log_store, store_id)
+        raise LogAnalysisError(
+            "No Mongosync Data Found",
+            f"The file '{filename}' was processed ({line_count:,} lines) but no recognizable "
+            f"mongosync log entries or metrics were found. Please ensure you are uploading a "
+            f"valid mongosync log file (NDJSON format with standard mongosync log messages).",
+        )
 
-        # Log if options data is empty
-        if not mongosync_hiddenflags:
-            logger.info("mongosync_hiddenflags is empty")
+    if progress is not None:
+        progress.update(phase='charting')
+
+    # Sort log data by timestamp to ensure correct chronological plot ordering
+    # (archives may contain rotated log files in non-chronological order)
+    data.sort_by_time()
+    mongosync_ops_stats.sort_by_time()
+    mongosync_crud_rate.sort_by_time()
+    sort_records_by_time(mongosync_partition_progress)
+    sort_records_by_time(mongosync_sent_response)
+    verifier_dst_lag_items.sort_by_time()
+    verifier_src_lag_items.sort_by_time()
+    progress_flag_events = _extract_progress_flag_events(mongosync_sent_response)
+
+    # Aggregate partition initialization data per collection
+    partition_init_data = []
+    if partition_single_created or partition_multi_created or partition_sampling_info or partition_persisted_after_sampling:
+        pi_map = {}  # keyed by (db, coll)
+
+        for item in partition_single_created:
+            db = item.get('database', '')
+            coll = item.get('collection', '')
+            key = (db, coll)
+            if key not in pi_map:
+                pi_map[key] = {}
+            reason = item.get('reason', '')
+            pi_map[key]['type'] = 'Natural Order' if 'natural order' in reason.lower() else 'Capped'
+            pi_map[key]['reason'] = reason
+            pi_map[key]['partition_count'] = 1
+            pi_map[key]['init_started'] = item.get('time', '')
+            pi_map[key]['init_ended'] = item.get('time', '')
+            pi_map[key].setdefault('sampler', 'N/A')
+            pi_map[key].setdefault('doc_count', None)
+            pi_map[key].setdefault('expected_partition_size', None)
+            pi_map[key].setdefault('ids_sampled', None)
+
+        for item in partition_multi_created:
+            db = item.get('database', '')
+            coll = item.get('collection', '')
+            key = (db, coll)
+            if key not in pi_map:
+                pi_map[key] = {}
+            pi_map[key]['type'] = 'Sampled (multi-partition)'
+            pi_map[key]['reason'] = 'Index sampled'
+            pi_map[key].setdefault('partition_count', 0)
+            pi_map[key]['init_started'] = item.get('time', '')
+            pi_map[key]['expected_partition_size'] = item.get('expectedSizePerPartition')
+
+        for item in partition_sampling_info:
+            db = item.get('database', '')
+            coll = item.get('collection', '')
+            key = (db, coll)
+            if key not in pi_map:
+                pi_map[key] = {}
+            pi_map[key]['sampler'] = item.get('sampler', 'N/A')
+            pi_map[key]['doc_count'] = item.get('collectionDocCount')
+            pi_map[key]['ids_sampled'] = item.get('numIDsToSample')
+
+        for item in partition_persisted_after_sampling:
+            coll = item.get('collection', '')
+            p = item.get('partition', {})
+            ns = p.get('partition', {})
+            db = ns.get('db', '')
+            if not coll:
+                coll = ns.get('coll', '')
+            key = (db, coll)
+            if key not in pi_map:
+                pi_map[key] = {}
+            pi_map[key]['partition_count'] = pi_map[key].get('partition_count', 0) + 1
+            ts = item.get('time', '')
+            if ts > pi_map[key].get('init_ended', ''):
+                pi_map[key]['init_ended'] = ts
+
+        for (db, coll), info in sorted(pi_map.items()):
+            started = info.get('init_started', '')
+            ended = info.get('init_ended', started)
+            duration_sec = None
+            if started and ended:
+                try:
+                    t0 = parse_log_time(started)
+                    t1 = parse_log_time(ended)
+                    duration_sec = round((t1 - t0).total_seconds(), 2)
+                except (ValueError, TypeError):
+                    pass
+            exp_size = info.get('expected_partition_size')
+            exp_size_display = f"{exp_size / (1024*1024):.0f} MB" if exp_size else 'N/A'
+            partition_init_data.append({
+                'collection': f"{db}.{coll}",
+                'type': info.get('type', 'Unknown'),
+                'reason': info.get('reason', ''),
+                'partition_count': info.get('partition_count', 0),
+                'doc_count': info.get('doc_count'),
+                'expected_partition_size': exp_size_display,
+                'sampler': info.get('sampler', 'N/A'),
+                'ids_sampled': info.get('ids_sampled'),
+                'init_started': started[:26] if started else '',
+                'init_ended': ended[:26] if ended else '',
+                'duration_sec': duration_sec,
+            })
+        logger.info(f"Aggregated partition init data for {len(partition_init_data)} collections")
+
+    # Build partition init progress time series (in-progress and completed per collection over time)
+    partition_init_progress_times = []
+    partition_init_progress_in_progress = []
+    partition_init_progress_completed = []
+    if partition_init_data:
+        init_events = []
+        for d in partition_init_data:
+            if d['init_started']:
+                try:
+                    t0 = parse_log_time(d['init_started'])
+                    init_events.append((t0, 'start'))
+                except (ValueError, TypeError):
+                    pass
+            if d['init_ended']:
+                try:
+                    t1 = parse_log_time(d['init_ended'])
+                    init_events.append((t1, 'end'))
+                except (ValueError, TypeError):
+                    pass
+        if init_events:
+            init_events.sort(key=lambda e: e[0])
+            in_prog = 0
+            done = 0
+            for ts, kind in init_events:
+                if kind == 'start':
+                    in_prog += 1
+                else:
+                    in_prog = max(0, in_prog - 1)
+                    done += 1
+                partition_init_progress_times.append(ts)
+                partition_init_progress_in_progress.append(in_prog)
+                partition_init_progress_completed.append(done)
+            logger.info(f"Built partition init progress time series with {len(init_events)} events")
+
+    latest_progress = None
+    for record in mongosync_sent_response:
+        if not record.body_decoded:
+            latest_progress = None  # If parse fails, use None
+            logger.warning(f"No message 'sent response' found in the logs")
+        elif record.progress is not None:
+            # Only use this response if it contains 'progress'
+            latest_progress = record.progress
+
+    # Create a string with all the version information
+    if version_info_list and isinstance(version_info_list[0], dict):  
+        version = version_info_list[0].get('version', 'Unknown')  
+        os_name = version_info_list[0].get('os', 'Unknown')  
+        arch = version_info_list[0].get('arch', 'Unknown')  
+        version_text = f"MongoSync Version: {version}, OS: {os_name}, Arch: {arch}"   
+    else:  
+        version_text = f"MongoSync Version is not available"  
+        logger.error(version_text)  
         
-        if not mongosync_opts_list:
-            logger.info("mongosync_opts_list is empty")
 
-        #Getting the Timezone
-        try:  
-            dt = parser.isoparse(data[0]['time'])  
-            tz_name = dt.strftime('%Z')  
-            tz_offset = dt.strftime('%z')  
-            if tz_name:  
-                timeZoneInfo = tz_name  
-            elif tz_offset:  
-                # Format offset as +HH:MM  
-                tz_sign = tz_offset[0]  
-                tz_hour = tz_offset[1:3]  
-                tz_min = tz_offset[3:5]  
-                timeZoneInfo = f"{tz_sign}{tz_hour}:{tz_min}"  
-            else:  
-                timeZoneInfo = ""  
-        except Exception:  
+    logger.info(f"Extracting data")
+
+    # Log if options data is empty
+    if not mongosync_hiddenflags:
+        logger.info("mongosync_hiddenflags is empty")
+    
+    if not mongosync_opts_list:
+        logger.info("mongosync_opts_list is empty")
+
+    #Getting the Timezone
+    try:  
+        dt = parser.isoparse(data.times[0])  
+        tz_name = dt.strftime('%Z')  
+        tz_offset = dt.strftime('%z')  
+        if tz_name:  
+            timeZoneInfo = tz_name  
+        elif tz_offset:  
+            # Format offset as +HH:MM  
+            tz_sign = tz_offset[0]  
+            tz_hour = tz_offset[1:3]  
+            tz_min = tz_offset[3:5]  
+            timeZoneInfo = f"{tz_sign}{tz_hour}:{tz_min}"  
+        else:  
             timeZoneInfo = ""  
-                
-
-        # Extract the data you want to plot
-        times = [datetime.strptime(item['time'][:26], "%Y-%m-%dT%H:%M:%S.%f") for item in data if 'time' in item]
-        totalEventsApplied = [item['totalEventsApplied'] for item in data if 'totalEventsApplied' in item]
-        lagTimeSeconds = [item['lagTimeSeconds'] for item in data if 'lagTimeSeconds' in item]
-        # Extract estimatedCopiedBytes time series from sent response entries
-        # The 'body' field is a JSON string containing progress.collectionCopy.estimatedCopiedBytes
-        estimatedCopiedBytes_series = []
-        estimatedCopiedBytes_times = []
-        for response in mongosync_sent_response:
-            try:
-                parsed_body = json.loads(response.get('body', '{}'))
-                copied = (parsed_body.get('progress') or {}).get('collectionCopy') or {}
-                copied = copied.get('estimatedCopiedBytes')
-                if copied is not None and 'time' in response:
-                    estimatedCopiedBytes_series.append(copied)
-                    estimatedCopiedBytes_times.append(datetime.strptime(response['time'][:26], "%Y-%m-%dT%H:%M:%S.%f"))
-            except (json.JSONDecodeError, TypeError, ValueError, AttributeError):
-                continue
-        CollectionCopySourceRead = [float(item['CollectionCopySourceRead']['averageDurationMs']) for item in mongosync_ops_stats if 'CollectionCopySourceRead' in item and 'averageDurationMs' in item['CollectionCopySourceRead']]
-        CollectionCopySourceRead_maximum = [float(item['CollectionCopySourceRead']['maximumDurationMs']) for item in mongosync_ops_stats if 'CollectionCopySourceRead' in item and 'maximumDurationMs' in item['CollectionCopySourceRead']]
-        CollectionCopySourceRead_numOperations = [float(item['CollectionCopySourceRead']['numOperations']) for item in mongosync_ops_stats if 'CollectionCopySourceRead' in item and 'numOperations' in item['CollectionCopySourceRead']]        
-        CollectionCopyDestinationWrite = [float(item['CollectionCopyDestinationWrite']['averageDurationMs']) for item in mongosync_ops_stats if 'CollectionCopyDestinationWrite' in item and 'averageDurationMs' in item['CollectionCopyDestinationWrite']]
-        CollectionCopyDestinationWrite_maximum  = [float(item['CollectionCopyDestinationWrite']['maximumDurationMs']) for item in mongosync_ops_stats if 'CollectionCopyDestinationWrite' in item and 'maximumDurationMs' in item['CollectionCopyDestinationWrite']]
-        CollectionCopyDestinationWrite_numOperations = [float(item['CollectionCopyDestinationWrite']['numOperations']) for item in mongosync_ops_stats if 'CollectionCopyDestinationWrite' in item and 'numOperations' in item['CollectionCopyDestinationWrite']]
-        CEASourceRead = [float(item['CEASourceRead']['averageDurationMs']) for item in mongosync_ops_stats if 'CEASourceRead' in item and 'averageDurationMs' in item['CEASourceRead']]
-        CEASourceRead_maximum  = [float(item['CEASourceRead']['maximumDurationMs']) for item in mongosync_ops_stats if 'CEASourceRead' in item and 'maximumDurationMs' in item['CEASourceRead']]
-        CEASourceRead_numOperations = [float(item['CEASourceRead']['numOperations']) for item in mongosync_ops_stats if 'CEASourceRead' in item and 'numOperations' in item['CEASourceRead']]
-        CEADestinationWrite = [float(item['CEADestinationWrite']['averageDurationMs']) for item in mongosync_ops_stats if 'CEADestinationWrite' in item and 'averageDurationMs' in item['CEADestinationWrite']]
-        CEADestinationWrite_maximum = [float(item['CEADestinationWrite']['maximumDurationMs']) for item in mongosync_ops_stats if 'CEADestinationWrite' in item and 'maximumDurationMs' in item['CEADestinationWrite']]    
-        CEADestinationWrite_numOperations = [float(item['CEADestinationWrite']['numOperations']) for item in mongosync_ops_stats if 'CEADestinationWrite' in item and 'numOperations' in item['CEADestinationWrite']] 
-        
-        # Ping latency data (from operation stats)
-        # Note: ping latency values can be non-numeric (e.g. 'unreachable'), so we filter those out safely
-        def _safe_float(val):
-            """Safely convert a value to float, returning None for non-numeric strings like 'unreachable'."""
-            try:
-                return float(val)
-            except (ValueError, TypeError):
-                return None
-        sourcePingLatencyMs = [v for v in (_safe_float(item['sourcePingLatencyMs']) for item in mongosync_ops_stats if 'sourcePingLatencyMs' in item) if v is not None]
-        destinationPingLatencyMs = [v for v in (_safe_float(item['destinationPingLatencyMs']) for item in mongosync_ops_stats if 'destinationPingLatencyMs' in item) if v is not None]
-        
-        # CRUD events rate data
-        srcCRUDEventsPerSec = [float(item['srcCRUDEventsPerSec']) for item in mongosync_crud_rate if 'srcCRUDEventsPerSec' in item]
-        crud_rate_times = [datetime.strptime(item['time'][:26], "%Y-%m-%dT%H:%M:%S.%f") for item in mongosync_crud_rate if 'time' in item]
-        
-        # Extract partition copy progress data
-        partition_times = []
-        partitions_copied = []
-        partitions_total = []
-        partition_re = re.compile(r"Completed writing (\d+) / (\d+) partitions")
-        for item in mongosync_partition_progress:
-            m = partition_re.search(item.get('message', ''))
-            if m and 'time' in item:
-                partition_times.append(datetime.strptime(item['time'][:26], "%Y-%m-%dT%H:%M:%S.%f"))
-                copied = int(m.group(1))
-                total = int(m.group(2))
-                partitions_copied.append(copied)
-                partitions_total.append(total)
-        
-        # Extract index building progress data from sent response entries
-        index_built_times = []
-        indexes_built = []
-        indexes_total = []
-        idx_coll_fin_times = []
-        idx_coll_fin_vals = []
-        idx_coll_tot_times = []
-        idx_coll_tot_vals = []
-
-        def _safe_int_idx(val):
-            try:
-                if val is None:
-                    return None
-                return int(val)
-            except (ValueError, TypeError):
+    except Exception:  
+        timeZoneInfo = ""  
+            
+
+    # Extract the data you want to plot
+    # Parse each replication progress time once; several series below reuse it
+    data_times = [parse_log_time(t) if t else None for t in data.times]
+    times = [t for t in data_times if t is not None]
+    totalEventsApplied = data.column('totalEventsApplied')
+    lagTimeSeconds = data.column('lagTimeSeconds')
+    # Extract estimatedCopiedBytes time series from sent response entries
+    # The 'body' field is a JSON string containing progress.collectionCopy.estimatedCopiedBytes
+    # Parse each sent response time once (None if missing or malformed);
+    # all the progress extractors below share it
+    sent_response_times = []
+    for record in mongosync_sent_response:
+        try:
+            sent_response_times.append(parse_log_time(record.time) if record.time else None)
+        except ValueError:
+            sent_response_times.append(None)
+    estimatedCopiedBytes_series = []
+    estimatedCopiedBytes_times = []
+    for record, t in zip(mongosync_sent_response, sent_response_times):
+        try:
+            copied = (record.progress or {}).get('collectionCopy') or {}
+            copied = copied.get('estimatedCopiedBytes')
+            if copied is not None and t is not None:
+                estimatedCopiedBytes_series.append(copied)
+                estimatedCopiedBytes_times.append(t)
+        except (TypeError, ValueError, AttributeError):
+            continue
+    CollectionCopySourceRead = mongosync_ops_stats.column('CollectionCopySourceRead.averageDurationMs')
+    CollectionCopySourceRead_maximum = mongosync_ops_stats.column('CollectionCopySourceRead.maximumDurationMs')
+    CollectionCopySourceRead_numOperations = mongosync_ops_stats.column('CollectionCopySourceRead.numOperations')
+    CollectionCopyDestinationWrite = mongosync_ops_stats.column('CollectionCopyDestinationWrite.averageDurationMs')
+    CollectionCopyDestinationWrite_maximum = mongosync_ops_stats.column('CollectionCopyDestinationWrite.maximumDurationMs')
+    CollectionCopyDestinationWrite_numOperations = mongosync_ops_stats.column('CollectionCopyDestinationWrite.numOperations')
+    CEASourceRead = mongosync_ops_stats.column('CEASourceRead.averageDurationMs')
+    CEASourceRead_maximum = mongosync_ops_stats.column('CEASourceRead.maximumDurationMs')
+    CEASourceRead_numOperations = mongosync_ops_stats.column('CEASourceRead.numOperations')
+    CEADestinationWrite = mongosync_ops_stats.column('CEADestinationWrite.averageDurationMs')
+    CEADestinationWrite_maximum = mongosync_ops_stats.column('CEADestinationWrite.maximumDurationMs')
+    CEADestinationWrite_numOperations = mongosync_ops_stats.column('CEADestinationWrite.numOperations')
+    
+    # Ping latency data (from operation stats)
+    # Note: ping latency values can be non-numeric (e.g. 'unreachable'); numeric
+    # columns skip values that do not convert to float
+    sourcePingLatencyMs = mongosync_ops_stats.column('sourcePingLatencyMs')
+    destinationPingLatencyMs = mongosync_ops_stats.column('destinationPingLatencyMs')
+    
+    # CRUD events rate data
+    srcCRUDEventsPerSec = mongosync_crud_rate.column('srcCRUDEventsPerSec')
+    crud_rate_times = [parse_log_time(t) for t in mongosync_crud_rate.times if t]
+    
+    # Extract partition copy progress data
+    partition_times = []
+    partitions_copied = []
+    partitions_total = []
+    partition_re = re.compile(r"Completed writing (\d+) / (\d+) partitions")
+    for item in mongosync_partition_progress:
+        m = partition_re.search(item.get('message', ''))
+        if m and 'time' in item:
+            partition_times.append(parse_log_time(item['time']))
+            copied = int(m.group(1))
+            total = int(m.group(2))
+            partitions_copied.append(copied)
+            partitions_total.append(total)
+    
+    # Extract index building progress data from sent response entries
+    index_built_times = []
+    indexes_built = []
+    indexes_total = []
+    idx_coll_fin_times = []
+    idx_coll_fin_vals = []
+    idx_coll_tot_times = []
+    idx_coll_tot_vals = []
+
+    def _safe_int_idx(val):
+        try:
+            if val is None:
                 return None
+            return int(val)
+        except (ValueError, TypeError):
+            return None
 
-        for response in mongosync_sent_response:
-            try:
-                t_raw = response.get('time')
-                if not t_raw:
-                    continue
-                t = datetime.strptime(t_raw[:26], "%Y-%m-%dT%H:%M:%S.%f")
-                parsed_body = json.loads(response.get('body', '{}'))
-                idx_building = (parsed_body.get('progress') or {}).get('indexBuilding') or {}
-                built = idx_building.get('indexesBuilt')
-                total_idx = idx_building.get('totalIndexesToBuild')
-                if built is not None and total_idx is not None:
-                    index_built_times.append(t)
-                    indexes_built.append(built)
-                    indexes_total.append(total_idx)
-                cf = _safe_int_idx(idx_building.get('collectionsFinished'))
-                if cf is not None:
-                    idx_coll_fin_times.append(t)
-                    idx_coll_fin_vals.append(cf)
-                ct = _safe_int_idx(idx_building.get('collectionsTotal'))
-                if ct is not None:
-                    idx_coll_tot_times.append(t)
-                    idx_coll_tot_vals.append(ct)
-            except (json.JSONDecodeError, TypeError, ValueError, AttributeError):
+    for record, t in zip(mongosync_sent_response, sent_response_times):
+        try:
+            if t is None:
                 continue
+            idx_building = (record.progress or {}).get('indexBuilding') or {}
+            built = idx_building.get('indexesBuilt')
+            total_idx = idx_building.get('totalIndexesToBuild')
+            if built is not None and total_idx is not None:
+                index_built_times.append(t)
+                indexes_built.append(built)
+                indexes_total.append(total_idx)
+            cf = _safe_int_idx(idx_building.get('collectionsFinished'))
+            if cf is not None:
+                idx_coll_fin_times.append(t)
+                idx_coll_fin_vals.append(cf)
+            ct = _safe_int_idx(idx_building.get('collectionsTotal'))
+            if ct is not None:
+                idx_coll_tot_times.append(t)
+                idx_coll_tot_vals.append(ct)
+        except (TypeError, ValueError, AttributeError):
+            continue
 
-        # Estimated seconds to CEA catchup (from sent response progress)
-        cea_catchup_times = []
-        cea_catchup_seconds = []
+    # Estimated seconds to CEA catchup (from sent response progress)
+    cea_catchup_times = []
+    cea_catchup_seconds = []
 
-        def _safe_int_catchup(val):
-            try:
-                if val is None:
-                    return None
-                return int(val)
-            except (ValueError, TypeError):
+    def _safe_int_catchup(val):
+        try:
+            if val is None:
                 return None
+            return int(val)
+        except (ValueError, TypeError):
+            return None
 
-        for response in mongosync_sent_response:
-            try:
-                t_raw = response.get('time')
-                if not t_raw:
-                    continue
-                t = datetime.strptime(t_raw[:26], "%Y-%m-%dT%H:%M:%S.%f")
-                parsed_body = json.loads(response.get('body', '{}'))
-                progress = parsed_body.get('progress') or {}
-                catchup = _safe_int_catchup(progress.get('estimatedSecondsToCEACatchup'))
-                if catchup is not None:
-                    cea_catchup_times.append(t)
-                    cea_catchup_seconds.append(float(catchup))
-            except (json.JSONDecodeError, TypeError, ValueError, AttributeError):
+    for record, t in zip(mongosync_sent_response, sent_response_times):
+        try:
+            if t is None:
                 continue
+            progress = record.progress or {}
+            catchup = _safe_int_catchup(progress.get('estimatedSecondsToCEACatchup'))
+            if catchup is not None:
+                cea_catchup_times.append(t)
+                cea_catchup_seconds.append(float(catchup))
+        except (TypeError, ValueError, AttributeError):
+            continue
 
-        # progress.verification (from sent response) for embedded verifier charts
-        verif_src_scan_times = []
-        verif_src_scanned = []
-        verif_src_total_coll = []
-        verif_dst_scan_times = []
-        verif_dst_scanned = []
-        verif_dst_total_coll = []
-        verif_src_hash_times = []
-        verif_src_hashed = []
-        verif_src_estimated = []
-        verif_dst_hash_times = []
-        verif_dst_hashed = []
-        verif_dst_estimated = []
-
-        for response in mongosync_sent_response:
-            try:
-                t_raw = response.get('time')
-                if not t_raw:
-                    continue
-                t = datetime.strptime(t_raw[:26], "%Y-%m-%dT%H:%M:%S.%f")
-                parsed_body = json.loads(response.get('body', '{}'))
-                progress = parsed_body.get('progress') or {}
-                ver = progress.get('verification')
-                if not isinstance(ver, dict) or not ver:
-                    continue
-                src = ver.get('source') or {}
-                dst = ver.get('destination') or {}
-                verif_src_scan_times.append(t)
-                verif_src_scanned.append(_safe_int_catchup(src.get('scannedCollectionCount')))
-                verif_src_total_coll.append(_safe_int_catchup(src.get('totalCollectionCount')))
-                verif_dst_scan_times.append(t)
-                verif_dst_scanned.append(_safe_int_catchup(dst.get('scannedCollectionCount')))
-                verif_dst_total_coll.append(_safe_int_catchup(dst.get('totalCollectionCount')))
-                verif_src_hash_times.append(t)
-                verif_src_hashed.append(_safe_int_catchup(src.get('hashedDocumentCount')))
-                verif_src_estimated.append(_safe_int_catchup(src.get('estimatedDocumentCount')))
-                verif_dst_hash_times.append(t)
-                verif_dst_hashed.append(_safe_int_catchup(dst.get('hashedDocumentCount')))
-                verif_dst_estimated.append(_safe_int_catchup(dst.get('estimatedDocumentCount')))
-            except (json.JSONDecodeError, TypeError, ValueError, AttributeError):
+    # progress.verification (from sent response) for embedded verifier charts
+    verif_src_scan_times = []
+    verif_src_scanned = []
+    verif_src_total_coll = []
+    verif_dst_scan_times = []
+    verif_dst_scanned = []
+    verif_dst_total_coll = []
+    verif_src_hash_times = []
+    verif_src_hashed = []
+    verif_src_estimated = []
+    verif_dst_hash_times = []
+    verif_dst_hashed = []
+    verif_dst_estimated = []
+
+    for record, t in zip(mongosync_sent_response, sent_response_times):
+        try:
+            if t is None:
+                continue
+            progress = record.progress or {}
+            ver = progress.get('verification')
+            if not isinstance(ver, dict) or not ver:
                 continue
+            src = ver.get('source') or {}
+            dst = ver.get('destination') or {}
+            verif_src_scan_times.append(t)
+            verif_src_scanned.append(_safe_int_catchup(src.get('scannedCollectionCount')))
+            verif_src_total_coll.append(_safe_int_catchup(src.get('totalCollectionCount')))
+            verif_dst_scan_times.append(t)
+            verif_dst_scanned.append(_safe_int_catchup(dst.get('scannedCollectionCount')))
+            verif_dst_total_coll.append(_safe_int_catchup(dst.get('totalCollectionCount')))
+            verif_src_hash_times.append(t)
+            verif_src_hashed.append(_safe_int_catchup(src.get('hashedDocumentCount')))
+            verif_src_estimated.append(_safe_int_catchup(src.get('estimatedDocumentCount')))
+            verif_dst_hash_times.append(t)
+            verif_dst_hashed.append(_safe_int_catchup(dst.get('hashedDocumentCount')))
+            verif_dst_estimated.append(_safe_int_catchup(dst.get('estimatedDocumentCount')))
+        except (TypeError, ValueError, AttributeError):
+            continue
 
-        # Estimated Source Oplog Time Remaining (from replication progress logs)
-        def _parse_oplog_time_remaining_minutes(value):
-            """Convert estimatedOplogTimeRemaining string to minutes."""
-            if not value or value == "not yet checked":
-                return None
-            if value == "more than 72 hours":
-                return 72 * 60
-            if value == "less than 15 minutes":
-                return 15
-            m = re.match(r"(\d+)\s+minutes?", value)
-            if m:
-                return int(m.group(1))
-            m = re.match(r"(\d+)\s+hours?", value)
-            if m:
-                return int(m.group(1)) * 60
+    # Estimated Source Oplog Time Remaining (from replication progress logs)
+    def _parse_oplog_time_remaining_minutes(value):
+        """Convert estimatedOplogTimeRemaining string to minutes."""
+        if not value or value == "not yet checked":
             return None
+        if value == "more than 72 hours":
+            return 72 * 60
+        if value == "less than 15 minutes":
+            return 15
+        m = re.match(r"(\d+)\s+minutes?", value)
+        if m:
+            return int(m.group(1))
+        m = re.match(r"(\d+)\s+hours?", value)
+        if m:
+            return int(m.group(1)) * 60
+        return None
 
-        oplog_remaining_times = []
-        oplog_remaining_minutes = []
-        for item in data:
-            val = _parse_oplog_time_remaining_minutes(item.get('estimatedOplogTimeRemaining'))
-            if val is not None and 'time' in item:
-                oplog_remaining_times.append(datetime.strptime(item['time'][:26], "%Y-%m-%dT%H:%M:%S.%f"))
-                oplog_remaining_minutes.append(val)
-
-        # Event Application Rate per Second (from replication progress logs)
-        eventRatePerSecond = []
-        eventRatePerSecond_times = []
-        for item in data:
-            rate = item.get('eventApplicationRatePerSecond')
-            if rate is not None and 'time' in item:
-                eventRatePerSecond.append(float(rate))
-                eventRatePerSecond_times.append(datetime.strptime(item['time'][:26], "%Y-%m-%dT%H:%M:%S.%f"))
-
-        dst_lag_times = [datetime.strptime(item['time'][:26], "%Y-%m-%dT%H:%M:%S.%f") for item in verifier_dst_lag_items if 'time' in item]
-        verifierDstLagTimeSeconds = [item['verifierDstLagTimeSeconds'] for item in verifier_dst_lag_items if 'verifierDstLagTimeSeconds' in item]
-
-        src_lag_times = [datetime.strptime(item['time'][:26], "%Y-%m-%dT%H:%M:%S.%f") for item in verifier_src_lag_items if 'time' in item]
-        verifierSrcLagTimeSeconds = [item['verifierSrcLagTimeSeconds'] for item in verifier_src_lag_items if 'verifierSrcLagTimeSeconds' in item]
-
-        # Calculate global date range from all time sources for X-axis synchronization
-        all_times = []
-        if times:
-            all_times.extend(times)
-        if crud_rate_times:
-            all_times.extend(crud_rate_times)
-        if partition_times:
-            all_times.extend(partition_times)
-        if estimatedCopiedBytes_times:
-            all_times.extend(estimatedCopiedBytes_times)
-        if index_built_times:
-            all_times.extend(index_built_times)
-        if idx_coll_fin_times:
-            all_times.extend(idx_coll_fin_times)
-        if idx_coll_tot_times:
-            all_times.extend(idx_coll_tot_times)
-        if dst_lag_times:
-            all_times.extend(dst_lag_times)
-        if src_lag_times:
-            all_times.extend(src_lag_times)
-        if cea_catchup_times:
-            all_times.extend(cea_catchup_times)
-        if verif_src_scan_times:
-            all_times.extend(verif_src_scan_times)
-        if verif_dst_scan_times:
-            all_times.extend(verif_dst_scan_times)
-        if verif_src_hash_times:
-            all_times.extend(verif_src_hash_times)
-        if verif_dst_hash_times:
-            all_times.extend(verif_dst_hash_times)
-
-        if all_times:
-            global_min_date = min(all_times)
-            global_max_date = max(all_times)
-        else:
-            global_min_date = None
-            global_max_date = None
-        
-        # Initialize estimated_total_bytes and estimated_copied_bytes with a default value
-        estimated_total_bytes = 0
-        estimated_copied_bytes = 0
-        
-        api_phase_transitions = []
-        phase_transitions = ""
-        # Check that mongosync_sent_response_body is a dict before searching for 'progress'  
-        if isinstance(mongosync_sent_response_body, dict):
-            if 'progress' in mongosync_sent_response_body:
-                estimated_total_bytes = mongosync_sent_response_body['progress']['collectionCopy']['estimatedTotalBytes']
-                estimated_copied_bytes = mongosync_sent_response_body['progress']['collectionCopy']['estimatedCopiedBytes']
-
-                try:  
-                    api_phase_transitions = mongosync_sent_response_body['progress']['atlasLiveMigrateMetrics']['PhaseTransitions']  
-                except KeyError as e:  
-                    logger.error(f"Key not found: {e}")  
-                    api_phase_transitions = []
-
-            else:
-                logger.warning(f"Key 'progress' not found in mongosync_sent_response_body")
-
-        if api_phase_transitions or phase_transitions_json or phase_in_memory_json:
-            merged = _merge_phase_events(
-                phase_transitions_json,
-                phase_in_memory_json,
-                api_transitions=api_phase_transitions or None,
-            )
-            if merged:
-                ts_t_list_formatted = [t for t, _ in merged]
-                phase_list = [label for _, label in merged]
-                phase_transitions = True
-            else:
-                phase_transitions = ""
-
-        # Include phase and progress-flag times in global date range
-        progress_timestamps = []
-        if phase_transitions and ts_t_list_formatted:
-            progress_timestamps.extend(ts_t_list_formatted)
-        if progress_flag_events:
-            progress_timestamps.extend(t for t, _ in progress_flag_events)
-        if progress_timestamps:
-            progress_datetimes = [
-                datetime.strptime(t.rstrip('Z'), "%Y-%m-%dT%H:%M:%S.%f") for t in progress_timestamps
-            ]
-            all_times.extend(progress_datetimes)
-            global_min_date = min(all_times)
-            global_max_date = max(all_times)
-
-        estimated_total_bytes, estimated_total_bytes_unit = format_byte_size(estimated_total_bytes)
-        estimated_copied_bytes = convert_bytes(estimated_copied_bytes, estimated_total_bytes_unit)
-        estimatedCopiedBytes_converted = [convert_bytes(b, estimated_total_bytes_unit) for b in estimatedCopiedBytes_series]
-
-        logger.info(f"Plotting")
-
-        # Create a subplot for the scatter plots (tables are now in a separate tab)
-        fig = make_subplots(rows=17, cols=2, subplot_titles=("Mongosync Phases", "Mongosync Progress",
-                                                            "Lag Time (seconds)", "Estimated Source Oplog Time Remaining (minutes)",
-                                                            "Ping Latency (ms)", "Average Source CRUD Event Rate (Events/sec)",
-                                                            "Est. seconds to CEA catchup", "",
-                                                            "Partition Init Progress", "Partition Init Summary",
-                                                            "Data Copied (" + estimated_total_bytes_unit + ")", "Estimated Total and Copied " + estimated_total_bytes_unit,
-                                                            "Partitions Copied", "Total and Copied Partitions",
-                                                            "Collection Copy - Avg and Max Read time (ms)", "Collection Copy Source Reads",
-                                                            "Collection Copy - Avg and Max Write time (ms)", "Collection Copy Destination Writes",
-                                                            "Change Events Applied", "Events Rate per Second",
-                                                            "CEA Source - Avg and Max Read time (ms)", "CEA Source Reads",
-                                                            "CEA Destination - Avg and Max Write time (ms)", "CEA Destination Writes",
-                                                            "Collections finished", "Collections total / finished",
-                                                            "Index Built", "Total and Index Built",
-                                                            "Source Verifier Lag Time (seconds)", "Destination Verifier Lag Time (seconds)",
-                                                            "Verification collections (source)", "Verification collections (destination)",
-                                                            "Verification document hash (source)", "Verification document hash (destination)"),
-                            specs=[ [{}, {"type": "table"}], #Row 1: Mongosync Phases and Mongosync Progress
-                                    [{}, {}], #Row 2: Lag Time and Estimated Source Oplog Time Remaining
-                                    [{}, {}], #Row 3: Ping Latency and CRUD Event Rate
-                                    [{}, {}], #Row 4: CEA catchup (col 1); col 2 intentionally empty
-                                    [{}, {"type": "table"}], #Row 5: Partition Init Progress and Summary
-                                    [{}, {}], #Row 6: Data Copied Over Time + Estimated Total and Copied
-                                    [{}, {}], #Row 7: Partitions Copied and Completion %
-                                    [{}, {}], #Row 8: Collection Copy Source
-                                    [{}, {}], #Row 9: Collection Copy Destination
-                                    [{}, {}], #Row 10: Change Events Applied and Events Rate per Second
-                                    [{}, {}], #Row 11: CEA Source
-                                    [{}, {}], #Row 12: CEA Destination
-                                    [{}, {}], #Row 13: Collections (time + summary bars)
-                                    [{}, {}], #Row 14: Index Built and Total and Index Built
-                                    [{}, {}], #Row 15: Verifier Lag
-                                    [{}, {}], #Row 16: Verification collections
-                                    [{}, {}] ]) #Row 17: Verification document hash
-
-        # Add traces
-
-        # Row 1: Mongosync Phases
-        if phase_transitions:
-            fig.add_trace(go.Scatter(x=ts_t_list_formatted, y=phase_list, mode='markers+text',marker=dict(color='green')), row=1, col=1)
-            fig.update_yaxes(showticklabels=False, row=1, col=1)  
-        else:
-            fig.add_trace(go.Scatter(x=[0], y=[0], text="NO DATA", mode='text', name='Mongosync Phases',textfont=dict(size=30, color="black")), row=1, col=1)
-            fig.update_yaxes(range=[-1, 1], row=1, col=1)
-            fig.update_xaxes(range=[-1, 1], row=1, col=1)
-
-        # Row 1: Mongosync Progress (phases + canCommit/canWrite transitions)
-        progress_table_rows = []
-        if phase_transitions:
-            progress_table_rows.extend(zip(ts_t_list_formatted, phase_list))
-        progress_table_rows.extend(progress_flag_events)
-        if progress_table_rows:
-            progress_table_data = sorted(progress_table_rows, key=lambda x: x[0])
-            table_dates = [row[0] for row in progress_table_data]
-            table_events = [row[1] for row in progress_table_data]
-            fig.add_trace(go.Table(
-                header=dict(values=["Date Time", "Event"]),
-                cells=dict(values=[table_dates, table_events])
-            ), row=1, col=2)
-        else:
-            fig.add_trace(go.Table(
-                header=dict(values=["Date Time", "Event"]),
-                cells=dict(values=[[], []])
-            ), row=1, col=2)
-
-        # Row 2: Lag Time
-        if lagTimeSeconds:
-            fig.add_trace(go.Scattergl(x=times, y=lagTimeSeconds, mode='lines', name='Seconds', legendgroup="groupEventsAndLags"), row=2, col=1)
-        else:
-            fig.add_trace(go.Scatter(x=[0], y=[0], text="NO DATA", mode='text', name='Lag Time',textfont=dict(size=30, color="black")), row=2, col=1)
-            fig.update_yaxes(range=[-1, 1], row=2, col=1)
-            fig.update_xaxes(range=[-1, 1], row=2, col=1)
-
-        # Row 2: Estimated Source Oplog Time Remaining (minutes)
-        if oplog_remaining_minutes:
-            fig.add_trace(go.Scattergl(x=oplog_remaining_times, y=oplog_remaining_minutes, mode='lines', name='Minutes Remaining', legendgroup="groupEventsAndLags"), row=2, col=2)
-        else:
-            fig.add_trace(go.Scatter(x=[0], y=[0], text="NO DATA", mode='text', name='Oplog Time Remaining',textfont=dict(size=30, color="black")), row=2, col=2)
-            fig.update_yaxes(range=[-1, 1], row=2, col=2)
-            fig.update_xaxes(range=[-1, 1], row=2, col=2)
-
-        # Row 3: Ping Latency
-        if sourcePingLatencyMs or destinationPingLatencyMs:
-            fig.add_trace(go.Scattergl(x=times, y=sourcePingLatencyMs, mode='lines', name='Source Ping (ms)', legendgroup="groupPingLatency"), row=3, col=1)
-            fig.add_trace(go.Scattergl(x=times, y=destinationPingLatencyMs, mode='lines', name='Destination Ping (ms)', legendgroup="groupPingLatency"), row=3, col=1)
-        else:
-            fig.add_trace(go.Scatter(x=[0], y=[0], text="NO DATA", mode='text', name='Ping Latency', textfont=dict(size=30, color="black")), row=3, col=1)
-            fig.update_yaxes(range=[-1, 1], row=3, col=1)
-            fig.update_xaxes(range=[-1, 1], row=3, col=1)
-
-        # Row 3: Average Source CRUD Event Rate
-        if srcCRUDEventsPerSec:
-            fig.add_trace(go.Scattergl(x=crud_rate_times, y=srcCRUDEventsPerSec, mode='lines', name='Events/sec', legendgroup="groupCRUDRate"), row=3, col=2)
-        else:
-            fig.add_trace(go.Scatter(x=[0], y=[0], text="NO DATA", mode='text', name='CRUD Event Rate', textfont=dict(size=30, color="black")), row=3, col=2)
-            fig.update_yaxes(range=[-1, 1], row=3, col=2)
-            fig.update_xaxes(range=[-1, 1], row=3, col=2)
+    oplog_remaining_times = []
+    oplog_remaining_minutes = []
+    for value, t in zip(data.column_by_row('estimatedOplogTimeRemaining'), data_times):
+        val = _parse_oplog_time_remaining_minutes(value)
+        if val is not None and t is not None:
+            oplog_remaining_times.append(t)
+            oplog_remaining_minutes.append(val)
+
+    # Event Application Rate per Second (from replication progress logs)
+    eventRatePerSecond = []
+    eventRatePerSecond_times = []
+    for rate, t in zip(data.column_by_row('eventApplicationRatePerSecond'), data_times):
+        if rate is not None and t is not None:
+            eventRatePerSecond.append(float(rate))
+            eventRatePerSecond_times.append(t)
+
+    dst_lag_times = [parse_log_time(t) for t in verifier_dst_lag_items.times]
+    verifierDstLagTimeSeconds = verifier_dst_lag_items.column('verifierDstLagTimeSeconds')
+
+    src_lag_times = [parse_log_time(t) for t in verifier_src_lag_items.times]
+    verifierSrcLagTimeSeconds = verifier_src_lag_items.column('verifierSrcLagTimeSeconds')
+
+    # Calculate global date range from all time sources for X-axis synchronization
+    all_times = []
+    if times:
+        all_times.extend(times)
+    if crud_rate_times:
+        all_times.extend(crud_rate_times)
+    if partition_times:
+        all_times.extend(partition_times)
+    if estimatedCopiedBytes_times:
+        all_times.extend(estimatedCopiedBytes_times)
+    if index_built_times:
+        all_times.extend(index_built_times)
+    if idx_coll_fin_times:
+        all_times.extend(idx_coll_fin_times)
+    if idx_coll_tot_times:
+        all_times.extend(idx_coll_tot_times)
+    if dst_lag_times:
+        all_times.extend(dst_lag_times)
+    if src_lag_times:
+        all_times.extend(src_lag_times)
+    if cea_catchup_times:
+        all_times.extend(cea_catchup_times)
+    if verif_src_scan_times:
+        all_times.extend(verif_src_scan_times)
+    if verif_dst_scan_times:
+        all_times.extend(verif_dst_scan_times)
+    if verif_src_hash_times:
+        all_times.extend(verif_src_hash_times)
+    if verif_dst_hash_times:
+        all_times.extend(verif_dst_hash_times)
+
+    if all_times:
+        global_min_date = min(all_times)
+        global_max_date = max(all_times)
+    else:
+        global_min_date = None
+        global_max_date = None
+    
+    # Initialize estimated_total_bytes and estimated_copied_bytes with a default value
+    estimated_total_bytes = 0
+    estimated_copied_bytes = 0
+    
+    api_phase_transitions = []
+    phase_transitions = ""
+    if latest_progress is not None:
+        estimated_total_bytes = latest_progress['collectionCopy']['estimatedTotalBytes']
+        estimated_copied_bytes = latest_progress['collectionCopy']['estimatedCopiedBytes']
 
-        # Row 4: Estimated seconds to CEA catchup (col 1 only; col 2 left empty per layout)
-        if cea_catchup_times:
-            fig.add_trace(
-                go.Scattergl(
-                    x=cea_catchup_times,
-                    y=cea_catchup_seconds,
-                    mode='lines',
-                    name='Est. seconds to CEA catchup',
-                    legendgroup="groupCEACatchup",
-                ),
-                row=4,
-                col=1,
-            )
+        try:  
+            api_phase_transitions = latest_progress['atlasLiveMigrateMetrics']['PhaseTransitions']  
+        except KeyError as e:  
+            logger.error(f"Key not found: {e}")  
+            api_phase_transitions = []
+
+    if api_phase_transitions or phase_transitions_json or phase_in_memory_json:
+        merged = _merge_phase_events(
+            phase_transitions_json,
+            phase_in_memory_json,
+            api_transitions=api_phase_transitions or None,
+        )
+        if merged:
+            ts_t_list_formatted = [t for t, _ in merged]
+            phase_list = [label for _, label in merged]
+            phase_transitions = True
         else:
-            fig.add_trace(
-                go.Scatter(
-                    x=[0],
-                    y=[0],
-                    text="NO DATA",
-                    mode='text',
-                    name='CEA catchup estimate',
-                    textfont=dict(size=30, color="black"),
-                ),
-                row=4,
-                col=1,
-            )
-            fig.update_yaxes(range=[-1, 1], row=4, col=1)
-            fig.update_xaxes(range=[-1, 1], row=4, col=1)
-        fig.update_xaxes(visible=False, row=4, col=2)
-        fig.update_yaxes(visible=False, row=4, col=2)
-
-        # Row 5: Partition Init Progress - collections initializing vs completed over time
-        if partition_init_progress_times:
-            total_collections = len(partition_init_data) if partition_init_data else 0
-            fig.add_trace(go.Scattergl(
-                x=partition_init_progress_times, y=partition_init_progress_in_progress,
-                mode='lines', name='In Progress', line=dict(color='#2196F3'),
-                legendgroup="groupPartitionInitProgress"
-            ), row=5, col=1)
+            phase_transitions = ""
+
+    # Include phase and progress-flag times in global date range
+    progress_timestamps = []
+    if phase_transitions and ts_t_list_formatted:
+        progress_timestamps.extend(ts_t_list_formatted)
+    if progress_flag_events:
+        progress_timestamps.extend(t for t, _ in progress_flag_events)
+    if progress_timestamps:
+        progress_datetimes = [
+            parse_log_time(t.rstrip('Z')) for t in progress_timestamps
+        ]
+        all_times.extend(progress_datetimes)
+        global_min_date = min(all_times)
+        global_max_date = max(all_times)
+
+    estimated_total_bytes, estimated_total_bytes_unit = format_byte_size(estimated_total_bytes)
+    estimated_copied_bytes = convert_bytes(estimated_copied_bytes, estimated_total_bytes_unit)
+    estimatedCopiedBytes_converted = [convert_bytes(b, estimated_total_bytes_unit) for b in estimatedCopiedBytes_series]
+
+    logger.info(f"Plotting")
+
+    # Create a subplot for the scatter plots (tables are now in a separate tab)
+    fig = make_subplots(rows=17, cols=2, subplot_titles=("Mongosync Phases", "Mongosync Progress",
+                                                        "Lag Time (seconds)", "Estimated Source Oplog Time Remaining (minutes)",
+                                                        "Ping Latency (ms)", "Average Source CRUD Event Rate (Events/sec)",
+                                                        "Est. seconds to CEA catchup", "",
+                                                        "Partition Init Progress", "Partition Init Summary",
+                                                        "Data Copied (" + estimated_total_bytes_unit + ")", "Estimated Total and Copied " + estimated_total_bytes_unit,
+                                                        "Partitions Copied", "Total and Copied Partitions",
+                                                        "Collection Copy - Avg and Max Read time (ms)", "Collection Copy Source Reads",
+                                                        "Collection Copy - Avg and Max Write time (ms)", "Collection Copy Destination Writes",
+                                                        "Change Events Applied", "Events Rate per Second",
+                                                        "CEA Source - Avg and Max Read time (ms)", "CEA Source Reads",
+                                                        "CEA Destination - Avg and Max Write time (ms)", "CEA Destination Writes",
+                                                        "Collections finished", "Collections total / finished",
+                                                        "Index Built", "Total and Index Built",
+                                                        "Source Verifier Lag Time (seconds)", "Destination Verifier Lag Time (seconds)",
+                                                        "Verification collections (source)", "Verification collections (destination)",
+                                                        "Verification document hash (source)", "Verification document hash (destination)"),
+                        specs=[ [{}, {"type": "table"}], #Row 1: Mongosync Phases and Mongosync Progress
+                                [{}, {}], #Row 2: Lag Time and Estimated Source Oplog Time Remaining
+                                [{}, {}], #Row 3: Ping Latency and CRUD Event Rate
+                                [{}, {}], #Row 4: CEA catchup (col 1); col 2 intentionally empty
+                                [{}, {"type": "table"}], #Row 5: Partition Init Progress and Summary
+                                [{}, {}], #Row 6: Data Copied Over Time + Estimated Total and Copied
+                                [{}, {}], #Row 7: Partitions Copied and Completion %
+                                [{}, {}], #Row 8: Collection Copy Source
+                                [{}, {}], #Row 9: Collection Copy Destination
+                                [{}, {}], #Row 10: Change Events Applied and Events Rate per Second
+                                [{}, {}], #Row 11: CEA Source
+                                [{}, {}], #Row 12: CEA Destination
+                                [{}, {}], #Row 13: Collections (time + summary bars)
+                                [{}, {}], #Row 14: Index Built and Total and Index Built
+                                [{}, {}], #Row 15: Verifier Lag
+                                [{}, {}], #Row 16: Verification collections
+                                [{}, {}] ]) #Row 17: Verification document hash
+
+    # Add traces
+
+    # Row 1: Mongosync Phases
+    if phase_transitions:
+        fig.add_trace(go.Scatter(x=ts_t_list_formatted, y=phase_list, mode='markers+text',marker=dict(color='green')), row=1, col=1)
+        fig.update_yaxes(showticklabels=False, row=1, col=1)  
+    else:
+        fig.add_trace(go.Scatter(x=[0], y=[0], text="NO DATA", mode='text', name='Mongosync Phases',textfont=dict(size=30, color="black")), row=1, col=1)
+        fig.update_yaxes(range=[-1, 1], row=1, col=1)
+        fig.update_xaxes(range=[-1, 1], row=1, col=1)
+
+    # Row 1: Mongosync Progress (phases + canCommit/canWrite transitions)
+    progress_table_rows = []
+    if phase_transitions:
+        progress_table_rows.extend(zip(ts_t_list_formatted, phase_list))
+    progress_table_rows.extend(progress_flag_events)
+    if progress_table_rows:
+        progress_table_data = sorted(progress_table_rows, key=lambda x: x[0])
+        table_dates = [row[0] for row in progress_table_data]
+        table_events = [row[1] for row in progress_table_data]
+        fig.add_trace(go.Table(
+            header=dict(values=["Date Time", "Event"]),
+            cells=dict(values=[table_dates, table_events])
+        ), row=1, col=2)
+    else:
+        fig.add_trace(go.Table(
+            header=dict(values=["Date Time", "Event"]),
+            cells=dict(values=[[], []])
+        ), row=1, col=2)
+
+    # Row 2: Lag Time
+    if lagTimeSeconds:
+        fig.add_trace(go.Scattergl(x=times, y=lagTimeSeconds, mode='lines', name='Seconds', legendgroup="groupEventsAndLags"), row=2, col=1)
+    else:
+        fig.add_trace(go.Scatter(x=[0], y=[0], text="NO DATA", mode='text', name='Lag Time',textfont=dict(size=30, color="black")), row=2, col=1)
+        fig.update_yaxes(range=[-1, 1], row=2, col=1)
+        fig.update_xaxes(range=[-1, 1], row=2, col=1)
+
+    # Row 2: Estimated Source Oplog Time Remaining (minutes)
+    if oplog_remaining_minutes:
+        fig.add_trace(go.Scattergl(x=oplog_remaining_times, y=oplog_remaining_minutes, mode='lines', name='Minutes Remaining', legendgroup="groupEventsAndLags"), row=2, col=2)
+    else:
+        fig.add_trace(go.Scatter(x=[0], y=[0], text="NO DATA", mode='text', name='Oplog Time Remaining',textfont=dict(size=30, color="black")), row=2, col=2)
+        fig.update_yaxes(range=[-1, 1], row=2, col=2)
+        fig.update_xaxes(range=[-1, 1], row=2, col=2)
+
+    # Row 3: Ping Latency
+    if sourcePingLatencyMs or destinationPingLatencyMs:
+        fig.add_trace(go.Scattergl(x=times, y=sourcePingLatencyMs, mode='lines', name='Source Ping (ms)', legendgroup="groupPingLatency"), row=3, col=1)
+        fig.add_trace(go.Scattergl(x=times, y=destinationPingLatencyMs, mode='lines', name='Destination Ping (ms)', legendgroup="groupPingLatency"), row=3, col=1)
+    else:
+        fig.add_trace(go.Scatter(x=[0], y=[0], text="NO DATA", mode='text', name='Ping Latency', textfont=dict(size=30, color="black")), row=3, col=1)
+        fig.update_yaxes(range=[-1, 1], row=3, col=1)
+        fig.update_xaxes(range=[-1, 1], row=3, col=1)
+
+    # Row 3: Average Source CRUD Event Rate
+    if srcCRUDEventsPerSec:
+        fig.add_trace(go.Scattergl(x=crud_rate_times, y=srcCRUDEventsPerSec, mode='lines', name='Events/sec', legendgroup="groupCRUDRate"), row=3, col=2)
+    else:
+        fig.add_trace(go.Scatter(x=[0], y=[0], text="NO DATA", mode='text', name='CRUD Event Rate', textfont=dict(size=30, color="black")), row=3, col=2)
+        fig.update_yaxes(range=[-1, 1], row=3, col=2)
+        fig.update_xaxes(range=[-1, 1], row=3, col=2)
+
+    # Row 4: Estimated seconds to CEA catchup (col 1 only; col 2 left empty per layout)
+    if cea_catchup_times:
+        fig.add_trace(
+            go.Scattergl(
+                x=cea_catchup_times,
+                y=cea_catchup_seconds,
+                mode='lines',
+                name='Est. seconds to CEA catchup',
+                legendgroup="groupCEACatchup",
+            ),
+            row=4,
+            col=1,
+        )
+    else:
+        fig.add_trace(
+            go.Scatter(
+                x=[0],
+                y=[0],
+                text="NO DATA",
+                mode='text',
+                name='CEA catchup estimate',
+                textfont=dict(size=30, color="black"),
+            ),
+            row=4,
+            col=1,
+        )
+        fig.update_yaxes(range=[-1, 1], row=4, col=1)
+        fig.update_xaxes(range=[-1, 1], row=4, col=1)
+    fig.update_xaxes(visible=False, row=4, col=2)
+    fig.update_yaxes(visible=False, row=4, col=2)
+
+    # Row 5: Partition Init Progress - collections initializing vs completed over time
+    if partition_init_progress_times:
+        total_collections = len(partition_init_data) if partition_init_data else 0
+        fig.add_trace(go.Scattergl(
+            x=partition_init_progress_times, y=partition_init_progress_in_progress,
+            mode='lines', name='In Progress', line=dict(color='#2196F3'),
+            legendgroup="groupPartitionInitProgress"
+        ), row=5, col=1)
+        fig.add_trace(go.Scattergl(
+            x=partition_init_progress_times, y=partition_init_progress_completed,
+            mode='lines', name='Completed', line=dict(color='#4CAF50'),
+            legendgroup="groupPartitionInitProgress"
+        ), row=5, col=1)
+        if total_collections > 0:
             fig.add_trace(go.Scattergl(
-                x=partition_init_progress_times, y=partition_init_progress_completed,
-                mode='lines', name='Completed', line=dict(color='#4CAF50'),
+                x=[partition_init_progress_times[0], partition_init_progress_times[-1]],
+                y=[total_collections, total_collections],
+                mode='lines', name='Total Collections', line=dict(color='gray', dash='dash'),
                 legendgroup="groupPartitionInitProgress"
             ), row=5, col=1)
-            if total_collections > 0:
-                fig.add_trace(go.Scattergl(
-                    x=[partition_init_progress_times[0], partition_init_progress_times[-1]],
-                    y=[total_collections, total_collections],
-                    mode='lines', name='Total Collections', line=dict(color='gray', dash='dash'),
-                    legendgroup="groupPartitionInitProgress"
-                ), row=5, col=1)
-        else:
-            fig.add_trace(go.Scatter(x=[0], y=[0], text="NO DATA", mode='text', name='Partition Init Progress', textfont=dict(size=30, color="black")), row=5, col=1)
-            fig.update_yaxes(range=[-1, 1], row=5, col=1)
-            fig.update_xaxes(range=[-1, 1], row=5, col=1)
-
-        # Row 5: Partition Init Summary Table
-        if partition_init_data:
-            fig.add_trace(go.Table(
-                header=dict(values=["Collection", "Type", "Partitions", "Doc Count", "Duration (s)"]),
-                cells=dict(values=[
-                    [d['collection'] for d in partition_init_data],
-                    [d['type'] for d in partition_init_data],
-                    [d['partition_count'] for d in partition_init_data],
-                    [f"{d['doc_count']:,}" if d['doc_count'] else 'N/A' for d in partition_init_data],
-                    [d['duration_sec'] if d['duration_sec'] is not None else 'N/A' for d in partition_init_data],
-                ])
-            ), row=5, col=2)
-        else:
-            fig.add_trace(go.Table(
-                header=dict(values=["Collection", "Type", "Partitions", "Doc Count", "Duration (s)"]),
-                cells=dict(values=[[], [], [], [], []])
-            ), row=5, col=2)
-
-        # Row 6: Data Copied Over Time
-        if estimatedCopiedBytes_converted:
-            fig.add_trace(go.Scattergl(x=estimatedCopiedBytes_times, y=estimatedCopiedBytes_converted, mode='lines', name='Copied ' + estimated_total_bytes_unit, legendgroup="groupTotalCopied"), row=6, col=1)
-        else:
-            fig.add_trace(go.Scatter(x=[0], y=[0], text="NO DATA", mode='text', name='Data Copied Over Time',textfont=dict(size=30, color="black")), row=6, col=1)
-            fig.update_yaxes(range=[-1, 1], row=6, col=1)
-            fig.update_xaxes(range=[-1, 1], row=6, col=1)
-
-        # Row 6: Estimated Total and Copied
-        if estimated_total_bytes > 0 or estimated_copied_bytes > 0:
-            fig.add_trace( go.Bar( name='Estimated ' + estimated_total_bytes_unit + ' to be Copied',  x=[estimated_total_bytes_unit],  y=[estimated_total_bytes], legendgroup="groupTotalCopied" ), row=6, col=2)
-            fig.add_trace( go.Bar( name='Estimated Copied ' + estimated_total_bytes_unit, x=[estimated_total_bytes_unit],  y=[estimated_copied_bytes], legendgroup="groupTotalCopied"), row=6, col=2)
-        else:
-            fig.add_trace(go.Scatter(x=[0], y=[0], text="NO DATA", mode='text', name='Estimated Total and Copied',textfont=dict(size=30, color="black")), row=6, col=2)
-            fig.update_yaxes(range=[-1, 1], row=6, col=2)
-            fig.update_xaxes(range=[-1, 1], row=6, col=2)
-
-        # Row 7: Partitions Copied Over Time
-        if partition_times:
-            fig.add_trace(go.Scattergl(x=partition_times, y=partitions_copied, mode='lines', name='Partitions Copied', legendgroup="groupPartitions"), row=7, col=1)
-            fig.add_trace(go.Scattergl(x=partition_times, y=partitions_total, mode='lines', name='Total Partitions', legendgroup="groupPartitions"), row=7, col=1)
-        else:
-            fig.add_trace(go.Scatter(x=[0], y=[0], text="NO DATA", mode='text', name='Partitions Copied', textfont=dict(size=30, color="black")), row=7, col=1)
-            fig.update_yaxes(range=[-1, 1], row=7, col=1)
-            fig.update_xaxes(range=[-1, 1], row=7, col=1)
-
-        # Row 7: Total and Copied Partitions
-        if partition_times:
-            last_copied = partitions_copied[-1]
-            last_total = partitions_total[-1]
-            fig.add_trace(go.Bar(name='Total Partitions', x=['Partitions'], y=[last_total], legendgroup="groupPartitions"), row=7, col=2)
-            fig.add_trace(go.Bar(name='Copied Partitions', x=['Partitions'], y=[last_copied], legendgroup="groupPartitions"), row=7, col=2)
-        else:
-            fig.add_trace(go.Scatter(x=[0], y=[0], text="NO DATA", mode='text', name='Total and Copied Partitions', textfont=dict(size=30, color="black")), row=7, col=2)
-            fig.update_yaxes(range=[-1, 1], row=7, col=2)
-            fig.update_xaxes(range=[-1, 1], row=7, col=2)
-
-        # Row 7: Collection Copy Source Read
-        if CollectionCopySourceRead or CollectionCopySourceRead_maximum:
-            fig.add_trace(go.Scattergl(x=times, y=CollectionCopySourceRead, mode='lines', name='Average time (ms)', legendgroup="groupCCSourceRead"), row=8, col=1)
-            fig.add_trace(go.Scattergl(x=times, y=CollectionCopySourceRead_maximum, mode='lines', name='Maximum time (ms)', legendgroup="groupCCSourceRead"), row=8, col=1)
-        else:
-            fig.add_trace(go.Scatter(x=[0], y=[0], text="NO DATA", mode='text', name='Collection Copy Source Read',textfont=dict(size=30, color="black")), row=8, col=1)
-            fig.update_yaxes(range=[-1, 1], row=8, col=1)
-            fig.update_xaxes(range=[-1, 1], row=8, col=1)
-
-        # Row 7: Collection Copy Source Reads (numOperations)
-        if CollectionCopySourceRead_numOperations:
-            fig.add_trace(go.Scattergl(x=times, y=CollectionCopySourceRead_numOperations, mode='lines', name='Reads', legendgroup="groupCCSourceRead"), row=8, col=2)
-        else:
-            fig.add_trace(go.Scatter(x=[0], y=[0], text="NO DATA", mode='text', name='Collection Copy Source Reads',textfont=dict(size=30, color="black")), row=8, col=2)
-            fig.update_yaxes(range=[-1, 1], row=8, col=2)
-            fig.update_xaxes(range=[-1, 1], row=8, col=2)
-
-        # Row 8: Collection Copy Destination Write
-        if CollectionCopyDestinationWrite or CollectionCopyDestinationWrite_maximum:
-            fig.add_trace(go.Scattergl(x=times, y=CollectionCopyDestinationWrite, mode='lines', name='Average time (ms)', legendgroup="groupCCDestinationWrite"), row=9, col=1)
-            fig.add_trace(go.Scattergl(x=times, y=CollectionCopyDestinationWrite_maximum, mode='lines', name='Maximum time (ms)', legendgroup="groupCCDestinationWrite"), row=9, col=1)
-        else:
-            fig.add_trace(go.Scatter(x=[0], y=[0], text="NO DATA", mode='text', name='Collection Copy Destination Write',textfont=dict(size=30, color="black")), row=9, col=1)
-            fig.update_yaxes(range=[-1, 1], row=9, col=1)
-            fig.update_xaxes(range=[-1, 1], row=9, col=1)
-
-        # Row 8: Collection Copy Destination Writes (numOperations)
-        if CollectionCopyDestinationWrite_numOperations:
-            fig.add_trace(go.Scattergl(x=times, y=CollectionCopyDestinationWrite_numOperations, mode='lines', name='Writes', legendgroup="groupCCDestinationWrite"), row=9, col=2)
-        else:
-            fig.add_trace(go.Scatter(x=[0], y=[0], text="NO DATA", mode='text', name='Collection Copy Destination Writes',textfont=dict(size=30, color="black")), row=9, col=2)
-            fig.update_yaxes(range=[-1, 1], row=9, col=2)
-            fig.update_xaxes(range=[-1, 1], row=9, col=2)
-
-        # Row 9: Total Events Applied
-        if totalEventsApplied:
-            fig.add_trace(go.Scattergl(x=times, y=totalEventsApplied, mode='lines', name='Events', legendgroup="groupEventsAndLags"), row=10, col=1)
-        else:
-            fig.add_trace(go.Scatter(x=[0], y=[0], text="NO DATA", mode='text', name='Change Events Applied',textfont=dict(size=30, color="black")), row=10, col=1)
-            fig.update_yaxes(range=[-1, 1], row=10, col=1)
-            fig.update_xaxes(range=[-1, 1], row=10, col=1)
-
-        # Row 9: Events Rate per Second
-        if eventRatePerSecond:
-            fig.add_trace(go.Scattergl(x=eventRatePerSecond_times, y=eventRatePerSecond, mode='lines', name='Events/sec', legendgroup="groupEventsAndLags"), row=10, col=2)
-        else:
-            fig.add_trace(go.Scatter(x=[0], y=[0], text="NO DATA", mode='text', name='Events Rate per Second',textfont=dict(size=30, color="black")), row=10, col=2)
-            fig.update_yaxes(range=[-1, 1], row=10, col=2)
-            fig.update_xaxes(range=[-1, 1], row=10, col=2)
-
-        # Row 10: CEA Source Read
-        if CEASourceRead or CEASourceRead_maximum:
-            fig.add_trace(go.Scattergl(x=times, y=CEASourceRead, mode='lines', name='Average time (ms)', legendgroup="groupCEASourceRead"), row=11, col=1)
-            fig.add_trace(go.Scattergl(x=times, y=CEASourceRead_maximum, mode='lines', name='Maximum time (ms)', legendgroup="groupCEASourceRead"), row=11, col=1)
-        else:
-            fig.add_trace(go.Scatter(x=[0], y=[0], text="NO DATA", mode='text', name='CEA Source Read',textfont=dict(size=30, color="black")), row=11, col=1)
-            fig.update_yaxes(range=[-1, 1], row=11, col=1)
-            fig.update_xaxes(range=[-1, 1], row=11, col=1)
-
-        # Row 10: CEA Source Reads (numOperations)
-        if CEASourceRead_numOperations:
-            fig.add_trace(go.Scattergl(x=times, y=CEASourceRead_numOperations, mode='lines', name='Reads', legendgroup="groupCEASourceRead"), row=11, col=2)
-        else:
-            fig.add_trace(go.Scatter(x=[0], y=[0], text="NO DATA", mode='text', name='CEA Source Reads',textfont=dict(size=30, color="black")), row=11, col=2)
-            fig.update_yaxes(range=[-1, 1], row=11, col=2)
-            fig.update_xaxes(range=[-1, 1], row=11, col=2)
-
-        # Row 11: CEA Destination Write
-        if CEADestinationWrite or CEADestinationWrite_maximum:
-            fig.add_trace(go.Scattergl(x=times, y=CEADestinationWrite, mode='lines', name='Average time (ms)', legendgroup="groupCEADestinationWrite"), row=12, col=1)
-            fig.add_trace(go.Scattergl(x=times, y=CEADestinationWrite_maximum, mode='lines', name='Maximum time (ms)', legendgroup="groupCEADestinationWrite"), row=12, col=1)
-        else:
-            fig.add_trace(go.Scatter(x=[0], y=[0], text="NO DATA", mode='text', name='CEA Destination Write',textfont=dict(size=30, color="black")), row=12, col=1)
-            fig.update_yaxes(range=[-1, 1], row=12, col=1)
-            fig.update_xaxes(range=[-1, 1], row=12, col=1)
-
-        # Row 11: CEA Destination Writes (numOperations)
-        if CEADestinationWrite_numOperations:
-            fig.add_trace(go.Scattergl(x=times, y=CEADestinationWrite_numOperations, mode='lines', name='Writes during CEA', legendgroup="groupCEADestinationWrite"), row=12, col=2)
-        else:
-            fig.add_trace(go.Scatter(x=[0], y=[0], text="NO DATA", mode='text', name='CEA Destination Writes',textfont=dict(size=30, color="black")), row=12, col=2)
-            fig.update_yaxes(range=[-1, 1], row=12, col=2)
-            fig.update_xaxes(range=[-1, 1], row=12, col=2)
-
-        # Row 13: Collections finished (time) — Indexes Metrics
-        if idx_coll_fin_times:
+    else:
+        fig.add_trace(go.Scatter(x=[0], y=[0], text="NO DATA", mode='text', name='Partition Init Progress', textfont=dict(size=30, color="black")), row=5, col=1)
+        fig.update_yaxes(range=[-1, 1], row=5, col=1)
+        fig.update_xaxes(range=[-1, 1], row=5, col=1)
+
+    # Row 5: Partition Init Summary Table
+    if partition_init_data:
+        fig.add_trace(go.Table(
+            header=dict(values=["Collection", "Type", "Partitions", "Doc Count", "Duration (s)"]),
+            cells=dict(values=[
+                [d['collection'] for d in partition_init_data],
+                [d['type'] for d in partition_init_data],
+                [d['partition_count'] for d in partition_init_data],
+                [f"{d['doc_count']:,}" if d['doc_count'] else 'N/A' for d in partition_init_data],
+                [d['duration_sec'] if d['duration_sec'] is not None else 'N/A' for d in partition_init_data],
+            ])
+        ), row=5, col=2)
+    else:
+        fig.add_trace(go.Table(
+            header=dict(values=["Collection", "Type", "Partitions", "Doc Count", "Duration (s)"]),
+            cells=dict(values=[[], [], [], [], []])
+        ), row=5, col=2)
+
+    # Row 6: Data Copied Over Time
+    if estimatedCopiedBytes_converted:
+        fig.add_trace(go.Scattergl(x=estimatedCopiedBytes_times, y=estimatedCopiedBytes_converted, mode='lines', name='Copied ' + estimated_total_bytes_unit, legendgroup="groupTotalCopied"), row=6, col=1)
+    else:
+        fig.add_trace(go.Scatter(x=[0], y=[0], text="NO DATA", mode='text', name='Data Copied Over Time',textfont=dict(size=30, color="black")), row=6, col=1)
+        fig.update_yaxes(range=[-1, 1], row=6, col=1)
+        fig.update_xaxes(range=[-1, 1], row=6, col=1)
+
+    # Row 6: Estimated Total and Copied
+    if estimated_total_bytes > 0 or estimated_copied_bytes > 0:
+        fig.add_trace( go.Bar( name='Estimated ' + estimated_total_bytes_unit + ' to be Copied',  x=[estimated_total_bytes_unit],  y=[estimated_total_bytes], legendgroup="groupTotalCopied" ), row=6, col=2)
+        fig.add_trace( go.Bar( name='Estimated Copied ' + estimated_total_bytes_unit, x=[estimated_total_bytes_unit],  y=[estimated_copied_bytes], legendgroup="groupTotalCopied"), row=6, col=2)
+    else:
+        fig.add_trace(go.Scatter(x=[0], y=[0], text="NO DATA", mode='text', name='Estimated Total and Copied',textfont=dict(size=30, color="black")), row=6, col=2)
+        fig.update_yaxes(range=[-1, 1], row=6, col=2)
+        fig.update_xaxes(range=[-1, 1], row=6, col=2)
+
+    # Row 7: Partitions Copied Over Time
+    if partition_times:
+        fig.add_trace(go.Scattergl(x=partition_times, y=partitions_copied, mode='lines', name='Partitions Copied', legendgroup="groupPartitions"), row=7, col=1)
+        fig.add_trace(go.Scattergl(x=partition_times, y=partitions_total, mode='lines', name='Total Partitions', legendgroup="groupPartitions"), row=7, col=1)
+    else:
+        fig.add_trace(go.Scatter(x=[0], y=[0], text="NO DATA", mode='text', name='Partitions Copied', textfont=dict(size=30, color="black")), row=7, col=1)
+        fig.update_yaxes(range=[-1, 1], row=7, col=1)
+        fig.update_xaxes(range=[-1, 1], row=7, col=1)
+
+    # Row 7: Total and Copied Partitions
+    if partition_times:
+        last_copied = partitions_copied[-1]
+        last_total = partitions_total[-1]
+        fig.add_trace(go.Bar(name='Total Partitions', x=['Partitions'], y=[last_total], legendgroup="groupPartitions"), row=7, col=2)
+        fig.add_trace(go.Bar(name='Copied Partitions', x=['Partitions'], y=[last_copied], legendgroup="groupPartitions"), row=7, col=2)
+    else:
+        fig.add_trace(go.Scatter(x=[0], y=[0], text="NO DATA", mode='text', name='Total and Copied Partitions', textfont=dict(size=30, color="black")), row=7, col=2)
+        fig.update_yaxes(range=[-1, 1], row=7, col=2)
+        fig.update_xaxes(range=[-1, 1], row=7, col=2)
+
+    # Row 7: Collection Copy Source Read
+    if CollectionCopySourceRead or CollectionCopySourceRead_maximum:
+        fig.add_trace(go.Scattergl(x=times, y=CollectionCopySourceRead, mode='lines', name='Average time (ms)', legendgroup="groupCCSourceRead"), row=8, col=1)
+        fig.add_trace(go.Scattergl(x=times, y=CollectionCopySourceRead_maximum, mode='lines', name='Maximum time (ms)', legendgroup="groupCCSourceRead"), row=8, col=1)
+    else:
+        fig.add_trace(go.Scatter(x=[0], y=[0], text="NO DATA", mode='text', name='Collection Copy Source Read',textfont=dict(size=30, color="black")), row=8, col=1)
+        fig.update_yaxes(range=[-1, 1], row=8, col=1)
+        fig.update_xaxes(range=[-1, 1], row=8, col=1)
+
+    # Row 7: Collection Copy Source Reads (numOperations)
+    if CollectionCopySourceRead_numOperations:
+        fig.add_trace(go.Scattergl(x=times, y=CollectionCopySourceRead_numOperations, mode='lines', name='Reads', legendgroup="groupCCSourceRead"), row=8, col=2)
+    else:
+        fig.add_trace(go.Scatter(x=[0], y=[0], text="NO DATA", mode='text', name='Collection Copy Source Reads',textfont=dict(size=30, color="black")), row=8, col=2)
+        fig.update_yaxes(range=[-1, 1], row=8, col=2)
+        fig.update_xaxes(range=[-1, 1], row=8, col=2)
+
+    # Row 8: Collection Copy Destination Write
+    if CollectionCopyDestinationWrite or CollectionCopyDestinationWrite_maximum:
+        fig.add_trace(go.Scattergl(x=times, y=CollectionCopyDestinationWrite, mode='lines', name='Average time (ms)', legendgroup="groupCCDestinationWrite"), row=9, col=1)
+        fig.add_trace(go.Scattergl(x=times, y=CollectionCopyDestinationWrite_maximum, mode='lines', name='Maximum time (ms)', legendgroup="groupCCDestinationWrite"), row=9, col=1)
+    else:
+        fig.add_trace(go.Scatter(x=[0], y=[0], text="NO DATA", mode='text', name='Collection Copy Destination Write',textfont=dict(size=30, color="black")), row=9, col=1)
+        fig.update_yaxes(range=[-1, 1], row=9, col=1)
+        fig.update_xaxes(range=[-1, 1], row=9, col=1)
+
+    # Row 8: Collection Copy Destination Writes (numOperations)
+    if CollectionCopyDestinationWrite_numOperations:
+        fig.add_trace(go.Scattergl(x=times, y=CollectionCopyDestinationWrite_numOperations, mode='lines', name='Writes', legendgroup="groupCCDestinationWrite"), row=9, col=2)
+    else:
+        fig.add_trace(go.Scatter(x=[0], y=[0], text="NO DATA", mode='text', name='Collection Copy Destination Writes',textfont=dict(size=30, color="black")), row=9, col=2)
+        fig.update_yaxes(range=[-1, 1], row=9, col=2)
+        fig.update_xaxes(range=[-1, 1], row=9, col=2)
+
+    # Row 9: Total Events Applied
+    if totalEventsApplied:
+        fig.add_trace(go.Scattergl(x=times, y=totalEventsApplied, mode='lines', name='Events', legendgroup="groupEventsAndLags"), row=10, col=1)
+    else:
+        fig.add_trace(go.Scatter(x=[0], y=[0], text="NO DATA", mode='text', name='Change Events Applied',textfont=dict(size=30, color="black")), row=10, col=1)
+        fig.update_yaxes(range=[-1, 1], row=10, col=1)
+        fig.update_xaxes(range=[-1, 1], row=10, col=1)
+
+    # Row 9: Events Rate per Second
+    if eventRatePerSecond:
+        fig.add_trace(go.Scattergl(x=eventRatePerSecond_times, y=eventRatePerSecond, mode='lines', name='Events/sec', legendgroup="groupEventsAndLags"), row=10, col=2)
+    else:
+        fig.add_trace(go.Scatter(x=[0], y=[0], text="NO DATA", mode='text', name='Events Rate per Second',textfont=dict(size=30, color="black")), row=10, col=2)
+        fig.update_yaxes(range=[-1, 1], row=10, col=2)
+        fig.update_xaxes(range=[-1, 1], row=10, col=2)
+
+    # Row 10: CEA Source Read
+    if CEASourceRead or CEASourceRead_maximum:
+        fig.add_trace(go.Scattergl(x=times, y=CEASourceRead, mode='lines', name='Average time (ms)', legendgroup="groupCEASourceRead"), row=11, col=1)
+        fig.add_trace(go.Scattergl(x=times, y=CEASourceRead_maximum, mode='lines', name='Maximum time (ms)', legendgroup="groupCEASourceRead"), row=11, col=1)
+    else:
+        fig.add_trace(go.Scatter(x=[0], y=[0], text="NO DATA", mode='text', name='CEA Source Read',textfont=dict(size=30, color="black")), row=11, col=1)
+        fig.update_yaxes(range=[-1, 1], row=11, col=1)
+        fig.update_xaxes(range=[-1, 1], row=11, col=1)
+
+    # Row 10: CEA Source Reads (numOperations)
+    if CEASourceRead_numOperations:
+        fig.add_trace(go.Scattergl(x=times, y=CEASourceRead_numOperations, mode='lines', name='Reads', legendgroup="groupCEASourceRead"), row=11, col=2)
+    else:
+        fig.add_trace(go.Scatter(x=[0], y=[0], text="NO DATA", mode='text', name='CEA Source Reads',textfont=dict(size=30, color="black")), row=11, col=2)
+        fig.update_yaxes(range=[-1, 1], row=11, col=2)
+        fig.update_xaxes(range=[-1, 1], row=11, col=2)
+
+    # Row 11: CEA Destination Write
+    if CEADestinationWrite or CEADestinationWrite_maximum:
+        fig.add_trace(go.Scattergl(x=times, y=CEADestinationWrite, mode='lines', name='Average time (ms)', legendgroup="groupCEADestinationWrite"), row=12, col=1)
+        fig.add_trace(go.Scattergl(x=times, y=CEADestinationWrite_maximum, mode='lines', name='Maximum time (ms)', legendgroup="groupCEADestinationWrite"), row=12, col=1)
+    else:
+        fig.add_trace(go.Scatter(x=[0], y=[0], text="NO DATA", mode='text', name='CEA Destination Write',textfont=dict(size=30, color="black")), row=12, col=1)
+        fig.update_yaxes(range=[-1, 1], row=12, col=1)
+        fig.update_xaxes(range=[-1, 1], row=12, col=1)
+
+    # Row 11: CEA Destination Writes (numOperations)
+    if CEADestinationWrite_numOperations:
+        fig.add_trace(go.Scattergl(x=times, y=CEADestinationWrite_numOperations, mode='lines', name='Writes during CEA', legendgroup="groupCEADestinationWrite"), row=12, col=2)
+    else:
+        fig.add_trace(go.Scatter(x=[0], y=[0], text="NO DATA", mode='text', name='CEA Destination Writes',textfont=dict(size=30, color="black")), row=12, col=2)
+        fig.update_yaxes(range=[-1, 1], row=12, col=2)
+        fig.update_xaxes(range=[-1, 1], row=12, col=2)
+
+    # Row 13: Collections finished (time) — Indexes Metrics
+    if idx_coll_fin_times:
+        fig.add_trace(
+            go.Scattergl(
+                x=idx_coll_fin_times,
+                y=idx_coll_fin_vals,
+                mode='lines',
+                name='Collections finished',
+                legendgroup="groupIndexCollections",
+            ),
+            row=13,
+            col=1,
+        )
+    else:
+        fig.add_trace(
+            go.Scatter(
+                x=[0],
+                y=[0],
+                text="NO DATA",
+                mode='text',
+                name='Collections finished',
+                textfont=dict(size=30, color="black"),
+            ),
+            row=13,
+            col=1,
+        )
+        fig.update_yaxes(range=[-1, 1], row=13, col=1)
+        fig.update_xaxes(range=[-1, 1], row=13, col=1)
+
+    # Row 13: Collections total vs finished (bars) — same pattern as Total / Indexes Built
+    if idx_coll_tot_vals or idx_coll_fin_vals:
+        last_coll_total = idx_coll_tot_vals[-1] if idx_coll_tot_vals else None
+        last_coll_finished = idx_coll_fin_vals[-1] if idx_coll_fin_vals else None
+        if last_coll_total is not None:
             fig.add_trace(
-                go.Scattergl(
-                    x=idx_coll_fin_times,
-                    y=idx_coll_fin_vals,
-                    mode='lines',
-                    name='Collections finished',
+                go.Bar(
+                    name='Total collections',
+                    x=['Collections'],
+                    y=[last_coll_total],
                     legendgroup="groupIndexCollections",
                 ),
                 row=13,
-                col=1,
-            )
-        else:
-            fig.add_trace(
-                go.Scatter(
-                    x=[0],
-                    y=[0],
-                    text="NO DATA",
-                    mode='text',
-                    name='Collections finished',
-                    textfont=dict(size=30, color="black"),
-                ),
-                row=13,
-                col=1,
+                col=2,
             )
-            fig.update_yaxes(range=[-1, 1], row=13, col=1)
-            fig.update_xaxes(range=[-1, 1], row=13, col=1)
-
-        # Row 13: Collections total vs finished (bars) — same pattern as Total / Indexes Built
-        if idx_coll_tot_vals or idx_coll_fin_vals:
-            last_coll_total = idx_coll_tot_vals[-1] if idx_coll_tot_vals else None
-            last_coll_finished = idx_coll_fin_vals[-1] if idx_coll_fin_vals else None
-            if last_coll_total is not None:
-                fig.add_trace(
-                    go.Bar(
-                        name='Total collections',
-                        x=['Collections'],
-                        y=[last_coll_total],
-                        legendgroup="groupIndexCollections",
-                    ),
-                    row=13,
-                    col=2,
-                )
-            if last_coll_finished is not None:
-                fig.add_trace(
-                    go.Bar(
-                        name='Collections finished (summary)',
-                        x=['Collections'],
-                        y=[last_coll_finished],
-                        legendgroup="groupIndexCollections",
-                    ),
-                    row=13,
-                    col=2,
-                )
-        else:
+        if last_coll_finished is not None:
             fig.add_trace(
-                go.Scatter(
-                    x=[0],
-                    y=[0],
-                    text="NO DATA",
-                    mode='text',
-                    name='Collections summary',
-                    textfont=dict(size=30, color="black"),
+                go.Bar(
+                    name='Collections finished (summary)',
+                    x=['Collections'],
+                    y=[last_coll_finished],
+                    legendgroup="groupIndexCollections",
                 ),
                 row=13,
                 col=2,
             )
-            fig.update_yaxes(range=[-1, 1], row=13, col=2)
-            fig.update_xaxes(range=[-1, 1], row=13, col=2)
-
-        # Row 14: Index Built Over Time
-        if index_built_times:
-            fig.add_trace(go.Scattergl(x=index_built_times, y=indexes_built, mode='lines', name='Indexes Built', legendgroup="groupIndexBuilt"), row=14, col=1)
-        else:
-            fig.add_trace(go.Scatter(x=[0], y=[0], text="NO DATA", mode='text', name='Index Built', textfont=dict(size=30, color="black")), row=14, col=1)
-            fig.update_yaxes(range=[-1, 1], row=14, col=1)
-            fig.update_xaxes(range=[-1, 1], row=14, col=1)
-
-        # Row 14: Total and Index Built
-        if index_built_times:
-            last_built = indexes_built[-1]
-            last_total = indexes_total[-1]
-            fig.add_trace(go.Bar(name='Total Indexes', x=['Indexes'], y=[last_total], legendgroup="groupIndexBuilt"), row=14, col=2)
-            fig.add_trace(go.Bar(name='Indexes Built', x=['Indexes'], y=[last_built], legendgroup="groupIndexBuilt"), row=14, col=2)
-        else:
-            fig.add_trace(go.Scatter(x=[0], y=[0], text="NO DATA", mode='text', name='Total and Index Built', textfont=dict(size=30, color="black")), row=14, col=2)
-            fig.update_yaxes(range=[-1, 1], row=14, col=2)
-            fig.update_xaxes(range=[-1, 1], row=14, col=2)
-
-        # Row 15: Source Verifier Lag Time
-        if verifierSrcLagTimeSeconds:
-            fig.add_trace(go.Scattergl(x=src_lag_times, y=verifierSrcLagTimeSeconds, mode='lines', name='Source Verifier Lag Time (seconds)', legendgroup="groupVerifierLag"), row=15, col=1)
-        else:
-            fig.add_trace(go.Scatter(x=[0], y=[0], text="NO DATA", mode='text', name='Source Verifier Lag Time', textfont=dict(size=30, color="black")), row=15, col=1)
-            fig.update_yaxes(range=[-1, 1], row=15, col=1)
-            fig.update_xaxes(range=[-1, 1], row=15, col=1)
-
-        # Row 15: Destination Verifier Lag Time
-        if verifierDstLagTimeSeconds:
-            fig.add_trace(go.Scattergl(x=dst_lag_times, y=verifierDstLagTimeSeconds, mode='lines', name='Destination Verifier Lag Time (seconds)', legendgroup="groupVerifierLag"), row=15, col=2)
-        else:
-            fig.add_trace(go.Scatter(x=[0], y=[0], text="NO DATA", mode='text', name='Destination Verifier Lag Time', textfont=dict(size=30, color="black")), row=15, col=2)
-            fig.update_yaxes(range=[-1, 1], row=15, col=2)
-            fig.update_xaxes(range=[-1, 1], row=15, col=2)
-
-        # Row 16: Verification collection scan (source / destination)
-        if any(v is not None for v in verif_src_scanned) or any(v is not None for v in verif_src_total_coll):
-            fig.add_trace(go.Scattergl(x=verif_src_scan_times, y=verif_src_scanned, mode='lines', name='Source scanned collections', legendgroup="groupVerifierScan"), row=16, col=1)
-            fig.add_trace(go.Scattergl(x=verif_src_scan_times, y=verif_src_total_coll, mode='lines', name='Source total collections', legendgroup="groupVerifierScan"), row=16, col=1)
-        else:
-            fig.add_trace(go.Scatter(x=[0], y=[0], text="NO DATA", mode='text', name='Verification collections (source)', textfont=dict(size=30, color="black")), row=16, col=1)
-            fig.update_yaxes(range=[-1, 1], row=16, col=1)
-            fig.update_xaxes(range=[-1, 1], row=16, col=1)
-        if any(v is not None for v in verif_dst_scanned) or any(v is not None for v in verif_dst_total_coll):
-            fig.add_trace(go.Scattergl(x=verif_dst_scan_times, y=verif_dst_scanned, mode='lines', name='Destination scanned collections', legendgroup="groupVerifierScan"), row=16, col=2)
-            fig.add_trace(go.Scattergl(x=verif_dst_scan_times, y=verif_dst_total_coll, mode='lines', name='Destination total collections', legendgroup="groupVerifierScan"), row=16, col=2)
-        else:
-            fig.add_trace(go.Scatter(x=[0], y=[0], text="NO DATA", mode='text', name='Verification collections (destination)', textfont=dict(size=30, color="black")), row=16, col=2)
-            fig.update_yaxes(range=[-1, 1], row=16, col=2)
-            fig.update_xaxes(range=[-1, 1], row=16, col=2)
-
-        # Row 17: Verification document hash (source / destination)
-        if any(v is not None for v in verif_src_hashed) or any(v is not None for v in verif_src_estimated):
-            fig.add_trace(go.Scattergl(x=verif_src_hash_times, y=verif_src_hashed, mode='lines', name='Source hashed documents', legendgroup="groupVerifierHash"), row=17, col=1)
-            fig.add_trace(go.Scattergl(x=verif_src_hash_times, y=verif_src_estimated, mode='lines', name='Source estimated documents', legendgroup="groupVerifierHash"), row=17, col=1)
-        else:
-            fig.add_trace(go.Scatter(x=[0], y=[0], text="NO DATA", mode='text', name='Verification document hash (source)', textfont=dict(size=30, color="black")), row=17, col=1)
-            fig.update_yaxes(range=[-1, 1], row=17, col=1)
-            fig.update_xaxes(range=[-1, 1], row=17, col=1)
-        if any(v is not None for v in verif_dst_hashed) or any(v is not None for v in verif_dst_estimated):
-            fig.add_trace(go.Scattergl(x=verif_dst_hash_times, y=verif_dst_hashed, mode='lines', name='Destination hashed documents', legendgroup="groupVerifierHash"), row=17, col=2)
-            fig.add_trace(go.Scattergl(x=verif_dst_hash_times, y=verif_dst_estimated, mode='lines', name='Destination estimated documents', legendgroup="groupVerifierHash"), row=17, col=2)
-        else:
-            fig.add_trace(go.Scatter(x=[0], y=[0], text="NO DATA", mode='text', name='Verification document hash (destination)', textfont=dict(size=30, color="black")), row=17, col=2)
-            fig.update_yaxes(range=[-1, 1], row=17, col=2)
-            fig.update_xaxes(range=[-1, 1], row=17, col=2)
-
-        # Force all y-axes to start at 0 for better visual comparison
-        fig.update_yaxes(rangemode='tozero')
-        
-        # Add section label annotations above each section group
-        section_labels = [
-            ("Global Migration Metrics", 'yaxis'),        # row 1
-            ("Collection Copy Metrics", 'yaxis8'),        # row 5 (partition)
-            ("CEA Metrics", 'yaxis17'),                   # row 10
-            ("Indexes Metrics", 'yaxis23'),               # row 13 (collections)
-            ("Verifier Metrics", 'yaxis27'),              # row 15
-        ]
-        for section_name, yaxis_key in section_labels:
-            domain = fig.layout[yaxis_key].domain
-            if domain:
-                y_pos = domain[1] + 0.012
-                fig.add_annotation(
-                    x=0.5, y=y_pos, xref='paper', yref='paper',
-                    text=f'<b>{section_name}</b>',
-                    **section_label_style(),
-                )
-        
-        # Synchronize X-axis date range across all date-based plots
-        # Tables at row 1 col 2 and row 5 col 2 are excluded; row 4 col 2 is intentionally empty
-        if global_min_date and global_max_date:
-            fig.update_xaxes(range=[global_min_date, global_max_date], row=1, col=1)
-            for row in range(2, 4):  # rows 2-3 (both cols are charts)
-                for col in range(1, 3):
-                    fig.update_xaxes(range=[global_min_date, global_max_date], row=row, col=col)
-            fig.update_xaxes(range=[global_min_date, global_max_date], row=4, col=1)
-            fig.update_xaxes(range=[global_min_date, global_max_date], row=5, col=1)
-            for row in range(6, 18):  # rows 6-17 (both cols are charts)
-                for col in range(1, 3):
-                    fig.update_xaxes(range=[global_min_date, global_max_date], row=row, col=col)
-
-        apply_mi_theme(
-            fig,
-            title="Mongosync Replication Progress - "
-            + version_text
-            + " - Timezone info: "
-            + timeZoneInfo,
-            height=17 * 225,
-            width=1450,
-            legend_tracegroupgap=190,
-            legend=dict(y=1),
+    else:
+        fig.add_trace(
+            go.Scatter(
+                x=[0],
+                y=[0],
+                text="NO DATA",
+                mode='text',
+                name='Collections summary',
+                textfont=dict(size=30, color="black"),
+            ),
+            row=13,
+            col=2,
         )
-
-        # Convert the figure to JSON
-        plot_json = json.dumps(fig, cls=PlotlyJSONEncoder) if logs_line_count > 0 else ""
-
-        logger.info(f"Render the plot in the browser")
-        
-        # Generate metrics plot if we have metrics data
-        metrics_plot_json = ""
-        if metrics_collector.metrics_count > 0:
-            logger.info(f"Creating Prometheus metrics plots")
-            metrics_plot_json = create_metrics_plots(metrics_collector)
-
-        # Prepare mongosync options data for HTML table
-        options_data = []
-        if mongosync_opts_list:
-            for key, value in mongosync_opts_list[0].items():
-                # Convert complex values to string representation
-                if isinstance(value, (dict, list)):
-                    value = json.dumps(value, indent=2)
-                options_data.append({'key': str(key), 'value': str(value)})
-        
-        # Prepare hidden options data for HTML table
-        hidden_options_data = []
-        if mongosync_hiddenflags:
-            for key, value in mongosync_hiddenflags[0].items():
-                # Convert complex values to string representation
-                if isinstance(value, (dict, list)):
-                    value = json.dumps(value, indent=2)
-                hidden_options_data.append({'key': str(key), 'value': str(value)})
-
-        # Prepare start options data for HTML table
-        start_options_data = []
-        if mongosync_start_options:
-            for key, value in mongosync_start_options[0].items():
-                if isinstance(value, (dict, list)):
-                    value = json.dumps(value, indent=2)
-                start_options_data.append({'key': str(key), 'value': str(value)})
-
-        # Deduplicate natural order collections
-        natural_order_data = []
-        seen_nat = set()
-        for item in natural_order_collections:
-            key = (item['database'], item['collection'])
-            if key not in seen_nat:
-                seen_nat.add(key)
-                natural_order_data.append(item)
-
-        # Determine which tabs have data
-        has_logs_data = logs_line_count > 0 and len(data) > 0
-        has_metrics_data = metrics_collector.metrics_count > 0
-
-        template_data = {
-            'plot_json': plot_json,
-            'metrics_plot_json': metrics_plot_json,
-            'options_data': options_data,
-            'hidden_options_data': hidden_options_data,
-            'start_options_data': start_options_data,
-            'natural_order_data': natural_order_data,
-            'errors_data': matched_errors,
-            'partition_init_data': partition_init_data,
-            'has_logs_data': has_logs_data,
-            'has_metrics_data': has_metrics_data,
-            'log_viewer_lines': log_viewer_lines_out,
-            'log_viewer_max_lines': LOG_VIEWER_MAX_LINES,
-            'log_store_id': store_id,
-        }
-
-        snapshot_id = str(uuid_mod.uuid4())
-        try:
-            save_snapshot(snapshot_id, filename, file_size, line_count, store_id, template_data)
-        except Exception as e:
-            logger.warning(f"Failed to save snapshot: {e}")
-
-        return render_template('upload_results.html', **template_data)
+        fig.update_yaxes(range=[-1, 1], row=13, col=2)
+        fig.update_xaxes(range=[-1, 1], row=13, col=2)
+
+    # Row 14: Index Built Over Time
+    if index_built_times:
+        fig.add_trace(go.Scattergl(x=index_built_times, y=indexes_built, mode='lines', name='Indexes Built', legendgroup="groupIndexBuilt"), row=14, col=1)
+    else:
+        fig.add_trace(go.Scatter(x=[0], y=[0], text="NO DATA", mode='text', name='Index Built', textfont=dict(size=30, color="black")), row=14, col=1)
+        fig.update_yaxes(range=[-1, 1], row=14, col=1)
+        fig.update_xaxes(range=[-1, 1], row=14, col=1)
+
+    # Row 14: Total and Index Built
+    if index_built_times:
+        last_built = indexes_built[-1]
+        last_total = indexes_total[-1]
+        fig.add_trace(go.Bar(name='Total Indexes', x=['Indexes'], y=[last_total], legendgroup="groupIndexBuilt"), row=14, col=2)
+        fig.add_trace(go.Bar(name='Indexes Built', x=['Indexes'], y=[last_built], legendgroup="groupIndexBuilt"), row=14, col=2)
+    else:
+        fig.add_trace(go.Scatter(x=[0], y=[0], text="NO DATA", mode='text', name='Total and Index Built', textfont=dict(size=30, color="black")), row=14, col=2)
+        fig.update_yaxes(range=[-1, 1], row=14, col=2)
+        fig.update_xaxes(range=[-1, 1], row=14, col=2)
+
+    # Row 15: Source Verifier Lag Time
+    if verifierSrcLagTimeSeconds:
+        fig.add_trace(go.Scattergl(x=src_lag_times, y=verifierSrcLagTimeSeconds, mode='lines', name='Source Verifier Lag Time (seconds)', legendgroup="groupVerifierLag"), row=15, col=1)
+    else:
+        fig.add_trace(go.Scatter(x=[0], y=[0], text="NO DATA", mode='text', name='Source Verifier Lag Time', textfont=dict(size=30, color="black")), row=15, col=1)
+        fig.update_yaxes(range=[-1, 1], row=15, col=1)
+        fig.update_xaxes(range=[-1, 1], row=15, col=1)
+
+    # Row 15: Destination Verifier Lag Time
+    if verifierDstLagTimeSeconds:
+        fig.add_trace(go.Scattergl(x=dst_lag_times, y=verifierDstLagTimeSeconds, mode='lines', name='Destination Verifier Lag Time (seconds)', legendgroup="groupVerifierLag"), row=15, col=2)
+    else:
+        fig.add_trace(go.Scatter(x=[0], y=[0], text="NO DATA", mode='text', name='Destination Verifier Lag Time', textfont=dict(size=30, color="black")), row=15, col=2)
+        fig.update_yaxes(range=[-1, 1], row=15, col=2)
+        fig.update_xaxes(range=[-1, 1], row=15, col=2)
+
+    # Row 16: Verification collection scan (source / destination)
+    if any(v is not None for v in verif_src_scanned) or any(v is not None for v in verif_src_total_coll):
+        fig.add_trace(go.Scattergl(x=verif_src_scan_times, y=verif_src_scanned, mode='lines', name='Source scanned collections', legendgroup="groupVerifierScan"), row=16, col=1)
+        fig.add_trace(go.Scattergl(x=verif_src_scan_times, y=verif_src_total_coll, mode='lines', name='Source total collections', legendgroup="groupVerifierScan"), row=16, col=1)
+    else:
+        fig.add_trace(go.Scatter(x=[0], y=[0], text="NO DATA", mode='text', name='Verification collections (source)', textfont=dict(size=30, color="black")), row=16, col=1)
+        fig.update_yaxes(range=[-1, 1], row=16, col=1)
+        fig.update_xaxes(range=[-1, 1], row=16, col=1)
+    if any(v is not None for v in verif_dst_scanned) or any(v is not None for v in verif_dst_total_coll):
+        fig.add_trace(go.Scattergl(x=verif_dst_scan_times, y=verif_dst_scanned, mode='lines', name='Destination scanned collections', legendgroup="groupVerifierScan"), row=16, col=2)
+        fig.add_trace(go.Scattergl(x=verif_dst_scan_times, y=verif_dst_total_coll, mode='lines', name='Destination total collections', legendgroup="groupVerifierScan"), row=16, col=2)
+    else:
+        fig.add_trace(go.Scatter(x=[0], y=[0], text="NO DATA", mode='text', name='Verification collections (destination)', textfont=dict(size=30, color="black")), row=16, col=2)
+        fig.update_yaxes(range=[-1, 1], row=16, col=2)
+        fig.update_xaxes(range=[-1, 1], row=16, col=2)
+
+    # Row 17: Verification document hash (source / destination)
+    if any(v is not None for v in verif_src_hashed) or any(v is not None for v in verif_src_estimated):
+        fig.add_trace(go.Scattergl(x=verif_src_hash_times, y=verif_src_hashed, mode='lines', name='Source hashed documents', legendgroup="groupVerifierHash"), row=17, col=1)
+        fig.add_trace(go.Scattergl(x=verif_src_hash_times, y=verif_src_estimated, mode='lines', name='Source estimated documents', legendgroup="groupVerifierHash"), row=17, col=1)
+    else:
+        fig.add_trace(go.Scatter(x=[0], y=[0], text="NO DATA", mode='text', name='Verification document hash (source)', textfont=dict(size=30, color="black")), row=17, col=1)
+        fig.update_yaxes(range=[-1, 1], row=17, col=1)
+        fig.update_xaxes(range=[-1, 1], row=17, col=1)
+    if any(v is not None for v in verif_dst_hashed) or any(v is not None for v in verif_dst_estimated):
+        fig.add_trace(go.Scattergl(x=verif_dst_hash_times, y=verif_dst_hashed, mode='lines', name='Destination hashed documents', legendgroup="groupVerifierHash"), row=17, col=2)
+        fig.add_trace(go.Scattergl(x=verif_dst_hash_times, y=verif_dst_estimated, mode='lines', name='Destination estimated documents', legendgroup="groupVerifierHash"), row=17, col=2)
+    else:
+        fig.add_trace(go.Scatter(x=[0], y=[0], text="NO DATA", mode='text', name='Verification document hash (destination)', textfont=dict(size=30, color="black")), row=17, col=2)
+        fig.update_yaxes(range=[-1, 1], row=17, col=2)
+        fig.update_xaxes(range=[-1, 1], row=17, col=2)
+
+    # Force all y-axes to start at 0 for better visual comparison
+    fig.update_yaxes(rangemode='tozero')
+    
+    # Add section label annotations above each section group
+    section_labels = [
+        ("Global Migration Metrics", 'yaxis'),        # row 1
+        ("Collection Copy Metrics", 'yaxis8'),        # row 5 (partition)
+        ("CEA Metrics", 'yaxis17'),                   # row 10
+        ("Indexes Metrics", 'yaxis23'),               # row 13 (collections)
+        ("Verifier Metrics", 'yaxis27'),              # row 15
+    ]
+    for section_name, yaxis_key in section_labels:
+        domain = fig.layout[yaxis_key].domain
+        if domain:
+            y_pos = domain[1] + 0.012
+            fig.add_annotation(
+                x=0.5, y=y_pos, xref='paper', yref='paper',
+                text=f'<b>{section_name}</b>',
+                **section_label_style(),
+            )
+    
+    # Synchronize X-axis date range across all date-based plots
+    # Tables at row 1 col 2 and row 5 col 2 are excluded; row 4 col 2 is intentionally empty
+    if global_min_date and global_max_date:
+        fig.update_xaxes(range=[global_min_date, global_max_date], row=1, col=1)
+        for row in range(2, 4):  # rows 2-3 (both cols are charts)
+            for col in range(1, 3):
+                fig.update_xaxes(range=[global_min_date, global_max_date], row=row, col=col)
+        fig.update_xaxes(range=[global_min_date, global_max_date], row=4, col=1)
+        fig.update_xaxes(range=[global_min_date, global_max_date], row=5, col=1)
+        for row in range(6, 18):  # rows 6-17 (both cols are charts)
+            for col in range(1, 3):
+                fig.update_xaxes(range=[global_min_date, global_max_date], row=row, col=col)
+
+    apply_mi_theme(
+        fig,
+        title="Mongosync Replication Progress - "
+        + version_text
+        + " - Timezone info: "
+        + timeZoneInfo,
+        height=17 * 225,
+        width=1450,
+        legend_tracegroupgap=190,
+        legend=dict(y=1),
+    )
+
+    # Convert the figure to JSON
+    plot_json = json.dumps(fig, cls=PlotlyJSONEncoder) if logs_line_count > 0 else ""
+
+    logger.info(f"Render the plot in the browser")
+    
+    # Generate metrics plot if we have metrics data
+    metrics_plot_json = ""
+    if metrics_collector.metrics_count > 0:
+        logger.info(f"Creating Prometheus metrics plots")
+        metrics_plot_json = create_metrics_plots(metrics_collector)
+
+    # Prepare mongosync options data for HTML table
+    options_data = []
+    if mongosync_opts_list:
+        for key, value in mongosync_opts_list[0].items():
+            # Convert complex values to string representation
+            if isinstance(value, (dict, list)):
+                value = json.dumps(value, indent=2)
+            options_data.append({'key': str(key), 'value': str(value)})
+    
+    # Prepare hidden options data for HTML table
+    hidden_options_data = []
+    if mongosync_hiddenflags:
+        for key, value in mongosync_hiddenflags[0].items():
+            # Convert complex values to string representation
+            if isinstance(value, (dict, list)):
+                value = json.dumps(value, indent=2)
+            hidden_options_data.append({'key': str(key), 'value': str(value)})
+
+    # Prepare start options data for HTML table
+    start_options_data = []
+    if mongosync_start_options:
+        for key, value in mongosync_start_options[0].items():
+            if isinstance(value, (dict, list)):
+                value = json.dumps(value, indent=2)
+            start_options_data.append({'key': str(key), 'value': str(value)})
+
+    # Deduplicate natural order collections
+    natural_order_data = []
+    seen_nat = set()
+    for item in natural_order_collections:
+        key = (item['database'], item['collection'])
+        if key not in seen_nat:
+            seen_nat.add(key)
+            natural_order_data.append(item)
+
+    # All chart series are built; spilled category records are no longer needed
+    log_store.drop_spilled_records()
+    errors_suppressed = matched_errors.suppressed_counts()
+    if errors_suppressed:
+        logger.info(f"Error captures capped at {MAX_ERROR_CAPTURES} per pattern; "
+                    f"matches not kept: {errors_suppressed}")
+
+    # Determine which tabs have data
+    has_logs_data = logs_line_count > 0 and len(data) > 0
+    has_metrics_data = metrics_collector.metrics_count > 0
+
+    template_data = {
+        'plot_json': plot_json,
+        'metrics_plot_json': metrics_plot_json,
+        'options_data': options_data,
+        'hidden_options_data': hidden_options_data,
+        'start_options_data': start_options_data,
+        'natural_order_data': natural_order_data,
+        'errors_data': list(matched_errors),
+        'errors_suppressed': errors_suppressed,
+        'max_error_captures': MAX_ERROR_CAPTURES,
+        'partition_init_data': partition_init_data,
+        'has_logs_data': has_logs_data,
+        'has_metrics_data': has_metrics_data,
+        'log_viewer_lines': log_viewer_lines_out,
+        'log_viewer_max_lines': LOG_VIEWER_MAX_LINES,
+        'log_store_id': store_id,
+    }
+
+    if progress is not None:
+        progress.update(phase='saving')
+    snapshot_id = str(uuid_mod.uuid4())
+    try:
+        save_snapshot(snapshot_id, filename, file_size, line_count, store_id, template_data)
+    except Exception as e:
+        logger.warning(f"Failed to save snapshot: {e}")
+        snapshot_id = ''
+
+    # Report memory high-water marks so operators can size hosts
+    peak_rss = peak_rss_bytes()
+    if peak_rss is not None:
+        rss_message = f"Peak RSS after processing {filename}: {format_bytes_compact(peak_rss)}"
+        if ingest.workers > 1:
+            rss_message += f" (largest parse worker: {format_bytes_compact(peak_rss_bytes(children=True))})"
+        if ingest.spill_count:
+            rss_message += f"; category records spilled to the log store {ingest.spill_count} time(s)"
+        logger.info(rss_message)
+
+    return snapshot_id, template_data
@@ -14,6 +14,8 @@ from datetime import datetime
 from collections import defaultdict, OrderedDict
 from typing import Dict, List, Any, Tuple, Optional
 
+from .json_backend import loads as json_loads
+from .timestamps import parse_log_time
 from .plot_theme import apply_mi_theme, section_label_style, no_data_text_style
 
 logger = logging.getLogger(__name__)
@@ -104,7 +106,7 @@ def parse_metrics_log_line(line: str) -> Tuple[Optional[datetime], List[Dict[str
         Tuple of (timestamp as datetime, list of parsed metrics)
     """
     try:
-        json_obj = json.loads(line)
+        json_obj = json_loads(line)
         time_str = json_obj.get('time', '')
         message = json_obj.get('message', '')
         
@@ -113,7 +115,7 @@ def parse_metrics_log_line(line: str) -> Tuple[Optional[datetime], List[Dict[str
         if time_str:
             try:
                 # Handle ISO format with microseconds
-                timestamp = datetime.strptime(time_str[:26], "%Y-%m-%dT%H:%M:%S.%f")
+                timestamp = parse_log_time(time_str)
             except ValueError:
                 try:
                     timestamp = datetime.strptime(time_str[:19], "%Y-%m-%dT%H:%M:%S")
@@ -0,0 +1,92 @@
+"""
+Category record collections that can spill to the per-upload log store.
+
+In bounded-memory ingest, list categories that grow with the log (sent
+responses, partition and phase events, ...) hold their records pickled.
+When the records of all categories exceed the memory budget, LogIngest
+moves them into the upload's SQLite log store; they are streamed back
+one at a time whenever the category is iterated.
+"""
+import pickle
+from typing import Any, Iterator
+
+
+def record_time(record: Any) -> str:
+    """Return the 'time' sort key of a dict or record object ('' if missing)."""
+    if isinstance(record, dict):
+        time = record.get('time', '')
+    else:
+        time = getattr(record, 'time', '')
+    return time if isinstance(time, str) else ''
+
+
+class SpillableRecords:
+    """
+    Append-only record collection, iterated in append order or, after
+    sort_by_time(), stably by time like list.sort(key=time).
+    """
+
+    def __init__(self, category: str, log_store):
+        self.category = category
+        self._log_store = log_store
+        # (time, seq, pickled record) not yet written to the log store
+        self._pending: list[tuple[str, int, bytes]] = []
+        self.pending_bytes = 0
+        self._count = 0
+        self._spilled = False
+        self._sorted = False
+        # Records decoded by sort_by_time() when nothing was spilled
+        self._loaded: list = []
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator:
+        if self._loaded or (self._sorted and not self._spilled):
+            return iter(self._loaded)
+        return self._iter_records()
+
+    def _iter_records(self) -> Iterator:
+        if self._spilled:
+            for blob in self._log_store.iter_spilled_records(self.category, by_time=self._sorted):
+                yield pickle.loads(blob)
+        for _, _, blob in self._pending:
+            yield pickle.loads(blob)
+
+    def append(self, record: Any):
+        blob = pickle.dumps(record, pickle.HIGHEST_PROTOCOL)
+        self._pending.append((record_time(record), self._count, blob))
+        self._count += 1
+        self.pending_bytes += len(blob)
+
+    def extend(self, records):
+        for record in records:
+            self.append(record)
+
+    def spill(self):
+        """Move the pending records into the log store."""
+        if not self._pending:
+            return
+        self._log_store.spill_records(self.category, self._pending)
+        self._spilled = True
+        self._pending = []
+        self.pending_bytes = 0
+
+    def sort_by_time(self):
+        """Order later iteration by time; the store sorts spilled records."""
+        if self._spilled:
+            self.spill()
+        else:
+            self._pending.sort(key=lambda row: row[0])
+            self._loaded = [pickle.loads(blob) for _, _, blob in self._pending]
+            self._pending = []
+            self.pending_bytes = 0
+        self._sorted = True
+
+
+def sort_records_by_time(records):
+    """Stably sort a category by time, whether it is a list or SpillableRecords."""
+    if isinstance(records, list):
+        records.sort(key=record_time)
+    else:
+        records.sort_by_time()
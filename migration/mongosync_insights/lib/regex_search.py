@@ -0,0 +1,136 @@
+"""
+Trigram prefilter for regular expression searches in the Log Viewer.
+
+A regex cannot be answered by an FTS5 MATCH directly, but every line it
+matches must contain the literal text the pattern requires (for
+"E11000 duplicate key.*collection" that is "E11000 duplicate key" and
+"collection"). regex_trigram_query() turns those literals into an FTS5
+query over the store's trigram index (one AND term per distinct
+trigram), which narrows the lines the regex itself has to be run on.
+The prefilter may let through lines that do not match, never the other
+way round.
+
+compile_regex() also rejects patterns that could backtrack for minutes
+on a single line: patterns longer than MAX_PATTERN_LENGTH and unbounded
+repeats nested inside another unbounded repeat, such as "(a+)+$".
+
+The index holds the raw JSON lines, where a JSON encoder may escape
+quotes, backslashes, control characters, <, > and & and any non-ASCII
+character, so literals are split at those characters: the text on
+either side appears verbatim in both the message and the raw line.
+"""
+import re
+from re import _parser
+from typing import Optional
+
+# Trigram AND terms per query; more add little selectivity but cost a doclist each
+MAX_TRIGRAMS = 32
+# Longest search pattern accepted, in characters
+MAX_PATTERN_LENGTH = 500
+
+_OPAQUE_CHARS = re.compile(r'[^\x20-\x7e]|["\\<>&]')
+# With IGNORECASE Python also matches i against dotless/dotted I (U+0131,
+# U+0130), which the index does not fold to i
+_CASE_OPAQUE_CHARS = re.compile(r'[iI]')
+_REPEATS = (_parser.MAX_REPEAT, _parser.MIN_REPEAT, _parser.POSSESSIVE_REPEAT)
+
+
+def compile_regex(pattern: str) -> re.Pattern:
+    """
+    Compile a user search pattern, raising ValueError if it is invalid,
+    too long or nests unbounded repeats (catastrophic backtracking).
+    """
+    if len(pattern) > MAX_PATTERN_LENGTH:
+        raise ValueError(f"Regular expression is longer than {MAX_PATTERN_LENGTH} characters")
+    try:
+        parsed = _parser.parse(pattern)
+        compiled = re.compile(pattern)
+    except re.error as e:
+        raise ValueError(f"Invalid regular expression: {e}") from e
+    if _has_nested_repeat(parsed, False):
+        raise ValueError("Regular expression nests unbounded repeats (such as (a+)+), "
+                         "which can take too long to search")
+    return compiled
+
+
+def _has_nested_repeat(items, in_repeat: bool) -> bool:
+    """Internal: whether an unbounded repeat in items contains (or is inside) another."""
+    for op, arg in items:
+        if op in _REPEATS:
+            unbounded = arg[1] == _parser.MAXREPEAT
+            if unbounded and in_repeat:
+                return True
+            if _has_nested_repeat(arg[2], in_repeat or unbounded):
+                return True
+        elif op is _parser.SUBPATTERN:
+            if _has_nested_repeat(arg[3], in_repeat):
+                return True
+        elif op is _parser.ATOMIC_GROUP:
+            if _has_nested_repeat(arg, in_repeat):
+                return True
+        elif op is _parser.BRANCH:
+            if any(_has_nested_repeat(branch, in_repeat) for branch in arg[1]):
+                return True
+        elif op in (_parser.ASSERT, _parser.ASSERT_NOT):
+            if _has_nested_repeat(arg[1], in_repeat):
+                return True
+        elif op is _parser.GROUPREF_EXISTS:
+            if any(_has_nested_repeat(branch, in_repeat) for branch in arg[1:] if branch):
+                return True
+    return False
+
+
+def required_literals(pattern: str) -> list[str]:
+    """
+    Literal strings every match of pattern contains, in pattern order.
+
+    Only literals outside alternations and optional parts are returned;
+    a pattern without any (".*", "a|b") gives an empty list.
+    """
+    parsed = _parser.parse(pattern)
+    literals: list[str] = []
+    _collect(parsed, bool(parsed.state.flags & re.IGNORECASE), literals)
+    return [part for literal in literals for part in _OPAQUE_CHARS.split(literal) if part]
+
+
+def _collect(items, ignorecase: bool, literals: list[str]):
+    """Internal: append the literal runs of a parsed sequence to literals."""
+    run: list[str] = []
+
+    def end_run():
+        if run:
+            text = ''.join(run)
+            literals.extend(_CASE_OPAQUE_CHARS.split(text) if ignorecase else [text])
+            run.clear()
+
+    for op, arg in items:
+        if op is _parser.LITERAL:
+            run.append(chr(arg))
+            continue
+        end_run()
+        if op is _parser.SUBPATTERN:
+            _group, add_flags, del_flags, sub_items = arg
+            sub_ignorecase = (ignorecase or bool(add_flags & re.IGNORECASE)) and not del_flags & re.IGNORECASE
+            _collect(sub_items, sub_ignorecase, literals)
+        elif op is _parser.ATOMIC_GROUP:
+            _collect(arg, ignorecase, literals)
+        elif op in _REPEATS and arg[0] >= 1:
+            _collect(arg[2], ignorecase, literals)
+    end_run()
+
+
+def regex_trigram_query(pattern: str) -> Optional[str]:
+    """
+    FTS5 MATCH expression for a trigram index that every line matching
+    pattern satisfies, or None if the pattern requires no literal of at
+    least three characters (the caller must then scan).
+    """
+    trigrams: list[str] = []
+    for literal in required_literals(pattern):
+        for i in range(len(literal) - 2):
+            trigram = literal[i:i + 3].lower()
+            if trigram not in trigrams:
+                trigrams.append(trigram)
+    if not trigrams:
+        return None
+    return ' AND '.join('"' + t.replace('"', '""') + '"' for t in trigrams[:MAX_TRIGRAMS])
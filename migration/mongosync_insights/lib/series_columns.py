@@ -0,0 +1,106 @@
+"""
+Columnar accumulator for the chart series of a log category.
+
+Categories such as replication progress and operation stats produce one
+point per log line in several charts. Instead of keeping every matching
+log line as a dict until plotting, ColumnarSeries keeps the line's time
+plus only the fields the charts read. Numeric fields go into typed
+arrays ('d' = C double). Each column records which rows it has a value
+for, so a column returns exactly the values a
+`[item[field] for item in items if field in item]` pass over the dicts
+would have produced.
+"""
+from array import array
+from typing import Any, Optional
+
+
+class ColumnarSeries:
+    """
+    Time-ordered columns extracted from the log lines of one category.
+
+    Behaves like the list of dicts it replaces where the ingest code
+    relies on it: append() takes a parsed log line, extend() merges
+    another instance, and len() is the number of lines appended.
+    """
+
+    def __init__(self, columns: dict[str, Optional[str]]):
+        """
+        Args:
+            columns: field name -> array typecode. Dotted names address
+                nested fields ('CEASourceRead.averageDurationMs'). A
+                typecode of 'd' stores the value converted with float() and
+                skips values that do not convert; None stores the raw value.
+        """
+        self._specs = {name: (tuple(name.split('.')), typecode) for name, typecode in columns.items()}
+        # Sort key of every row: its 'time' string, '' when missing
+        self.times: list[str] = []
+        self._rows: dict[str, array] = {name: array('q') for name in columns}
+        self._values: dict[str, Any] = {
+            name: array(typecode) if typecode else [] for name, typecode in columns.items()
+        }
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, ColumnarSeries):
+            return NotImplemented
+        return (self._specs == other._specs and self.times == other.times
+                and self._rows == other._rows and self._values == other._values)
+
+    def append(self, json_obj: dict):
+        """Add one parsed log line, keeping only the configured fields."""
+        row = len(self.times)
+        time = json_obj.get('time', '')
+        self.times.append(time if isinstance(time, str) else '')
+        for name, (path, typecode) in self._specs.items():
+            value = json_obj
+            for key in path:
+                if not isinstance(value, dict) or key not in value:
+                    break
+                value = value[key]
+            else:
+                if typecode:
+                    try:
+                        value = float(value)
+                    except (TypeError, ValueError):
+                        continue
+                self._rows[name].append(row)
+                self._values[name].append(value)
+
+    def extend(self, other: 'ColumnarSeries'):
+        """Append all rows of another instance built with the same columns."""
+        offset = len(self.times)
+        self.times.extend(other.times)
+        for name in self._specs:
+            self._rows[name].extend(array('q', (row + offset for row in other._rows[name])))
+            self._values[name].extend(other._values[name])
+
+    def sort_by_time(self):
+        """Stably reorder the rows by time, like list.sort(key=time)."""
+        times = self.times
+        if all(a <= b for a, b in zip(times, times[1:])):
+            return
+        order = sorted(range(len(times)), key=times.__getitem__)
+        rank = [0] * len(order)
+        for position, row in enumerate(order):
+            rank[row] = position
+        self.times = [times[row] for row in order]
+        for name, (_, typecode) in self._specs.items():
+            rows = self._rows[name]
+            values = self._values[name]
+            positions = sorted(range(len(rows)), key=lambda k: rank[rows[k]])
+            self._rows[name] = array('q', (rank[rows[k]] for k in positions))
+            reordered = [values[k] for k in positions]
+            self._values[name] = array(typecode, reordered) if typecode else reordered
+
+    def column(self, name: str) -> list:
+        """Return the values of rows that have the field, in row order."""
+        return list(self._values[name])
+
+    def column_by_row(self, name: str) -> list:
+        """Return one entry per row: the field value, or None if absent."""
+        result = [None] * len(self.times)
+        for row, value in zip(self._rows[name], self._values[name]):
+            result[row] = value
+        return result
@@ -0,0 +1,145 @@
+"""
+Staging of uploaded log files for background ingest jobs.
+
+The request thread writes the upload body to a staging file under
+LOG_STORE_DIR as it arrives, while the ingest job reads the same file
+through open_reader(). Reads block until the requested bytes have been
+written, so parsing overlaps the network transfer and a multi-GB upload
+is never buffered in memory. Seeking relative to the end (as zip does to
+find its central directory) waits for the whole upload.
+"""
+import io
+import logging
+import os
+import tempfile
+import threading
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+class UploadAborted(Exception):
+    """The upload ended without a complete file; shown on the error page."""
+
+    def __init__(self, title: str, message: str):
+        super().__init__(message)
+        self.title = title
+        self.message = message
+
+
+class StagedUpload:
+    """Upload body staged on disk, readable while it is still being written."""
+
+    def __init__(self, directory: str):
+        fd, self.path = tempfile.mkstemp(dir=directory, prefix='mi_upload_')
+        self._writer: Optional[io.BufferedWriter] = os.fdopen(fd, 'wb')
+        self._cond = threading.Condition()
+        # Bytes written so far; the file size once complete
+        self.size = 0
+        self.complete = False
+        self.error: Optional[UploadAborted] = None
+
+    def write(self, data: bytes):
+        """Append upload bytes; ignored once the upload ended or was removed."""
+        with self._cond:
+            if self._writer is None or not data:
+                return
+            self._writer.write(data)
+            self._writer.flush()
+            self.size += len(data)
+            self._cond.notify_all()
+
+    def finish(self):
+        """Mark the upload complete; readers see EOF after the last byte."""
+        with self._cond:
+            self._close_writer()
+            self.complete = True
+            self._cond.notify_all()
+
+    def abort(self, title: str, message: str):
+        """Fail the upload; blocked and later reads raise UploadAborted."""
+        with self._cond:
+            self._close_writer()
+            self.error = UploadAborted(title, message)
+            self._cond.notify_all()
+
+    def open_reader(self, buffer_size: int = 1024 * 1024) -> io.BufferedReader:
+        """Return a seekable binary reader that follows the upload as it grows."""
+        return io.BufferedReader(_StagedUploadReader(self), buffer_size=buffer_size)
+
+    def remove(self):
+        """Delete the staged file; writes still arriving are discarded."""
+        with self._cond:
+            self._close_writer()
+        try:
+            os.remove(self.path)
+        except OSError as e:
+            logger.warning(f"Failed to remove staged upload {self.path}: {e}")
+
+    def wait_for(self, offset: int) -> int:
+        """Block until `offset` bytes were written or the upload ended; return the size."""
+        with self._cond:
+            while self.size < offset and not self.complete and self.error is None:
+                self._cond.wait()
+            if self.error is not None:
+                raise self.error
+            return self.size
+
+    def wait_complete(self) -> int:
+        """Block until the whole upload was written and return its size."""
+        with self._cond:
+            while not self.complete and self.error is None:
+                self._cond.wait()
+            if self.error is not None:
+                raise self.error
+            return self.size
+
+    def _close_writer(self):
+        """Internal: close the staging file for writing. Caller must hold _cond."""
+        writer, self._writer = self._writer, None
+        if writer is not None:
+            writer.close()
+
+
+class _StagedUploadReader(io.RawIOBase):
+    """Raw reader over a StagedUpload; wrap in io.BufferedReader for line iteration."""
+
+    def __init__(self, upload: StagedUpload):
+        self._upload = upload
+        self._file = open(upload.path, 'rb')
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        available = self._upload.wait_for(self._pos + 1)
+        count = min(len(buffer), available - self._pos)
+        if count <= 0:
+            return 0
+        self._file.seek(self._pos)
+        count = self._file.readinto(memoryview(buffer)[:count])
+        self._pos += count
+        return count
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            self._pos = offset
+        elif whence == io.SEEK_CUR:
+            self._pos += offset
+        elif whence == io.SEEK_END:
+            self._pos = self._upload.wait_complete() + offset
+        else:
+            raise ValueError(f'Invalid whence: {whence}')
+        return self._pos
+
+    def tell(self) -> int:
+        return self._pos
+
+    def close(self):
+        if not self.closed:
+            self._file.close()
+        super().close()
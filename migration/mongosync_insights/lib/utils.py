@@ -81,3 +81,21 @@ def convert_bytes(size_bytes, target_unit):
     else:
         value = size_bytes
     return round(value, 4)
+
+
+def peak_rss_bytes(children=False):
+    """
+    Peak resident set size in bytes of this process, or of its largest
+    terminated child process (e.g. parse workers) when children is True.
+    Returns None where the platform has no getrusage (Windows).
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    import sys
+
+    who = resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF
+    peak = resource.getrusage(who).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    return peak if sys.platform == 'darwin' else peak * 1024
@@ -143,8 +143,13 @@ def _format_access_url(host: str, port: int, *, use_ssl: bool) -> str:
 
 
 if __name__ == "__main__":
+    import multiprocessing
+
     import flask.cli
 
+    # Parse workers (MI_PARSE_WORKERS) re-enter the frozen executable
+    multiprocessing.freeze_support()
+
     flask.cli.show_server_banner = lambda *args, **kwargs: None
 
     app_info = get_app_info()
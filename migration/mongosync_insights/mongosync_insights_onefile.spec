@@ -34,6 +34,14 @@ a = Analysis(
         "lib.otel_metrics",
         "lib.snapshot_store",
         "lib.log_store",
+        "lib.regex_search",
+        "lib.log_ingest",
+        "lib.json_backend",
+        "lib.timestamps",
+        "lib.series_columns",
+        "lib.record_spill",
+        "lib.ingest_jobs",
+        "lib.upload_stream",
         "lib.log_store_registry",
         "lib.log_store_maintenance",
         "lib.file_decompressor",
@@ -46,6 +54,7 @@ a = Analysis(
         "engineio.async_drivers.threading",
         "dns.resolver",
         "dns.rdatatype",
+        "zstandard",
     ],
     hookspath=[],
     hooksconfig={},
@@ -8,6 +8,7 @@ from lib import app_config
 from lib.app_config import (
     build_progress_endpoint_url,
     normalize_progress_endpoint_url,
+    parse_env_fields,
     parse_env_int,
     validate_config,
     validate_progress_endpoint_url,
@@ -44,6 +45,29 @@ class TestParseEnvInt:
                 parse_env_int("MI_TEST_INT", 42, max_value=65535)
 
 
+class TestParseEnvFields:
+    def test_default_when_unset(self):
+        with patch.dict(os.environ, {}, clear=False):
+            os.environ.pop("MI_TEST_FIELDS", None)
+            assert parse_env_fields("MI_TEST_FIELDS", "database, collection") == {
+                "database": "database", "collection": "collection"}
+
+    def test_nested_paths(self):
+        with patch.dict(os.environ, {"MI_TEST_FIELDS": "componentName,partitionDb=partition.partition.db"}):
+            assert parse_env_fields("MI_TEST_FIELDS", "") == {
+                "componentName": "componentName", "partitionDb": "partition.partition.db"}
+
+    def test_empty_string_disables(self):
+        with patch.dict(os.environ, {"MI_TEST_FIELDS": ""}):
+            assert parse_env_fields("MI_TEST_FIELDS", "database") == {}
+
+    @pytest.mark.parametrize("value", ["data-base", "db=a..b", "x=$.y", "a'b"])
+    def test_invalid_entry_raises(self, value):
+        with patch.dict(os.environ, {"MI_TEST_FIELDS": value}):
+            with pytest.raises(ValueError, match="MI_TEST_FIELDS"):
+                parse_env_fields("MI_TEST_FIELDS", "")
+
+
 class TestValidateConfig:
     @patch.object(app_config, "LOG_LEVEL", "VERBOSE")
     @patch("lib.app_config.os.access", return_value=True)
@@ -67,6 +91,18 @@ class TestValidateConfig:
         mock_path.return_value.parent.exists.return_value = True
         assert validate_config() is True
 
+    @patch.object(app_config, "LOG_STORE_LOAD_PROFILE", "fast")
+    @patch("lib.app_config.os.access", return_value=True)
+    @patch("lib.app_config.Path")
+    def test_rejects_unknown_load_profile(self, mock_path, mock_access):
+        mock_path.return_value.parent.exists.return_value = True
+        with pytest.raises(ValueError, match="MI_LOG_STORE_LOAD_PROFILE"):
+            validate_config()
+
+    def test_load_profile_names_match_log_store(self):
+        from lib.log_store import LogStore
+        assert app_config.VALID_LOG_STORE_LOAD_PROFILES == set(LogStore.LOAD_PROFILES)
+
 
 class TestProgressEndpointUrl:
     def test_build_empty_host_returns_none(self):
@@ -0,0 +1,296 @@
+"""Tests for decompression of uploaded archives and their nested members."""
+import bz2
+import gzip
+import io
+import json
+import lzma
+import os
+import subprocess
+import sys
+import tarfile
+import textwrap
+import threading
+import time
+import zipfile
+
+import pytest
+
+from lib import file_decompressor
+from lib.file_decompressor import (
+    decompress_bzip2,
+    decompress_bzip2_classified,
+    decompress_gzip,
+    decompress_gzip_classified,
+    decompress_tar,
+    decompress_tar_classified,
+    decompress_zip,
+    decompress_file_classified,
+    decompress_zip_classified,
+    get_file_extension,
+    iter_lines,
+)
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+LOG_LINES = [b'{"level":"info","message":"line %d"}\n' % i for i in range(500)]
+METRICS_LINES = [b'{"metric":%d}\n' % i for i in range(50)]
+
+
+def _members():
+    return [
+        ('mongosync.log', b''.join(LOG_LINES[:150])),
+        ('mongosync-1.log.gz', gzip.compress(b''.join(LOG_LINES[150:300]))),
+        ('mongosync-2.log.bz2', bz2.compress(b''.join(LOG_LINES[300:]))),
+        ('mongosync_metrics.log.gz', gzip.compress(b''.join(METRICS_LINES))),
+        ('notes.txt', b'not a log\n'),
+    ]
+
+
+def _zip_bytes(members):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as zf:
+        for name, data in members:
+            zf.writestr(name, data)
+    return buffer
+
+
+def _tar_bytes(members, compression):
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode=f'w:{compression}') as tf:
+        for name, data in members:
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tf.addfile(info, io.BytesIO(data))
+    return buffer
+
+
+def _archives():
+    members = _members()
+    return [
+        ('zip', _zip_bytes(members), decompress_zip, decompress_zip_classified),
+        ('tar.gz', _tar_bytes(members, 'gz'),
+         decompress_tar, lambda f: decompress_tar_classified(f, compression='gz')),
+        ('tar.bz2', _tar_bytes(members, 'bz2'),
+         lambda f: decompress_tar(f, compression='bz2'),
+         lambda f: decompress_tar_classified(f, compression='bz2')),
+    ]
+
+
+class TestIterLines:
+    @pytest.mark.parametrize('chunk_size', [1, 7, 64, 1024 * 1024])
+    def test_lines_across_chunk_boundaries(self, chunk_size):
+        data = b''.join(LOG_LINES) + b'x' * 200 + b'\n\n\r\nlast'
+        lines = list(iter_lines(io.BytesIO(data), chunk_size=chunk_size))
+        assert lines == LOG_LINES + [b'x' * 200 + b'\n', b'\n', b'\r\n', b'last']
+
+    def test_line_longer_than_chunk(self):
+        data = b'a' * 1000 + b'\n' + b'b' * 1000
+        assert list(iter_lines(io.BytesIO(data), chunk_size=16)) == [b'a' * 1000 + b'\n', b'b' * 1000]
+
+    def test_empty_stream(self):
+        assert list(iter_lines(io.BytesIO(b''))) == []
+
+    def test_single_file_decompressors(self):
+        data = b''.join(LOG_LINES)
+        assert list(decompress_gzip(io.BytesIO(gzip.compress(data)))) == LOG_LINES
+        # Concatenated streams are all read; trailing garbage after a stream is ignored
+        bz2_data = bz2.compress(data[:1000]) + bz2.compress(data[1000:]) + b'\0garbage'
+        assert list(decompress_bzip2(io.BytesIO(bz2_data))) == LOG_LINES
+        assert list(decompress_bzip2_classified(io.BytesIO(bz2_data), 'mongosync.log.bz2')) == \
+            [(line, 'logs') for line in LOG_LINES]
+
+
+class TestNestedMembers:
+    @pytest.mark.parametrize('kind, archive, plain, classified', _archives(), ids=lambda v: v if isinstance(v, str) else '')
+    def test_nested_members_are_decompressed(self, kind, archive, plain, classified):
+        assert list(plain(archive)) == LOG_LINES + METRICS_LINES + [b'not a log\n']
+        tagged = list(classified(archive))
+        assert [line for line, file_type in tagged if file_type == 'logs'] == LOG_LINES
+        assert [line for line, file_type in tagged if file_type == 'metrics'] == METRICS_LINES
+        assert len(tagged) == len(LOG_LINES) + len(METRICS_LINES)
+
+    def test_multistream_members(self):
+        data = gzip.compress(LOG_LINES[0]) + gzip.compress(LOG_LINES[1])
+        data_bz2 = bz2.compress(LOG_LINES[2]) + bz2.compress(LOG_LINES[3])
+        archive = _zip_bytes([('mongosync-1.log.gz', data), ('mongosync-2.log.bz2', data_bz2)])
+        assert list(decompress_zip(archive)) == LOG_LINES[:4]
+
+
+class TestXzAndZstd:
+    def test_xz_file(self):
+        data = io.BytesIO(lzma.compress(b''.join(LOG_LINES)))
+        lines = decompress_file_classified(data, 'application/x-xz', 'mongosync.log.xz')
+        assert list(lines) == [(line, 'logs') for line in LOG_LINES]
+
+    def test_tar_xz_bundle_with_nested_xz(self):
+        members = _members() + [('mongosync-3.log.xz', lzma.compress(b'{"extra":1}\n'))]
+        lines = decompress_file_classified(_tar_bytes(members, 'xz'), 'application/x-xz', 'bundle.tar.xz')
+        assert [line for line, file_type in lines if file_type == 'logs'] == LOG_LINES + [b'{"extra":1}\n']
+
+    def test_zstd_file_and_bundles(self):
+        zstandard = pytest.importorskip('zstandard')
+        compressor = zstandard.ZstdCompressor()
+        logs = b''.join(LOG_LINES)
+        # Two frames, as written by a shipper that flushes periodically
+        data = io.BytesIO(compressor.compress(logs[:1000]) + compressor.compress(logs[1000:]))
+        assert [line for line, _ in decompress_file_classified(data, 'application/zstd', 'mongosync.log.zst')] == LOG_LINES
+
+        tar_zst = io.BytesIO(compressor.compress(_tar_bytes(_members(), '').getvalue()))
+        lines = decompress_file_classified(tar_zst, 'application/zstd', 'bundle.tar.zst')
+        assert [line for line, file_type in lines if file_type == 'logs'] == LOG_LINES
+
+        nested = _zip_bytes([('mongosync-1.log.zst', compressor.compress(logs))])
+        assert list(decompress_zip(nested)) == LOG_LINES
+
+    def test_zstd_without_package_raises_value_error(self, monkeypatch):
+        monkeypatch.setattr('lib.file_decompressor.zstandard', None)
+        with pytest.raises(ValueError, match='zstandard'):
+            list(decompress_file_classified(io.BytesIO(b'\x28\xb5\x2f\xfd'), 'application/zstd', 'mongosync.log.zst'))
+
+    @pytest.mark.parametrize('filename, ext', [
+        ('bundle.tar.xz', '.tar.xz'), ('bundle.TAR.ZST', '.tar.zst'), ('mongosync.log.zst', '.zst'),
+    ])
+    def test_extensions(self, filename, ext):
+        assert get_file_extension(filename) == ext
+
+
+class TestParallelZipMembers:
+    @pytest.mark.parametrize('workers', [2, 8])
+    def test_same_lines_in_member_order(self, workers, monkeypatch):
+        monkeypatch.setattr('lib.file_decompressor.LINE_CHUNK_BYTES', 256)
+        monkeypatch.setattr('lib.file_decompressor.READ_AHEAD_CHUNKS', 2)
+        archive = _zip_bytes(_members())
+        assert list(decompress_zip_classified(archive, workers=workers)) == list(decompress_zip_classified(archive))
+
+    def test_member_error_is_raised(self):
+        archive = _zip_bytes([('mongosync.log', LOG_LINES[0]), ('mongosync-1.log.gz', b'not gzip data')])
+        with pytest.raises(OSError):
+            list(decompress_zip_classified(archive, workers=2))
+
+    def test_queued_bytes_bounded_by_window(self, monkeypatch):
+        chunk_bytes, read_ahead, workers = 1024, 2, 2
+        monkeypatch.setattr('lib.file_decompressor.LINE_CHUNK_BYTES', chunk_bytes)
+        monkeypatch.setattr('lib.file_decompressor.READ_AHEAD_CHUNKS', read_ahead)
+        streams = []
+        queued_stream = file_decompressor._QueuedStream
+
+        class RecordingStream(queued_stream):
+            def __init__(self, chunks):
+                super().__init__(chunks)
+                streams.append(chunks)
+
+        monkeypatch.setattr('lib.file_decompressor._QueuedStream', RecordingStream)
+        member = gzip.compress(b''.join(LOG_LINES[:20]) * 40)  # ~30 KB each
+        archive = _zip_bytes([(f'mongosync-{i}.log.gz', member) for i in range(40)])
+
+        lines = decompress_zip_classified(archive, workers=workers)
+        try:
+            assert next(lines)[1] == 'logs'
+            # Give the pool time to run ahead as far as it is allowed to
+            time.sleep(0.5)
+            queued = sum(len(chunk) for chunks in streams for chunk in list(chunks.queue)
+                         if isinstance(chunk, bytes))
+        finally:
+            lines.close()
+        assert len(streams) <= workers
+        assert queued <= workers * read_ahead * chunk_bytes
+
+    def test_consumer_stopping_early_releases_members(self, monkeypatch):
+        monkeypatch.setattr('lib.file_decompressor.LINE_CHUNK_BYTES', 64)
+        monkeypatch.setattr('lib.file_decompressor.READ_AHEAD_CHUNKS', 1)
+        lines = decompress_zip_classified(_zip_bytes(_members()), workers=4)
+        assert next(lines) == (LOG_LINES[0], 'logs')
+        lines.close()
+        assert not [t for t in threading.enumerate() if t.name.startswith('zip-member')]
+
+
+class TestPipelinedDecompression:
+    @pytest.mark.parametrize('compress, decompress', [
+        (gzip.compress, decompress_gzip_classified),
+        (bz2.compress, decompress_bzip2_classified),
+    ])
+    def test_same_lines_as_inline(self, compress, decompress, monkeypatch):
+        monkeypatch.setattr('lib.file_decompressor.LINE_CHUNK_BYTES', 100)
+        monkeypatch.setattr('lib.file_decompressor.READ_AHEAD_CHUNKS', 2)
+        data = io.BytesIO(compress(b''.join(LOG_LINES)))
+        assert list(decompress(data, 'mongosync.log.gz', pipelined=True)) == [(line, 'logs') for line in LOG_LINES]
+
+    def test_truncated_stream_error_is_raised(self):
+        data = io.BytesIO(gzip.compress(b''.join(LOG_LINES))[:-20])
+        with pytest.raises(EOFError):
+            list(decompress_gzip_classified(data, 'mongosync.log.gz', pipelined=True))
+
+    def test_consumer_stopping_early_stops_reader(self, monkeypatch):
+        monkeypatch.setattr('lib.file_decompressor.LINE_CHUNK_BYTES', 64)
+        monkeypatch.setattr('lib.file_decompressor.READ_AHEAD_CHUNKS', 1)
+        data = io.BytesIO(gzip.compress(b''.join(LOG_LINES)))
+        lines = decompress_gzip_classified(data, 'mongosync.log.gz', pipelined=True)
+        assert next(lines) == (LOG_LINES[0], 'logs')
+        lines.close()
+        assert not [t for t in threading.enumerate() if t.name == 'decompress-pipeline']
+
+
+# Decompresses a large archive in a fresh interpreter and prints how much its
+# peak RSS grew, so earlier tests in this process cannot hide the growth
+_RSS_SCRIPT = textwrap.dedent('''
+    import resource, sys
+    from lib.file_decompressor import decompress_tar_classified, decompress_zip_classified
+    path, kind = sys.argv[1], sys.argv[2]
+    before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    with open(path, 'rb') as f:
+        if kind == 'zip':
+            lines = decompress_zip_classified(f)
+        else:
+            lines = decompress_tar_classified(f, compression='gz')
+        total = sum(len(line) for line, _file_type in lines)
+    after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(total, (after - before) * 1024)
+''')
+
+LARGE_MEMBER_MB = 64
+RSS_GROWTH_LIMIT_MB = 16
+
+
+def _write_large_members(directory):
+    """Write a .gz and a .bz2 log of LARGE_MEMBER_MB uncompressed each; return their paths and size."""
+    block = b''.join(
+        json.dumps({'level': 'info', 'message': f'Replicating batch {i}', 'pad': 'x' * 64}).encode() + b'\n'
+        for i in range(10000)
+    )
+    repeats = LARGE_MEMBER_MB * 1024 * 1024 // len(block)
+    gz_path = os.path.join(directory, 'mongosync-1.log.gz')
+    bz2_path = os.path.join(directory, 'mongosync-2.log.bz2')
+    with gzip.open(gz_path, 'wb', compresslevel=1) as gz, bz2.open(bz2_path, 'wb', compresslevel=1) as bz:
+        for _ in range(repeats):
+            gz.write(block)
+            bz.write(block)
+    return [gz_path, bz2_path], len(block) * repeats
+
+
+@pytest.fixture(scope='module')
+def large_archives(tmp_path_factory):
+    directory = tmp_path_factory.mktemp('large_archives')
+    paths, member_size = _write_large_members(str(directory))
+    zip_path = directory / 'bundle.zip'
+    with zipfile.ZipFile(zip_path, 'w') as zf:
+        for path in paths:
+            zf.write(path, os.path.basename(path))
+    tar_path = directory / 'bundle.tar.gz'
+    with tarfile.open(tar_path, 'w:gz', compresslevel=1) as tf:
+        for path in paths:
+            tf.add(path, os.path.basename(path))
+    return {'zip': str(zip_path), 'tar.gz': str(tar_path)}, 2 * member_size
+
+
+@pytest.mark.skipif(sys.platform != 'linux', reason='ru_maxrss is reported in KB on Linux only')
+class TestBoundedMemory:
+    @pytest.mark.parametrize('kind', ['zip', 'tar.gz'])
+    def test_peak_rss_does_not_grow_with_member_size(self, large_archives, kind):
+        paths, expected_bytes = large_archives
+        result = subprocess.run(
+            [sys.executable, '-c', _RSS_SCRIPT, paths[kind], kind],
+            cwd=APP_DIR, capture_output=True, text=True, check=True,
+        )
+        total, growth = map(int, result.stdout.split())
+        assert total == expected_bytes
+        assert growth < RSS_GROWTH_LIMIT_MB * 1024 * 1024
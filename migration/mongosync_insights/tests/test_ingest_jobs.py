@@ -0,0 +1,395 @@
+"""Tests for the background ingest job queue and its /logs/job routes."""
+import gzip
+import io
+import json
+import threading
+import time
+from unittest.mock import patch
+from urllib.parse import quote
+
+import pytest
+
+from lib import snapshot_store
+from lib.ingest_jobs import IngestJob, IngestJobManager
+from lib.log_store_registry import log_store_registry
+
+
+def _wait_finished(job, timeout=30):
+    deadline = time.time() + timeout
+    while not job.finished:
+        assert time.time() < deadline, f"job still in phase {job.phase!r}"
+        time.sleep(0.02)
+
+
+def _progress_log(n=20):
+    lines = []
+    for i in range(n):
+        lines.append(json.dumps({
+            'level': 'info',
+            'time': f'2024-03-01T00:00:{i:02d}.000000-05:00',
+            'message': 'Replication progress.',
+            'totalEventsApplied': i * 10,
+            'lagTimeSeconds': 5,
+        }))
+    return ('\n'.join(lines) + '\n').encode()
+
+
+class TestIngestJob:
+    def test_progress_rates_and_eta(self):
+        job = IngestJob('mongosync.log', 1000)
+        job.update(phase='parsing')
+        job._parse_started -= 2.0
+        job.update(bytes_read=250, lines=4000)
+        status = job.to_dict()
+        assert status['phase'] == 'parsing'
+        assert status['bytes_read'] == 250
+        assert status['lines_per_second'] == pytest.approx(2000, rel=0.05)
+        assert status['eta_seconds'] == pytest.approx(6.0, rel=0.05)
+
+    def test_rate_is_frozen_after_parsing(self):
+        job = IngestJob('mongosync.log', 1000)
+        job.update(phase='parsing')
+        job._parse_started -= 1.0
+        job.update(phase='indexing', bytes_read=1000, lines=1000)
+        rate = job.to_dict()['lines_per_second']
+        time.sleep(0.05)
+        status = job.to_dict()
+        assert status['lines_per_second'] == rate
+        assert status['eta_seconds'] is None
+
+    def test_bytes_read_capped_at_total(self):
+        job = IngestJob('mongosync.log', 100)
+        job.update(bytes_read=150)
+        assert job.bytes_read == 100
+
+    def test_finish_keeps_results_only_without_snapshot(self):
+        saved = IngestJob('a.log', 10)
+        saved.finish('snap', {'plot_json': '{}'})
+        assert saved.template_data is None
+        assert saved.to_dict()['eta_seconds'] == 0
+
+        unsaved = IngestJob('b.log', 10)
+        unsaved.finish('', {'plot_json': '{}'})
+        assert unsaved.template_data == {'plot_json': '{}'}
+        assert unsaved.finished
+
+    def test_fail(self):
+        job = IngestJob('a.log', 10)
+        job.fail('Decompression Error', 'bad archive')
+        status = job.to_dict()
+        assert status['phase'] == 'error'
+        assert status['error_title'] == 'Decompression Error'
+        assert job.finished_at is not None
+
+
+class TestIngestJobManager:
+    def test_runs_work_in_background(self):
+        manager = IngestJobManager(max_workers=2)
+        try:
+            job = manager.submit('a.log', 10, lambda j: j.finish('snap', {}))
+            _wait_finished(job)
+            assert manager.get(job.job_id) is job
+            assert manager.status(job.job_id)['snapshot_id'] == 'snap'
+        finally:
+            manager.shutdown()
+
+    def test_concurrent_jobs_are_bounded(self):
+        manager = IngestJobManager(max_workers=1)
+        release = threading.Event()
+
+        def blocking(job):
+            job.update(phase='parsing')
+            release.wait(10)
+            job.finish('snap', {})
+
+        try:
+            first = manager.submit('a.log', 10, blocking)
+            second = manager.submit('b.log', 10, blocking)
+            third = manager.submit('c.log', 10, blocking)
+            deadline = time.time() + 5
+            while first.phase != 'parsing' and time.time() < deadline:
+                time.sleep(0.01)
+            assert first.phase == 'parsing'
+            assert second.phase == 'queued'
+            assert manager.status(second.job_id)['queued_ahead'] == 0
+            assert manager.status(third.job_id)['queued_ahead'] == 1
+            release.set()
+            for job in (first, second, third):
+                _wait_finished(job)
+        finally:
+            release.set()
+            manager.shutdown()
+
+    def test_unexpected_exception_fails_job(self):
+        def broken(job):
+            raise RuntimeError('boom')
+
+        manager = IngestJobManager(max_workers=1)
+        try:
+            job = manager.submit('a.log', 10, broken)
+            _wait_finished(job)
+            assert job.phase == 'error'
+            assert job.error_title == 'Processing Error'
+            assert 'a.log' in job.error_message
+        finally:
+            manager.shutdown()
+
+    def test_work_without_result_fails_job(self):
+        manager = IngestJobManager(max_workers=1)
+        try:
+            job = manager.submit('a.log', 10, lambda j: None)
+            _wait_finished(job)
+            assert job.phase == 'error'
+        finally:
+            manager.shutdown()
+
+    def test_finished_jobs_expire(self):
+        manager = IngestJobManager(max_workers=1, finished_ttl=60)
+        try:
+            job = manager.submit('a.log', 10, lambda j: j.finish('snap', {}))
+            _wait_finished(job)
+            job.finished_at -= 120
+            assert manager.get(job.job_id) is None
+        finally:
+            manager.shutdown()
+
+
+class TestIngestJobRoutes:
+    @pytest.fixture
+    def manager(self):
+        manager = IngestJobManager(max_workers=1)
+        yield manager
+        manager.shutdown()
+
+    @pytest.fixture
+    def app_client(self, tmp_path, monkeypatch, manager):
+        log_dir = tmp_path / 'logs'
+        log_dir.mkdir()
+        store_dir = tmp_path / 'store'
+        store_dir.mkdir()
+        monkeypatch.setenv('MI_LOG_FILE', str(log_dir / 'insights.log'))
+        monkeypatch.setattr(snapshot_store, 'LOG_STORE_DIR', str(store_dir))
+        monkeypatch.setattr('lib.log_store_registry.LOG_STORE_DIR', str(store_dir))
+        monkeypatch.setattr('lib.logs_metrics.LOG_STORE_DIR', str(store_dir))
+        monkeypatch.setattr('lib.logs_metrics.INGEST_JOB_WORKERS', 1)
+        monkeypatch.setattr('lib.logs_metrics.ingest_job_manager', manager)
+        monkeypatch.setattr('blueprints.logs.ingest_job_manager', manager)
+
+        with patch('lib.app_config.validate_config', return_value=True):
+            with patch('lib.app_config.setup_logging') as mock_log:
+                mock_log.return_value = __import__('logging').getLogger('test')
+                from mongosync_insights import create_app
+                app = create_app()
+                app.config['TESTING'] = True
+                with app.test_client() as client:
+                    yield client
+
+    def _upload(self, client, content, filename='mongosync.log'):
+        return client.post(
+            '/logs/uploadLogs',
+            data={'file': (io.BytesIO(content), filename)},
+            content_type='multipart/form-data',
+        )
+
+    def test_upload_returns_job_and_redirects_to_snapshot(self, app_client, manager, tmp_path):
+        r = self._upload(app_client, _progress_log())
+        assert r.status_code == 302
+        job_id = r.headers['Location'].rstrip('/').split('/')[-2]
+        job = manager.get(job_id)
+        assert job is not None
+        _wait_finished(job)
+
+        status = app_client.get(f'/logs/job/{job_id}').get_json()
+        assert status['phase'] == 'done'
+        assert status['lines'] == 20
+        assert status['bytes_read'] == status['total_bytes']
+        assert status['result_url'].endswith(f'/logs/job/{job_id}/result')
+
+        r = app_client.get(status['result_url'])
+        assert r.status_code == 302
+        assert r.headers['Location'].endswith(f"/logs/load_snapshot/{status['snapshot_id']}")
+        # The staged upload is removed once the job has run
+        assert not list((tmp_path / 'store').glob('mi_upload_*'))
+
+    def test_progress_page_while_queued(self, app_client, manager):
+        release = threading.Event()
+        blocker = manager.submit('busy.log', 10, lambda j: (release.wait(10), j.finish('s', {})))
+        try:
+            r = self._upload(app_client, _progress_log())
+            job_id = r.headers['Location'].rstrip('/').split('/')[-2]
+            page = app_client.get(f'/logs/job/{job_id}/result')
+            assert page.status_code == 200
+            assert b'Analyzing Log File' in page.data
+            status = app_client.get(f'/logs/job/{job_id}').get_json()
+            assert status['phase'] == 'queued'
+            assert 'result_url' not in status
+        finally:
+            release.set()
+        _wait_finished(blocker)
+        _wait_finished(manager.get(job_id))
+
+    def test_no_data_reports_error(self, app_client, manager):
+        r = self._upload(app_client, b'{"level":"info","message":"hello"}\n')
+        job_id = r.headers['Location'].rstrip('/').split('/')[-2]
+        _wait_finished(manager.get(job_id))
+
+        status = app_client.get(f'/logs/job/{job_id}').get_json()
+        assert status['phase'] == 'error'
+        assert status['error_title'] == 'No Mongosync Data Found'
+        page = app_client.get(status['result_url'])
+        assert b'No Mongosync Data Found' in page.data
+
+    def test_no_data_discards_log_store(self, app_client, manager, tmp_path):
+        r = self._upload(app_client, b'{"level":"info","message":"hello"}\n')
+        job_id = r.headers['Location'].rstrip('/').split('/')[-2]
+        _wait_finished(manager.get(job_id))
+        assert manager.get(job_id).error_title == 'No Mongosync Data Found'
+        assert not list((tmp_path / 'store').glob('mi_logstore_*'))
+
+    def test_ingest_failure_discards_searchable_store(self, app_client, manager, monkeypatch, tmp_path):
+        monkeypatch.setattr('lib.logs_metrics.INCREMENTAL_LOG_INDEX', True)
+        fed = []
+
+        def broken_feed(self, line, line_no):
+            fed.append(line_no)
+            if len(fed) > 5:
+                raise RuntimeError('boom')
+
+        monkeypatch.setattr('lib.log_ingest.LogIngest.feed', broken_feed)
+        r = self._upload(app_client, _progress_log())
+        job_id = r.headers['Location'].rstrip('/').split('/')[-2]
+        job = manager.get(job_id)
+        _wait_finished(job)
+
+        assert job.phase == 'error'
+        assert job.log_store_id
+        assert log_store_registry.open_store(job.log_store_id) is None
+        assert job.log_store_id not in log_store_registry._entries
+        assert not list((tmp_path / 'store').glob('mi_logstore_*'))
+
+    def test_unknown_job(self, app_client):
+        assert app_client.get('/logs/job/not-a-uuid').status_code == 404
+        missing = 'a1b2c3d4-e5f6-7890-abcd-ef1234567890'
+        assert app_client.get(f'/logs/job/{missing}').status_code == 404
+        page = app_client.get(f'/logs/job/{missing}/result')
+        assert b'Analysis Job Not Found' in page.data
+
+    def test_streamed_upload_enforces_size_limit(self, app_client, manager, monkeypatch, tmp_path):
+        monkeypatch.setattr('lib.logs_metrics.MAX_FILE_SIZE', 3000)
+        monkeypatch.setattr('lib.logs_metrics.UPLOAD_READ_CHUNK_BYTES', 1024)
+        r = self._upload(app_client, _progress_log(100))
+        assert r.status_code == 200
+        assert b'File Too Large' in r.data
+        # The job started after the MIME sample and fails with the same error
+        (job,) = manager._jobs.values()
+        _wait_finished(job)
+        assert job.phase == 'error'
+        assert job.error_title == 'File Too Large'
+        assert not list(tmp_path.glob('store/mi_upload_*'))
+
+    def test_gzip_upload_streamed(self, app_client, manager):
+        r = self._upload(app_client, gzip.compress(_progress_log()), filename='mongosync.log.gz')
+        job_id = r.headers['Location'].rstrip('/').split('/')[-2]
+        job = manager.get(job_id)
+        _wait_finished(job)
+        assert job.phase == 'done'
+        assert job.lines == 20
+
+    def test_missing_zstandard_names_package(self, app_client, manager, monkeypatch):
+        monkeypatch.setattr('lib.file_decompressor.zstandard', None)
+        r = self._upload(app_client, b'\x28\xb5\x2f\xfd' + b'\0' * 16, filename='mongosync.log.zst')
+        job_id = r.headers['Location'].rstrip('/').split('/')[-2]
+        job = manager.get(job_id)
+        _wait_finished(job)
+        assert job.error_title == 'Decompression Error'
+        assert "'zstandard' package" in job.error_message
+
+    def test_staged_without_streaming(self, app_client, manager, monkeypatch):
+        monkeypatch.setattr('lib.logs_metrics.STREAM_UPLOADS', False)
+        content = _progress_log()
+        r = self._upload(app_client, content)
+        job_id = r.headers['Location'].rstrip('/').split('/')[-2]
+        job = manager.get(job_id)
+        assert job.total_bytes == len(content)
+        _wait_finished(job)
+        assert job.phase == 'done'
+
+    def test_incremental_index_reports_searchable_store(self, app_client, manager, monkeypatch):
+        monkeypatch.setattr('lib.logs_metrics.INCREMENTAL_LOG_INDEX', True)
+        r = self._upload(app_client, _progress_log())
+        job_id = r.headers['Location'].rstrip('/').split('/')[-2]
+        _wait_finished(manager.get(job_id))
+
+        status = app_client.get(f'/logs/job/{job_id}').get_json()
+        assert status['log_store_id']
+        found = app_client.get(f"/logs/search_logs?store_id={status['log_store_id']}&q=progress").get_json()
+        assert found['total'] == 20
+
+    def test_search_logs_cursor_pages(self, app_client, manager, monkeypatch):
+        monkeypatch.setattr('lib.logs_metrics.INCREMENTAL_LOG_INDEX', True)
+        r = self._upload(app_client, _progress_log())
+        job_id = r.headers['Location'].rstrip('/').split('/')[-2]
+        _wait_finished(manager.get(job_id))
+        store_id = manager.get(job_id).log_store_id
+
+        url = f'/logs/search_logs?store_id={store_id}&q=progress&per_page=8'
+        first = app_client.get(url).get_json()
+        second = app_client.get(f"{url}&page=2&after_rowid={first['next_after_rowid']}").get_json()
+        assert second['page'] == 2
+        assert second['cache']['misses'] >= 2
+        assert second['results'] == app_client.get(f'{url}&page=2').get_json()['results']
+        back = app_client.get(f"{url}&before_rowid={second['prev_before_rowid']}").get_json()
+        assert back['results'] == first['results']
+        assert app_client.get(f'{url}&after_rowid=x').status_code == 400
+
+    def test_search_logs_by_field(self, app_client, manager, monkeypatch):
+        monkeypatch.setattr('lib.logs_metrics.INCREMENTAL_LOG_INDEX', True)
+        monkeypatch.setattr('lib.logs_metrics.LOG_STORE_FIELDS', {'componentName': 'componentName'})
+        lines = [json.dumps({'level': 'info', 'time': '2024-03-01T00:01:00.000000-05:00',
+                             'message': 'Copying', 'componentName': 'Collection Copy'})]
+        r = self._upload(app_client, _progress_log() + '\n'.join(lines).encode() + b'\n')
+        job_id = r.headers['Location'].rstrip('/').split('/')[-2]
+        _wait_finished(manager.get(job_id))
+        store_id = manager.get(job_id).log_store_id
+
+        found = app_client.get(f'/logs/search_logs?store_id={store_id}&componentName=Collection%20Copy').get_json()
+        assert [r['message'] for r in found['results']] == ['Copying']
+
+    def test_search_logs_modes(self, app_client, manager, monkeypatch):
+        monkeypatch.setattr('lib.logs_metrics.INCREMENTAL_LOG_INDEX', True)
+        monkeypatch.setattr('lib.logs_metrics.LOG_REGEX_INDEX', True)
+        r = self._upload(app_client, _progress_log())
+        job_id = r.headers['Location'].rstrip('/').split('/')[-2]
+        _wait_finished(manager.get(job_id))
+        url = f'/logs/search_logs?store_id={manager.get(job_id).log_store_id}'
+
+        pattern = quote('"totalEventsApplied": 1[0-9]0,')
+        found = app_client.get(f'{url}&mode=regex&q={pattern}').get_json()
+        assert found['total'] is None
+        assert [r['line'] for r in found['results']] == list(range(11, 21))
+        assert app_client.get(f'{url}&mode=phrase&q=Replication%20progress').get_json()['total'] == 20
+        assert app_client.get(f'{url}&mode=phrase&q=progress%20Replication').get_json()['total'] == 0
+        assert app_client.get(f'{url}&mode=regex&q=(').status_code == 400
+        assert app_client.get(f'{url}&mode=glob&q=x').status_code == 400
+
+    def test_log_histogram(self, app_client, manager, monkeypatch):
+        monkeypatch.setattr('lib.logs_metrics.INCREMENTAL_LOG_INDEX', True)
+        r = self._upload(app_client, _progress_log())
+        job_id = r.headers['Location'].rstrip('/').split('/')[-2]
+        _wait_finished(manager.get(job_id))
+        url = f'/logs/log_histogram?store_id={manager.get(job_id).log_store_id}'
+
+        result = app_client.get(f'{url}&bucket_seconds=10').get_json()
+        assert result['total'] == 20
+        assert [b['counts'] for b in result['buckets']] == [{'info': 10}, {'info': 10}]
+        assert app_client.get(f'{url}&q=progress&level=info').get_json()['total'] == 20
+        assert app_client.get(f'{url}&timestamp_gte=2024-03-01T00:00:15').get_json()['total'] == 5
+        assert app_client.get(f'{url}&bucket_seconds=0').status_code == 400
+        assert app_client.get(f'{url}&bucket_seconds=x').status_code == 400
+        assert app_client.get('/logs/log_histogram?store_id=../x').status_code == 400
+
+    def test_synchronous_mode_renders_results(self, app_client, monkeypatch):
+        monkeypatch.setattr('lib.logs_metrics.INGEST_JOB_WORKERS', 0)
+        r = self._upload(app_client, b'{"level":"info","message":"hello"}\n')
+        assert r.status_code == 200
+        assert b'No Mongosync Data Found' in r.data
@@ -0,0 +1,37 @@
+"""Tests for the pluggable JSON decoding backend."""
+import json
+
+import pytest
+
+from lib import json_backend
+
+
+class TestLoads:
+    @pytest.mark.parametrize('text', [
+        '{"time":"2024-01-01T00:00:00Z","level":"info","message":"Replication progress"}',
+        '{"a": [1, 2.5, -3e10, true, false, null], "b": {"c": "\\u00e9\\n"}}',
+        '{"dup": 1, "dup": 2}',
+        '{"int64": 9223372036854775807}',
+        '{"nan": NaN, "inf": Infinity}',
+        '"\\ud800"',
+        '  {"padded": 1}  ',
+    ])
+    def test_matches_stdlib(self, text):
+        expected = json.loads(text)
+        result = json_backend.loads(text)
+        if 'NaN' in text:
+            assert result['inf'] == expected['inf'] and result['nan'] != result['nan']
+        else:
+            assert result == expected
+
+    @pytest.mark.parametrize('text', ['{"time": "broken', '', 'not json', '{"a": 1} trailing'])
+    def test_invalid_raises_stdlib_error_type(self, text):
+        with pytest.raises(json.JSONDecodeError):
+            json_backend.loads(text)
+
+    def test_non_string_raises_type_error(self):
+        with pytest.raises(TypeError):
+            json_backend.loads(None)
+
+    def test_backend_name(self):
+        assert json_backend.BACKEND in ('orjson', 'json')
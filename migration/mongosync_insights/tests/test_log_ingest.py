@@ -0,0 +1,295 @@
+"""Tests for log line classification and parallel ingest."""
+import json
+
+import pytest
+
+from lib.app_config import load_error_patterns
+from lib.log_store import LogStore
+from lib.log_ingest import (
+    LOG_CATEGORIES,
+    LOG_MESSAGE_PATTERNS,
+    LogIngest,
+    LogLineClassifier,
+    MultiPatternMatcher,
+    ProgressRecord,
+    SPILLABLE_CATEGORIES,
+    literal_anchors,
+    new_categories,
+)
+
+
+class FakeLogStore:
+    """Collects rows the way LogStore would insert them."""
+
+    def __init__(self):
+        self.rows = []
+
+    def insert_line(self, line, parsed=None):
+        self.rows.append((
+            parsed.get('time', ''),
+            parsed.get('level', ''),
+            parsed.get('message', ''),
+            line,
+        ))
+
+    def insert_rows(self, rows):
+        self.rows.extend(rows)
+
+
+def _line(i, message, **fields):
+    obj = {'time': f'2024-01-01T00:00:{i % 60:02d}.000000Z', 'level': 'info', 'message': message}
+    obj.update(fields)
+    return json.dumps(obj, separators=(',', ':'))
+
+
+def _sample_lines():
+    lines = []
+    for i in range(400):
+        lines.append(_line(i, 'Replication progress', lagTimeSeconds=i))
+        lines.append(_line(i, 'Operation duration stats', CEASourceRead={'averageDurationMs': 1}))
+        lines.append(_line(i, 'sent response', body=json.dumps({'progress': {'canCommit': i > 200}})))
+        lines.append(_line(i, 'Mongosync Options', verbosity=1))
+        lines.append(_line(i, 'Received request', uri='/api/v1/start', body='{"source": "cluster0"}'))
+        lines.append(_line(i, 'plain chatter', reason='Selected for natural order collection reads',
+                           database='db', collection=f'c{i}'))
+        lines.append(_line(i, 'Completed writing 3 / 10 partitions to destination cluster'))
+        lines.append(_line(i, 'verifier', verifierDstLagTimeSeconds=2, verifierSrcLagTimeSeconds=3))
+        lines.append(_line(i, 'resume point may no longer be in the oplog'))
+        if i % 50 == 0:
+            lines.append('{"time": "broken')
+    return lines
+
+
+def _run(lines, workers, chunk_lines=64, store=None, **kwargs):
+    store = store if store is not None else FakeLogStore()
+    ingest = LogIngest(load_error_patterns(), store, 100, workers=workers, chunk_lines=chunk_lines, **kwargs)
+    try:
+        for line_no, line in enumerate(lines, start=1):
+            ingest.feed(line, line_no)
+        ingest.finish()
+    finally:
+        ingest.close()
+    return ingest, store
+
+
+class TestLogLineClassifier:
+    def test_routes_message_to_categories(self):
+        classifier = LogLineClassifier([])
+        categories = new_categories()
+        obj = {'time': 't', 'level': 'info', 'message': 'Version info', 'version': '1.9'}
+        classifier.classify(obj, categories)
+        assert categories['version_info'] == [obj]
+        assert all(not categories[name] for name in LOG_CATEGORIES if name != 'version_info')
+
+    def test_first_error_pattern_wins(self):
+        classifier = LogLineClassifier([
+            {'pattern': 'boom', 'friendly_name': 'First'},
+            {'pattern': 'boom', 'friendly_name': 'Second'},
+        ])
+        categories = new_categories()
+        classifier.classify({'message': 'BOOM happened'}, categories)
+        assert [e['friendly_name'] for e in categories['matched_errors']] == ['First']
+
+
+    def test_chart_categories_keep_columns_only(self):
+        classifier = LogLineClassifier([])
+        categories = new_categories()
+        classifier.classify({'time': 't2', 'message': 'Replication progress', 'lagTimeSeconds': 4,
+                             'unrelated': 'x' * 100}, categories)
+        series = categories['replication_progress']
+        assert len(series) == 1
+        assert series.times == ['t2']
+        assert series.column('lagTimeSeconds') == [4]
+        assert series.column_by_row('totalEventsApplied') == [None]
+
+
+class TestProgressRecord:
+    def test_decodes_progress_once(self):
+        obj = {'time': 't1', 'message': 'sent response',
+               'body': json.dumps({'progress': {'canCommit': True, 'collectionCopy': {'estimatedCopiedBytes': 5}}})}
+        record = ProgressRecord.from_response(obj)
+        assert record == ProgressRecord('t1', {'canCommit': True, 'collectionCopy': {'estimatedCopiedBytes': 5}}, True)
+
+    @pytest.mark.parametrize('obj, expected', [
+        ({'time': 't', 'body': '{"ok": 1}'}, ProgressRecord('t', None, True)),
+        ({'time': 't', 'body': '{"progress": null}'}, ProgressRecord('t', None, True)),
+        ({'time': 't', 'body': '[1, 2]'}, ProgressRecord('t', None, True)),
+        ({'time': 't', 'body': '{"progress": '}, ProgressRecord('t', None, False)),
+        ({'time': 't'}, ProgressRecord('t', None, False)),
+        ({'body': '{"progress": {}}'}, ProgressRecord('', {}, True)),
+    ])
+    def test_bodies_without_progress(self, obj, expected):
+        assert ProgressRecord.from_response(obj) == expected
+
+    def test_classify_stores_records(self):
+        classifier = LogLineClassifier([])
+        categories = new_categories()
+        classifier.classify({'time': 't', 'message': 'sent response', 'body': '{"progress": {"canWrite": false}}'},
+                            categories)
+        assert categories['sent_response'] == [ProgressRecord('t', {'canWrite': False}, True)]
+
+
+class TestLiteralAnchors:
+    @pytest.mark.parametrize('pattern, expected', [
+        ('Replication progress', ('replication progress',)),
+        ('Completed writing \\d+ / \\d+ partitions', ('completed writing ',)),
+        ('Starting A|Commit B', ('starting a', 'commit b')),
+        ('from $out aggregations', ('from ',)),
+        ('colou?r', ('colo',)),
+        ('ab{0,2}c', ('a',)),
+    ])
+    def test_derives_required_literals(self, pattern, expected):
+        assert literal_anchors(pattern) == expected
+
+    @pytest.mark.parametrize('pattern', [
+        '^start',
+        '(?i)foo',
+        '[ab]c',
+        'foo(x)|bar',
+        'a|',
+        '\\w+ failed',
+    ])
+    def test_no_anchor_when_unsafe(self, pattern):
+        assert literal_anchors(pattern) == ()
+
+
+class TestMultiPatternMatcher:
+    MESSAGES = [
+        'Replication progress',
+        'replication PROGRESS and sent response',
+        'Completed writing 3 / 10 partitions to destination cluster',
+        'Completed writing x / 10 partitions to destination cluster',
+        'Starting collection copy phase; Commit handler called',
+        'ſent response',  # long s is case-insensitively equal to 's' for re
+        'Mongosync Options \u212a',
+        'nothing to see here',
+        '',
+    ]
+
+    def test_match_all_equals_individual_searches(self):
+        matcher = MultiPatternMatcher(list(LOG_MESSAGE_PATTERNS.items()))
+        for message in self.MESSAGES:
+            expected = [name for name, p in LOG_MESSAGE_PATTERNS.items() if p.search(message)]
+            assert matcher.match_all(message) == expected, message
+
+    def test_match_first_uses_priority_order(self):
+        config = load_error_patterns() + [{'pattern': '^zzz|yyy', 'friendly_name': 'unanchored'}]
+        classifier = LogLineClassifier(config)
+        matcher = MultiPatternMatcher([(ep['friendly_name'], ep['pattern']) for ep in classifier.error_patterns])
+        messages = self.MESSAGES + [
+            'the resume token was not found',
+            'RESUME POINT MAY NO LONGER BE IN THE OPLOG',
+            'zzz at start',
+            'contains yyy',
+        ]
+        for message in messages:
+            expected = next(
+                (i for i, ep in enumerate(classifier.error_patterns) if ep['pattern'].search(message)),
+                None,
+            )
+            assert matcher.match_first(message) == expected, message
+
+    def test_might_match_never_misses_a_match(self):
+        matcher = MultiPatternMatcher(list(LOG_MESSAGE_PATTERNS.items()))
+        for message in self.MESSAGES:
+            if matcher.match_all(message):
+                assert matcher.might_match(message), message
+        assert not matcher.might_match('nothing to see here')
+
+
+class TestLazyDecode:
+    def test_matches_full_decode_of_every_line(self):
+        lines = _sample_lines() + [
+            _line(1, 'routine chatter', error={'message': 'resume point may no longer be in the oplog'}),
+            _line(2, 'routine chatter \u00e9 Replication progress'),
+            _line(3, 'plain', reason='Selected for natural order collection reads', database='d', collection='c'),
+            _line(4, 'plain', verifierSrcLagTimeSeconds=0),
+            '{"level":"info","time":"t","message":"Replication progress"}',
+        ]
+        classifier = LogLineClassifier(load_error_patterns())
+        expected = new_categories()
+        expected_rows = []
+        for line in lines:
+            try:
+                obj = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            expected_rows.append((obj.get('time', ''), obj.get('level', ''), obj.get('message', ''), line))
+            classifier.classify(obj, expected)
+
+        ingest, store = _run(lines, workers=1)
+        assert ingest.categories == expected
+        assert store.rows == expected_rows
+
+    @pytest.mark.parametrize('line', [
+        # outer brace missing, line still ends in a nested object's '}'
+        '{"level":"info","time":"t","message":"Read batch","lsid":{"id":"x"}',
+        '{"level":"info","time":"t","message":"Read batch",oops}',
+    ])
+    def test_malformed_chatter_counted_invalid(self, line):
+        ingest, store = _run([_line(1, 'Read batch of change events'), line], workers=1)
+        assert ingest.invalid_json_count == 1
+        assert len(store.rows) == 1
+
+    def test_chatter_skips_classification(self):
+        classifier = LogLineClassifier(load_error_patterns())
+        row, obj = classifier.parse_line(_line(1, 'Read batch of change events', numEvents=3))
+        assert obj is None
+        assert row[1:3] == ('info', 'Read batch of change events')
+        row, obj = classifier.parse_line(_line(1, 'Replication progress', lagTimeSeconds=1))
+        assert obj is not None and obj['lagTimeSeconds'] == 1
+
+
+class TestParallelIngest:
+    def test_parallel_matches_sequential(self):
+        lines = _sample_lines()
+        seq, seq_store = _run(lines, workers=1)
+        par, par_store = _run(lines, workers=2)
+
+        assert par.categories == seq.categories
+        assert par_store.rows == seq_store.rows
+        assert list(par.raw_log_tail) == list(seq.raw_log_tail)
+        assert par.invalid_json_count == seq.invalid_json_count == 8
+
+    @pytest.mark.parametrize('chunk_lines', [1, 7, 100000])
+    def test_chunk_size_does_not_change_results(self, chunk_lines):
+        lines = _sample_lines()[:300]
+        seq, _ = _run(lines, workers=1)
+        par, _ = _run(lines, workers=2, chunk_lines=chunk_lines)
+        assert par.categories == seq.categories
+
+
+class TestBoundedMemory:
+    @pytest.mark.parametrize('workers', [1, 2])
+    def test_error_captures_are_capped_per_pattern(self, workers):
+        lines = _sample_lines()
+        full, _ = _run(lines, workers=1)
+        capped, _ = _run(lines, workers=workers, chunk_lines=7, max_error_captures=3)
+        errors = capped.categories['matched_errors']
+        assert errors == full.categories['matched_errors'][:3]
+        assert errors.match_counts == full.categories['matched_errors'].match_counts
+        name = errors[0]['friendly_name']
+        assert errors.suppressed_counts() == {name: 400 - 3}
+
+    @pytest.mark.parametrize('workers, store_kwargs', [
+        (1, {}),
+        (2, {}),
+        # Spills share the writer thread's connection (MI_LOG_STORE_WRITER_QUEUE)
+        (1, {'writer_queue_batches': 1}),
+        (2, {'writer_queue_batches': 2, 'incremental_index': True}),
+        (1, {'load_profile': 'bulk'}),
+    ])
+    def test_spilled_categories_match_in_memory(self, tmp_path, workers, store_kwargs):
+        lines = _sample_lines()
+        expected, _ = _run(lines, workers=1)
+        store = LogStore(str(tmp_path / 'mi_logstore_spill.db'), **store_kwargs)
+        try:
+            spilled, _ = _run(lines, workers=workers, store=store, memory_budget_bytes=2048)
+            assert spilled.spill_count > 0
+            for name in LOG_CATEGORIES:
+                if name in SPILLABLE_CATEGORIES:
+                    assert list(spilled.categories[name]) == expected.categories[name], name
+                else:
+                    assert spilled.categories[name] == expected.categories[name], name
+        finally:
+            store.close()
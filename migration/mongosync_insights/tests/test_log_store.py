@@ -0,0 +1,652 @@
+"""Tests for the SQLite log store behind the Log Viewer."""
+import json
+import sqlite3
+import threading
+
+import pytest
+
+from lib.log_store import LogStore
+
+
+def _doc(i, level='info', message=None):
+    return {
+        'level': level,
+        'time': f'2024-03-01T00:{i // 60:02d}:{i % 60:02d}.000000-05:00',
+        'message': message or f'Replication progress {i}',
+    }
+
+
+def _fill(store, n, **kwargs):
+    for i in range(n):
+        doc = _doc(i, **kwargs)
+        store.insert_line(json.dumps(doc), doc)
+
+
+@pytest.fixture
+def make_store(tmp_path):
+    stores = []
+
+    def make(name='store.db', **kwargs):
+        store = LogStore(str(tmp_path / name), **kwargs)
+        stores.append(store)
+        return store
+
+    yield make
+    for store in stores:
+        store.close()
+
+
+def _index_names(store):
+    rows = store._conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'").fetchall()
+    return {name for (name,) in rows}
+
+
+class TestIncrementalIndex:
+    def test_same_results_as_rebuild(self, make_store):
+        rebuilt = make_store('rebuilt.db')
+        incremental = make_store('incremental.db', incremental_index=True)
+        for store in (rebuilt, incremental):
+            _fill(store, 12000)
+            store.insert_line(json.dumps(_doc(1, level='error', message='oplog rollover')),
+                              _doc(1, level='error', message='oplog rollover'))
+            store.build_fts_index()
+
+        for query in ({'$text': 'progress'}, {'$text': 'rollover'}, {'level': 'error'},
+                      {'$text': 'progress', 'timestamp_gte': '2024-03-01T01:00'}):
+            assert incremental.find(query, limit=200) == rebuilt.find(query, limit=200)
+
+    def test_searchable_before_ingest_finishes(self, make_store):
+        store = make_store(incremental_index=True)
+        _fill(store, LogStore.BATCH_SIZE + 10)
+        # The first batch has been written and indexed; the rest is still buffered
+        reader = LogStore(store.db_path)
+        try:
+            assert reader.count({'$text': 'progress'}) == LogStore.BATCH_SIZE
+        finally:
+            reader.close()
+        store.flush()
+        assert store.count({'$text': 'progress'}) == LogStore.BATCH_SIZE + 10
+
+    def test_secondary_indexes_created_up_front(self, make_store):
+        assert {'idx_level', 'idx_timestamp'} <= _index_names(make_store(incremental_index=True))
+        assert not {'idx_level', 'idx_timestamp'} & _index_names(make_store('plain.db'))
+
+    def test_insert_many_is_indexed(self, make_store):
+        store = make_store(incremental_index=True)
+        store.insert_many([_doc(i) for i in range(10)])
+        assert store.count({'$text': 'progress'}) == 10
+
+
+class TestWriterThread:
+    def test_same_rows_as_inline_writes(self, make_store):
+        inline = make_store('inline.db')
+        threaded = make_store('threaded.db', writer_queue_batches=2)
+        for store in (inline, threaded):
+            _fill(store, 3 * LogStore.BATCH_SIZE + 7)
+            store.flush()
+            store.build_fts_index()
+        assert threaded.total_documents == inline.total_documents == 3 * LogStore.BATCH_SIZE + 7
+        assert threaded.find({'$text': 'progress'}, skip=9000) == inline.find({'$text': 'progress'}, skip=9000)
+        assert threaded.batches_written == 4
+        assert threaded.write_seconds > 0
+
+    def test_flush_stops_writer_and_later_inserts_restart_it(self, make_store):
+        store = make_store(writer_queue_batches=1)
+        _fill(store, LogStore.BATCH_SIZE)
+        assert store._writer is not None
+        store.flush()
+        assert store._writer is None
+        store.insert_many([_doc(1)])
+        store.flush()
+        assert store.total_documents == LogStore.BATCH_SIZE + 1
+
+    def test_writer_with_incremental_index(self, make_store):
+        store = make_store(incremental_index=True, writer_queue_batches=2)
+        _fill(store, 2 * LogStore.BATCH_SIZE + 3)
+        store.flush()
+        assert store.count({'$text': 'progress'}) == 2 * LogStore.BATCH_SIZE + 3
+
+    def test_writer_error_is_raised_on_flush(self, make_store):
+        store = make_store(writer_queue_batches=1)
+        store._conn.execute("DROP TABLE log_lines")
+        store._conn.commit()
+        store.insert_many([_doc(1)])
+        with pytest.raises(sqlite3.OperationalError):
+            store.flush()
+
+
+class TestKeysetPagination:
+    def _pages(self, store, query, limit):
+        pages = []
+        page = store.find(query, limit=limit)
+        while True:
+            pages.append(page)
+            if page['next_after_rowid'] is None:
+                return pages
+            page = store.find(query, limit=limit, after_rowid=page['next_after_rowid'])
+
+    def test_cursor_pages_match_offset_pages(self, make_store):
+        store = make_store()
+        _fill(store, 230)
+        store.build_fts_index()
+        for query in ({}, {'$text': 'progress'}, {'timestamp_gte': '2024-03-01T00:01'}):
+            pages = self._pages(store, query, 50)
+            for number, page in enumerate(pages):
+                offset_page = store.find(query, skip=number * 50, limit=50)
+                assert page['results'] == offset_page['results']
+            assert sum(len(p['results']) for p in pages) == pages[0]['total']
+
+    def test_previous_page_by_cursor(self, make_store):
+        store = make_store()
+        _fill(store, 120)
+        store.flush()
+        first = store.find(limit=50)
+        assert first['prev_before_rowid'] is None
+        second = store.find(limit=50, after_rowid=first['next_after_rowid'])
+        back = store.find(limit=50, before_rowid=second['prev_before_rowid'])
+        assert back['results'] == first['results']
+        assert back['prev_before_rowid'] is None
+        assert back['next_after_rowid'] == first['next_after_rowid']
+
+        last = store.find(limit=50, after_rowid=second['next_after_rowid'])
+        assert len(last['results']) == 20
+        assert last['next_after_rowid'] is None
+
+    def test_total_counted_once_per_query(self, make_store):
+        store = make_store()
+        _fill(store, 120)
+        store.flush()
+        statements = []
+        store._conn.set_trace_callback(statements.append)
+        page = store.find({'level': 'info'}, limit=50)
+        store.find({'level': 'info'}, limit=50, after_rowid=page['next_after_rowid'])
+        assert sum('COUNT(*)' in sql for sql in statements) == 1
+
+    def test_total_cache_sees_new_rows(self, make_store):
+        store = make_store()
+        _fill(store, 10)
+        store.flush()
+        assert store.find(limit=5)['total'] == 10
+        store.insert_many([_doc(1)])
+        store.flush()
+        assert store.find(limit=5)['total'] == 11
+        # Rows committed through another connection invalidate the cache too
+        other = make_store()
+        other.insert_many([_doc(2)])
+        other.flush()
+        assert store.find(limit=5)['total'] == 12
+
+
+class TestQueryCache:
+    def _traced(self, store):
+        statements = []
+        store._conn.set_trace_callback(
+            lambda sql: statements.append(sql) if 'data_version' not in sql else None)
+        return statements
+
+    def test_repeated_page_runs_no_query(self, make_store):
+        store = make_store()
+        _fill(store, 120)
+        store.flush()
+        first = store.find({'level': 'info'}, limit=50)
+        first['page'] = 1
+        statements = self._traced(store)
+        again = store.find({'level': 'info'}, limit=50)
+        assert statements == []
+        assert 'page' not in again
+        assert again['results'] == first['results']
+        assert store.cache_hits == 1
+
+    def test_counts_logged_periodically(self, make_store, caplog, monkeypatch):
+        monkeypatch.setattr(LogStore, 'CACHE_LOG_INTERVAL', 4)
+        store = make_store()
+        _fill(store, 10)
+        store.flush()
+        with caplog.at_level('INFO', logger='lib.log_store'):
+            # The first find misses on its page and its total, the next two hit
+            for _ in range(3):
+                store.find({'level': 'info'}, limit=5)
+        assert [r.getMessage() for r in caplog.records if 'query cache' in r.getMessage()] == [
+            'Log store query cache for store.db: 2 hits, 2 misses']
+
+    def test_store_change_empties_cache(self, make_store):
+        store = make_store()
+        _fill(store, 10)
+        store.flush()
+        assert len(store.find(limit=50)['results']) == 10
+        store.insert_many([_doc(1)])
+        store.flush()
+        assert len(store.find(limit=50)['results']) == 11
+
+    def test_least_recently_used_evicted(self, make_store):
+        store = make_store(query_cache_size=2)
+        _fill(store, 10)
+        store.flush()
+        store.find({'level': 'info'}, limit=5)
+        assert len(store._cache) == 2
+        store.find({'level': 'error'}, limit=5)
+        assert len(store._cache) == 2
+        assert not any(key[0] == 'page' and 'info' in key[2] for key in store._cache)
+
+    def test_disabled_cache(self, make_store):
+        store = make_store(query_cache_size=0)
+        _fill(store, 10)
+        store.flush()
+        store.find(limit=5)
+        statements = self._traced(store)
+        store.find(limit=5)
+        assert sum('COUNT(*)' in sql for sql in statements) == 1
+
+    def test_count_reads_no_rows(self, make_store):
+        store = make_store()
+        _fill(store, 30)
+        store.flush()
+        statements = self._traced(store)
+        assert store.count({'level': 'info'}) == 30
+        assert store.count({'level': 'info'}) == 30
+        assert len(statements) == 1 and 'COUNT(*)' in statements[0]
+        # find() reuses the total counted for count()
+        store.find({'level': 'info'}, limit=5)
+        assert sum('COUNT(*)' in sql for sql in statements) == 1
+
+
+class TestReadPool:
+    def test_same_results_as_shared_connection(self, make_store):
+        store = make_store(doc_block_rows=16)
+        _fill(store, 100)
+        store.flush()
+        store.build_fts_index()
+        pooled = make_store(read_connections=2, query_cache_size=0)
+        for query in ({}, {'level': 'info'}, {'$text': 'progress'}):
+            assert pooled.find(query, limit=20) == store.find(query, limit=20)
+        assert pooled.histogram() == store.histogram()
+        assert pooled.fetch_latest_raw_lines(10) == store.fetch_latest_raw_lines(10)
+        assert pooled.total_documents == 100
+
+    def test_readers_are_read_only(self, make_store):
+        store = make_store(read_connections=1)
+        with store._reader() as conn:
+            assert conn is not store._conn
+            with pytest.raises(sqlite3.OperationalError):
+                conn.execute("DELETE FROM log_lines")
+
+    def test_queries_run_while_a_reader_is_busy(self, make_store):
+        store = make_store(read_connections=2)
+        _fill(store, 10)
+        store.flush()
+        with store._reader():
+            results = []
+            worker = threading.Thread(target=lambda: results.append(store.count()))
+            worker.start()
+            worker.join(timeout=5)
+            assert results == [10]
+        assert store._readers_opened == 2
+
+    def test_waits_for_a_free_reader(self, make_store):
+        store = make_store(read_connections=1, query_cache_size=0)
+        _fill(store, 10)
+        store.flush()
+        results = []
+        worker = threading.Thread(target=lambda: results.append(store.count()))
+        with store._reader():
+            worker.start()
+            worker.join(timeout=0.2)
+            assert worker.is_alive()
+        worker.join(timeout=5)
+        assert results == [10]
+        assert store._readers_opened == 1
+
+    def test_readers_see_new_rows_and_close(self, make_store):
+        store = make_store(read_connections=2)
+        _fill(store, 10)
+        store.flush()
+        assert store.count() == 10
+        store.insert_many([_doc(1)])
+        store.flush()
+        assert store.count() == 11
+        store.close()
+        assert store._readers.empty() and store._readers_opened == 0
+
+
+def _journal_mode(store):
+    return store._conn.execute("PRAGMA journal_mode").fetchone()[0]
+
+
+class TestLoadProfiles:
+    @pytest.mark.parametrize('profile', sorted(LogStore.LOAD_PROFILES))
+    def test_same_results_for_every_profile(self, make_store, profile):
+        reference = make_store('reference.db', doc_block_rows=16)
+        store = make_store(f'{profile}.db', doc_block_rows=16, load_profile=profile)
+        for target in (reference, store):
+            _fill(target, 250, level='warn')
+            target.build_fts_index()
+        assert _journal_mode(store) == 'wal'
+        for query in ({}, {'$text': 'progress'}, {'level': 'warn'}):
+            assert store.find(query, limit=100) == reference.find(query, limit=100)
+        assert store.histogram() == reference.histogram()
+
+    def test_bulk_profile_settings(self, make_store):
+        store = make_store(load_profile='bulk')
+        assert _journal_mode(store) == 'off'
+        assert store._conn.execute("PRAGMA page_size").fetchone()[0] == 16384
+        assert store.batch_size == 20000
+
+    def test_single_transaction_committed_on_flush(self, make_store, monkeypatch):
+        monkeypatch.setattr(LogStore, 'BATCH_SIZE', 100)
+        store = make_store(load_profile='memory')
+        _fill(store, 250)
+        reader = sqlite3.connect(store.db_path)
+        try:
+            assert reader.execute("SELECT COUNT(*) FROM log_lines").fetchone()[0] == 0
+            store.flush()
+            assert reader.execute("SELECT COUNT(*) FROM log_lines").fetchone()[0] == 250
+        finally:
+            reader.close()
+
+    def test_spill_stays_in_load_transaction(self, make_store):
+        store = make_store(load_profile='bulk')
+        _fill(store, LogStore.BATCH_SIZE)
+        store.spill_records('replication_progress', [('t', 0, b'x')])
+        assert store._conn.in_transaction
+        assert list(store.iter_spilled_records('replication_progress')) == [b'x']
+        assert not store._conn.in_transaction
+
+    def test_invalid_json_keeps_earlier_batches(self, make_store):
+        store = make_store(load_profile='bulk', fields={'database': 'database'})
+        store.insert_many([{'level': 'info', 'time': _doc(0)['time'], 'database': 'a'}])
+        store.insert_rows([(_doc(1)['time'], 'info', 'not json', 'not json')])
+        store.flush()
+        assert store.total_documents == 2
+        assert store.count({'database': 'a'}) == 1
+
+    @pytest.mark.parametrize('kwargs', [{'incremental_index': True}, {'writer_queue_batches': 2}])
+    def test_readers_during_ingest_force_wal(self, make_store, kwargs):
+        store = make_store(load_profile='bulk', **kwargs)
+        assert _journal_mode(store) == 'wal'
+        assert not store._profile['single_transaction']
+
+    def test_unknown_profile(self, make_store):
+        with pytest.raises(ValueError, match='load profile'):
+            make_store(load_profile='fast')
+
+
+def _regex_docs(n=300):
+    docs = []
+    for i in range(n):
+        doc = _doc(i, level='error' if i % 10 == 0 else 'info')
+        if i % 10 == 0:
+            doc['message'] = f'E11000 duplicate key error index: _id_{i}'
+        doc['collection'] = f'coll{i % 7}'
+        docs.append(doc)
+    return docs
+
+
+class TestRegexSearch:
+    @pytest.fixture(params=[False, True], ids=['scan', 'trigram'])
+    def store(self, make_store, request):
+        store = make_store(doc_block_rows=16, regex_index=request.param)
+        store.insert_many(_regex_docs())
+        store.build_fts_index()
+        return store
+
+    def _all_pages(self, store, query, limit):
+        lines = []
+        page = store.find(query, limit=limit)
+        while True:
+            lines += [r['line'] for r in page['results']]
+            if page['next_after_rowid'] is None:
+                return lines
+            page = store.find(query, limit=limit, after_rowid=page['next_after_rowid'])
+
+    def test_matches_message_and_raw_doc(self, store):
+        found = store.find({'$regex': r'E11000 .* _id_1\d0$'}, limit=50)
+        assert [r['message'] for r in found['results']] == [
+            f'E11000 duplicate key error index: _id_{i}' for i in range(100, 200, 10)]
+        assert found['total'] is None and not found['truncated']
+        # collection is only in the raw document
+        by_doc = store.find({'$regex': '"collection":"coll3"', 'level': 'error'}, limit=50)
+        assert [r['line'] for r in by_doc['results']] == [i + 1 for i in range(0, 300, 10) if i % 7 == 3]
+
+    def test_cursor_pages_cover_every_match(self, store):
+        assert self._all_pages(store, {'$regex': 'duplicate'}, limit=7) == list(range(1, 301, 10))
+        last = store.find({'$regex': 'duplicate'}, skip=28, limit=7)
+        assert [r['line'] for r in last['results']] == [281, 291]
+        back = store.find({'$regex': 'duplicate'}, limit=7, before_rowid=281)
+        assert [r['line'] for r in back['results']] == list(range(211, 281, 10))
+
+    def test_examined_rows_are_capped(self, store):
+        store.regex_max_rows = 25
+        page = store.find({'$regex': 'progress 2[0-9]{2}'}, limit=50)
+        assert page['truncated'] and page['examined'] == 25
+        # The cursor resumes after the last examined line
+        lines = self._all_pages(store, {'$regex': 'progress 2[0-9]{2}'}, limit=50)
+        assert lines == [i + 1 for i in range(200, 300) if i % 10]
+
+    def test_time_limit_truncates_page(self, store):
+        store.regex_time_limit = 0
+        page = store.find({'$regex': 'progress 2[0-9]{2}'}, limit=50)
+        assert page['truncated'] and page['examined'] == 1
+        # Each page tests one line, and the cursor still covers every match
+        lines = self._all_pages(store, {'$regex': 'progress 2[0-9]{2}'}, limit=50)
+        assert lines == [i + 1 for i in range(200, 300) if i % 10]
+
+    def test_trigram_index_narrows_examined_rows(self, make_store):
+        store = make_store(regex_index=True)
+        store.insert_many(_regex_docs())
+        assert store.find({'$regex': 'E11000'}, limit=100)['examined'] == 30
+        assert store.find({'$regex': '.*'}, limit=10)['examined'] == 11
+
+    def test_invalid_and_unsupported(self, store):
+        with pytest.raises(ValueError, match='regular expression'):
+            store.find({'$regex': '('})
+        with pytest.raises(ValueError):
+            store.count({'$regex': 'E11000'})
+        with pytest.raises(ValueError):
+            store.histogram({'$regex': 'E11000'})
+
+    def test_index_created_only_for_new_stores(self, make_store):
+        make_store().close()
+        assert not make_store(regex_index=True)._has_trigram_index
+        assert make_store('indexed.db', regex_index=True)._has_trigram_index
+
+
+class TestDocBlocks:
+    def test_same_results_as_doc_column(self, make_store):
+        plain = make_store('plain.db')
+        blocked = make_store('blocked.db', doc_block_rows=7)
+        for store in (plain, blocked):
+            _fill(store, LogStore.BATCH_SIZE + 30)
+            store.insert_many([_doc(3, level='error', message='oplog rollover')])
+            store.flush()
+            store.build_fts_index()
+
+        for query in ({}, {'$text': 'rollover'}, {'level': 'error'},
+                      {'timestamp_gte': '2024-03-01T00:30'}):
+            assert blocked.find(query, skip=40, limit=60) == plain.find(query, skip=40, limit=60)
+        assert blocked.fetch_latest_raw_lines(500) == plain.fetch_latest_raw_lines(500)
+
+    def test_docs_are_not_stored_per_row(self, make_store):
+        store = make_store(doc_block_rows=10)
+        _fill(store, 25)
+        store.flush()
+        assert store._conn.execute("SELECT COUNT(*) FROM log_lines WHERE doc IS NOT NULL").fetchone()[0] == 0
+        firsts = [r[0] for r in store._conn.execute("SELECT first_rowid FROM doc_blocks ORDER BY 1")]
+        assert firsts == [1, 11, 21]
+
+    def test_docs_resolved_with_two_block_queries(self, make_store):
+        store = make_store(doc_block_rows=4)
+        _fill(store, 200)
+        store.flush()
+        queries = []
+        store._conn.set_trace_callback(queries.append)
+        page = store.find(limit=100, skip=50)
+        assert [r['raw'] for r in page['results']] == [json.dumps(_doc(i)) for i in range(50, 150)]
+        assert len([q for q in queries if 'doc_blocks' in q]) == 2
+
+    def test_invalid_json_retry_keeps_block_rows_aligned(self, make_store):
+        store = make_store(doc_block_rows=3, fields={'database': 'database'})
+        lines = [json.dumps({'level': 'info', 'time': _doc(i)['time'], 'database': f'db{i}'}) for i in range(7)]
+        lines[4] = '{"level": "info", "trunc'
+        store.insert_rows([(_doc(i)['time'], 'info', f'm{i}', line) for i, line in enumerate(lines)])
+        store.flush()
+        assert [r['raw'] for r in store.find(limit=10)['results']] == lines
+        assert store.count({'database': 'db5'}) == 1
+
+    def test_blocks_read_without_setting(self, make_store):
+        writer = make_store(doc_block_rows=4, writer_queue_batches=1)
+        _fill(writer, 9)
+        writer.flush()
+        reader = make_store()
+        assert [r['raw'] for r in reader.find(limit=10)['results']] == [json.dumps(_doc(i)) for i in range(9)]
+
+
+FIELDS = {'componentName': 'componentName', 'database': 'database',
+          'partitionDb': 'partition.partition.db'}
+
+
+def _field_docs():
+    return [
+        {'level': 'info', 'time': '2024-03-01T00:00:01', 'message': 'Copying',
+         'componentName': 'Collection Copy', 'database': 'sales'},
+        {'level': 'info', 'time': '2024-03-01T00:00:02', 'message': 'Applying',
+         'componentName': 'Change Event Application'},
+        {'level': 'info', 'time': '2024-03-01T00:00:03', 'message': 'Persisted a new partition after sampling',
+         'partition': {'partition': {'db': 'sales', 'coll': 'orders'}}},
+        {'level': 'error', 'time': '2024-03-01T00:00:04', 'message': 'Copy failed',
+         'componentName': 'Collection Copy', 'database': 42},
+    ]
+
+
+class TestFieldColumns:
+    @pytest.mark.parametrize('doc_block_rows', [0, 2])
+    def test_find_by_field(self, make_store, doc_block_rows):
+        store = make_store(fields=FIELDS, doc_block_rows=doc_block_rows)
+        store.insert_many(_field_docs())
+        store.build_fts_index()
+
+        def messages(query):
+            return [r['message'] for r in store.find(query)['results']]
+
+        assert messages({'componentName': 'Collection Copy'}) == ['Copying', 'Copy failed']
+        assert messages({'componentName': 'Collection Copy', 'level': 'error'}) == ['Copy failed']
+        assert messages({'database': {'$in': ['sales', 42]}}) == ['Copying', 'Copy failed']
+        assert messages({'partitionDb': 'sales'}) == ['Persisted a new partition after sampling']
+        assert messages({'componentName': {'$exists': False}}) == ['Persisted a new partition after sampling']
+        assert store.find({'database': 'sales'})['results'][0]['raw'] == json.dumps(
+            _field_docs()[0], separators=(',', ':'))
+
+    def test_field_indexes(self, make_store):
+        store = make_store(fields=FIELDS)
+        store.insert_many(_field_docs())
+        store.build_fts_index()
+        assert {'idx_f_componentName', 'idx_f_database', 'idx_f_partitionDb'} <= _index_names(store)
+        plan = store._conn.execute(
+            "EXPLAIN QUERY PLAN SELECT rowid FROM log_lines l WHERE l.f_componentName = ?", ('x',)
+        ).fetchall()
+        assert 'idx_f_componentName' in str(plan)
+        assert {'idx_f_database'} <= _index_names(make_store('incremental.db', fields=FIELDS,
+                                                             incremental_index=True))
+
+    def test_reader_discovers_fields(self, make_store):
+        writer = make_store(fields=FIELDS)
+        writer.insert_many(_field_docs())
+        writer.flush()
+        reader = make_store()
+        assert set(reader.search_fields) == set(FIELDS)
+        assert reader.count({'componentName': 'Collection Copy'}) == 2
+        # Unknown keys are ignored, as before
+        assert make_store('plain.db').search_fields == ()
+
+    def test_invalid_json_line_is_stored(self, make_store):
+        store = make_store(fields=FIELDS)
+        store.insert_line('{"level": "info", "message": "trunc', {'level': 'info', 'message': 'trunc'})
+        store.insert_line(json.dumps(_field_docs()[0]), _field_docs()[0])
+        store.flush()
+        assert store.total_documents == 2
+        assert store.count({'database': 'sales'}) == 1
+
+    def test_rejects_unsafe_field_names(self, make_store):
+        with pytest.raises(ValueError):
+            make_store(fields={"a'b": 'a'})
+
+
+def _timeline(store, n=600):
+    levels = ('info', 'warn', 'error')
+    store.insert_many([
+        {'level': levels[i % 3], 'time': f'2024-03-01T00:{i // 60:02d}:{i % 60:02d}.500000-05:00',
+         'message': f'step {i}', 'componentName': 'Collection Copy' if i < 300 else 'CEA'}
+        for i in range(n)
+    ])
+
+
+class TestHistogram:
+    def test_counts_per_level_and_bucket(self, make_store):
+        store = make_store()
+        _timeline(store)
+        store.flush()
+        result = store.histogram(bucket_seconds=60)
+        assert result['bucket_seconds'] == 60
+        assert result['levels'] == ['error', 'info', 'warn']
+        assert result['total'] == 600
+        assert len(result['buckets']) == 10
+        assert result['buckets'][0] == {'start': '2024-03-01T00:00:00',
+                                        'counts': {'error': 20, 'info': 20, 'warn': 20}}
+
+    def test_default_bucket_size(self, make_store):
+        store = make_store()
+        _timeline(store)
+        store.flush()
+        result = store.histogram()
+        assert result['bucket_seconds'] == 5
+        assert len(result['buckets']) == 120
+
+    def test_rollup_and_line_scan_agree(self, make_store):
+        store = make_store(fields={'componentName': 'componentName'})
+        _timeline(store)
+        store.build_fts_index()
+        for query in ({'level': 'error'}, {'level': {'$in': ['warn', 'error']}},
+                      {'timestamp_gte': '2024-03-01T00:02:30', 'timestamp_lte': '2024-03-01T00:04:59'}):
+            rollup = store.histogram(query, bucket_seconds=30)
+            store._has_level_counts = False
+            scanned = store.histogram(query, bucket_seconds=30)
+            store._has_level_counts = True
+            assert rollup == scanned
+        assert store.histogram({'level': 'error'})['total'] == 200
+
+    def test_text_and_field_filters(self, make_store):
+        store = make_store(fields={'componentName': 'componentName'})
+        _timeline(store)
+        store.build_fts_index()
+        copy = store.histogram({'componentName': 'Collection Copy'}, bucket_seconds=60)
+        assert copy['total'] == 300
+        # The time axis spans the whole store, so filtered histograms line up
+        assert len(copy['buckets']) == 10
+        assert copy['buckets'][-1]['counts'] == {}
+        assert store.histogram({'$text': 'step'}, bucket_seconds=60)['total'] == 600
+
+    def test_gaps_are_empty_buckets(self, make_store):
+        store = make_store()
+        store.insert_many([_doc(0), _doc(0), _doc(179, level='error'), {'level': 'info', 'message': 'no time'}])
+        store.flush()
+        result = store.histogram(bucket_seconds=60)
+        assert [b['counts'] for b in result['buckets']] == [{'info': 2}, {}, {'error': 1}]
+        assert result['total'] == 3
+
+    def test_empty_store_and_invalid_bucket(self, make_store, monkeypatch):
+        store = make_store()
+        assert store.histogram() == {'bucket_seconds': None, 'levels': [], 'total': 0, 'buckets': []}
+        _timeline(store, 10)
+        store.flush()
+        with pytest.raises(ValueError):
+            store.histogram(bucket_seconds=0)
+        monkeypatch.setattr(LogStore, 'HISTOGRAM_MAX_BUCKETS', 5)
+        with pytest.raises(ValueError, match='maximum'):
+            store.histogram(bucket_seconds=1)
+
+    def test_counts_follow_writer_thread_and_blocks(self, make_store, monkeypatch):
+        monkeypatch.setattr(LogStore, 'BATCH_SIZE', 1000)
+        store = make_store(writer_queue_batches=1, doc_block_rows=16)
+        _fill(store, 3005)
+        store.flush()
+        assert store.batches_written == 4
+        assert store.histogram(bucket_seconds=3600)['total'] == 3005
@@ -0,0 +1,68 @@
+"""Tests for category records that spill to the log store."""
+import pytest
+
+from lib.log_ingest import ProgressRecord
+from lib.log_store import LogStore
+from lib.record_spill import SpillableRecords, sort_records_by_time
+
+
+@pytest.fixture
+def store(tmp_path):
+    log_store = LogStore(str(tmp_path / 'mi_logstore_test.db'))
+    yield log_store
+    log_store.close()
+
+
+def _records(n):
+    return [{'time': f'2024-01-01T00:00:{(i * 7) % 60:02d}', 'i': i} for i in range(n)]
+
+
+class TestSpillableRecords:
+    def test_in_memory_iteration_and_sort(self, store):
+        records = SpillableRecords('partition_copy_progress', store)
+        items = _records(50)
+        records.extend(items)
+        assert len(records) == 50
+        assert list(records) == items
+        sort_records_by_time(records)
+        assert list(records) == sorted(items, key=lambda x: x['time'])
+
+    @pytest.mark.parametrize('spill_every', [1, 7, 50])
+    def test_spilled_records_match_list(self, store, spill_every):
+        records = SpillableRecords('partition_copy_progress', store)
+        items = _records(120)
+        for i, item in enumerate(items, start=1):
+            records.append(item)
+            if i % spill_every == 0:
+                records.spill()
+        assert len(records) == 120
+        assert list(records) == items
+        sort_records_by_time(records)
+        expected = sorted(items, key=lambda x: x['time'])
+        assert list(records) == expected
+        assert list(records) == expected  # iterable more than once
+
+    def test_categories_are_kept_apart(self, store):
+        a = SpillableRecords('a', store)
+        b = SpillableRecords('b', store)
+        a.append({'time': '1'})
+        b.append({'time': '2'})
+        a.spill()
+        b.spill()
+        assert list(a) == [{'time': '1'}]
+        assert list(b) == [{'time': '2'}]
+
+    def test_progress_records_sort_by_time(self, store):
+        records = SpillableRecords('sent_response', store)
+        records.extend([ProgressRecord('t2', {}, True), ProgressRecord('t1', None, False)])
+        records.spill()
+        records.sort_by_time()
+        assert [r.time for r in records] == ['t1', 't2']
+
+    def test_drop_spilled_records(self, store):
+        records = SpillableRecords('a', store)
+        records.append({'time': '1'})
+        records.spill()
+        store.drop_spilled_records()
+        tables = {row[0] for row in store._conn.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+        assert 'spilled_records' not in tables
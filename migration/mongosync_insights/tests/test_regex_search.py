@@ -0,0 +1,84 @@
+"""Tests for the trigram prefilter of Log Viewer regex searches."""
+import json
+import re
+import sqlite3
+
+import pytest
+
+from lib.regex_search import compile_regex, regex_trigram_query, required_literals
+
+
+class TestRequiredLiterals:
+    @pytest.mark.parametrize('pattern, literals', [
+        ('E11000 duplicate key.*collection', ['E11000 duplicate key', 'collection']),
+        ('x?abc', ['abc']),
+        ('abc(?:def)?ghi', ['abc', 'ghi']),
+        ('(lic)+ation', ['lic', 'ation']),
+        ('a{0,2}bcd', ['bcd']),
+        (r'\berror\b', ['error']),
+        ('(?>abcd)', ['abcd']),
+        ('a|b', []),
+        ('.*', []),
+    ])
+    def test_literals(self, pattern, literals):
+        assert required_literals(pattern) == literals
+
+    def test_split_at_json_escaped_characters(self):
+        assert required_literals('"database":"x<y"') == ['database', ':', 'x', 'y']
+        assert required_literals('señor\tpath') == ['se', 'or', 'path']
+
+    def test_ignorecase_splits_at_i(self):
+        assert required_literals('(?i)Replication') == ['Repl', 'cat', 'on']
+        assert required_literals('x(?i:Rep)ition') == ['x', 'Rep', 'ition']
+        assert required_literals('(?i)a(?-i:Replication)') == ['a', 'Replication']
+
+
+class TestRegexTrigramQuery:
+    def test_and_of_distinct_trigrams(self):
+        assert regex_trigram_query('Error.*error') == '"err" AND "rro" AND "ror"'
+
+    def test_terms_are_quoted(self):
+        assert regex_trigram_query('a-b c') == '"a-b" AND "-b " AND "b c"'
+
+    def test_short_literals_give_no_query(self):
+        assert regex_trigram_query('ab.cd') is None
+
+    def test_prefilter_keeps_every_match(self):
+        docs = [
+            {'message': 'E11000 duplicate key error collection: db.c', 'level': 'error'},
+            {'message': 'Replication progress of db."quoted"<c>'},
+            {'message': 'REPLICATİON progress of señor'},
+            {'message': 'nothing here', 'error': 'E11000 elsewhere'},
+        ]
+        lines = [json.dumps(doc) for doc in docs]
+        conn = sqlite3.connect(':memory:')
+        conn.execute("CREATE VIRTUAL TABLE t USING fts5(doc, content='', tokenize='trigram', detail='none')")
+        conn.executemany("INSERT INTO t(rowid, doc) VALUES (?,?)", enumerate(lines))
+        for pattern in ['E11000', 'dup.*key', '"quoted"<c>', '(?i)replication', 'Rep[a-z]+ion pro', 'of señor']:
+            regex = re.compile(pattern)
+            matching = {i for i, (doc, line) in enumerate(zip(docs, lines))
+                        if regex.search(doc['message']) or regex.search(line)}
+            candidates = {rowid for (rowid,) in conn.execute(
+                "SELECT rowid FROM t WHERE t MATCH ?", (regex_trigram_query(pattern),))}
+            assert matching and matching <= candidates, pattern
+
+
+def test_compile_regex_raises_value_error():
+    with pytest.raises(ValueError, match='Invalid regular expression'):
+        compile_regex('(')
+
+
+@pytest.mark.parametrize('pattern', [r'(a+)+$', r'(\w+\s)*end', r'(?:a|b*)+', r'(?=(x+)*y)'])
+def test_compile_regex_rejects_nested_repeats(pattern):
+    with pytest.raises(ValueError, match='nests unbounded repeats'):
+        compile_regex(pattern)
+
+
+@pytest.mark.parametrize('pattern', [r'E11000.*collection', r'(\d+\.)?\d+', r'(ab{2,3})+', r'a*b+'])
+def test_compile_regex_accepts_single_repeats(pattern):
+    assert compile_regex(pattern).pattern == pattern
+
+
+def test_compile_regex_rejects_long_patterns():
+    with pytest.raises(ValueError, match='longer than'):
+        compile_regex('a' * 501)
@@ -0,0 +1,72 @@
+"""Tests for the columnar chart series accumulator."""
+import random
+
+from lib.series_columns import ColumnarSeries
+
+COLUMNS = {'lag': None, 'stats.avg': 'd', 'ping': 'd'}
+
+
+def _items(n, seed=3):
+    rng = random.Random(seed)
+    items = []
+    for i in range(n):
+        item = {'time': f'2024-01-01T00:{rng.randrange(60):02d}:00.000000Z'}
+        if i % 3:
+            item['lag'] = None if i % 7 == 0 else i
+        if i % 4:
+            item['stats'] = {'avg': str(i)} if i % 5 else {'max': 1}
+        if i % 2:
+            item['ping'] = 'unreachable' if i % 9 == 0 else i * 0.5
+        if i % 11 == 0:
+            del item['time']
+        items.append(item)
+    return items
+
+
+def _expected(items):
+    items = sorted(items, key=lambda x: x.get('time', ''))
+    return {
+        'times': [x.get('time', '') for x in items],
+        'lag': [x['lag'] for x in items if 'lag' in x],
+        'stats.avg': [float(x['stats']['avg']) for x in items if 'stats' in x and 'avg' in x['stats']],
+        'ping': [float(x['ping']) for x in items if 'ping' in x and x['ping'] != 'unreachable'],
+        'lag_by_row': [x.get('lag') for x in items],
+    }
+
+
+class TestColumnarSeries:
+    def test_columns_match_list_of_dicts(self):
+        items = _items(500)
+        series = ColumnarSeries(COLUMNS)
+        for item in items:
+            series.append(item)
+        series.sort_by_time()
+        expected = _expected(items)
+        assert len(series) == len(items)
+        assert series.times == expected['times']
+        for name in COLUMNS:
+            assert series.column(name) == expected[name], name
+        assert series.column_by_row('lag') == expected['lag_by_row']
+
+    def test_extend_matches_single_series(self):
+        items = _items(300)
+        whole = ColumnarSeries(COLUMNS)
+        for item in items:
+            whole.append(item)
+        merged = ColumnarSeries(COLUMNS)
+        for start in range(0, len(items), 64):
+            part = ColumnarSeries(COLUMNS)
+            for item in items[start:start + 64]:
+                part.append(item)
+            merged.extend(part)
+        assert merged == whole
+        merged.sort_by_time()
+        whole.sort_by_time()
+        assert merged == whole
+
+    def test_sorted_input_is_left_alone(self):
+        series = ColumnarSeries(COLUMNS)
+        for second in range(10):
+            series.append({'time': f'2024-01-01T00:00:{second:02d}', 'ping': second})
+        series.sort_by_time()
+        assert series.column('ping') == [float(s) for s in range(10)]
@@ -0,0 +1,70 @@
+"""Tests for the cached log timestamp parser."""
+from datetime import datetime
+
+import pytest
+
+from lib import timestamps
+from lib.timestamps import LOG_TIME_FORMAT, parse_log_time
+
+
+def _strptime(value):
+    return datetime.strptime(value[:26], LOG_TIME_FORMAT)
+
+
+VALID = [
+    '2024-03-01T05:33:19.900000-05:00',
+    '2024-03-01T05:33:19.000001Z',
+    '2024-03-01T05:33:19.123456789+00:00',
+    '2024-03-01T05:33:19.9',
+    '2024-03-01T05:33:19.123',
+    '2024-02-29T23:59:59.999999',
+    '1999-12-31T00:00:00.000000Z',
+]
+
+INVALID = [
+    '',
+    '2024-03-01T05:33:19',
+    '2024-03-01T05:33:19.',
+    '2024-03-01T05:33:19.9-05:00',
+    '2024-03-01 05:33:19.900000',
+    '2024-13-01T05:33:19.900000',
+    '2023-02-29T05:33:19.900000',
+    '2024-03-01T24:00:00.000000',
+    '2024-03-01T05:33:60.000000',
+    '2024-03-01T05:33:19.90000x',
+    '2024-03-01T05:33:19.١٢٣',
+    'not a timestamp at all, really',
+]
+
+
+class TestParseLogTime:
+    @pytest.mark.parametrize('value', VALID)
+    def test_matches_strptime(self, value):
+        assert parse_log_time(value) == _strptime(value)
+
+    @pytest.mark.parametrize('value', VALID)
+    def test_cached_second_matches_strptime(self, value):
+        parse_log_time(value)
+        assert parse_log_time(value) == _strptime(value)
+
+    @pytest.mark.parametrize('value', INVALID)
+    def test_errors_match_strptime(self, value):
+        with pytest.raises(ValueError):
+            _strptime(value)
+        with pytest.raises(ValueError):
+            parse_log_time(value)
+
+    def test_non_string_raises_type_error(self):
+        with pytest.raises(TypeError):
+            parse_log_time(None)
+
+    def test_many_seconds_match_strptime(self):
+        for second in range(0, 86400, 7):
+            value = f'2024-03-01T{second // 3600:02d}:{second // 60 % 60:02d}:{second % 60:02d}.{second:06d}Z'
+            assert parse_log_time(value) == _strptime(value)
+
+    def test_cache_is_bounded(self, monkeypatch):
+        monkeypatch.setattr(timestamps, '_CACHE_MAX_ENTRIES', 10)
+        for second in range(60):
+            parse_log_time(f'2024-03-01T00:00:{second:02d}.000000')
+        assert len(timestamps._seconds_cache) <= 10
@@ -0,0 +1,76 @@
+"""Tests for uploads staged on disk and read while they arrive."""
+import gzip
+import os
+import threading
+import time
+
+import pytest
+
+from lib.upload_stream import StagedUpload, UploadAborted
+
+
+def _write_slowly(upload, data, pieces=10, delay=0.01, finish=True):
+    step = max(1, len(data) // pieces)
+    for i in range(0, len(data), step):
+        upload.write(data[i:i + step])
+        time.sleep(delay)
+    if finish:
+        upload.finish()
+
+
+class TestStagedUpload:
+    def test_reader_follows_writer(self, tmp_path):
+        data = b''.join(b'{"line": %d}\n' % i for i in range(2000))
+        upload = StagedUpload(str(tmp_path))
+        writer = threading.Thread(target=_write_slowly, args=(upload, data))
+        writer.start()
+        with upload.open_reader() as reader:
+            lines = list(reader)
+        writer.join()
+        assert b''.join(lines) == data
+        assert upload.size == len(data)
+
+    def test_read_blocks_until_bytes_arrive(self, tmp_path):
+        upload = StagedUpload(str(tmp_path))
+        upload.write(b'abc')
+        threading.Timer(0.05, lambda: (upload.write(b'defg'), upload.finish())).start()
+        with upload.open_reader() as reader:
+            assert reader.read(7) == b'abcdefg'
+            assert reader.read() == b''
+
+    def test_seek_end_waits_for_complete_upload(self, tmp_path):
+        upload = StagedUpload(str(tmp_path))
+        upload.write(b'x' * 100)
+        threading.Timer(0.05, lambda: (upload.write(b'y' * 50), upload.finish())).start()
+        with upload.open_reader() as reader:
+            assert reader.seek(0, os.SEEK_END) == 150
+            reader.seek(100)
+            assert reader.read() == b'y' * 50
+
+    def test_gzip_over_growing_file(self, tmp_path):
+        data = b''.join(b'{"line": %d}\n' % i for i in range(5000))
+        upload = StagedUpload(str(tmp_path))
+        writer = threading.Thread(target=_write_slowly, args=(upload, gzip.compress(data)))
+        writer.start()
+        with upload.open_reader() as reader:
+            with gzip.GzipFile(fileobj=reader, mode='rb') as gz:
+                assert gz.read() == data
+        writer.join()
+
+    def test_abort_fails_blocked_reader(self, tmp_path):
+        upload = StagedUpload(str(tmp_path))
+        upload.write(b'partial')
+        threading.Timer(0.05, upload.abort, args=("Upload Error", "interrupted")).start()
+        with upload.open_reader() as reader:
+            with pytest.raises(UploadAborted) as excinfo:
+                reader.read(100)
+        assert excinfo.value.title == "Upload Error"
+
+    def test_remove_discards_later_writes(self, tmp_path):
+        upload = StagedUpload(str(tmp_path))
+        upload.write(b'data')
+        upload.remove()
+        upload.write(b'more')
+        upload.finish()
+        assert not os.path.exists(upload.path)
+        assert upload.size == 4